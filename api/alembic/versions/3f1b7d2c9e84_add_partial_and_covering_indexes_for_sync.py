@@ -0,0 +1,46 @@
+"""Add partial and covering indexes for sync status lookups
+
+Revision ID: 3f1b7d2c9e84
+Revises: 7c2e9a41d5b3
+Create Date: 2026-10-19 10:12:47.903116+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1b7d2c9e84"
+down_revision: Union[str, Sequence[str], None] = "7c2e9a41d5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # get_failed_syncs reads only failed rows, newest first. Replaces the index
+    # on sync_status, a value nearly every row shares.
+    op.execute("""
+        CREATE INDEX idx_synced_runs_failed ON synced_runs (updated_at DESC)
+        WHERE sync_status = 'failed'
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_synced_runs_sync_status")
+
+    # Lets the run detail listings join sync info per run with an index-only
+    # scan. Replaces the plain run_id index, which duplicated the unique
+    # constraint's index.
+    op.execute("""
+        CREATE INDEX idx_synced_runs_run_id_detail ON synced_runs (run_id)
+        INCLUDE (sync_status, synced_at, google_event_id, run_version, error_message)
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_synced_runs_run_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("CREATE INDEX idx_synced_runs_run_id ON synced_runs(run_id)")
+    op.execute("DROP INDEX IF EXISTS idx_synced_runs_run_id_detail")
+    op.execute("CREATE INDEX idx_synced_runs_sync_status ON synced_runs(sync_status)")
+    op.execute("DROP INDEX IF EXISTS idx_synced_runs_failed")
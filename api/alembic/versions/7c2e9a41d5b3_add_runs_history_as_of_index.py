@@ -0,0 +1,34 @@
+"""Add covering index for point-in-time reads of runs_history
+
+Revision ID: 7c2e9a41d5b3
+Revises: 16b1cd7556b0
+Create Date: 2026-10-19 09:40:12.418305+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e9a41d5b3"
+down_revision: Union[str, Sequence[str], None] = "16b1cd7556b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lets `DISTINCT ON (run_id) ... WHERE changed_at <= as_of` read each run's
+    # latest version from the index alone, without visiting the table.
+    op.execute("""
+        CREATE INDEX idx_runs_history_as_of ON runs_history (run_id, version_number DESC)
+        INCLUDE (changed_at, datetime_utc, type, distance, duration, source,
+                 avg_heart_rate, shoe_id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_runs_history_as_of")
@@ -0,0 +1,127 @@
+"""Optionally partition runs_history by year of changed_at
+
+Revision ID: b5d04e7a93c1
+Revises: 3f1b7d2c9e84
+Create Date: 2026-10-19 11:02:31.551870+00:00
+
+Opt-in: the table is only converted when the migration is run with
+
+    alembic -x partition_runs_history=true upgrade head
+
+Otherwise the revision is recorded without changing anything. To convert later,
+downgrade past this revision and upgrade again with the flag.
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d04e7a93c1"
+down_revision: Union[str, Sequence[str], None] = "3f1b7d2c9e84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = """
+    CREATE INDEX idx_runs_history_run_id ON runs_history (run_id);
+    CREATE INDEX idx_runs_history_run_id_version ON runs_history (run_id, version_number DESC);
+    CREATE INDEX idx_runs_history_as_of ON runs_history (run_id, version_number DESC)
+    INCLUDE (changed_at, datetime_utc, type, distance, duration, source,
+             avg_heart_rate, shoe_id);
+"""
+
+
+def _is_partitioned() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = 'runs_history'::regclass"
+            )
+        )
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    x_args = context.get_x_argument(as_dictionary=True)
+    if x_args.get("partition_runs_history", "").lower() != "true" or _is_partitioned():
+        return
+
+    op.execute("""
+        UPDATE runs_history SET changed_at = datetime_utc WHERE changed_at IS NULL;
+        ALTER TABLE runs_history RENAME TO runs_history_unpartitioned;
+        ALTER INDEX runs_history_pkey RENAME TO runs_history_unpartitioned_pkey;
+        DROP INDEX idx_runs_history_run_id;
+        DROP INDEX idx_runs_history_run_id_version;
+        DROP INDEX idx_runs_history_as_of;
+
+        -- Unique constraints on a partitioned table must include the partition
+        -- key, so (run_id, version_number) can no longer be enforced here;
+        -- versions come from runs.version, which each edit bumps atomically.
+        CREATE TABLE runs_history (
+            LIKE runs_history_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            PRIMARY KEY (history_id, changed_at),
+            CONSTRAINT fk_runs_history_run_id FOREIGN KEY (run_id)
+                REFERENCES runs(id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (changed_at);
+        ALTER TABLE runs_history ALTER COLUMN changed_at SET NOT NULL;
+        ALTER SEQUENCE runs_history_history_id_seq OWNED BY runs_history.history_id;
+
+        -- Catches rows outside the yearly partitions so inserts never fail.
+        CREATE TABLE runs_history_default PARTITION OF runs_history DEFAULT;
+    """)
+
+    first_year = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT EXTRACT(YEAR FROM MIN(changed_at))::int "
+                "FROM runs_history_unpartitioned"
+            )
+        )
+        .scalar()
+    )
+    current_year = datetime.now(timezone.utc).year
+    for year in range(first_year or current_year, current_year + 2):
+        op.execute(f"""
+            CREATE TABLE runs_history_{year} PARTITION OF runs_history
+            FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')
+        """)
+
+    op.execute(f"""
+        INSERT INTO runs_history SELECT * FROM runs_history_unpartitioned;
+        DROP TABLE runs_history_unpartitioned;
+        {_INDEXES}
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_partitioned():
+        return
+
+    op.execute(f"""
+        ALTER TABLE runs_history RENAME TO runs_history_partitioned;
+        CREATE TABLE runs_history (
+            LIKE runs_history_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        );
+        ALTER TABLE runs_history ALTER COLUMN changed_at DROP NOT NULL;
+        ALTER SEQUENCE runs_history_history_id_seq OWNED BY runs_history.history_id;
+
+        INSERT INTO runs_history SELECT * FROM runs_history_partitioned;
+        DROP TABLE runs_history_partitioned;
+
+        ALTER TABLE runs_history ADD PRIMARY KEY (history_id);
+        ALTER TABLE runs_history ADD CONSTRAINT unique_run_version
+            UNIQUE (run_id, version_number);
+        ALTER TABLE runs_history ADD CONSTRAINT fk_runs_history_run_id
+            FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE;
+        {_INDEXES}
+    """)
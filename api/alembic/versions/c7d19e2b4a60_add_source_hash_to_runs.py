@@ -0,0 +1,34 @@
+"""Add runs.source_hash for diff-based imports
+
+Revision ID: c7d19e2b4a60
+Revises: e8a4c3f0d217
+Create Date: 2026-10-19 14:21:47.309118+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d19e2b4a60"
+down_revision: Union[str, Sequence[str], None] = "e8a4c3f0d217"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        -- Hash of the run as last imported from its source; NULL for runs
+        -- imported before it was stored.
+        ALTER TABLE runs ADD COLUMN source_hash TEXT;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        ALTER TABLE runs DROP COLUMN IF EXISTS source_hash;
+    """)
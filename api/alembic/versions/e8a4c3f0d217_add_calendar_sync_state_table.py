@@ -0,0 +1,38 @@
+"""Add calendar_sync_state table for incremental Google Calendar reconciliation
+
+Revision ID: e8a4c3f0d217
+Revises: b5d04e7a93c1
+Create Date: 2026-10-19 13:12:08.204417+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a4c3f0d217"
+down_revision: Union[str, Sequence[str], None] = "b5d04e7a93c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE calendar_sync_state (
+            calendar_id VARCHAR(255) PRIMARY KEY,
+            -- nextSyncToken from the last events.list; NULL until Google returns one.
+            sync_token TEXT,
+            reconciled_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        DROP TABLE IF EXISTS calendar_sync_state;
+    """)
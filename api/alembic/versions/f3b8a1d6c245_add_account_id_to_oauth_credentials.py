@@ -0,0 +1,34 @@
+"""Add oauth_credentials.account_id to tell whose account credentials are for
+
+Revision ID: f3b8a1d6c245
+Revises: c7d19e2b4a60
+Create Date: 2026-10-19 16:02:11.482907+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8a1d6c245"
+down_revision: Union[str, Sequence[str], None] = "c7d19e2b4a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        -- The provider's ID for the authorized account, e.g. the Strava athlete
+        -- ID; NULL for credentials stored before it was recorded.
+        ALTER TABLE oauth_credentials ADD COLUMN account_id TEXT;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        ALTER TABLE oauth_credentials DROP COLUMN IF EXISTS account_id;
+    """)
@@ -0,0 +1 @@
+"""Standalone performance benchmarks. Run with `make bench`."""
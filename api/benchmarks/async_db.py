@@ -0,0 +1,115 @@
+"""Load test async handlers that read from the database under concurrent clients.
+
+Compares three ways an async FastAPI handler can call the db layer:
+
+- sync call: the sync function called directly, blocking the event loop
+  (what `update_strava_data` and `upload_mmf_csv` did before).
+- threadpool: the sync function on the default threadpool, as FastAPI does for
+  sync handlers.
+- async pool: the `fitness.db.aio` function on the async connection pool.
+
+Each request also waits ROUND_TRIP_MS inside the database (`pg_sleep`) to stand
+in for the network latency of a hosted Postgres; a local server answers too
+quickly for blocking to matter. Needs a migrated database in DATABASE_URL; it
+only reads. Run with:
+
+    uv run python -m benchmarks.async_db
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from fitness.db.connection import (
+    close_async_db_pool,
+    close_db_pool,
+    get_async_db_cursor,
+    get_db_cursor,
+)
+from fitness.db.statements import ACTIVE_RUN_IDS
+
+NUM_CLIENTS = 50
+REQUESTS_PER_CLIENT = 20
+ROUND_TRIP_MS = 10
+
+_SLOW_RUN_IDS = f"SELECT pg_sleep({ROUND_TRIP_MS / 1000}); {ACTIVE_RUN_IDS.sql}"
+
+
+def _run_ids() -> int:
+    with get_db_cursor() as cursor:
+        cursor.execute(_SLOW_RUN_IDS)
+        cursor.nextset()
+        return len(cursor.fetchall())
+
+
+async def _run_ids_async() -> int:
+    async with get_async_db_cursor() as cursor:
+        await cursor.execute(_SLOW_RUN_IDS)
+        cursor.nextset()
+        return len(await cursor.fetchall())
+
+
+app = FastAPI()
+
+
+@app.get("/sync-call")
+async def sync_call() -> int:
+    return _run_ids()
+
+
+@app.get("/threadpool")
+async def threadpool() -> int:
+    return await run_in_threadpool(_run_ids)
+
+
+@app.get("/async-pool")
+async def async_pool() -> int:
+    return await _run_ids_async()
+
+
+async def _client(http: httpx.AsyncClient, path: str) -> list[float]:
+    """Send requests one after another, returning each latency in milliseconds."""
+    latencies = []
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        response = await http.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def _load_test(path: str) -> tuple[float, float, float]:
+    """Requests per second, median and p95 latency with NUM_CLIENTS clients."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        # Warm up the pools and prepared statements.
+        await _client(http, path)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(_client(http, path) for _ in range(NUM_CLIENTS))
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies = [latency for client in results for latency in client]
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    return len(latencies) / elapsed, statistics.median(latencies), p95
+
+
+async def main() -> None:
+    print(f"{NUM_CLIENTS} clients x {REQUESTS_PER_CLIENT} requests")
+    print(f"{'handler':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    try:
+        for path in ("/sync-call", "/threadpool", "/async-pool"):
+            throughput, p50, p95 = await _load_test(path)
+            print(f"{path.lstrip('/'):<14}{throughput:>10.0f}{p50:>10.1f}{p95:>10.1f}")
+    finally:
+        close_db_pool()
+        await close_async_db_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
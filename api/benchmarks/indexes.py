@@ -0,0 +1,150 @@
+"""EXPLAIN ANALYZE the main run queries on 200k seeded runs, before and after the
+indexes added in migration 3f1b7d2c9e84.
+
+Steps:
+- Seed NUM_RUNS runs. 10% are soft-deleted. Half are synced to Google
+  Calendar, and about 1% of those syncs failed.
+- VACUUM ANALYZE, so index-only scans are possible as they would be in
+  production.
+- Time each query with the indexes the migration replaced, then with the new
+  ones.
+
+For `get_run_details_in_date_range`, "before" also uses the old
+`DATE(datetime_utc)` predicate, which no index could serve.
+
+Needs a migrated scratch database in DATABASE_URL. The seeded rows are deleted
+and the new indexes restored at the end. Run with:
+
+    uv run python -m benchmarks.indexes
+"""
+
+import json
+import statistics
+from datetime import date
+from typing import Any, Mapping
+
+import psycopg
+
+from fitness.db.connection import get_database_url
+from fitness.db.statements import (
+    ACTIVE_RUNS,
+    FAILED_SYNCED_RUNS,
+    RUN_DETAILS_IN_RANGE,
+)
+
+NUM_RUNS = 200_000
+REPEATS = 7
+
+# Same DDL as the migration's downgrade() and upgrade().
+OLD_INDEXES = """
+    DROP INDEX IF EXISTS idx_synced_runs_failed;
+    DROP INDEX IF EXISTS idx_synced_runs_run_id_detail;
+    CREATE INDEX IF NOT EXISTS idx_synced_runs_sync_status ON synced_runs (sync_status);
+    CREATE INDEX IF NOT EXISTS idx_synced_runs_run_id ON synced_runs (run_id);
+"""
+NEW_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_synced_runs_failed ON synced_runs (updated_at DESC)
+        WHERE sync_status = 'failed';
+    CREATE INDEX IF NOT EXISTS idx_synced_runs_run_id_detail ON synced_runs (run_id)
+        INCLUDE (sync_status, synced_at, google_event_id, run_version, error_message);
+    DROP INDEX IF EXISTS idx_synced_runs_sync_status;
+    DROP INDEX IF EXISTS idx_synced_runs_run_id;
+"""
+
+SEED = f"""
+    INSERT INTO shoes (id, name)
+    SELECT 'bench_shoe_' || i, 'Bench Shoe ' || i FROM generate_series(1, 40) i;
+
+    INSERT INTO runs (id, datetime_utc, type, distance, duration, source, shoe_id, deleted_at)
+    SELECT 'bench_' || i,
+           timestamp '2010-01-01' + random() * interval '15 years',
+           'Outdoor Run', 2 + random() * 10, 900 + random() * 5400, 'Strava',
+           'bench_shoe_' || (1 + i % 40),
+           CASE WHEN i % 10 = 0 THEN timestamp '2025-01-01' END
+    FROM generate_series(1, {NUM_RUNS}) i;
+
+    INSERT INTO synced_runs (run_id, google_event_id, sync_status, updated_at)
+    SELECT 'bench_' || i, 'event_' || i,
+           CASE WHEN i % 97 = 0 THEN 'failed' ELSE 'synced' END,
+           timestamp '2020-01-01' + i * interval '1 minute'
+    FROM generate_series(1, {NUM_RUNS}, 2) i;
+"""
+
+CLEANUP = """
+    DELETE FROM synced_runs WHERE run_id LIKE 'bench\\_%';
+    DELETE FROM runs WHERE id LIKE 'bench\\_%';
+    DELETE FROM shoes WHERE id LIKE 'bench\\_shoe\\_%';
+"""
+
+_OLD_RUN_DETAILS_IN_RANGE = RUN_DETAILS_IN_RANGE.sql.replace(
+    "r.datetime_utc >= %(start)s::date\n      AND r.datetime_utc < %(end)s::date + 1",
+    "DATE(r.datetime_utc) BETWEEN %(start)s AND %(end)s",
+)
+
+
+def _range(start: date, end: date) -> dict[str, Any]:
+    return {"start": start, "end": end, "include_deleted": False, "synced": None}
+
+
+# (query name, SQL before, SQL after, parameters)
+QUERIES: list[tuple[str, str, str, Mapping[str, Any] | None]] = [
+    ("get_all_runs", ACTIVE_RUNS.sql, ACTIVE_RUNS.sql, None),
+    (
+        "get_run_details_in_date_range (week)",
+        _OLD_RUN_DETAILS_IN_RANGE,
+        RUN_DETAILS_IN_RANGE.sql,
+        _range(date(2020, 3, 1), date(2020, 3, 7)),
+    ),
+    (
+        "get_run_details_in_date_range (month)",
+        _OLD_RUN_DETAILS_IN_RANGE,
+        RUN_DETAILS_IN_RANGE.sql,
+        _range(date(2020, 3, 1), date(2020, 3, 31)),
+    ),
+    ("get_failed_syncs", FAILED_SYNCED_RUNS.sql, FAILED_SYNCED_RUNS.sql, None),
+]
+
+
+def _explain(
+    connection: psycopg.Connection, sql: str, params: Mapping[str, Any] | None
+) -> float:
+    """Median execution time of the query in milliseconds."""
+    times = []
+    for _ in range(REPEATS):
+        (result,) = connection.execute(
+            f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params
+        ).fetchone()
+        if isinstance(result, str):
+            result = json.loads(result)
+        times.append(result[0]["Execution Time"])
+    return statistics.median(times)
+
+
+def _measure(connection: psycopg.Connection, indexes: str, before: bool) -> list[float]:
+    connection.execute(indexes)
+    connection.execute("VACUUM ANALYZE runs")
+    connection.execute("VACUUM ANALYZE synced_runs")
+    return [
+        _explain(connection, before_sql if before else after_sql, params)
+        for _name, before_sql, after_sql, params in QUERIES
+    ]
+
+
+def main() -> None:
+    print(f"{NUM_RUNS} runs, median of {REPEATS} executions")
+    with psycopg.connect(get_database_url(), autocommit=True) as connection:
+        try:
+            connection.execute(SEED)
+            before = _measure(connection, OLD_INDEXES, before=True)
+            after = _measure(connection, NEW_INDEXES, before=False)
+        finally:
+            connection.execute(CLEANUP)
+            connection.execute(NEW_INDEXES)
+
+    print(f"{'query':<40}{'before ms':>10}{'after ms':>10}")
+    for (name, *_), old, new in zip(QUERIES, before, after):
+        print(f"{name:<40}{old:>10.1f}{new:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
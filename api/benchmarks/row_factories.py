@@ -0,0 +1,77 @@
+"""Benchmark building Run and RunDetail models from database rows.
+
+Compares full pydantic validation against the unvalidated construction the
+psycopg row factories in `fitness.db.runs` use for trusted rows. Run with:
+
+    uv run python -m benchmarks.row_factories
+"""
+
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from fitness.db.runs import _row_to_run, _row_to_run_detail
+
+NUM_ROWS = 100_000
+
+
+def _make_rows(num_rows: int) -> list[tuple]:
+    """Rows shaped like the SELECT in `get_all_run_details`."""
+    rng = random.Random(num_rows)
+    first = datetime(2000, 1, 1, 12)
+    rows = []
+    for i in range(num_rows):
+        synced = rng.random() < 0.5
+        rows.append(
+            (
+                f"strava_{i}",
+                first + timedelta(hours=rng.randrange(25 * 365 * 24)),
+                rng.choice(["Outdoor Run", "Treadmill Run"]),
+                rng.uniform(2, 15),
+                rng.uniform(900, 7200),
+                "Strava",
+                rng.choice([None, rng.uniform(110, 185)]),
+                "nike_pegasus_37",
+                None,
+                "Nike Pegasus 37",
+                None,
+                "synced" if synced else None,
+                first if synced else None,
+                f"event_{i}" if synced else None,
+                1 if synced else None,
+                None,
+                1,
+            )
+        )
+    return rows
+
+
+def _best_of(fn, number: int = 3) -> float:
+    """Best wall time in milliseconds over a few repeats."""
+    return min(timeit.repeat(fn, number=1, repeat=number)) * 1000
+
+
+def main() -> None:
+    detail_rows = _make_rows(NUM_ROWS)
+    run_rows = [row[:10] for row in detail_rows]
+
+    benchmarks = [
+        ("_row_to_run", _row_to_run, run_rows),
+        ("_row_to_run_detail", _row_to_run_detail, detail_rows),
+    ]
+
+    print(f"{NUM_ROWS} rows")
+    print(f"{'benchmark':<24}{'validate ms':>14}{'trusted ms':>14}{'speedup':>10}")
+    for name, row_to_model, rows in benchmarks:
+        validate_ms = _best_of(lambda: [row_to_model(row) for row in rows])
+        trusted_ms = _best_of(
+            lambda: [row_to_model(row, validate=False) for row in rows]
+        )
+        print(
+            f"{name:<24}{validate_ms:>14.2f}{trusted_ms:>14.2f}"
+            f"{validate_ms / trusted_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark memory use and construction time of run objects for 100k rows.
+
+Compares the pydantic `Run`/`LocalizedRun` models against the slotted
+`RunRecord`/`LocalizedRunRecord` used internally for aggregation. Run with:
+
+    uv run python -m benchmarks.run_records
+"""
+
+import gc
+import random
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+from fitness.db.runs import _row_to_run
+from fitness.models import LocalizedRun, RunRecord
+from fitness.utils.timezone import convert_runs_to_user_timezone
+
+NUM_ROWS = 100_000
+USER_TIMEZONE = "America/Chicago"
+
+
+def _make_rows(num_rows: int) -> list[tuple]:
+    """Rows shaped like the SELECT in `get_all_runs`."""
+    rng = random.Random(num_rows)
+    first = datetime(2000, 1, 1, 12)
+    return [
+        (
+            f"strava_{i}",
+            first + timedelta(hours=rng.randrange(25 * 365 * 24)),
+            rng.choice(["Outdoor Run", "Treadmill Run"]),
+            rng.uniform(2, 15),
+            rng.uniform(900, 7200),
+            "Strava",
+            rng.choice([None, rng.uniform(110, 185)]),
+            "nike_pegasus_37",
+            None,
+            "Nike Pegasus 37",
+        )
+        for i in range(num_rows)
+    ]
+
+
+def _bytes_per_item(build) -> float:
+    """Bytes allocated per item while building (and holding) a list of objects."""
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(items)
+
+
+def _best_of(fn, number: int = 3) -> float:
+    """Best wall time in milliseconds over a few repeats."""
+    return min(timeit.repeat(fn, number=1, repeat=number)) * 1000
+
+
+def main() -> None:
+    rows = _make_rows(NUM_ROWS)
+    runs = [_row_to_run(row) for row in rows]
+    records = [RunRecord(*row) for row in rows]
+
+    benchmarks = [
+        (
+            "row -> Run",
+            lambda: [_row_to_run(row) for row in rows],
+        ),
+        (
+            "row -> RunRecord",
+            lambda: [RunRecord(*row) for row in rows],
+        ),
+        (
+            "Run -> LocalizedRun",
+            lambda: [LocalizedRun.from_run(run, USER_TIMEZONE) for run in runs],
+        ),
+        (
+            "RunRecord -> LocalizedRunRecord",
+            lambda: convert_runs_to_user_timezone(records, USER_TIMEZONE),
+        ),
+    ]
+
+    print(f"{NUM_ROWS} rows")
+    print(f"{'benchmark':<34}{'total ms':>12}{'bytes/run':>12}")
+    for name, build in benchmarks:
+        total_ms = _best_of(build)
+        bytes_per_run = _bytes_per_item(build)
+        print(f"{name:<34}{total_ms:>12.2f}{bytes_per_run:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
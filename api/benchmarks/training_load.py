@@ -0,0 +1,108 @@
+"""Benchmark training load computation over multi-decade daily series.
+
+Compares the vectorized TRIMP/EWMA implementation against the original
+pure-Python loops. Run with:
+
+    uv run python -m benchmarks.training_load
+"""
+
+import math
+import random
+import timeit
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+
+from fitness.agg.training_load import (
+    _ewma,
+    trimp,
+    trimp_values,
+    training_stress_balance,
+)
+from fitness.models import Run
+
+YEARS = (10, 30, 50)
+RUNS_PER_WEEK = 5
+
+
+def _loop_ewma(values: list[float], tau: int) -> list[float]:
+    alpha = 1 - math.exp(-1 / tau)
+    load = []
+    prev = 0.0
+    for value in values:
+        prev = prev + alpha * (value - prev)
+        load.append(prev)
+    return load
+
+
+def _make_runs(years: int) -> list[Run]:
+    rng = random.Random(years)
+    first_day = date(2025 - years, 1, 1)
+    num_days = years * 365
+    num_runs = num_days * RUNS_PER_WEEK // 7
+    return [
+        Run(
+            id=f"bench_{i}",
+            datetime_utc=datetime.combine(
+                first_day + timedelta(days=rng.randrange(num_days)), time(12)
+            ),
+            type="Outdoor Run",
+            distance=rng.uniform(2, 15),
+            duration=rng.uniform(900, 7200),
+            source="Strava",
+            avg_heart_rate=rng.uniform(110, 185),
+        )
+        for i in range(num_runs)
+    ]
+
+
+def _best_of(fn, number: int = 3) -> float:
+    """Best wall time in milliseconds over a few repeats."""
+    return min(timeit.repeat(fn, number=1, repeat=number)) * 1000
+
+
+def main() -> None:
+    print(
+        f"{'benchmark':<34}{'years':>6}{'loop ms':>12}{'numpy ms':>12}{'speedup':>10}"
+    )
+    for years in YEARS:
+        runs = _make_runs(years)
+        num_days = years * 365
+        daily = np.random.default_rng(years).uniform(0, 200, num_days)
+        daily_list = daily.tolist()
+        heart_rates = np.array([run.avg_heart_rate for run in runs])
+        durations = np.array([run.duration for run in runs])
+
+        rows = [
+            (
+                "EWMA (ATL + CTL)",
+                lambda: (_loop_ewma(daily_list, 7), _loop_ewma(daily_list, 42)),
+                lambda: (_ewma(daily, 7), _ewma(daily, 42)),
+            ),
+            (
+                f"TRIMP ({len(runs)} runs)",
+                lambda: [trimp(run, 190, 50, "M") for run in runs],
+                lambda: trimp_values(heart_rates, durations, 190, 50, "M"),
+            ),
+        ]
+        for name, loop_fn, numpy_fn in rows:
+            loop_ms = _best_of(loop_fn)
+            numpy_ms = _best_of(numpy_fn)
+            print(
+                f"{name:<34}{years:>6}{loop_ms:>12.2f}{numpy_ms:>12.2f}"
+                f"{loop_ms / numpy_ms:>9.1f}x"
+            )
+
+        end = date(2025, 1, 1)
+        tsb_ms = _best_of(
+            lambda: training_stress_balance(
+                runs, 190, 50, "M", end - timedelta(days=365), end
+            )
+        )
+        print(
+            f"{'training_stress_balance (1y out)':<34}{years:>6}{'':>12}{tsb_ms:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
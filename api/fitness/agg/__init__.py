@@ -1,17 +1,26 @@
-from .shoes import mileage_by_shoes
+from .shoes import mileage_by_shoes, shoe_usage
 from .mileage import (
     total_mileage,
     rolling_sum,
     miles_by_day,
 )
 from .seconds import total_seconds
-from .training_load import training_stress_balance
+from .duplicates import find_duplicate_runs
+from .training_load import (
+    training_load_by_model,
+    training_stress_balance,
+    training_stress_balance_by_profile,
+)
 
 __all__ = [
     "mileage_by_shoes",
+    "shoe_usage",
     "total_mileage",
     "rolling_sum",
     "miles_by_day",
     "total_seconds",
+    "find_duplicate_runs",
+    "training_load_by_model",
     "training_stress_balance",
+    "training_stress_balance_by_profile",
 ]
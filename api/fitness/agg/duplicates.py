@@ -0,0 +1,66 @@
+from typing import Container, Sequence
+
+from fitness.models import LocalizedRunRecord, RunLike
+from fitness.utils.timezone import convert_runs_to_user_timezone
+
+# How far apart two runs' distances and durations may be, as a fraction of the
+# larger one, for them to be the same workout. Sources measure the same run a
+# little differently, e.g. a watch's GPS track versus a phone app's.
+DEFAULT_DISTANCE_TOLERANCE = 0.05
+DEFAULT_DURATION_TOLERANCE = 0.05
+
+
+def find_duplicate_runs(
+    runs: Sequence[RunLike],
+    user_timezone: str | None = None,
+    involving: Container[str] | None = None,
+    distance_tolerance: float = DEFAULT_DISTANCE_TOLERANCE,
+    duration_tolerance: float = DEFAULT_DURATION_TOLERANCE,
+) -> list[tuple[LocalizedRunRecord, LocalizedRunRecord]]:
+    """
+    Find pairs of runs from different sources that are likely the same workout.
+
+    Two runs are a likely duplicate if they are on the same local date and their
+    distances and durations are within the tolerances of each other. Runs are
+    sorted by (local date, distance) and swept in that order, so each run is only
+    compared with the runs after it up to the first one too long to match, rather
+    than with every other run.
+
+    Args:
+        runs: Runs to search, e.g. every stored run.
+        user_timezone: Timezone for local dates. If None, uses UTC dates.
+        involving: If given, only pairs with at least one of these run IDs, e.g.
+            the runs just imported.
+        distance_tolerance: Allowed distance difference, as a fraction.
+        duration_tolerance: Allowed duration difference, as a fraction.
+
+    Returns:
+        Pairs of runs, in (local date, distance) order.
+    """
+    localized = convert_runs_to_user_timezone(runs, user_timezone)
+    localized.sort(key=lambda run: (run.local_date, run.distance))
+
+    pairs: list[tuple[LocalizedRunRecord, LocalizedRunRecord]] = []
+    for i, run in enumerate(localized):
+        for j in range(i + 1, len(localized)):
+            other = localized[j]
+            # Later runs are at least as long, so once one is too long to match
+            # every one after it is too.
+            if other.local_date != run.local_date or not _within(
+                run.distance, other.distance, distance_tolerance
+            ):
+                break
+            if other.source == run.source:
+                continue
+            if involving is not None and not (
+                run.id in involving or other.id in involving
+            ):
+                continue
+            if _within(run.duration, other.duration, duration_tolerance):
+                pairs.append((run, other))
+    return pairs
+
+
+def _within(a: float, b: float, tolerance: float) -> bool:
+    """Whether `a` and `b` differ by at most `tolerance` of the larger one."""
+    return abs(a - b) <= tolerance * max(a, b)
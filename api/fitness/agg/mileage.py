@@ -1,7 +1,8 @@
 from collections import deque
 from datetime import timedelta, date
+from typing import Sequence
 
-from fitness.models import Run
+from fitness.models import RunLike
 from fitness.utils.timezone import (
     filter_runs_by_local_date_range,
     convert_runs_to_user_timezone,
@@ -9,7 +10,7 @@ from fitness.utils.timezone import (
 
 
 def total_mileage(
-    runs: list[Run], start: date, end: date, user_timezone: str | None = None
+    runs: Sequence[RunLike], start: date, end: date, user_timezone: str | None = None
 ) -> float:
     """
     Calculate the total mileage for a list of runs.
@@ -25,7 +26,7 @@ def total_mileage(
 
 
 def avg_miles_per_day(
-    runs: list[Run], start: date, end: date, user_timezone: str | None = None
+    runs: Sequence[RunLike], start: date, end: date, user_timezone: str | None = None
 ) -> float:
     """
     Calculate the average mileage per day for a list of runs in the range [start, end].
@@ -43,7 +44,7 @@ def avg_miles_per_day(
 
 
 def miles_by_day(
-    runs: list[Run], start: date, end: date, user_timezone: str | None = None
+    runs: Sequence[RunLike], start: date, end: date, user_timezone: str | None = None
 ) -> list[tuple[date, float]]:
     """
     Calculate the total mileage for each day in the range [start, end].
@@ -58,7 +59,7 @@ def miles_by_day(
 
 
 def rolling_sum(
-    runs: list[Run],
+    runs: Sequence[RunLike],
     start: date,
     end: date,
     window: int,
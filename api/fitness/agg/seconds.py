@@ -1,10 +1,12 @@
 from datetime import date
-from fitness.models import Run
+from typing import Sequence
+
+from fitness.models import RunLike
 from fitness.utils.timezone import filter_runs_by_local_date_range
 
 
 def total_seconds(
-    runs: list[Run], start: date, end: date, user_timezone: str | None = None
+    runs: Sequence[RunLike], start: date, end: date, user_timezone: str | None = None
 ) -> float:
     """
     Calculate the total seconds for a list of runs.
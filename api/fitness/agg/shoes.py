@@ -1,9 +1,22 @@
-from fitness.models import Run
-from fitness.models.shoe import Shoe, ShoeMileage
+from datetime import date, timedelta
+from typing import Sequence
+
+from fitness.models import RunLike
+from fitness.models.shoe import (
+    Shoe,
+    ShoeMileage,
+    ShoeMileagePoint,
+    ShoeUsage,
+    ShoeUsageRate,
+)
+from fitness.utils.timezone import convert_runs_to_user_timezone
+
+DEFAULT_RETIREMENT_THRESHOLD = 400.0  # miles
+DEFAULT_USAGE_WINDOWS = (30, 90)  # days
 
 
 def mileage_by_shoes(
-    runs: list[Run],
+    runs: Sequence[RunLike],
     shoes: list[Shoe],
     include_retired: bool = False,
 ) -> list[ShoeMileage]:
@@ -48,3 +61,107 @@ def mileage_by_shoes(
     results.sort(key=lambda x: x.shoe.name)
 
     return results
+
+
+def shoe_usage(
+    runs: Sequence[RunLike],
+    shoes: list[Shoe],
+    today: date,
+    retirement_threshold: float = DEFAULT_RETIREMENT_THRESHOLD,
+    windows: tuple[int, ...] = DEFAULT_USAGE_WINDOWS,
+    include_retired: bool = False,
+    user_timezone: str | None = None,
+) -> list[ShoeUsage]:
+    """
+    Calculate cumulative mileage over time and a retirement projection for each shoe.
+
+    Runs are walked once in date order, building each shoe's cumulative mileage
+    series (one point per local date the shoe was used), its mileage within each
+    trailing window, and the date it crossed `retirement_threshold`, if it has.
+
+    Shoes that haven't reached the threshold get a projected retirement date based
+    on the usage rate over the shortest window. Retired shoes are never projected.
+
+    Args:
+        runs: List of runs (with UTC dates)
+        shoes: List of all shoes to check retirement status against
+        today: The current date in the user's timezone; windows end on this day
+        retirement_threshold: Mileage at which a shoe should be retired
+        windows: Trailing window lengths (in days) to report usage rates over
+        include_retired: Whether to include retired shoes in the calculation
+        user_timezone: User's timezone (e.g., "America/Chicago"). If None, uses UTC dates.
+
+    Returns:
+        List of ShoeUsage objects, sorted by shoe name
+    """
+    shoe_id_lookup = {shoe.id: shoe for shoe in shoes}
+    window_starts = [today - timedelta(days=window - 1) for window in windows]
+
+    series_by_id: dict[str, list[ShoeMileagePoint]] = {}
+    window_miles_by_id: dict[str, list[float]] = {}
+    crossed_on_by_id: dict[str, date] = {}
+
+    shoe_runs = [
+        run
+        for run in runs
+        if run.shoe_id is not None
+        and run.shoe_id in shoe_id_lookup
+        and (include_retired or not shoe_id_lookup[run.shoe_id].is_retired)
+    ]
+    localized_runs = convert_runs_to_user_timezone(shoe_runs, user_timezone)
+    localized_runs.sort(key=lambda run: run.localized_datetime)
+
+    for run in localized_runs:
+        shoe_id = run.shoe_id
+        if shoe_id is None:
+            continue
+        run_date = run.local_date
+        series = series_by_id.setdefault(shoe_id, [])
+        mileage = (series[-1].mileage if series else 0.0) + run.distance
+
+        # Collapse multiple runs on the same day into a single point.
+        if series and series[-1].date == run_date:
+            series[-1].mileage = mileage
+        else:
+            series.append(ShoeMileagePoint(date=run_date, mileage=mileage))
+
+        if shoe_id not in crossed_on_by_id and mileage >= retirement_threshold:
+            crossed_on_by_id[shoe_id] = run_date
+
+        window_miles = window_miles_by_id.setdefault(shoe_id, [0.0] * len(windows))
+        for i, window_start in enumerate(window_starts):
+            if window_start <= run_date <= today:
+                window_miles[i] += run.distance
+
+    results = []
+    for shoe_id, series in series_by_id.items():
+        shoe = shoe_id_lookup[shoe_id]
+        mileage = series[-1].mileage
+        usage_rates = [
+            ShoeUsageRate(window_days=window, miles=miles, miles_per_day=miles / window)
+            for window, miles in zip(windows, window_miles_by_id[shoe_id])
+        ]
+
+        projected_retirement_date = crossed_on_by_id.get(shoe_id)
+        if projected_retirement_date is None and not shoe.is_retired and usage_rates:
+            rate = min(usage_rates, key=lambda r: r.window_days).miles_per_day
+            if rate > 0:
+                days_remaining = (retirement_threshold - mileage) / rate
+                projected_retirement_date = today + timedelta(
+                    days=round(days_remaining)
+                )
+
+        results.append(
+            ShoeUsage(
+                shoe=shoe,
+                mileage=mileage,
+                cumulative_mileage=series,
+                usage_rates=usage_rates,
+                retirement_threshold=retirement_threshold,
+                projected_retirement_date=projected_retirement_date,
+            )
+        )
+
+    results.sort(key=lambda x: x.shoe.name)
+
+    return results
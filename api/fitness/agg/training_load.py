@@ -1,11 +1,25 @@
+from __future__ import annotations
+
 from datetime import date, timedelta
 import math
-from collections import defaultdict
-from typing import NamedTuple
+from typing import TYPE_CHECKING, Callable, NamedTuple, Sequence
 
-from fitness.models import Run, DayTrainingLoad, TrainingLoad, Sex
+from fitness.models import (
+    RunLike,
+    LocalizedRunRecord,
+    DayTrainingLoad,
+    TrainingLoad,
+    HRProfile,
+    LoadModel,
+    Sex,
+)
 from fitness.utils.timezone import convert_runs_to_user_timezone
 
+# numpy is imported by the functions that need it, so that importing the app
+# (and every endpoint that doesn't compute training load) doesn't pay for it.
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class DayTrimp(NamedTuple):
     date: date
@@ -15,8 +29,12 @@ class DayTrimp(NamedTuple):
 ATL_LOOKBACK = 7
 CTL_LOOKBACK = 42
 
+# Largest exponent used when rescaling an EWMA block; exp(50) keeps the
+# intermediate cumulative sums far from float overflow.
+_MAX_BLOCK_EXPONENT = 50
+
 
-def trimp(run: Run, max_hr: float, resting_hr: float, sex: Sex) -> float:
+def trimp(run: RunLike, max_hr: float, resting_hr: float, sex: Sex) -> float:
     """
     Calculate the Banister TRaining IMPulse score for a run.
 
@@ -41,38 +59,168 @@ def trimp(run: Run, max_hr: float, resting_hr: float, sex: Sex) -> float:
     return duration_minutes * hr_relative * y
 
 
-def _exponential_training_load(trimp_values: list[float], tau: int) -> list[float]:
-    alpha = 1 - math.exp(-1 / tau)
-    load = []
-    prev = 0.0
-    for trimp in trimp_values:
-        current = prev + alpha * (trimp - prev)
-        load.append(current)
-        prev = current
-    return load
+def trimp_values(
+    avg_heart_rates: np.ndarray,
+    durations: np.ndarray,
+    max_hr: float,
+    resting_hr: float,
+    sex: Sex,
+) -> np.ndarray:
+    """
+    Calculate Banister TRIMP scores for many runs at once.
+
+    Vectorized equivalent of `trimp()`: `avg_heart_rates` and `durations` (seconds)
+    are parallel arrays with one entry per run, and none of the heart rates may be NaN.
+    """
+    import numpy as np
+
+    hr_relative = (avg_heart_rates - resting_hr) / (max_hr - resting_hr)
+    # Clamp hr_relative to the range [0, 1]
+    hr_relative = np.clip(hr_relative, 0.0, 1.0)
+    match sex:
+        case "M":
+            y = 0.64 * np.exp(1.92 * hr_relative)
+        case "F":
+            y = 0.86 * np.exp(1.67 * hr_relative)
+    duration_minutes = durations / 60
+    return duration_minutes * hr_relative * y
+
+
+class _DayRunArrays(NamedTuple):
+    """
+    Per-run arrays of local day offsets and load inputs, shared by every load model.
+
+    Runs without heart rate data have a NaN average heart rate.
+    """
+
+    first_date: date
+    num_days: int
+    day_offsets: np.ndarray
+    avg_heart_rates: np.ndarray
+    durations: np.ndarray
+    distances: np.ndarray
 
 
-def _calculate_atl_and_ctl(
-    trimp_values: list[float],
-) -> tuple[list[float], list[float]]:
+def _day_run_arrays(
+    localized_runs: list[LocalizedRunRecord], first_date: date, num_days: int
+) -> _DayRunArrays:
+    """Extract the fields the load models need, with day offsets from `first_date`."""
+    import numpy as np
+
+    count = len(localized_runs)
+    day_offsets = np.fromiter(
+        ((run.local_date - first_date).days for run in localized_runs),
+        dtype=np.int64,
+        count=count,
+    )
+    avg_heart_rates = np.fromiter(
+        (
+            math.nan if run.avg_heart_rate is None else run.avg_heart_rate
+            for run in localized_runs
+        ),
+        dtype=np.float64,
+        count=count,
+    )
+    durations = np.fromiter(
+        (run.duration for run in localized_runs), dtype=np.float64, count=count
+    )
+    distances = np.fromiter(
+        (run.distance for run in localized_runs), dtype=np.float64, count=count
+    )
+    return _DayRunArrays(
+        first_date, num_days, day_offsets, avg_heart_rates, durations, distances
+    )
+
+
+def _banister_load(arrays: _DayRunArrays, profile: HRProfile | None) -> np.ndarray:
+    """Banister TRIMP per run; runs without heart rate data are not scored."""
+    if profile is None:
+        raise ValueError("The banister load model requires a heart rate profile.")
+    return trimp_values(
+        arrays.avg_heart_rates,
+        arrays.durations,
+        profile.max_hr,
+        profile.resting_hr,
+        profile.sex,
+    )
+
+
+def _distance_load(arrays: _DayRunArrays, profile: HRProfile | None) -> np.ndarray:
+    """Distance in miles per run."""
+    return arrays.distances
+
+
+def _duration_load(arrays: _DayRunArrays, profile: HRProfile | None) -> np.ndarray:
+    """Duration in minutes per run, usable for runs without heart rate data."""
+    return arrays.durations / 60
+
+
+# Per-run load functions by model name. A model returns NaN for runs it can't score.
+LOAD_MODELS: dict[
+    LoadModel, Callable[[_DayRunArrays, HRProfile | None], np.ndarray]
+] = {
+    "banister": _banister_load,
+    "distance": _distance_load,
+    "duration": _duration_load,
+}
+
+
+def _daily_load(arrays: _DayRunArrays, loads: np.ndarray) -> np.ndarray:
+    """Sum per-run loads into one value per day, ignoring unscored runs."""
+    import numpy as np
+
+    counted = (
+        ~np.isnan(loads)
+        & (arrays.day_offsets >= 0)
+        & (arrays.day_offsets < arrays.num_days)
+    )
+    return np.bincount(
+        arrays.day_offsets[counted],
+        weights=loads[counted],
+        minlength=max(arrays.num_days, 0),
+    )
+
+
+def _ewma(values: np.ndarray, tau: float) -> np.ndarray:
     """
-    Calculate Acute Training Load (ATL) and Chronic Training Load (CTL).
+    Exponentially weighted moving average with time constant `tau`, starting from 0.
 
-    The ATL is calculated over a 7-day lookback period, and the CTL is calculated over a 42-day lookback period.
+    Solves the recursion `load[i] = load[i-1] + alpha * (values[i] - load[i-1])` in
+    closed form: within a block, `load[i] = decay^i * (decay * prev + alpha *
+    cumsum(values[k] * decay^-k))`. Blocks are kept short enough that `decay^-k`
+    can't overflow, so only a handful of Python-level iterations are needed even
+    for decades of daily values.
     """
-    atl_values = _exponential_training_load(trimp_values, ATL_LOOKBACK)
-    ctl_values = _exponential_training_load(trimp_values, CTL_LOOKBACK)
-    return atl_values, ctl_values
+    import numpy as np
+
+    decay = math.exp(-1 / tau)
+    alpha = 1 - decay
+    num_values = len(values)
+    load = np.empty(num_values, dtype=np.float64)
+    block_size = max(1, int(_MAX_BLOCK_EXPONENT * tau))
+    growth = np.exp(np.arange(min(block_size, num_values)) / tau)
+
+    prev = 0.0
+    for block_start in range(0, num_values, block_size):
+        block = values[block_start : block_start + block_size]
+        block_growth = growth[: len(block)]
+        weighted_sums = np.cumsum(block * block_growth)
+        block_load = (decay * prev + alpha * weighted_sums) / block_growth
+        load[block_start : block_start + len(block)] = block_load
+        prev = block_load[-1]
+    return load
 
 
 def training_stress_balance(
-    runs: list[Run],
+    runs: Sequence[RunLike],
     max_hr: float,
     resting_hr: float,
     sex: Sex,
     start_date: date,
     end_date: date,
     user_timezone: str | None = None,
+    atl_days: float = ATL_LOOKBACK,
+    ctl_days: float = CTL_LOOKBACK,
 ) -> list[DayTrainingLoad]:
     """
     Calculate Training Stress Balance (TSB) as the difference between CTL and ATL.
@@ -85,55 +233,169 @@ def training_stress_balance(
         start_date: Start date in user's timezone
         end_date: End date in user's timezone
         user_timezone: User's timezone (e.g., "America/Chicago"). If None, uses UTC dates.
+        atl_days: Time constant of the Acute Training Load, in days
+        ctl_days: Time constant of the Chronic Training Load, in days
+    """
+    profile = HRProfile(max_hr=max_hr, resting_hr=resting_hr, sex=sex)
+    [training_load] = training_stress_balance_by_profile(
+        runs, [profile], start_date, end_date, user_timezone, atl_days, ctl_days
+    )
+    return training_load
+
+
+def training_stress_balance_by_profile(
+    runs: Sequence[RunLike],
+    profiles: Sequence[HRProfile],
+    start_date: date,
+    end_date: date,
+    user_timezone: str | None = None,
+    atl_days: float = ATL_LOOKBACK,
+    ctl_days: float = CTL_LOOKBACK,
+) -> list[list[DayTrainingLoad]]:
+    """
+    Calculate Training Stress Balance (TSB) for several heart rate profiles at once.
+
+    Filtering, timezone conversion and day bucketing of the runs happen once and are
+    shared by every profile; only the TRIMP scores and load curves are per-profile.
+
+    Args:
+        runs: List of runs (with UTC dates)
+        profiles: Heart rate profiles to compute training load for
+        start_date: Start date in user's timezone
+        end_date: End date in user's timezone
+        user_timezone: User's timezone (e.g., "America/Chicago"). If None, uses UTC dates.
+        atl_days: Time constant of the Acute Training Load, in days
+        ctl_days: Time constant of the Chronic Training Load, in days
+
+    Returns:
+        One list of DayTrainingLoad per profile, in the same order as `profiles`.
     """
     # Filter runs to only those with a valid average heart rate.
     hr_runs = [run for run in runs if run.avg_heart_rate is not None]
+    arrays = _localized_day_run_arrays(hr_runs, end_date, user_timezone)
+    return [
+        _training_load_series(
+            arrays,
+            None if arrays is None else _banister_load(arrays, profile),
+            start_date,
+            end_date,
+            atl_days,
+            ctl_days,
+        )
+        for profile in profiles
+    ]
 
-    # Convert runs to user timezone if specified
-    user_tz_runs = convert_runs_to_user_timezone(hr_runs, user_timezone)
 
-    trimp_by_date: list[tuple[date, float]] = []
+def training_load_by_model(
+    runs: Sequence[RunLike],
+    models: Sequence[LoadModel],
+    start_date: date,
+    end_date: date,
+    profile: HRProfile | None = None,
+    user_timezone: str | None = None,
+    atl_days: float = ATL_LOOKBACK,
+    ctl_days: float = CTL_LOOKBACK,
+) -> dict[LoadModel, list[DayTrainingLoad]]:
+    """
+    Calculate ATL/CTL/TSB by day for several training load models at once.
+
+    The runs are localized and bucketed by day once; each model only adds its own
+    per-run scoring and load curves.
 
-    # Handle empty runs case
+    Args:
+        runs: List of runs (with UTC dates)
+        models: Names of the load models to compute (see LOAD_MODELS)
+        start_date: Start date in user's timezone
+        end_date: End date in user's timezone
+        profile: Heart rate profile, required by the "banister" model
+        user_timezone: User's timezone (e.g., "America/Chicago"). If None, uses UTC dates.
+        atl_days: Time constant of the Acute Training Load, in days
+        ctl_days: Time constant of the Chronic Training Load, in days
+    """
+    if "banister" in models and profile is None:
+        raise ValueError("The banister load model requires a heart rate profile.")
+    if all(model == "banister" for model in models):
+        # Only heart rate runs can be scored, so skip localizing the rest.
+        runs = [run for run in runs if run.avg_heart_rate is not None]
+    arrays = _localized_day_run_arrays(runs, end_date, user_timezone)
+    return {
+        model: _training_load_series(
+            arrays,
+            None if arrays is None else LOAD_MODELS[model](arrays, profile),
+            start_date,
+            end_date,
+            atl_days,
+            ctl_days,
+        )
+        for model in models
+    }
+
+
+def _localized_day_run_arrays(
+    runs: Sequence[RunLike], end_date: date, user_timezone: str | None
+) -> _DayRunArrays | None:
+    """Localize runs and bucket them by day from the first run up to `end_date`."""
+    # Convert runs to user timezone if specified
+    user_tz_runs = convert_runs_to_user_timezone(runs, user_timezone)
     if not user_tz_runs:
-        # Return zero values for each day in the requested range
-        current_date = start_date
-        while current_date <= end_date:
-            trimp_by_date.append((current_date, 0.0))
-            current_date += timedelta(days=1)
-        atl = [0.0] * len(trimp_by_date)
-        ctl = [0.0] * len(trimp_by_date)
-        tsb = [0.0] * len(trimp_by_date)
-        dates = [dt for dt, _ in trimp_by_date]
-        return [
-            DayTrainingLoad(date=d, training_load=TrainingLoad(ctl=c, atl=a, tsb=t))
-            for (d, c, a, t) in zip(dates, ctl, atl, tsb)
-        ]
+        return None
 
     # Always start calculations from the beginning of running data, because these metrics converge over time.
     # If we start at the start date, metrics will be inaccurately close to zero.
     first_run_date = min(localized_run.local_date for localized_run in user_tz_runs)
-    for i in range((end_date - first_run_date).days + 1):
-        current_date = first_run_date + timedelta(days=i)
-        runs_for_day = [
-            localized_run
-            for localized_run in user_tz_runs
-            if localized_run.local_date == current_date
-        ]
-        trimp_values = [trimp(run, max_hr, resting_hr, sex) for run in runs_for_day]
-        trimp_by_date.append((current_date, sum(trimp_values, start=0.0)))
-    atl, ctl = _calculate_atl_and_ctl([trimp for _, trimp in trimp_by_date])
-    tsb = [ctl_value - atl_value for ctl_value, atl_value in zip(ctl, atl)]
-    dates = [dt for dt, _ in trimp_by_date]
+    num_days = (end_date - first_run_date).days + 1
+    return _day_run_arrays(user_tz_runs, first_run_date, num_days)
+
+
+def _training_load_series(
+    arrays: _DayRunArrays | None,
+    loads: np.ndarray | None,
+    start_date: date,
+    end_date: date,
+    atl_days: float,
+    ctl_days: float,
+) -> list[DayTrainingLoad]:
+    """Smooth per-run loads into ATL/CTL/TSB for each requested day."""
+    import numpy as np
+
+    scored = None if loads is None else ~np.isnan(loads)
+    if arrays is None or loads is None or not scored.any():
+        # Return zero values for each day in the requested range
+        num_days = (end_date - start_date).days + 1
+        zeros = np.zeros(max(num_days, 0))
+        return _day_training_loads(start_date, zeros, zeros)
+
+    daily_load = _daily_load(arrays, loads)
+    atl = _ewma(daily_load, atl_days)
+    ctl = _ewma(daily_load, ctl_days)
+
+    # Only build models for the requested days, starting no earlier than the first
+    # run this model could score.
+    first_scored_offset = int(arrays.day_offsets[scored].min())
+    first_offset = max((start_date - arrays.first_date).days, first_scored_offset)
+    return _day_training_loads(
+        arrays.first_date + timedelta(days=first_offset),
+        atl[first_offset:],
+        ctl[first_offset:],
+    )
+
+
+def _day_training_loads(
+    first_date: date, atl: np.ndarray, ctl: np.ndarray
+) -> list[DayTrainingLoad]:
+    """Build consecutive DayTrainingLoad entries starting at `first_date`."""
+    tsb = ctl - atl
     return [
-        DayTrainingLoad(date=d, training_load=TrainingLoad(ctl=c, atl=a, tsb=t))
-        for (d, c, a, t) in zip(dates, ctl, atl, tsb)
-        if start_date <= d <= end_date
+        DayTrainingLoad(
+            date=first_date + timedelta(days=i),
+            training_load=TrainingLoad(ctl=c, atl=a, tsb=t),
+        )
+        for i, (c, a, t) in enumerate(zip(ctl.tolist(), atl.tolist(), tsb.tolist()))
     ]
 
 
 def trimp_by_day(
-    runs: list[Run],
+    runs: Sequence[RunLike],
     start: date,
     end: date,
     max_hr: float,
@@ -159,23 +421,12 @@ def trimp_by_day(
     # Convert runs to user timezone if specified
     user_tz_runs = convert_runs_to_user_timezone(runs_with_hr, user_timezone)
 
-    # Group runs by local date
-    runs_by_date = defaultdict(list)
-    for localized_run in user_tz_runs:
-        if start <= localized_run.local_date <= end:
-            runs_by_date[localized_run.local_date].append(localized_run)
+    num_days = (end - start).days + 1
+    arrays = _day_run_arrays(user_tz_runs, start, num_days)
+    profile = HRProfile(max_hr=max_hr, resting_hr=resting_hr, sex=sex)
+    daily_trimp = _daily_load(arrays, _banister_load(arrays, profile))
 
-    # Calculate TRIMP for each day
-    day_trimps = []
-    current_date = start
-    while current_date <= end:
-        day_runs = runs_by_date[current_date]
-        daily_trimp = 0.0
-
-        for run in day_runs:
-            daily_trimp += trimp(run, max_hr, resting_hr, sex)
-
-        day_trimps.append(DayTrimp(date=current_date, trimp=daily_trimp))
-        current_date += timedelta(days=1)
-
-    return day_trimps
+    return [
+        DayTrimp(date=start + timedelta(days=i), trimp=daily)
+        for i, daily in enumerate(daily_trimp.tolist())
+    ]
@@ -4,16 +4,20 @@ from .env_loader import get_current_environment
 
 import os
 import logging
+from contextlib import asynccontextmanager
 from datetime import date
 from typing import Literal, TypeVar, Any
 
 from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from fitness.models import Run
+from fitness.db.connection import close_async_db_pool, close_db_pool
+from fitness.integrations.google.calendar_client import close_calendar_client
+from fitness.integrations.http_client import close_clients, http_stats
+from fitness.models import Run, RunRecord
 from fitness.models.run_detail import RunDetail
-from .constants import DEFAULT_START, DEFAULT_END
-from .dependencies import all_runs
+from .constants import DEFAULT_START
+from .dependencies import all_runs, end_date
 from .routers import (
     metrics_router,
     shoe_router,
@@ -24,9 +28,13 @@ from .routers import (
     mmf_router,
     summary_router,
 )
-from .models import EnvironmentResponse
+from .models import DuplicateRunPair, EnvironmentResponse
 from .auth import verify_credentials
-from fitness.utils.timezone import convert_runs_to_user_timezone
+from fitness.agg import find_duplicate_runs
+from fitness.utils.timezone import (
+    convert_runs_to_user_timezone,
+    filter_runs_by_local_date_range,
+)
 
 """FastAPI application setup for the fitness API.
 
@@ -42,14 +50,25 @@ RunSortBy = Literal[
 SortOrder = Literal["asc", "desc"]
 
 # Type variable for generic sorting function
-# Supports Run and RunDetail (which shares the sorted fields)
-T = TypeVar("T", Run, RunDetail)
+# Supports Run, RunRecord and RunDetail (which share the sorted fields)
+T = TypeVar("T", Run, RunRecord, RunDetail)
 
 PUBLIC_API_BASE_URL = os.environ["PUBLIC_API_BASE_URL"]
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Return pooled database and HTTP connections on shutdown.
+    close_db_pool()
+    await close_async_db_pool()
+    close_calendar_client()
+    close_clients()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(metrics_router)
 app.include_router(shoe_router)
 app.include_router(run_router)
@@ -98,11 +117,11 @@ if "LOG_LEVEL" in os.environ:
 @app.get("/runs", response_model=list[Run])
 def read_all_runs(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     user_timezone: str | None = None,
     sort_by: RunSortBy = "date",
     sort_order: SortOrder = "desc",
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> list[Run]:
     """Get all runs with optional sorting.
 
@@ -125,14 +144,15 @@ def read_all_runs(
             run for run in localized_runs if start <= run.local_date <= end
         ]
 
-    # Apply sorting to filtered runs
-    return sort_runs_generic(filtered_runs, sort_by, sort_order)
+    # Apply sorting to filtered runs, and only then validate the ones we return
+    sorted_runs = sort_runs_generic(filtered_runs, sort_by, sort_order)
+    return [run.to_run() for run in sorted_runs]
 
 
 @app.get("/runs/details", response_model=list[RunDetail])
 def read_run_details(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date | None = None,
     sort_by: RunSortBy = "date",
     sort_order: SortOrder = "desc",
     synced: bool | None = None,
@@ -144,8 +164,8 @@ def read_run_details(
     from fitness.db.runs import get_run_details_in_date_range, get_all_run_details
 
     # Get run details from database
-    if start != DEFAULT_START or end != DEFAULT_END:
-        details = get_run_details_in_date_range(start, end, synced=synced)
+    if start != DEFAULT_START or end is not None:
+        details = get_run_details_in_date_range(start, end_date(end), synced=synced)
     else:
         details = get_all_run_details(synced=synced)
 
@@ -159,7 +179,7 @@ def read_run_details(
 @app.get("/runs-details", response_model=list[RunDetail])
 def read_run_details_alt(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date | None = None,
     sort_by: RunSortBy = "date",
     sort_order: SortOrder = "desc",
     synced: bool | None = None,
@@ -169,18 +189,45 @@ def read_run_details_alt(
     )
 
 
+@app.get("/runs/duplicates", response_model=list[DuplicateRunPair])
+def read_duplicate_runs(
+    start: date = DEFAULT_START,
+    end: date = Depends(end_date),
+    user_timezone: str | None = None,
+    runs: list[RunRecord] = Depends(all_runs),
+) -> list[DuplicateRunPair]:
+    """List pairs of runs from different sources that are likely the same workout.
+
+    A workout recorded in both Strava and MapMyFitness is stored under two IDs
+    and counted twice by the metrics; these are the candidates to remove one of.
+
+    Args:
+        start: Inclusive start date for filtering (local to `user_timezone` if provided).
+        end: Inclusive end date for filtering (local to `user_timezone` if provided).
+        user_timezone: IANA timezone for local dates. If None, use UTC dates.
+        runs: Dependency injection of all runs from the database.
+    """
+    filtered_runs = filter_runs_by_local_date_range(runs, start, end, user_timezone)
+    return [
+        DuplicateRunPair(
+            local_date=first.local_date, runs=(first.to_run(), second.to_run())
+        )
+        for first, second in find_duplicate_runs(filtered_runs, user_timezone)
+    ]
+
+
 def sort_runs_generic(
     runs: list[T], sort_by: RunSortBy, sort_order: SortOrder
 ) -> list[T]:
     """Sort runs by the specified field and order.
 
-    Works with both `Run` and `RunDetail` types.
+    Works with `Run`, `RunRecord` and `RunDetail` types.
     """
     reverse = sort_order == "desc"
 
     def get_sort_key(run: T) -> Any:
         if sort_by == "date":
-            # Use localized_datetime for LocalizedRun, otherwise datetime_utc
+            # Use localized_datetime for localized runs, otherwise datetime_utc
             return getattr(run, "localized_datetime", run.datetime_utc)
         elif sort_by == "distance":
             return run.distance
@@ -243,3 +290,15 @@ def verify_auth(username: str = Depends(verify_credentials)) -> dict[str, str]:
         HTTPException 401 if credentials are invalid.
     """
     return {"status": "authenticated", "username": username}
+
+
+@app.get("/integrations/http-stats")
+def read_http_stats(
+    username: str = Depends(verify_credentials),
+) -> dict[str, dict[str, Any]]:
+    """Get request, retry and latency stats of the outbound HTTP clients.
+
+    Keyed by provider, for the providers this process has sent requests to. The
+    stats are kept in memory, so they cover this process since it started.
+    """
+    return http_stats()
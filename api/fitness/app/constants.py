@@ -3,9 +3,10 @@ from datetime import date
 """Default date bounds for API queries.
 
 These defaults bound metrics and run queries when the client does not pass
-explicit start/end dates.
+explicit start/end dates. Queries end today by default; see
+`fitness.app.dependencies.end_date`, which works that out per request rather
+than once at import.
 """
 
 # This is roughly when I started tracking my runs.
 DEFAULT_START = date(2016, 1, 1)
-DEFAULT_END = date.today()
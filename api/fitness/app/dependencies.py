@@ -1,22 +1,60 @@
 import logging
+from datetime import date, datetime
 
 from fastapi import HTTPException
 
-from fitness.models import Run
-from fitness.db.runs import get_all_runs
-from fitness.db.oauth_credentials import get_credentials
+from fitness.agg import find_duplicate_runs
+from fitness.models import RunRecord
+from fitness.db.runs import get_all_run_records, get_run_records_as_of
+from fitness.db.aio.oauth_credentials import get_credentials
 from fitness.integrations.strava.client import StravaClient
 
 logger = logging.getLogger(__name__)
 
 
-def all_runs() -> list[Run]:
-    """Get all runs from the database."""
-    return get_all_runs()
+def end_date(end: date | None = None) -> date:
+    """The inclusive end date of a query: `end` if given, otherwise today.
+
+    A dependency rather than a default value so "today" is the day of the request,
+    not the day the server started.
+    """
+    return date.today() if end is None else end
+
+
+def all_runs(as_of: datetime | None = None) -> list[RunRecord]:
+    """Get all runs from the database as compact records for aggregation.
+
+    With `as_of`, get the runs as they were at that instant instead, so metrics
+    can be compared with what they were before later imports and edits.
+    """
+    if as_of is not None:
+        return get_run_records_as_of(as_of)
+    return get_all_run_records()
+
+
+def possible_duplicates(
+    new_run_ids: set[str], user_timezone: str | None = None
+) -> list[list[str]]:
+    """Find the stored runs from other sources that newly imported runs duplicate.
+
+    Returns [new run ID, other run ID] pairs, and logs them so an import that
+    double-counts a workout doesn't go unnoticed.
+    """
+    if not new_run_ids:
+        return []
+    pairs = [
+        [first.id, second.id] if first.id in new_run_ids else [second.id, first.id]
+        for first, second in find_duplicate_runs(
+            get_all_run_records(), user_timezone, involving=new_run_ids
+        )
+    ]
+    if pairs:
+        logger.warning(f"Imported runs that are likely duplicates: {pairs}")
+    return pairs
 
 
 async def strava_client() -> StravaClient:
-    strava_creds = get_credentials("strava")
+    strava_creds = await get_credentials("strava")
     if strava_creds is None:
         raise HTTPException(status_code=503, detail="Strava integration not configured")
     client = StravaClient(creds=strava_creds)
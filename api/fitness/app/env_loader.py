@@ -6,7 +6,6 @@ run, so dependent modules see configured settings.
 
 import os
 from typing import Literal, cast
-from dotenv import load_dotenv
 
 EnvironmentName = Literal[
     "dev", "prod", "vercel-production", "vercel-preview", "vercel-development"
@@ -18,6 +17,9 @@ if "VERCEL_ENV" in os.environ:
     # We're running on vercel and don't need to load the env file.
     pass
 elif (env := os.getenv("ENV", "dev")) in ("dev", "prod"):
+    # Imported here since deployments set their variables and never need it.
+    from dotenv import load_dotenv
+
     print(f"Loading environment variables from .env.{env}")
     load_dotenv(f".env.{env}", verbose=True)
 else:
@@ -1,12 +1,12 @@
-from typing import Literal, Self, Optional
+from typing import Self, Optional
 from datetime import date
 
-from pydantic import BaseModel
-
-from .env_loader import EnvironmentName
+from pydantic import BaseModel, Field
 
+from fitness.agg.training_load import ATL_LOOKBACK, CTL_LOOKBACK
+from fitness.models import HRProfile, Run
 
-Sex = Literal["M", "F"]  # Biological sex used for HR-based training load formulas
+from .env_loader import EnvironmentName
 
 
 class LoadSeries(BaseModel):
@@ -42,6 +42,24 @@ class DayMileage(BaseModel):
         return self.date < other.date
 
 
+class DuplicateRunPair(BaseModel):
+    """Two runs from different sources that are likely the same workout."""
+
+    local_date: date
+    runs: tuple[Run, Run]
+
+
+class TrainingLoadProfilesRequest(BaseModel):
+    """Request model for computing training load for several HR profiles at once."""
+
+    start: date
+    end: date
+    profiles: list[HRProfile] = Field(min_length=1)
+    user_timezone: Optional[str] = None
+    atl_days: float = Field(ATL_LOOKBACK, gt=0)
+    ctl_days: float = Field(CTL_LOOKBACK, gt=0)
+
+
 class RetireShoeRequest(BaseModel):
     """Request model to retire a shoe on a specific date."""
 
@@ -1,23 +1,37 @@
-from datetime import date
+from datetime import date, datetime, timezone
+import zoneinfo
 from typing import List, Dict
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from fitness.agg import (
-    mileage_by_shoes,
     miles_by_day,
+    training_load_by_model,
+    shoe_usage,
     total_mileage,
     rolling_sum,
     total_seconds,
     training_stress_balance,
+    training_stress_balance_by_profile,
+)
+from fitness.db.shoes import get_shoes, get_shoe_mileages
+from fitness.agg.shoes import DEFAULT_RETIREMENT_THRESHOLD
+from fitness.agg.training_load import ATL_LOOKBACK, CTL_LOOKBACK, trimp_by_day
+from fitness.app.constants import DEFAULT_START
+from fitness.app.dependencies import all_runs, end_date
+from fitness.models import (
+    RunRecord,
+    Sex,
+    DayTrainingLoad,
+    HRProfile,
+    LoadModel,
+    ProfileTrainingLoad,
+    ShoeMileage,
+    ShoeUsage,
 )
-from fitness.db.shoes import get_shoes
-from fitness.agg.training_load import trimp_by_day
-from fitness.app.constants import DEFAULT_START, DEFAULT_END
-from fitness.app.dependencies import all_runs
-from fitness.models import Run, Sex, DayTrainingLoad, ShoeMileage
 from fitness.app.models import (
     DayMileage,
+    TrainingLoadProfilesRequest,
 )
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
@@ -26,9 +40,9 @@ router = APIRouter(prefix="/metrics", tags=["metrics"])
 @router.get("/seconds/total", response_model=float)
 def read_total_seconds(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> float:
     """Get total seconds.
 
@@ -44,9 +58,9 @@ def read_total_seconds(
 @router.get("/mileage/total", response_model=float)
 def read_total_mileage(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> float:
     """Get total mileage.
 
@@ -62,9 +76,9 @@ def read_total_mileage(
 @router.get("/mileage/by-day", response_model=List[DayMileage])
 def read_mileage_by_day(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> list[DayMileage]:
     """Get mileage by day.
 
@@ -78,10 +92,10 @@ def read_mileage_by_day(
 @router.get("/mileage/rolling-by-day", response_model=List[DayMileage])
 def read_rolling_mileage_by_day(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     window: int = 1,
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> list[DayMileage]:
     """Get rolling sum of mileage over a window by day.
 
@@ -96,20 +110,48 @@ def read_rolling_mileage_by_day(
 
 
 @router.get("/mileage/by-shoe", response_model=List[ShoeMileage])
-def read_miles_by_shoe(
-    include_retired: bool = False, runs: list[Run] = Depends(all_runs)
-) -> list[ShoeMileage]:
+def read_miles_by_shoe(include_retired: bool = False) -> list[ShoeMileage]:
     """
     Get mileage by shoe with complete shoe information.
 
+    Mileage is summed per shoe in the database, so this does not load every run.
+
     Args:
         include_retired: Whether to include retired shoes in results (default: False)
 
     Returns:
         List of ShoeMileage objects containing full shoe data including retirement info
     """
-    shoes = get_shoes()
-    return mileage_by_shoes(runs, shoes=shoes, include_retired=include_retired)
+    return get_shoe_mileages(include_retired=include_retired)
+
+
+@router.get("/mileage/by-shoe/over-time", response_model=List[ShoeUsage])
+def read_shoe_mileage_over_time(
+    include_retired: bool = False,
+    retirement_threshold: float = Query(DEFAULT_RETIREMENT_THRESHOLD, gt=0),
+    user_timezone: str | None = None,
+    runs: list[RunRecord] = Depends(all_runs),
+) -> list[ShoeUsage]:
+    """Get each shoe's cumulative mileage over time and projected retirement date.
+
+    Args:
+        include_retired: Whether to include retired shoes in results (default: False)
+        retirement_threshold: Mileage at which a shoe should be retired.
+        user_timezone: IANA timezone for local dates. If None, use UTC dates.
+        runs: Dependency injection of all runs from the database.
+    """
+    if user_timezone is None:
+        today = datetime.now(timezone.utc).date()
+    else:
+        today = datetime.now(zoneinfo.ZoneInfo(user_timezone)).date()
+    return shoe_usage(
+        runs,
+        shoes=get_shoes(),
+        today=today,
+        retirement_threshold=retirement_threshold,
+        include_retired=include_retired,
+        user_timezone=user_timezone,
+    )
 
 
 @router.get("/training-load/by-day", response_model=List[DayTrainingLoad])
@@ -120,7 +162,9 @@ def read_training_load_by_day(
     resting_hr: float,
     sex: Sex,
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    atl_days: float = Query(ATL_LOOKBACK, gt=0),
+    ctl_days: float = Query(CTL_LOOKBACK, gt=0),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> list[DayTrainingLoad]:
     """Get training load by day.
 
@@ -134,18 +178,85 @@ def read_training_load_by_day(
         start_date=start,
         end_date=end,
         user_timezone=user_timezone,
+        atl_days=atl_days,
+        ctl_days=ctl_days,
+    )
+
+
+@router.get(
+    "/training-load/by-model", response_model=Dict[LoadModel, List[DayTrainingLoad]]
+)
+def read_training_load_by_model(
+    start: date,
+    end: date,
+    model: list[LoadModel] = Query(["banister"]),
+    max_hr: float | None = None,
+    resting_hr: float | None = None,
+    sex: Sex | None = None,
+    user_timezone: str | None = None,
+    atl_days: float = Query(ATL_LOOKBACK, gt=0),
+    ctl_days: float = Query(CTL_LOOKBACK, gt=0),
+    runs: list[RunRecord] = Depends(all_runs),
+) -> dict[LoadModel, list[DayTrainingLoad]]:
+    """Get training load by day for one or more load models.
+
+    Models are "banister" (heart rate TRIMP; needs max_hr, resting_hr and sex),
+    "distance" (miles) and "duration" (minutes, includes runs without heart rate).
+    """
+    profile = None
+    if max_hr is not None and resting_hr is not None and sex is not None:
+        profile = HRProfile(max_hr=max_hr, resting_hr=resting_hr, sex=sex)
+    elif "banister" in model:
+        raise HTTPException(
+            status_code=422,
+            detail="max_hr, resting_hr and sex are required for the banister model",
+        )
+    return training_load_by_model(
+        runs=runs,
+        models=list(dict.fromkeys(model)),
+        start_date=start,
+        end_date=end,
+        profile=profile,
+        user_timezone=user_timezone,
+        atl_days=atl_days,
+        ctl_days=ctl_days,
+    )
+
+
+@router.post("/training-load/by-day/profiles", response_model=List[ProfileTrainingLoad])
+def read_training_load_by_day_for_profiles(
+    request: TrainingLoadProfilesRequest,
+    runs: list[RunRecord] = Depends(all_runs),
+) -> list[ProfileTrainingLoad]:
+    """Get training load by day for several heart rate profiles.
+
+    Equivalent to calling /training-load/by-day once per profile, but the runs are
+    localized and bucketed by day only once for all profiles.
+    """
+    training_loads = training_stress_balance_by_profile(
+        runs=runs,
+        profiles=request.profiles,
+        start_date=request.start,
+        end_date=request.end,
+        user_timezone=request.user_timezone,
+        atl_days=request.atl_days,
+        ctl_days=request.ctl_days,
     )
+    return [
+        ProfileTrainingLoad(profile=profile, training_load=training_load)
+        for profile, training_load in zip(request.profiles, training_loads)
+    ]
 
 
 @router.get("/trimp/by-day", response_model=List[Dict])
 def read_trimp_by_day(
     start: date = DEFAULT_START,
-    end: date = DEFAULT_END,
+    end: date = Depends(end_date),
     max_hr: float = 192,
     resting_hr: float = 42,
     sex: Sex = "M",
     user_timezone: str | None = None,
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> list[dict]:
     """Get TRIMP values by day.
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -7,8 +8,10 @@ from io import BytesIO
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
 
 from fitness.app.auth import verify_credentials
+from fitness.app.dependencies import possible_duplicates
 from fitness.models import Run
-from fitness.db.runs import get_existing_run_ids, bulk_create_runs
+from fitness.db.aio.runs import get_existing_run_ids, bulk_create_runs
+from fitness.integrations.google.auto_sync import auto_sync_enabled, sync_new_runs
 from fitness.load.mmf import load_mmf_runs_from_file
 
 logger = logging.getLogger(__name__)
@@ -34,7 +37,11 @@ async def upload_mmf_csv(
 
     Returns:
         Summary including counts of external runs, existing DB runs, new runs found
-        and inserted, and IDs of newly inserted runs.
+        and inserted, and IDs of newly inserted runs. `possible_duplicates` lists
+        [new run ID, other run ID] pairs of new runs that are likely the same
+        workout as a run from another source. With GOOGLE_CALENDAR_AUTO_SYNC
+        enabled, new runs are also synced to Google Calendar and the summary
+        includes `calendar_synced` and `calendar_sync_failed`.
     """
     try:
         # Determine timezone to use
@@ -45,32 +52,45 @@ async def upload_mmf_csv(
         logger.info(f"Loading MMF data from uploaded file: {file.filename}")
         file_content = await file.read()
         file_obj = BytesIO(file_content)
-        mmf_activities = load_mmf_runs_from_file(file_obj, timezone)
+        mmf_activities = await asyncio.to_thread(
+            load_mmf_runs_from_file, file_obj, timezone
+        )
 
         # Convert MMF activities to Run models
         mmf_runs = [Run.from_mmf(activity) for activity in mmf_activities]
 
         # Get the IDs of all existing runs in the db
-        existing_run_ids = get_existing_run_ids()
+        existing_run_ids = await get_existing_run_ids()
 
         # Filter to only new runs
         new_runs = [run for run in mmf_runs if run.id not in existing_run_ids]
 
         if new_runs:
-            inserted_count = bulk_create_runs(new_runs)
+            inserted_count = await bulk_create_runs(new_runs)
             logger.info(f"Inserted {inserted_count} new MMF runs into the database")
         else:
             inserted_count = 0
             logger.info("No new MMF runs to insert")
 
-        return {
+        summary = {
             "inserted_count": inserted_count,
             "total_runs_found": len(mmf_runs),
             "existing_runs": len(mmf_runs) - len(new_runs),
             "updated_at": datetime.now().isoformat(),
             "message": f"Inserted {inserted_count} new runs into the database",
+            "possible_duplicates": await asyncio.to_thread(
+                possible_duplicates, {run.id for run in new_runs}, timezone
+            ),
         }
 
+        if new_runs and auto_sync_enabled():
+            # bulk_create_runs inserts every run or raises, so all of new_runs are in.
+            calendar_sync = await asyncio.to_thread(sync_new_runs, new_runs)
+            if calendar_sync is not None:
+                summary["calendar_synced"] = calendar_sync.synced
+                summary["calendar_sync_failed"] = calendar_sync.failed
+        return summary
+
     except HTTPException:
         raise
     except Exception as e:
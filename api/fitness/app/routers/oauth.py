@@ -1,3 +1,4 @@
+import asyncio
 import os
 import logging
 
@@ -12,6 +13,7 @@ from fitness.db.oauth_credentials import (
 )
 from fitness.integrations import strava
 from fitness.integrations import google
+from fitness.integrations.google.calendar_client import reset_calendar_client
 
 PUBLIC_API_BASE_URL = os.environ["PUBLIC_API_BASE_URL"]
 PUBLIC_DASHBOARD_BASE_URL = os.environ["PUBLIC_DASHBOARD_BASE_URL"]
@@ -54,7 +56,8 @@ async def strava_oauth_callback(
         )
     token = await strava.exchange_code_for_token(code)
     # Store the token in the db.
-    upsert_credentials(
+    await asyncio.to_thread(
+        upsert_credentials,
         OAuthCredentials(
             provider="strava",
             client_id=strava.CLIENT_ID,
@@ -62,7 +65,9 @@ async def strava_oauth_callback(
             access_token=token.access_token,
             refresh_token=token.refresh_token,
             expires_at=token.expires_at_datetime(),
-        )
+            # Webhook events are only accepted for this athlete's activities.
+            account_id=None if token.athlete is None else str(token.athlete.id),
+        ),
     )
     # Redirect back to the frontend.
     return RedirectResponse(PUBLIC_DASHBOARD_BASE_URL)
@@ -117,7 +122,8 @@ async def google_oauth_callback(
         )
 
     # Store the token in the db.
-    upsert_credentials(
+    await asyncio.to_thread(
+        upsert_credentials,
         OAuthCredentials(
             provider="google",
             client_id=google.auth.GOOGLE_CLIENT_ID,
@@ -125,8 +131,10 @@ async def google_oauth_callback(
             access_token=token.access_token,
             refresh_token=token.refresh_token,
             expires_at=token.expires_at_datetime(),
-        )
+        ),
     )
+    # The shared calendar client caches the old credentials.
+    reset_calendar_client()
 
     # Redirect back to the frontend.
     return RedirectResponse(PUBLIC_DASHBOARD_BASE_URL)
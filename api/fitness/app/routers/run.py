@@ -7,7 +7,7 @@ previous version.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, status, Depends
@@ -16,9 +16,15 @@ from pydantic import BaseModel, Field
 from fitness.db.runs import get_run_by_id
 from fitness.db.runs_history import (
     update_run_with_history,
+    update_runs_with_history,
     get_run_history,
+    get_run_history_changes,
     get_run_version,
+    RunEdit,
+    RunHistoryChange,
     RunHistoryRecord,
+    RunNotFoundError,
+    RunVersionConflictError,
 )
 from fitness.app.auth import verify_credentials
 
@@ -27,8 +33,8 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["run-editing"])
 
 
-class RunUpdateRequest(BaseModel):
-    """Request model for updating a run."""
+class RunEditFields(BaseModel):
+    """Editable run fields. Fields left unset are not changed."""
 
     distance: Optional[float] = Field(None, ge=0, description="Distance in miles")
     duration: Optional[float] = Field(None, ge=0, description="Duration in seconds")
@@ -42,6 +48,30 @@ class RunUpdateRequest(BaseModel):
     datetime_utc: Optional[datetime] = Field(
         None, description="When the run occurred (UTC)"
     )
+    expected_version: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Version the edit is based on; rejected with 409 if the run has changed since",
+    )
+
+
+class RunUpdateRequest(RunEditFields):
+    """Request model for updating a run."""
+
+    change_reason: Optional[str] = Field(None, description="Reason for the change")
+    changed_by: str = Field(..., description="User making the change")
+
+
+class RunBatchEdit(RunEditFields):
+    """The updates for one run in a batch edit."""
+
+    run_id: str = Field(..., description="ID of the run to update")
+
+
+class RunBatchUpdateRequest(BaseModel):
+    """Request model for updating many runs at once."""
+
+    edits: List[RunBatchEdit] = Field(..., min_length=1, max_length=1000)
     change_reason: Optional[str] = Field(None, description="Reason for the change")
     changed_by: str = Field(..., description="User making the change")
 
@@ -85,6 +115,100 @@ class RunHistoryResponse(BaseModel):
         )
 
 
+class RunHistoryChangeResponse(BaseModel):
+    """Response model for run history with only the changed fields of each version."""
+
+    history_id: int
+    run_id: str
+    version_number: int
+    change_type: str
+    changed_at: datetime
+    changed_by: Optional[str]
+    change_reason: Optional[str]
+    changes: Dict[str, Any]
+
+    @classmethod
+    def from_history_change(
+        cls, change: RunHistoryChange
+    ) -> "RunHistoryChangeResponse":
+        """Convert a RunHistoryChange to a response model."""
+        return cls(
+            history_id=change.history_id,
+            run_id=change.run_id,
+            version_number=change.version_number,
+            change_type=change.change_type,
+            changed_at=change.changed_at,
+            changed_by=change.changed_by,
+            change_reason=change.change_reason,
+            changes=change.changes,
+        )
+
+
+@router.patch("/batch", response_model=Dict[str, Any])
+def update_runs_batch(
+    batch_request: RunBatchUpdateRequest,
+    username: str = Depends(verify_credentials),
+) -> Dict[str, Any]:
+    """
+    Update many runs at once with change tracking.
+
+    Requires authentication via HTTP Basic Auth.
+
+    All edits are applied in a single transaction: if any run doesn't exist or
+    has changed since its `expected_version`, none of them are applied.
+    Returns the new version number of each updated run.
+
+    Args:
+        batch_request: The per-run updates and shared audit metadata.
+        username: Authenticated username (injected by dependency).
+    """
+    edits = []
+    for run_edit in batch_request.edits:
+        updates = run_edit.model_dump(
+            exclude_none=True, exclude={"run_id", "expected_version"}
+        )
+        if not updates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No valid fields provided for run {run_edit.run_id}",
+            )
+        edits.append(
+            RunEdit(
+                run_id=run_edit.run_id,
+                updates=updates,
+                expected_version=run_edit.expected_version,
+            )
+        )
+
+    try:
+        versions = update_runs_with_history(
+            edits,
+            changed_by=batch_request.changed_by,
+            change_reason=batch_request.change_reason,
+        )
+    except RunNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RunVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error updating {len(edits)} runs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error occurred while updating runs",
+        )
+
+    logger.info(f"Updated {len(versions)} runs by {batch_request.changed_by}")
+    return {
+        "status": "success",
+        "message": f"Updated {len(versions)} runs",
+        "versions": versions,
+        "updated_at": datetime.now().isoformat(),
+        "updated_by": batch_request.changed_by,
+    }
+
+
 @router.patch("/{run_id}", response_model=Dict[str, Any])
 def update_run(
     run_id: str,
@@ -98,6 +222,8 @@ def update_run(
 
     This endpoint allows updating specific fields of a run while preserving
     the full edit history. The original state is saved before making changes.
+    If `expected_version` is given and the run has been edited since that
+    version, nothing is changed and 409 is returned.
 
     Args:
         run_id: The ID of the run to update.
@@ -105,17 +231,10 @@ def update_run(
         username: Authenticated username (injected by dependency).
     """
     try:
-        # Verify the run exists
-        existing_run = get_run_by_id(run_id)
-        if not existing_run:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Run with ID {run_id} not found",
-            )
-
         # Build updates dictionary, excluding None values and metadata fields
         updates = update_request.model_dump(
-            exclude_none=True, exclude={"changed_by", "change_reason"}
+            exclude_none=True,
+            exclude={"changed_by", "change_reason", "expected_version"},
         )
 
         if not updates:
@@ -125,26 +244,33 @@ def update_run(
             )
 
         # Perform the update with history tracking
-        update_run_with_history(
+        edited = update_run_with_history(
             run_id=run_id,
             updates=updates,
             changed_by=update_request.changed_by,
             change_reason=update_request.change_reason,
+            expected_version=update_request.expected_version,
         )
 
         logger.info(f"Successfully updated run {run_id} by {update_request.changed_by}")
 
-        # Return the updated run
-        updated_run = get_run_by_id(run_id)
         return {
             "status": "success",
             "message": f"Run {run_id} updated successfully",
-            "run": updated_run.model_dump() if updated_run else None,
+            "run": edited.run.model_dump(),
+            "version": edited.version,
             "updated_fields": list(updates.keys()),
             "updated_at": datetime.now().isoformat(),
             "updated_by": update_request.changed_by,
         }
 
+    except RunNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Run with ID {run_id} not found",
+        )
+    except RunVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         logger.error(f"Validation error updating run {run_id}: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -159,36 +285,43 @@ def update_run(
         )
 
 
-@router.get("/{run_id}/history", response_model=List[RunHistoryResponse])
+@router.get(
+    "/{run_id}/history",
+    response_model=Union[List[RunHistoryResponse], List[RunHistoryChangeResponse]],
+)
 def get_run_edit_history(
-    run_id: str, limit: Optional[int] = 50
-) -> List[RunHistoryResponse]:
+    run_id: str,
+    limit: Optional[int] = 50,
+    before_version: Optional[int] = None,
+    changes_only: bool = False,
+) -> Union[List[RunHistoryResponse], List[RunHistoryChangeResponse]]:
     """
     Get the edit history for a specific run.
 
-    Returns all historical versions of the run, ordered by version number (newest first).
+    Returns historical versions of the run, ordered by version number (newest first).
     The first entry will be the most recent version, and the last will be the original.
 
     Args:
         run_id: The run identifier to look up.
         limit: Optional maximum number of history entries to return (newest first).
+        before_version: Only return versions older than this one. To page through
+            the history, pass the last `version_number` of the previous page.
+        changes_only: Return only the fields each version changed instead of a
+            full snapshot. The original version has every field.
     """
     try:
-        # Verify the run exists
-        existing_run = get_run_by_id(run_id)
-        if not existing_run:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Run with ID {run_id} not found",
+        if changes_only:
+            changes = get_run_history_changes(
+                run_id, limit=limit, before_version=before_version
             )
+            return [
+                RunHistoryChangeResponse.from_history_change(change)
+                for change in changes
+            ]
 
-        history_records = get_run_history(run_id, limit=limit)
-
-        if not history_records:
-            # Run exists but has no history - this could happen during migration
-            logger.warning(f"Run {run_id} exists but has no history records")
-            return []
-
+        history_records = get_run_history(
+            run_id, limit=limit, before_version=before_version
+        )
         response = [
             RunHistoryResponse.from_history_record(record) for record in history_records
         ]
@@ -196,9 +329,11 @@ def get_run_edit_history(
         logger.debug(f"Retrieved {len(response)} history records for run {run_id}")
         return response
 
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is (like 404s)
-        raise
+    except RunNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Run with ID {run_id} not found",
+        )
     except Exception as e:
         logger.error(f"Error retrieving history for run {run_id}: {e}")
         raise HTTPException(
@@ -296,7 +431,7 @@ def restore_run_to_version(
         }
 
         # Perform the restoration with history tracking
-        update_run_with_history(
+        restored = update_run_with_history(
             run_id=run_id,
             updates=updates,
             changed_by=restored_by,
@@ -307,12 +442,11 @@ def restore_run_to_version(
             f"Successfully restored run {run_id} to version {version_number} by {restored_by}"
         )
 
-        # Return the updated run
-        updated_run = get_run_by_id(run_id)
         return {
             "status": "success",
             "message": f"Run {run_id} restored to version {version_number}",
-            "run": updated_run.model_dump() if updated_run else None,
+            "run": restored.run.model_dump(),
+            "version": restored.version,
             "restored_from_version": version_number,
             "restored_at": datetime.now().isoformat(),
             "restored_by": restored_by,
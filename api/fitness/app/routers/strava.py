@@ -1,14 +1,23 @@
+import asyncio
+import hmac
 import logging
+import math
+import os
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 
-from fitness.app.dependencies import strava_client
+from fitness.app.dependencies import possible_duplicates, strava_client
 from fitness.app.auth import verify_credentials
+from fitness.integrations.http_client import RateLimitedError
 from fitness.integrations.strava.client import StravaClient
+from fitness.integrations.strava.models import StravaWebhookEvent
 from fitness.models import Run
-from fitness.db.runs import get_existing_run_ids, bulk_create_runs
-from fitness.load.strava import load_strava_runs
+from fitness.db.aio.oauth_credentials import get_credentials
+from fitness.db.aio.runs import sync_source_runs
+from fitness.db.runs_history import upsert_run_with_history
+from fitness.integrations.google.auto_sync import auto_sync_enabled, sync_new_runs
+from fitness.load.strava import load_strava_run, load_strava_runs
 
 logger = logging.getLogger(__name__)
 
@@ -20,28 +29,176 @@ async def update_strava_data(
     username: str = Depends(verify_credentials),
     strava_client: StravaClient = Depends(strava_client),
 ) -> dict:
-    """Fetch Strava data and insert any new runs not in the database.
+    """Fetch Strava data and bring the database's Strava runs up to date.
+
+    New runs are inserted, runs edited in Strava since the last import are
+    updated, and runs no longer in Strava are soft-deleted, each with a history
+    entry; see `sync_source_runs`.
 
     Requires authentication via HTTP Basic Auth.
 
-    Returns a summary including counts of external runs, existing DB runs, new
-    runs found and inserted, and IDs of newly inserted runs.
+    Returns a summary with the counts of inserted, updated and deleted runs, and
+    as `possible_duplicates` the [new run ID, other run ID] pairs of new runs
+    that are likely the same workout as a run from another source.
+
+    With GOOGLE_CALENDAR_AUTO_SYNC enabled, new runs are also synced to Google
+    Calendar and the summary includes `calendar_synced` and
+    `calendar_sync_failed`.
+
+    Responds 503 with a Retry-After header if Strava's rate limit is used up.
     """
     # Get all the Strava runs from the Strava API and convert them to Run models.
-    strava_runs = [Run.from_strava(run) for run in load_strava_runs(strava_client)]
-    # Get the IDs of all existing runs in the db.
-    existing_run_ids = get_existing_run_ids()
-    # Filter to only new runs.
-    new_runs = [run for run in strava_runs if run.id not in existing_run_ids]
-
-    if new_runs:
-        inserted_count = bulk_create_runs(new_runs)
-        logger.info(f"Inserted {inserted_count} new runs into the database")
-    else:
-        inserted_count = 0
-        logger.info("No new runs to insert")
-    return {
+    # The fetch blocks, waiting on Strava and on its rate limit, so it runs in a
+    # worker thread to keep the event loop serving other requests.
+    try:
+        strava = await asyncio.to_thread(load_strava_runs, strava_client)
+        strava_runs = [Run.from_strava(run) for run in strava.runs]
+    except RateLimitedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    result = await sync_source_runs(
+        strava_runs,
+        "Strava",
+        changed_by="strava_import",
+        change_reason="Updated in Strava",
+        delete_missing=True,
+        # Runs without gear aren't imported, but they aren't deleted either.
+        listed_ids=[f"strava_{activity_id}" for activity_id in strava.listed_ids],
+    )
+    inserted_count = len(result.created)
+    summary = {
         "inserted_count": inserted_count,
+        "updated_count": len(result.updated),
+        "deleted_count": len(result.deleted),
         "updated_at": datetime.now().isoformat(),
         "message": f"Inserted {inserted_count} new runs into the database",
     }
+
+    created = set(result.created)
+    summary["possible_duplicates"] = await asyncio.to_thread(
+        possible_duplicates, created
+    )
+
+    new_runs = [run for run in strava_runs if run.id in created]
+    if new_runs and auto_sync_enabled():
+        calendar_sync = await asyncio.to_thread(sync_new_runs, new_runs)
+        if calendar_sync is not None:
+            summary["calendar_synced"] = calendar_sync.synced
+            summary["calendar_sync_failed"] = calendar_sync.failed
+    return summary
+
+
+@router.get("/webhook", response_model=dict)
+async def validate_strava_webhook(
+    mode: str = Query(alias="hub.mode"),
+    challenge: str = Query(alias="hub.challenge"),
+    verify_token: str = Query(alias="hub.verify_token"),
+) -> dict:
+    """Answer Strava's validation request when creating a push subscription.
+
+    The subscription must be created with STRAVA_WEBHOOK_VERIFY_TOKEN as its
+    verify token; the challenge is echoed back only if it matches.
+    """
+    expected_token = os.environ.get("STRAVA_WEBHOOK_VERIFY_TOKEN")
+    if not expected_token:
+        raise HTTPException(status_code=503, detail="Strava webhook not configured")
+    if mode != "subscribe" or not hmac.compare_digest(verify_token, expected_token):
+        raise HTTPException(status_code=403, detail="Invalid verify token")
+    return {"hub.challenge": challenge}
+
+
+@router.post("/webhook", response_model=dict)
+async def receive_strava_webhook(
+    event: StravaWebhookEvent, background_tasks: BackgroundTasks
+) -> dict:
+    """Receive a Strava push event.
+
+    Strava expects a response within two seconds, so a created or updated
+    activity is fetched and stored after responding: a new run is inserted (and
+    synced to Google Calendar with GOOGLE_CALENDAR_AUTO_SYNC), and an edited one
+    updated with a history entry. A deleted activity's run is soft-deleted
+    once Strava confirms the activity is gone.
+    Other events are acknowledged and ignored.
+
+    Responds 503 unless STRAVA_WEBHOOK_SUBSCRIPTION_ID is set and Strava has
+    been authorized. Events from any other subscription, or for another
+    athlete's activities, are rejected with 403.
+    """
+    subscription_id = os.environ.get("STRAVA_WEBHOOK_SUBSCRIPTION_ID")
+    if not subscription_id:
+        raise HTTPException(status_code=503, detail="Strava webhook not configured")
+    if str(event.subscription_id) != subscription_id:
+        raise HTTPException(status_code=403, detail="Unknown subscription")
+
+    creds = await get_credentials("strava")
+    if creds is None or creds.account_id is None:
+        # Credentials stored before the athlete was recorded have no account
+        # ID; authorizing Strava again records it.
+        raise HTTPException(
+            status_code=503, detail="Strava athlete unknown; authorize Strava again"
+        )
+    if str(event.owner_id) != creds.account_id:
+        raise HTTPException(status_code=403, detail="Unknown athlete")
+
+    if event.object_type == "activity" and event.aspect_type in ("create", "update"):
+        background_tasks.add_task(_ingest_strava_activity, event.object_id)
+        return {"accepted": True}
+    if event.object_type == "activity" and event.aspect_type == "delete":
+        background_tasks.add_task(_delete_strava_activity, event.object_id)
+        return {"accepted": True}
+
+    logger.info(
+        f"Ignoring Strava {event.object_type} {event.aspect_type} event "
+        f"for {event.object_id}: {event.updates}"
+    )
+    return {"accepted": False}
+
+
+async def _ingest_strava_activity(activity_id: int) -> None:
+    """Fetch one Strava activity and insert or update its run."""
+    try:
+        client = await strava_client()
+        await asyncio.to_thread(_store_strava_activity, client, activity_id)
+    except Exception:
+        logger.exception(f"Failed to ingest Strava activity {activity_id}")
+
+
+async def _delete_strava_activity(activity_id: int) -> None:
+    """Soft-delete the run of an activity deleted in Strava.
+
+    The deletion is confirmed with Strava first, since the event itself can't
+    be authenticated.
+    """
+    try:
+        client = await strava_client()
+        if await asyncio.to_thread(client.activity_exists, activity_id):
+            logger.warning(
+                f"Ignoring delete event for Strava activity {activity_id}, "
+                "which still exists"
+            )
+            return
+        await sync_source_runs(
+            [],
+            "Strava",
+            changed_by="strava_webhook",
+            change_reason="Deleted in Strava",
+            deleted_ids=[f"strava_{activity_id}"],
+        )
+    except Exception:
+        logger.exception(f"Failed to delete run of Strava activity {activity_id}")
+
+
+def _store_strava_activity(client: StravaClient, activity_id: int) -> None:
+    strava_run = load_strava_run(client, activity_id)
+    if strava_run is None:
+        return
+    run = Run.from_strava(strava_run)
+    outcome = upsert_run_with_history(
+        run, changed_by="strava_webhook", change_reason="Updated in Strava"
+    )
+    logger.info(f"Strava activity {activity_id}: run {run.id} {outcome}")
+    if outcome == "created" and auto_sync_enabled():
+        sync_new_runs([run])
@@ -4,11 +4,11 @@ import zoneinfo
 
 from fastapi import APIRouter, Depends
 
-from fitness.app.models import TrmnlSummary, Sex
+from fitness.app.models import TrmnlSummary
 from fitness.app.dependencies import all_runs
 from fitness.agg import total_mileage, total_seconds
 from fitness.agg.training_load import training_stress_balance
-from fitness.models import Run
+from fitness.models import RunRecord, Sex
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ def get_trmnl_summary(
     max_hr: float = 192,
     resting_hr: float = 42,
     sex: Sex = "M",
-    runs: list[Run] = Depends(all_runs),
+    runs: list[RunRecord] = Depends(all_runs),
 ) -> TrmnlSummary:
     """Get the summary of the fitness data."""
     miles_all_time = total_mileage(runs, date.min, date.max)
@@ -14,11 +14,13 @@ from fitness.db.synced_runs import (
     get_failed_syncs,
 )
 from fitness.models.sync import (
+    ReconcileResponse,
     SyncedRun,
     SyncResponse,
     SyncStatusResponse,
 )
-from fitness.integrations.google.calendar_client import GoogleCalendarClient
+from fitness.integrations.google.calendar_client import get_calendar_client
+from fitness.integrations.google.reconcile import reconcile_calendar
 from fitness.app.auth import verify_credentials
 
 logger = logging.getLogger(__name__)
@@ -95,8 +97,7 @@ def sync_run_to_calendar(
         )
 
     try:
-        # Initialize Google Calendar client
-        calendar_client = GoogleCalendarClient()
+        calendar_client = get_calendar_client()
 
         # Create the calendar event
         google_event_id = calendar_client.create_workout_event(run)
@@ -212,7 +213,7 @@ def unsync_run_from_calendar(
                 raise Exception("Failed to delete sync record from database")
 
         # Otherwise, delete from Google then remove local record
-        calendar_client = GoogleCalendarClient()
+        calendar_client = get_calendar_client()
         success = calendar_client.delete_workout_event(synced_run.google_event_id)
 
         if not success:
@@ -265,3 +266,37 @@ def get_failed_sync_records() -> List[SyncedRun]:
         List of SyncedRun records with 'failed' status.
     """
     return get_failed_syncs()
+
+
+@router.post("/reconcile", response_model=ReconcileResponse)
+def reconcile_calendar_events(
+    username: str = Depends(verify_credentials),
+) -> ReconcileResponse:
+    """Update Google Calendar events for runs edited since they were synced.
+
+    Only events Google reports as changed since the last reconciliation are
+    fetched. Events of deleted runs are removed along with their sync records.
+    Runs whose event was deleted in Google are marked failed.
+
+    Requires authentication via HTTP Basic Auth.
+
+    Args:
+        username: Authenticated username (injected by dependency).
+
+    Returns:
+        ReconcileResponse with counts of what changed.
+    """
+    try:
+        result = reconcile_calendar()
+    except (ValueError, RuntimeError) as e:
+        logger.error(f"Failed to reconcile Google Calendar: {e}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+    return ReconcileResponse(
+        changed_events=result.changed_events,
+        updated=result.updated,
+        deleted_in_calendar=result.deleted_in_calendar,
+        removed=result.removed,
+        failed=result.failed,
+        full_sync=result.full_sync,
+    )
@@ -0,0 +1,6 @@
+"""Async variants of the db functions called from async FastAPI handlers.
+
+Functions keep the names of their synchronous counterparts in `fitness.db` and
+run on `psycopg.AsyncConnection`s from a separate async pool, so awaiting them
+doesn't block the event loop.
+"""
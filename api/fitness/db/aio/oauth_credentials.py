@@ -0,0 +1,12 @@
+from ..connection import get_async_db_cursor
+from .. import statements
+from ..oauth_credentials import OAuthCredentials, OAuthProvider, _row_to_credentials
+from ..statements import execute_async
+
+
+async def get_credentials(provider: OAuthProvider) -> OAuthCredentials | None:
+    """Get OAuth credentials for a provider, or None if there are none."""
+    async with get_async_db_cursor() as cursor:
+        await execute_async(cursor, statements.CREDENTIALS_BY_PROVIDER, (provider,))
+        row = await cursor.fetchone()
+        return None if row is None else _row_to_credentials(row)
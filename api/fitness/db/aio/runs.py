@@ -0,0 +1,91 @@
+import logging
+from typing import List, Optional, Sequence
+
+from fitness.models import Run
+from fitness.models.run import RunSource
+from ..connection import get_async_db_connection, get_async_db_cursor
+from .. import statements
+from ..runs import (
+    SourceSyncResult,
+    _insert_rows,
+    _source_sync_params,
+    _source_sync_result,
+)
+from ..statements import execute_async
+from .shoes import bulk_create_shoes_by_names, get_existing_shoes_by_names
+
+logger = logging.getLogger(__name__)
+
+
+async def get_existing_run_ids() -> set[str]:
+    """Get all existing run IDs from the database."""
+    async with get_async_db_cursor() as cursor:
+        await execute_async(cursor, statements.ACTIVE_RUN_IDS)
+        rows = await cursor.fetchall()
+        existing_ids = {row[0] for row in rows}
+        logger.info(f"Found {len(existing_ids)} existing run IDs in database")
+        return existing_ids
+
+
+async def bulk_create_runs(runs: List[Run], chunk_size: int = 20) -> int:
+    """Insert multiple runs into the database in chunks with automatic history creation. Returns the number of inserted rows."""
+    if not runs:
+        return 0
+
+    logger.info(f"Starting bulk insert of {len(runs)} runs in chunks of {chunk_size}")
+
+    unique_shoe_names = {run.shoe_name for run in runs if run.shoe_name is not None}
+    existing_shoes = await get_existing_shoes_by_names(unique_shoe_names)
+    missing_shoe_names = unique_shoe_names - existing_shoes.keys()
+    new_shoes = await bulk_create_shoes_by_names(missing_shoe_names)
+    all_shoes = {**existing_shoes, **new_shoes}
+
+    total_inserted = 0
+
+    async with get_async_db_connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor() as cursor:
+                for i in range(0, len(runs), chunk_size):
+                    chunk = runs[i : i + chunk_size]
+                    run_data, history_data = _insert_rows(chunk, all_shoes)
+
+                    await cursor.executemany(statements.INSERT_RUN.sql, run_data)
+                    total_inserted += cursor.rowcount
+
+                    await cursor.executemany(
+                        statements.INSERT_RUN_HISTORY_BATCH.sql, history_data
+                    )
+
+    logger.info(
+        f"Bulk insert completed: {total_inserted} total runs inserted with original history entries"
+    )
+    return total_inserted
+
+
+async def sync_source_runs(
+    runs: Sequence[Run],
+    source: RunSource,
+    changed_by: str,
+    change_reason: Optional[str] = None,
+    delete_missing: bool = False,
+    deleted_ids: Sequence[str] = (),
+    listed_ids: Optional[Sequence[str]] = None,
+) -> SourceSyncResult:
+    """Async counterpart of `fitness.db.runs.sync_source_runs`."""
+    shoe_names = {run.shoe_name for run in runs if run.shoe_name is not None}
+    shoe_ids = await get_existing_shoes_by_names(shoe_names)
+    shoe_ids.update(await bulk_create_shoes_by_names(shoe_names - shoe_ids.keys()))
+
+    params = _source_sync_params(
+        runs,
+        shoe_ids,
+        source,
+        changed_by,
+        change_reason,
+        delete_missing,
+        deleted_ids,
+        listed_ids,
+    )
+    async with get_async_db_cursor() as cursor:
+        await execute_async(cursor, statements.SYNC_SOURCE_RUNS, params)
+        return _source_sync_result(source, await cursor.fetchall())
@@ -0,0 +1,33 @@
+import logging
+
+from fitness.models.shoe import generate_shoe_id
+from ..connection import get_async_db_cursor
+from .. import statements
+from ..statements import execute_async
+
+logger = logging.getLogger(__name__)
+
+
+async def get_existing_shoes_by_names(shoe_names: set[str]) -> dict[str, str]:
+    """Get existing shoes by their names. Returns dict mapping shoe_name -> shoe_id."""
+    if not shoe_names:
+        return {}
+
+    async with get_async_db_cursor() as cursor:
+        await execute_async(cursor, statements.SHOE_IDS_BY_NAMES, (list(shoe_names),))
+        return {name: shoe_id for name, shoe_id in await cursor.fetchall()}
+
+
+async def bulk_create_shoes_by_names(shoe_names: set[str]) -> dict[str, str]:
+    """Create multiple shoes by names. Returns dict mapping shoe_name -> shoe_id."""
+    if not shoe_names:
+        return {}
+
+    logger.info(f"Creating {len(shoe_names)} new shoes: {shoe_names}")
+
+    shoe_data = [(generate_shoe_id(name), name) for name in shoe_names]
+
+    async with get_async_db_cursor() as cursor:
+        await cursor.executemany(statements.INSERT_SHOE.sql, shoe_data)
+
+    return {name: shoe_id for shoe_id, name in shoe_data}
@@ -1,8 +1,18 @@
+import asyncio
 import os
-from contextlib import contextmanager
-from typing import Iterator
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
 
 import psycopg
+from psycopg.rows import AsyncRowFactory, RowFactory
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_loop: asyncio.AbstractEventLoop | None = None
 
 
 def get_database_url() -> str:
@@ -23,23 +33,120 @@ def get_sqlalchemy_database_url() -> str:
     return url
 
 
+def _get_pool() -> ConnectionPool:
+    """Get the process-wide connection pool for the current DATABASE_URL.
+
+    The pool is created lazily on first use and replaced if DATABASE_URL changes
+    (as it does between test databases).
+    """
+    global _pool
+    url = get_database_url()
+    with _pool_lock:
+        if _pool is None or _pool.conninfo != url:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                url,
+                **_pool_settings(),
+                # Serverless hosts may drop idle connections; check before handing out.
+                check=ConnectionPool.check_connection,
+                open=True,
+            )
+        return _pool
+
+
+def _pool_settings() -> dict[str, Any]:
+    return {
+        "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", "1")),
+        "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", "10")),
+        # Seconds to wait for a free connection before raising PoolTimeout.
+        "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", "30")),
+    }
+
+
+async def _get_async_pool() -> AsyncConnectionPool:
+    """Get the async connection pool for the current DATABASE_URL and event loop.
+
+    Async connections belong to the event loop that opened them, so the pool is
+    replaced if it was opened on a different loop (each TestClient runs its own).
+    """
+    global _async_pool, _async_pool_loop
+    url = get_database_url()
+    loop = asyncio.get_running_loop()
+    old_pool, old_loop = _async_pool, _async_pool_loop
+    if old_pool is not None and old_pool.conninfo == url and old_loop is loop:
+        return old_pool
+
+    pool = AsyncConnectionPool(
+        url,
+        **_pool_settings(),
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+    _async_pool, _async_pool_loop = pool, loop
+    await pool.open()
+    # A pool from another loop can't be closed from this one; drop it instead.
+    if old_pool is not None and old_loop is loop:
+        await old_pool.close()
+    return pool
+
+
+def close_db_pool() -> None:
+    """Close the connection pool, if one was opened."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+async def close_async_db_pool() -> None:
+    """Close the async connection pool, if one was opened on the running loop."""
+    global _async_pool, _async_pool_loop
+    pool, loop = _async_pool, _async_pool_loop
+    _async_pool, _async_pool_loop = None, None
+    if pool is not None and loop is asyncio.get_running_loop():
+        await pool.close()
+
+
 @contextmanager
 def get_db_connection() -> Iterator[psycopg.Connection]:
-    """Get a database connection context manager.
+    """Get a pooled database connection context manager.
 
-    Explicitly closes the connection to ensure proper cleanup in serverless environments.
+    The transaction is committed when the block exits normally and rolled back if
+    it raises; the connection is then returned to the pool. Pooled connections keep
+    their server-side prepared statements between uses.
     """
-    url = get_database_url()
-    conn = psycopg.connect(url)
-    try:
+    with _get_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
 
 
 @contextmanager
-def get_db_cursor() -> Iterator[psycopg.Cursor]:
-    """Get a database cursor context manager."""
+def get_db_cursor(
+    row_factory: RowFactory[Any] | None = None,
+) -> Iterator[psycopg.Cursor]:
+    """Get a database cursor context manager.
+
+    If `row_factory` is given, rows are built with it instead of as plain tuples.
+    """
     with get_db_connection() as conn:
-        with conn.cursor() as cursor:
+        with conn.cursor(row_factory=row_factory) as cursor:
+            yield cursor
+
+
+@asynccontextmanager
+async def get_async_db_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+    """Async counterpart of `get_db_connection` for use in async handlers."""
+    pool = await _get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def get_async_db_cursor(
+    row_factory: AsyncRowFactory[Any] | None = None,
+) -> AsyncIterator[psycopg.AsyncCursor]:
+    """Async counterpart of `get_db_cursor` for use in async handlers."""
+    async with get_async_db_connection() as conn:
+        async with conn.cursor(row_factory=row_factory) as cursor:
             yield cursor
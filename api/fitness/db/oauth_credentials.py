@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from pydantic import BaseModel
 
 from .connection import get_db_cursor, get_db_connection
+from . import statements
+from .statements import execute
 
 OAuthProvider = Literal["google", "strava"]
 
@@ -24,6 +26,8 @@ class OAuthCredentials:
     access_token: str
     refresh_token: str
     expires_at: datetime | None = None
+    # The provider's ID for the authorized account, e.g. the Strava athlete ID.
+    account_id: str | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
@@ -80,30 +84,27 @@ def get_credentials(provider: OAuthProvider) -> OAuthCredentials | None:
         OAuthCredentials if found, None otherwise
     """
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT provider, client_id, client_secret, access_token, refresh_token,
-                   expires_at, created_at, updated_at
-            FROM oauth_credentials
-            WHERE provider = %s
-            """,
-            (provider,),
-        )
+        execute(cursor, statements.CREDENTIALS_BY_PROVIDER, (provider,))
 
         row = cursor.fetchone()
         if row is None:
             return None
 
-        return OAuthCredentials(
-            provider=row[0],
-            client_id=row[1],
-            client_secret=row[2],
-            access_token=row[3],
-            refresh_token=row[4],
-            expires_at=row[5],
-            created_at=row[6],
-            updated_at=row[7],
-        )
+        return _row_to_credentials(row)
+
+
+def _row_to_credentials(row) -> OAuthCredentials:
+    return OAuthCredentials(
+        provider=row[0],
+        client_id=row[1],
+        client_secret=row[2],
+        access_token=row[3],
+        refresh_token=row[4],
+        expires_at=row[5],
+        created_at=row[6],
+        updated_at=row[7],
+        account_id=row[8],
+    )
 
 
 def upsert_credentials(credentials: OAuthCredentials) -> None:
@@ -116,14 +117,17 @@ def upsert_credentials(credentials: OAuthCredentials) -> None:
         access_token: OAuth access token
         refresh_token: OAuth refresh token
         expires_at: Optional expiration timestamp for access token
+        account_id: The authorized account's ID, if known. An unknown ID keeps
+            the one already stored.
     """
     with get_db_connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute(
                 """
                 INSERT INTO oauth_credentials
-                    (provider, client_id, client_secret, access_token, refresh_token, expires_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                    (provider, client_id, client_secret, access_token, refresh_token,
+                     expires_at, account_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT (provider)
                 DO UPDATE SET
                     client_id = EXCLUDED.client_id,
@@ -131,6 +135,9 @@ def upsert_credentials(credentials: OAuthCredentials) -> None:
                     access_token = EXCLUDED.access_token,
                     refresh_token = EXCLUDED.refresh_token,
                     expires_at = EXCLUDED.expires_at,
+                    account_id = COALESCE(
+                        EXCLUDED.account_id, oauth_credentials.account_id
+                    ),
                     updated_at = CURRENT_TIMESTAMP
                 """,
                 (
@@ -140,6 +147,7 @@ def upsert_credentials(credentials: OAuthCredentials) -> None:
                     credentials.access_token,
                     credentials.refresh_token,
                     credentials.expires_at,
+                    credentials.account_id,
                 ),
             )
             conn.commit()
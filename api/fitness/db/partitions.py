@@ -0,0 +1,161 @@
+"""Maintenance of the yearly runs_history partitions.
+
+runs_history is only partitioned if the opt-in partitioning migration was run
+(see DATABASE.md). Each year of `changed_at` has a `runs_history_<year>`
+partition, and rows outside them land in `runs_history_default`.
+
+Create next year's partition ahead of time, and archive old years by detaching
+them. Run with:
+
+    uv run python -m fitness.db.partitions create 2027
+    uv run python -m fitness.db.partitions archive 2015
+"""
+
+import argparse
+import logging
+from datetime import date
+from typing import List
+
+from psycopg import sql
+
+from .connection import get_db_cursor
+from . import statements
+from .statements import execute
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "runs_history_default"
+
+
+class NotPartitionedError(ValueError):
+    """runs_history is a plain table, or has no partition for the year."""
+
+
+def history_partition_name(year: int) -> str:
+    return f"runs_history_{year}"
+
+
+def history_is_partitioned() -> bool:
+    """Whether runs_history has been converted to a partitioned table."""
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.RUNS_HISTORY_IS_PARTITIONED)
+        return cursor.fetchone()[0]
+
+
+def get_history_partitions() -> List[str]:
+    """Names of the runs_history partitions, including the default partition."""
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.RUNS_HISTORY_PARTITIONS)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_history_partition(year: int) -> bool:
+    """
+    Create the runs_history partition for `year` unless it exists. Returns whether it was created.
+
+    Rows for that year already in the default partition are moved into the new
+    partition, in the same transaction.
+    """
+    partitions = get_history_partitions()
+    if not partitions:
+        raise NotPartitionedError("runs_history is not partitioned")
+    name = history_partition_name(year)
+    if name in partitions:
+        return False
+
+    params = {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)}
+    table = sql.Identifier(name)
+    default = sql.Identifier(DEFAULT_PARTITION)
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            sql.SQL(
+                "CREATE TABLE {} (LIKE runs_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ).format(table)
+        )
+        cursor.execute(
+            sql.SQL("""
+                WITH moved AS (
+                    DELETE FROM {default}
+                    WHERE changed_at >= %(start)s AND changed_at < %(end)s
+                    RETURNING *
+                )
+                INSERT INTO {table} SELECT * FROM moved
+            """).format(default=default, table=table),
+            params,
+        )
+        moved = cursor.rowcount
+        # Bounds can't be parameters in DDL; they are rendered from dates.
+        cursor.execute(
+            sql.SQL(
+                "ALTER TABLE runs_history ATTACH PARTITION {} FOR VALUES FROM ({}) TO ({})"
+            ).format(table, sql.Literal(params["start"]), sql.Literal(params["end"]))
+        )
+
+    logger.info(f"Created history partition {name}, moving {moved} rows into it")
+    return True
+
+
+def archive_history_partition(year: int) -> str:
+    """
+    Detach the runs_history partition for `year` and return its table name.
+
+    Detaching only changes the catalog, so it is cheap however many rows the year
+    has. Runs whose latest version was changed that year still need it: as_of
+    metrics, run history and restores read runs_history only. In the same
+    transaction those rows are moved back into runs_history, where they land in
+    the default partition. Only superseded versions stay in the detached table,
+    which can then be dumped (e.g. `pg_dump -t runs_history_2015`) and dropped.
+    """
+    name = history_partition_name(year)
+    if name not in get_history_partitions():
+        raise NotPartitionedError(f"runs_history has no partition {name}")
+
+    table = sql.Identifier(name)
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            sql.SQL("ALTER TABLE runs_history DETACH PARTITION {}").format(table)
+        )
+        cursor.execute(
+            sql.SQL("""
+                WITH latest AS (
+                    DELETE FROM {table} a
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {table} b
+                        WHERE b.run_id = a.run_id
+                          AND b.version_number > a.version_number
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM runs_history h
+                        WHERE h.run_id = a.run_id
+                          AND h.version_number > a.version_number
+                    )
+                    RETURNING *
+                )
+                INSERT INTO runs_history SELECT * FROM latest
+            """).format(table=table)
+        )
+        kept = cursor.rowcount
+
+    logger.info(
+        f"Archived history partition {name}, keeping {kept} latest versions "
+        f"in {DEFAULT_PARTITION}"
+    )
+    return name
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=["create", "archive"])
+    parser.add_argument("year", type=int)
+    args = parser.parse_args()
+
+    if args.action == "create":
+        created = create_history_partition(args.year)
+        name = history_partition_name(args.year)
+        print(f"Created {name}" if created else f"{name} already exists")
+    else:
+        print(f"Detached {archive_history_partition(args.year)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,35 @@
+import hashlib
+import json
 import logging
-from datetime import date
-from typing import List, Optional
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
-from fitness.models import Run
+import psycopg
+from psycopg.rows import args_row
+
+from fitness.models import Run, RunRecord
+from fitness.models.run import RunSource
 from fitness.models.run_detail import RunDetail
 from fitness.models.shoe import generate_shoe_id
 from .connection import get_db_cursor, get_db_connection
+from . import statements
+from .statements import execute
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SourceSyncResult:
+    """IDs of the runs a source sync created, updated and deleted."""
+
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+
 def _ensure_shoe_exists(shoe_name: str | None) -> str | None:
     """Ensure a shoe exists in the database and return its ID."""
     if shoe_name is None:
@@ -20,16 +40,10 @@ def _ensure_shoe_exists(shoe_name: str | None) -> str | None:
     with get_db_cursor() as cursor:
         logger.debug(f"Checking if shoe {shoe_name} (ID: {shoe_id}) exists")
         # Check if shoe already exists (including soft-deleted ones)
-        cursor.execute("SELECT 1 FROM shoes WHERE id = %s", (shoe_id,))
+        execute(cursor, statements.SHOE_EXISTS, (shoe_id,))
         if cursor.fetchone() is None:
             # Create the shoe if it doesn't exist
-            cursor.execute(
-                """
-                INSERT INTO shoes (id, name, retired_at, notes, retirement_notes, deleted_at)
-                VALUES (%s, %s, NULL, NULL, NULL, NULL)
-            """,
-                (shoe_id, shoe_name),
-            )
+            execute(cursor, statements.INSERT_SHOE, (shoe_id, shoe_name))
             logger.info(f"Created new shoe: {shoe_name} (ID: {shoe_id})")
 
     return shoe_id
@@ -37,24 +51,36 @@ def _ensure_shoe_exists(shoe_name: str | None) -> str | None:
 
 def get_all_runs(include_deleted: bool = False) -> List[Run]:
     """Get all runs from the database with shoe information."""
-    with get_db_cursor() as cursor:
+    return [record.to_run() for record in get_all_run_records(include_deleted)]
+
+
+def get_all_run_records(include_deleted: bool = False) -> List[RunRecord]:
+    """
+    Get all runs from the database as compact RunRecords for aggregation.
+
+    Rows come from our own database, so they are not re-validated.
+    """
+    with get_db_cursor(row_factory=args_row(RunRecord)) as cursor:
         if include_deleted:
-            cursor.execute("""
-                SELECT r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate, r.shoe_id, r.deleted_at, s.name
-                FROM runs r
-                LEFT JOIN shoes s ON r.shoe_id = s.id
-                ORDER BY r.datetime_utc
-            """)
+            execute(cursor, statements.ALL_RUNS)
         else:
-            cursor.execute("""
-                SELECT r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate, r.shoe_id, r.deleted_at, s.name
-                FROM runs r
-                LEFT JOIN shoes s ON r.shoe_id = s.id
-                WHERE r.deleted_at IS NULL
-                ORDER BY r.datetime_utc
-            """)
-        rows = cursor.fetchall()
-        return [_row_to_run(row) for row in rows]
+            execute(cursor, statements.ACTIVE_RUNS)
+        return cursor.fetchall()
+
+
+def get_run_records_as_of(as_of: datetime) -> List[RunRecord]:
+    """
+    Get the non-deleted runs as they were at `as_of`, rebuilt from runs_history.
+
+    Runs created after `as_of` are left out, and edited runs have the values
+    they had then. A naive `as_of` is taken to be UTC.
+    """
+    if as_of.tzinfo is not None:
+        # History timestamps are stored as naive UTC.
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    with get_db_cursor(row_factory=args_row(RunRecord)) as cursor:
+        execute(cursor, statements.ACTIVE_RUNS_AS_OF, {"as_of": as_of})
+        return cursor.fetchall()
 
 
 def bulk_create_runs(runs: List[Run], chunk_size: int = 20) -> int:
@@ -97,71 +123,17 @@ def bulk_create_runs(runs: List[Run], chunk_size: int = 20) -> int:
                 for i in range(0, len(runs), chunk_size):
                     chunk = runs[i : i + chunk_size]
 
-                    # Prepare run data for insertion
-                    run_data = []
-                    history_data = []
-
-                    for run in chunk:
-                        shoe_id = (
-                            all_shoes.get(run.shoe_name) if run.shoe_name else None
-                        )
-
-                        # Add to runs table data
-                        run_data.append(
-                            (
-                                run.id,
-                                run.datetime_utc,
-                                run.type,
-                                run.distance,
-                                run.duration,
-                                run.source,
-                                run.avg_heart_rate,
-                                shoe_id,
-                                run.deleted_at,
-                            )
-                        )
-
-                        # Add to history table data (original entry)
-                        history_data.append(
-                            (
-                                run.id,  # run_id
-                                1,  # version_number
-                                "original",  # change_type
-                                run.datetime_utc,
-                                run.type,
-                                run.distance,
-                                run.duration,
-                                run.source,
-                                run.avg_heart_rate,
-                                shoe_id,
-                                "system",  # changed_by
-                                "Initial import",  # change_reason
-                            )
-                        )
+                    run_data, history_data = _insert_rows(chunk, all_shoes)
 
                     # Insert runs
-                    cursor.executemany(
-                        """
-                        INSERT INTO runs (id, datetime_utc, type, distance, duration, source, avg_heart_rate, shoe_id, deleted_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        run_data,
-                    )
+                    cursor.executemany(statements.INSERT_RUN.sql, run_data)
 
                     chunk_inserted = cursor.rowcount
                     total_inserted += chunk_inserted
 
                     # Insert corresponding history entries
                     cursor.executemany(
-                        """
-                        INSERT INTO runs_history (
-                            run_id, version_number, change_type, datetime_utc, type, 
-                            distance, duration, source, avg_heart_rate, shoe_id,
-                            changed_by, change_reason
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        history_data,
+                        statements.INSERT_RUN_HISTORY_BATCH.sql, history_data
                     )
 
                     logger.info(
@@ -174,10 +146,166 @@ def bulk_create_runs(runs: List[Run], chunk_size: int = 20) -> int:
     return total_inserted
 
 
+def _insert_rows(
+    runs: Sequence[Run], shoe_ids: dict[str, str]
+) -> tuple[list[tuple], list[tuple]]:
+    """Build the `runs` rows and original `runs_history` rows for new runs."""
+    run_data = []
+    history_data = []
+
+    for run in runs:
+        shoe_id = shoe_ids.get(run.shoe_name) if run.shoe_name else None
+
+        # Add to runs table data
+        run_data.append(
+            (
+                run.id,
+                run.datetime_utc,
+                run.type,
+                run.distance,
+                run.duration,
+                run.source,
+                run.avg_heart_rate,
+                shoe_id,
+                run.deleted_at,
+            )
+        )
+
+        # Add to history table data (original entry)
+        history_data.append(
+            (
+                run.id,  # run_id
+                1,  # version_number
+                "original",  # change_type
+                run.datetime_utc,
+                run.type,
+                run.distance,
+                run.duration,
+                run.source,
+                run.avg_heart_rate,
+                shoe_id,
+                "system",  # changed_by
+                "Initial import",  # change_reason
+            )
+        )
+
+    return run_data, history_data
+
+
+def sync_source_runs(
+    runs: Sequence[Run],
+    source: RunSource,
+    changed_by: str,
+    change_reason: Optional[str] = None,
+    delete_missing: bool = False,
+    deleted_ids: Sequence[str] = (),
+    listed_ids: Optional[Sequence[str]] = None,
+) -> SourceSyncResult:
+    """
+    Bring the stored runs of a source in line with the runs fetched from it.
+
+    New runs are inserted, runs whose content changed at the source since they
+    were last imported are edited, and with `delete_missing` stored runs of the
+    source that weren't fetched are soft-deleted, as are any in `deleted_ids`.
+    If some runs the source listed aren't in `runs`, e.g. because they aren't
+    imported, `listed_ids` has the IDs of all of them so that those aren't
+    deleted; it defaults to the IDs of `runs`.
+    Each change gets a history entry. Runs edited here are only overwritten when
+    the source's copy changes, and runs deleted here stay deleted.
+
+    The whole diff is one set-based statement, so unchanged runs cost nothing
+    beyond being compared.
+    """
+    shoe_names = {run.shoe_name for run in runs if run.shoe_name is not None}
+    from fitness.db.shoes import get_existing_shoes_by_names, bulk_create_shoes_by_names
+
+    shoe_ids = get_existing_shoes_by_names(shoe_names)
+    shoe_ids.update(bulk_create_shoes_by_names(shoe_names - shoe_ids.keys()))
+
+    params = _source_sync_params(
+        runs,
+        shoe_ids,
+        source,
+        changed_by,
+        change_reason,
+        delete_missing,
+        deleted_ids,
+        listed_ids,
+    )
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.SYNC_SOURCE_RUNS, params)
+        return _source_sync_result(source, cursor.fetchall())
+
+
+def source_hash(run: Run) -> str:
+    """Hash of the fields of a run that come from its source."""
+    content = [
+        run.datetime_utc.isoformat(),
+        run.type,
+        run.distance,
+        run.duration,
+        run.avg_heart_rate,
+        run.shoe_name if run.shoe_name is not None else run.shoe_id,
+    ]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def _source_sync_params(
+    runs: Sequence[Run],
+    shoe_ids: dict[str, str],
+    source: RunSource,
+    changed_by: str,
+    change_reason: Optional[str],
+    delete_missing: bool,
+    deleted_ids: Sequence[str],
+    listed_ids: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    """The parameters of SYNC_SOURCE_RUNS: one array per run column."""
+    if listed_ids is None:
+        listed_ids = [run.id for run in runs]
+    if delete_missing and not listed_ids:
+        # An empty fetch is more likely a problem at the source than every
+        # run having been deleted there.
+        logger.warning(f"No {source} runs fetched; not deleting any")
+        delete_missing = False
+    return {
+        "id": [run.id for run in runs],
+        "datetime_utc": [run.datetime_utc for run in runs],
+        "type": [run.type for run in runs],
+        "distance": [run.distance for run in runs],
+        "duration": [run.duration for run in runs],
+        "avg_heart_rate": [run.avg_heart_rate for run in runs],
+        "shoe_id": [
+            shoe_ids[run.shoe_name] if run.shoe_name is not None else run.shoe_id
+            for run in runs
+        ],
+        "source_hash": [source_hash(run) for run in runs],
+        "source": source,
+        "changed_by": changed_by,
+        "change_reason": change_reason,
+        "delete_missing": delete_missing,
+        "deleted_ids": list(deleted_ids),
+        "listed_ids": list(listed_ids),
+    }
+
+
+def _source_sync_result(
+    source: RunSource, rows: Sequence[tuple[str, str]]
+) -> SourceSyncResult:
+    result = SourceSyncResult()
+    for outcome, run_id in rows:
+        getattr(result, outcome).append(run_id)
+    logger.info(
+        f"Synced {source} runs: {len(result.created)} created, "
+        f"{len(result.updated)} updated, {len(result.deleted)} deleted"
+    )
+    return result
+
+
 def get_existing_run_ids() -> set[str]:
     """Get all existing run IDs from the database."""
     with get_db_cursor() as cursor:
-        cursor.execute("SELECT id FROM runs WHERE deleted_at IS NULL")
+        execute(cursor, statements.ACTIVE_RUN_IDS)
         rows = cursor.fetchall()
         existing_ids = {row[0] for row in rows}
         logger.info(f"Found {len(existing_ids)} existing run IDs in database")
@@ -194,88 +322,61 @@ def get_run_details_in_date_range(
 
     Joins `runs` to `shoes` and `synced_runs`.
     """
-    with get_db_cursor() as cursor:
-        base_where = ["DATE(r.datetime_utc) BETWEEN %s AND %s"]
-        params: list = [start_date, end_date]
-        if not include_deleted:
-            base_where.append("r.deleted_at IS NULL")
-        if synced is True:
-            base_where.append("sr.sync_status = 'synced'")
-        elif synced is False:
-            base_where.append(
-                "(sr.sync_status IS DISTINCT FROM 'synced' OR sr.run_id IS NULL)"
-            )
-
-        where_clause = " AND ".join(base_where)
-        query = f"""
-            SELECT r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate, r.shoe_id, r.deleted_at,
-                   COALESCE(s.name, 'Unknown') as shoe_name, s.retirement_notes,
-                   sr.sync_status, sr.synced_at, sr.google_event_id, sr.run_version, sr.error_message, r.version
-            FROM runs r
-            LEFT JOIN shoes s ON r.shoe_id = s.id
-            LEFT JOIN synced_runs sr ON sr.run_id = r.id
-            WHERE {where_clause}
-            ORDER BY r.datetime_utc DESC
-        """
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [_row_to_run_detail(row) for row in rows]
+    with get_db_cursor(row_factory=_run_detail_row_factory) as cursor:
+        execute(
+            cursor,
+            statements.RUN_DETAILS_IN_RANGE[include_deleted, synced],
+            {"start": start_date, "end": end_date},
+        )
+        return cursor.fetchall()
 
 
 def get_all_run_details(
     include_deleted: bool = False, synced: Optional[bool] = None
 ) -> List[RunDetail]:
     """Get all detailed runs with shoes and sync info."""
-    with get_db_cursor() as cursor:
-        base_where = []
-        params: list = []
-        if not include_deleted:
-            base_where.append("r.deleted_at IS NULL")
-        if synced is True:
-            base_where.append("sr.sync_status = 'synced'")
-        elif synced is False:
-            base_where.append(
-                "(sr.sync_status IS DISTINCT FROM 'synced' OR sr.run_id IS NULL)"
-            )
-        where_clause = f"WHERE {' AND '.join(base_where)}" if base_where else ""
-        query = f"""
-            SELECT r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate, r.shoe_id, r.deleted_at,
-                   COALESCE(s.name, 'Unknown') as shoe_name, s.retirement_notes,
-                   sr.sync_status, sr.synced_at, sr.google_event_id, sr.run_version, sr.error_message, r.version
-            FROM runs r
-            LEFT JOIN shoes s ON r.shoe_id = s.id
-            LEFT JOIN synced_runs sr ON sr.run_id = r.id
-            {where_clause}
-            ORDER BY r.datetime_utc DESC
-        """
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [_row_to_run_detail(row) for row in rows]
+    with get_db_cursor(row_factory=_run_detail_row_factory) as cursor:
+        execute(cursor, statements.RUN_DETAILS[include_deleted, synced])
+        return cursor.fetchall()
 
 
 def get_run_by_id(run_id: str) -> Optional[Run]:
     """Get a single run by its ID."""
-    with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate, r.shoe_id, r.deleted_at, s.name
-            FROM runs r
-            LEFT JOIN shoes s ON r.shoe_id = s.id
-            WHERE r.id = %s AND r.deleted_at IS NULL
-        """,
-            (run_id,),
-        )
-        row = cursor.fetchone()
-        if not row:
-            return None
-        return _row_to_run(row)
+    with get_db_cursor(row_factory=_run_row_factory) as cursor:
+        execute(cursor, statements.RUN_BY_ID, (run_id,))
+        return cursor.fetchone()
 
 
 # Removed RunWithShoes helpers; superseded by RunDetail flows
 
 
-def _row_to_run(row) -> Run:
-    """Convert a database row to a Run object."""
+def _validate_db_rows() -> bool:
+    """Whether models built from database rows should be fully validated.
+
+    Rows come from our own schema, so by default models are built without
+    validation. Set VALIDATE_DB_ROWS=1 (the test suite does) to run pydantic
+    validation on every row instead.
+    """
+    return os.environ.get("VALIDATE_DB_ROWS", "").lower() in ("1", "true")
+
+
+def _run_row_factory(cursor: psycopg.Cursor) -> Callable[[Sequence[Any]], Run]:
+    """psycopg row factory building Run objects from the run SELECT columns."""
+    return partial(_row_to_run, validate=_validate_db_rows())
+
+
+def _run_detail_row_factory(
+    cursor: psycopg.Cursor,
+) -> Callable[[Sequence[Any]], RunDetail]:
+    """psycopg row factory building RunDetail objects from the detail SELECT columns."""
+    return partial(_row_to_run_detail, validate=_validate_db_rows())
+
+
+def _row_to_run(row, validate: bool = True) -> Run:
+    """Convert a database row to a Run object.
+
+    With `validate=False` the row is trusted and pydantic validation is skipped.
+    """
     (
         run_id,
         datetime_utc,
@@ -288,22 +389,25 @@ def _row_to_run(row) -> Run:
         deleted_at,
         shoe_name,
     ) = row
-    run = Run(
-        id=run_id,
-        datetime_utc=datetime_utc,
-        type=type_,
-        distance=distance,
-        duration=duration,
-        source=source,
-        avg_heart_rate=avg_heart_rate,
-        shoe_id=shoe_id,
-        deleted_at=deleted_at,
-    )
+    fields = {
+        "id": run_id,
+        "datetime_utc": datetime_utc,
+        "type": type_,
+        "distance": distance,
+        "duration": duration,
+        "source": source,
+        "avg_heart_rate": avg_heart_rate,
+        "shoe_id": shoe_id,
+        "deleted_at": deleted_at,
+    }
+    # model_construct trusts the row and skips validation.
+    run = Run(**fields) if validate else Run.model_construct(**fields)
     run._shoe_name = shoe_name
     return run
 
 
-def _row_to_run_detail(row) -> RunDetail:
+def _row_to_run_detail(row, validate: bool = True) -> RunDetail:
+    """Convert a detail row to a RunDetail, skipping validation if `validate=False`."""
     (
         run_id,
         datetime_utc,
@@ -328,23 +432,26 @@ def _row_to_run_detail(row) -> RunDetail:
     if shoe_name == "Unknown" or shoe_name is None:
         shoe_name = None
 
-    return RunDetail(
-        id=run_id,
-        datetime_utc=datetime_utc,
-        type=type_,
-        distance=distance,
-        duration=duration,
-        source=source,
-        avg_heart_rate=avg_heart_rate,
-        shoe_id=shoe_id,
-        shoes=shoe_name,
-        shoe_retirement_notes=retirement_notes,
-        deleted_at=deleted_at,
-        version=run_table_version,
-        is_synced=(sync_status == "synced"),
-        sync_status=sync_status,
-        synced_at=synced_at,
-        google_event_id=google_event_id or None,
-        synced_version=run_version,
-        error_message=error_message,
-    )
+    fields = {
+        "id": run_id,
+        "datetime_utc": datetime_utc,
+        "type": type_,
+        "distance": distance,
+        "duration": duration,
+        "source": source,
+        "avg_heart_rate": avg_heart_rate,
+        "shoe_id": shoe_id,
+        "shoes": shoe_name,
+        "shoe_retirement_notes": retirement_notes,
+        "deleted_at": deleted_at,
+        "version": run_table_version,
+        "is_synced": sync_status == "synced",
+        "sync_status": sync_status,
+        "synced_at": synced_at,
+        "google_event_id": google_event_id or None,
+        "synced_version": run_version,
+        "error_message": error_message,
+    }
+    if not validate:
+        return RunDetail.model_construct(**fields)
+    return RunDetail(**fields)
@@ -1,13 +1,34 @@
 import logging
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Dict, Any, Sequence
 from dataclasses import dataclass
 
 from fitness.models import Run
-from .connection import get_db_cursor, get_db_connection
+from .connection import get_db_cursor
+from .runs import _row_to_run, sync_source_runs
+from . import statements
+from .statements import execute
 
 logger = logging.getLogger(__name__)
 
+# Run fields that can be edited. 'source' is not editable as it maintains data lineage.
+EDITABLE_FIELDS = (
+    "datetime_utc",
+    "type",
+    "distance",
+    "duration",
+    "avg_heart_rate",
+    "shoe_id",
+)
+
+
+class RunNotFoundError(ValueError):
+    """The run doesn't exist or is deleted."""
+
+
+class RunVersionConflictError(ValueError):
+    """The run was edited since the version the caller expected."""
+
 
 @dataclass
 class RunHistoryRecord:
@@ -46,6 +67,38 @@ class RunHistoryRecord:
         )
 
 
+@dataclass
+class RunHistoryChange:
+    """A historical version of a run with only the fields that changed in it."""
+
+    history_id: int
+    run_id: str
+    version_number: int
+    change_type: str
+    changed_at: datetime
+    changed_by: Optional[str]
+    change_reason: Optional[str]
+    # Field name -> value in this version. The original version has every field.
+    changes: Dict[str, Any]
+
+
+@dataclass
+class RunEdit:
+    """Field updates for one run in a batch edit."""
+
+    run_id: str
+    updates: Dict[str, Any]
+    expected_version: Optional[int] = None
+
+
+@dataclass
+class EditedRun:
+    """A run after an edit, with the version number the edit created."""
+
+    run: Run
+    version: int
+
+
 def insert_run_history(
     run: Run,
     version_number: int,
@@ -55,16 +108,9 @@ def insert_run_history(
 ) -> int:
     """Insert a run into the history table and return the history_id."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO runs_history (
-                run_id, version_number, change_type, datetime_utc, type, 
-                distance, duration, source, avg_heart_rate, shoe_id,
-                changed_by, change_reason
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING history_id
-        """,
+        execute(
+            cursor,
+            statements.INSERT_RUN_HISTORY,
             (
                 run.id,
                 version_number,
@@ -93,25 +139,24 @@ def insert_run_history(
         return history_id
 
 
-def get_run_history(run_id: str, limit: Optional[int] = None) -> List[RunHistoryRecord]:
-    """Get the edit history for a specific run, ordered by version (newest first)."""
+def get_run_history(
+    run_id: str, limit: Optional[int] = None, before_version: Optional[int] = None
+) -> List[RunHistoryRecord]:
+    """
+    Get the edit history for a specific run, ordered by version (newest first).
+
+    Pass the last `version_number` of a page as `before_version` to get the next
+    page. Raises RunNotFoundError if the run doesn't exist or is deleted.
+    """
     with get_db_cursor() as cursor:
-        query = """
-            SELECT history_id, run_id, version_number, change_type, datetime_utc, 
-                   type, distance, duration, source, avg_heart_rate, shoe_id,
-                   changed_at, changed_by, change_reason
-            FROM runs_history 
-            WHERE run_id = %s 
-            ORDER BY version_number DESC
-        """
-        params = [run_id]
-
-        if limit:
-            query += " LIMIT %s"
-            params.append(limit)
-
-        cursor.execute(query, params)
+        execute(
+            cursor,
+            statements.RUN_HISTORY,
+            _history_page_params(run_id, limit, before_version),
+        )
         rows = cursor.fetchall()
+        if not rows:
+            _check_run_exists(cursor, run_id)
 
         history_records = []
         for row in rows:
@@ -140,19 +185,45 @@ def get_run_history(run_id: str, limit: Optional[int] = None) -> List[RunHistory
         return history_records
 
 
+def get_run_history_changes(
+    run_id: str, limit: Optional[int] = None, before_version: Optional[int] = None
+) -> List[RunHistoryChange]:
+    """
+    Like `get_run_history`, but each version has only the fields that changed.
+
+    The diffs against the previous version are computed by the database.
+    """
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.RUN_HISTORY_CHANGES,
+            _history_page_params(run_id, limit, before_version),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            _check_run_exists(cursor, run_id)
+
+    return [RunHistoryChange(*row) for row in rows]
+
+
+def _history_page_params(
+    run_id: str, limit: Optional[int], before_version: Optional[int]
+) -> Dict[str, Any]:
+    # A NULL limit returns every version.
+    return {"run_id": run_id, "limit": limit or None, "before_version": before_version}
+
+
+def _check_run_exists(cursor, run_id: str) -> None:
+    """Raise RunNotFoundError unless the run exists and isn't deleted."""
+    execute(cursor, statements.RUN_VERSION, (run_id,))
+    if cursor.fetchone() is None:
+        raise RunNotFoundError(f"Run {run_id} not found")
+
+
 def get_run_version(run_id: str, version_number: int) -> Optional[RunHistoryRecord]:
     """Get a specific version of a run from history."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT history_id, run_id, version_number, change_type, datetime_utc, 
-                   type, distance, duration, source, avg_heart_rate, shoe_id,
-                   changed_at, changed_by, change_reason
-            FROM runs_history 
-            WHERE run_id = %s AND version_number = %s
-        """,
-            (run_id, version_number),
-        )
+        execute(cursor, statements.RUN_HISTORY_VERSION, (run_id, version_number))
 
         row = cursor.fetchone()
         if not row:
@@ -179,14 +250,7 @@ def get_run_version(run_id: str, version_number: int) -> Optional[RunHistoryReco
 def get_latest_version_number(run_id: str) -> int:
     """Get the latest version number for a run."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT COALESCE(MAX(version_number), 0) 
-            FROM runs_history 
-            WHERE run_id = %s
-        """,
-            (run_id,),
-        )
+        execute(cursor, statements.LATEST_HISTORY_VERSION, (run_id,))
 
         result = cursor.fetchone()
         return result[0] if result else 0
@@ -197,105 +261,134 @@ def update_run_with_history(
     updates: Dict[str, Any],
     changed_by: str,
     change_reason: Optional[str] = None,
-) -> None:
+    expected_version: Optional[int] = None,
+) -> EditedRun:
     """
     Update a run and record the change in history.
-    This function performs both operations in a single transaction.
-    """
-    from .runs import get_run_by_id
 
+    The UPDATE and the history INSERT are a single statement, so both happen in
+    one round trip and one transaction. Concurrent edits get consecutive
+    versions; pass `expected_version` to instead reject the edit with
+    RunVersionConflictError if the run was edited since that version.
+    """
     # Validate allowed fields BEFORE any database operations
-    allowed_fields = {
-        "distance",
-        "duration",
-        "avg_heart_rate",
-        "shoe_id",
-        "type",
-        "datetime_utc",
-        # Note: We don't allow editing 'source' as it maintains data lineage
+    params: Dict[str, Any] = {
+        "id": run_id,
+        "changed_by": changed_by,
+        "change_reason": change_reason,
+        "expected_version": expected_version,
+        **_edit_params(updates),
     }
 
-    for field, value in updates.items():
-        if field not in allowed_fields:
-            raise ValueError(f"Field '{field}' is not allowed to be updated")
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.EDIT_RUN, params)
+        row = cursor.fetchone()
 
-    with get_db_connection() as conn:
-        with conn.transaction():
-            # Get the current run data
-            current_run = get_run_by_id(run_id)
-            if not current_run:
-                raise ValueError(f"Run {run_id} not found")
-
-            # Get the next version number
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT version FROM runs WHERE id = %s", (run_id,))
-                result = cursor.fetchone()
-                current_version = result[0] if result else 1
-                new_version = current_version + 1
-
-                # Build the UPDATE query dynamically based on provided updates
-                set_clauses = []
-                params = []
-
-                for field, value in updates.items():
-                    set_clauses.append(f"{field} = %s")
-                    params.append(value)
-
-                # Add metadata updates
-                set_clauses.extend(
-                    [
-                        "last_edited_at = CURRENT_TIMESTAMP",
-                        "last_edited_by = %s",
-                        "version = %s",
-                    ]
-                )
-                params.extend([changed_by, new_version])
-
-                # Add the WHERE clause parameter
-                params.append(run_id)
-
-                # Execute the update of the current run row
-                update_query = f"""
-                    UPDATE runs 
-                    SET {", ".join(set_clauses)}
-                    WHERE id = %s
-                """
-
-                cursor.execute(update_query, params)
-
-                if cursor.rowcount == 0:
-                    raise ValueError(f"No run found with ID {run_id}")
-
-                # Construct the updated run snapshot to record in history
-                from fitness.models.run import Run as RunModel
-
-                updated_run = RunModel(
-                    id=current_run.id,
-                    datetime_utc=updates.get("datetime_utc", current_run.datetime_utc),
-                    type=updates.get("type", current_run.type),
-                    distance=updates.get("distance", current_run.distance),
-                    duration=updates.get("duration", current_run.duration),
-                    source=current_run.source,
-                    avg_heart_rate=updates.get(
-                        "avg_heart_rate", current_run.avg_heart_rate
-                    ),
-                    shoe_id=updates.get("shoe_id", current_run.shoe_id),
-                    deleted_at=current_run.deleted_at,
-                )
+        if row is None:
+            # Nothing was updated: find out whether the run is missing or newer.
+            execute(cursor, statements.RUN_VERSION, (run_id,))
+            current = cursor.fetchone()
+            if current is None:
+                raise RunNotFoundError(f"Run {run_id} not found")
+            raise RunVersionConflictError(
+                f"Run {run_id} is at version {current[0]}, not {expected_version}"
+            )
+
+    edited = EditedRun(run=_row_to_run(row[:-1]), version=row[-1])
+    logger.info(f"Updated run {run_id} to version {edited.version} by {changed_by}")
+    return edited
 
-                # Insert the NEW state into history with the incremented version
-                insert_run_history_with_cursor(
-                    cursor,
-                    updated_run,
-                    new_version,
-                    "edit",
-                    changed_by,
-                    change_reason,
-                )
 
-                logger.info(
-                    f"Updated run {run_id} to version {new_version} by {changed_by}"
+def update_runs_with_history(
+    edits: Sequence[RunEdit],
+    changed_by: str,
+    change_reason: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Apply edits to many runs and record them in history. Returns run_id -> new version.
+
+    All edits are applied by one set-based UPDATE feeding one multi-row history
+    INSERT, in a single transaction. If any run is missing or not at its
+    `expected_version`, nothing is changed.
+    """
+    if not edits:
+        return {}
+
+    run_ids = [edit.run_id for edit in edits]
+    if len(set(run_ids)) != len(run_ids):
+        raise ValueError("Each run can only be edited once per batch")
+
+    # Validate allowed fields BEFORE any database operations
+    edit_params = [_edit_params(edit.updates) for edit in edits]
+    params: Dict[str, Any] = {
+        "id": run_ids,
+        "expected_version": [edit.expected_version for edit in edits],
+        "changed_by": changed_by,
+        "change_reason": change_reason,
+    }
+    # One array per flag/value column, in the same order as the run IDs.
+    for key in edit_params[0]:
+        params[key] = [run_params[key] for run_params in edit_params]
+
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.EDIT_RUNS, params)
+        versions = dict(cursor.fetchall())
+
+        not_updated = [run_id for run_id in run_ids if run_id not in versions]
+        if not_updated:
+            # Raising rolls back the edits that did apply.
+            execute(cursor, statements.RUN_VERSIONS, (not_updated,))
+            current_versions = dict(cursor.fetchall())
+            missing = [r for r in not_updated if r not in current_versions]
+            if missing:
+                raise RunNotFoundError(f"Runs not found: {', '.join(missing)}")
+            raise RunVersionConflictError(
+                "Runs edited since their expected version: "
+                + ", ".join(
+                    f"{run_id} (now version {current_versions[run_id]})"
+                    for run_id in not_updated
                 )
+            )
+
+    logger.info(f"Updated {len(versions)} runs in one batch by {changed_by}")
+    return versions
+
+
+def upsert_run_with_history(
+    run: Run,
+    changed_by: str,
+    change_reason: Optional[str] = None,
+) -> Literal["created", "updated", "unchanged"]:
+    """
+    Insert a run fetched from its source, or edit the stored run to match it.
+
+    The stored run is only edited if the run changed at its source since it was
+    last imported, so re-importing it adds no history and keeps edits made
+    here. A run that was deleted here stays deleted ("unchanged").
+    """
+    result = sync_source_runs([run], run.source, changed_by, change_reason)
+    if result.created:
+        return "created"
+    if result.updated:
+        return "updated"
+    return "unchanged"
+
+
+def _edit_params(updates: Dict[str, Any]) -> Dict[str, Any]:
+    """The `set_<field>` flags and values for EDIT_RUN and EDIT_RUNS."""
+    for field in updates:
+        if field not in EDITABLE_FIELDS:
+            raise ValueError(f"Field '{field}' is not allowed to be updated")
+
+    params: Dict[str, Any] = {}
+    for field in EDITABLE_FIELDS:
+        value = updates.get(field)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            # Runs store naive UTC datetimes.
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        params[f"set_{field}"] = field in updates
+        params[field] = value
+    return params
 
 
 def insert_run_history_with_cursor(
@@ -307,16 +400,9 @@ def insert_run_history_with_cursor(
     change_reason: Optional[str] = None,
 ) -> int:
     """Insert a run into the history table using an existing cursor (for transactions)."""
-    cursor.execute(
-        """
-        INSERT INTO runs_history (
-            run_id, version_number, change_type, datetime_utc, type, 
-            distance, duration, source, avg_heart_rate, shoe_id,
-            changed_by, change_reason
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING history_id
-    """,
+    execute(
+        cursor,
+        statements.INSERT_RUN_HISTORY,
         (
             run.id,
             version_number,
@@ -2,8 +2,10 @@ import logging
 from datetime import date
 from typing import List, Optional
 
-from fitness.models.shoe import Shoe
+from fitness.models.shoe import Shoe, ShoeMileage
 from .connection import get_db_cursor
+from . import statements
+from .statements import execute
 
 logger = logging.getLogger(__name__)
 
@@ -18,38 +20,13 @@ def get_shoes(
                 If False, return only active shoes.
         include_deleted: Whether to include soft-deleted shoes.
     """
+    # Retired shoes are listed most recently retired first, everything else by name.
+    if retired is True:
+        statement = statements.RETIRED_SHOES[include_deleted]
+    else:
+        statement = statements.SHOES_BY_NAME[include_deleted, retired]
     with get_db_cursor() as cursor:
-        # Build WHERE clause conditions
-        conditions = []
-
-        if not include_deleted:
-            conditions.append("deleted_at IS NULL")
-
-        if retired is True:
-            conditions.append("retired_at IS NOT NULL")
-        elif retired is False:
-            conditions.append("retired_at IS NULL")
-        # If retired is None, no retirement filter is applied
-
-        # Build the query
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-        # Choose ORDER BY based on retirement filter
-        if retired is True:
-            order_by = "ORDER BY retired_at DESC"
-        else:
-            order_by = "ORDER BY name"
-
-        query = f"""
-            SELECT id, name, retired_at, notes, retirement_notes, deleted_at
-            FROM shoes
-            {where_clause}
-            {order_by}
-        """
-
-        cursor.execute(query)
+        execute(cursor, statement)
         rows = cursor.fetchall()
         return [_row_to_shoe(row) for row in rows]
 
@@ -58,23 +35,9 @@ def get_shoe_by_id(shoe_id: str, include_deleted: bool = False) -> Optional[Shoe
     """Get a specific shoe by its ID."""
     with get_db_cursor() as cursor:
         if include_deleted:
-            cursor.execute(
-                """
-                SELECT id, name, retired_at, notes, retirement_notes, deleted_at
-                FROM shoes
-                WHERE id = %s
-            """,
-                (shoe_id,),
-            )
+            execute(cursor, statements.SHOE_BY_ID_INCLUDING_DELETED, (shoe_id,))
         else:
-            cursor.execute(
-                """
-                SELECT id, name, retired_at, notes, retirement_notes, deleted_at
-                FROM shoes
-                WHERE id = %s AND deleted_at IS NULL
-            """,
-                (shoe_id,),
-            )
+            execute(cursor, statements.SHOE_BY_ID, (shoe_id,))
         row = cursor.fetchone()
         return _row_to_shoe(row) if row else None
 
@@ -84,31 +47,37 @@ def retire_shoe_by_id(
 ) -> bool:
     """Retire a shoe by ID. Returns True if shoe was found and retired."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            UPDATE shoes 
-            SET retired_at = %s, retirement_notes = %s, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND deleted_at IS NULL
-        """,
-            (retired_at, retirement_notes, shoe_id),
-        )
+        execute(cursor, statements.RETIRE_SHOE, (retired_at, retirement_notes, shoe_id))
         return cursor.rowcount > 0
 
 
 def unretire_shoe_by_id(shoe_id: str) -> bool:
     """Unretire a shoe by ID. Returns True if shoe was found and unretired."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            UPDATE shoes 
-            SET retired_at = NULL, retirement_notes = NULL, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND deleted_at IS NULL
-        """,
-            (shoe_id,),
-        )
+        execute(cursor, statements.UNRETIRE_SHOE, (shoe_id,))
         return cursor.rowcount > 0
 
 
+def get_shoe_mileages(include_retired: bool = False) -> List[ShoeMileage]:
+    """Get the total mileage for each shoe, aggregated in the database.
+
+    Only non-deleted runs count towards a shoe's mileage, and shoes without any
+    runs are omitted. Results are ordered by shoe name.
+
+    Args:
+        include_retired: Whether to include retired shoes in the results.
+    """
+    statement = (
+        statements.ALL_SHOE_MILEAGES
+        if include_retired
+        else statements.ACTIVE_SHOE_MILEAGES
+    )
+    with get_db_cursor() as cursor:
+        execute(cursor, statement)
+        rows = cursor.fetchall()
+        return [ShoeMileage(shoe=_row_to_shoe(row[:6]), mileage=row[6]) for row in rows]
+
+
 def _row_to_shoe(row) -> Shoe:
     """Convert a database row to a Shoe object."""
     shoe_id, name, retired_at, notes, retirement_notes, deleted_at = row
@@ -130,15 +99,7 @@ def get_existing_shoes_by_names(shoe_names: set[str]) -> dict[str, str]:
     logger.debug(f"Checking existence of {len(shoe_names)} shoes: {shoe_names}")
 
     with get_db_cursor() as cursor:
-        # Create placeholders for IN clause
-        placeholders = ",".join(["%s"] * len(shoe_names))
-        cursor.execute(
-            f"""
-            SELECT name, id FROM shoes 
-            WHERE name IN ({placeholders}) AND deleted_at IS NULL
-        """,
-            list(shoe_names),
-        )
+        execute(cursor, statements.SHOE_IDS_BY_NAMES, (list(shoe_names),))
 
         result = {name: shoe_id for name, shoe_id in cursor.fetchall()}
         logger.debug(f"Found {len(result)} existing shoes in database")
@@ -158,13 +119,7 @@ def bulk_create_shoes_by_names(shoe_names: set[str]) -> dict[str, str]:
     shoe_data = [(generate_shoe_id(name), name) for name in shoe_names]
 
     with get_db_cursor() as cursor:
-        cursor.executemany(
-            """
-            INSERT INTO shoes (id, name, retired_at, notes, retirement_notes, deleted_at)
-            VALUES (%s, %s, NULL, NULL, NULL, NULL)
-        """,
-            shoe_data,
-        )
+        cursor.executemany(statements.INSERT_SHOE.sql, shoe_data)
 
         logger.info(f"Successfully created {len(shoe_data)} shoes")
 
@@ -0,0 +1,859 @@
+"""Registry of the named, parameterized SQL statements used by the db layer.
+
+Every statement is static text. Optional filters get one registered variant per
+combination (e.g. `RUN_DETAILS[include_deleted, synced]`) rather than catch-all
+predicates like `%(include_deleted)s OR deleted_at IS NULL`, which would stop
+Postgres from using a good generic plan. `execute()` asks psycopg to prepare the
+statement server-side on first use, and because connections are pooled the
+prepared plan is reused across requests.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+import psycopg
+
+
+@dataclass(frozen=True)
+class Statement:
+    """A named SQL statement."""
+
+    name: str
+    sql: str
+
+
+STATEMENTS: dict[str, Statement] = {}
+
+
+def _register(name: str, sql: str) -> Statement:
+    if name in STATEMENTS:
+        raise ValueError(f"Statement {name!r} is already registered")
+    statement = Statement(name=name, sql=sql)
+    STATEMENTS[name] = statement
+    return statement
+
+
+def execute(
+    cursor: psycopg.Cursor,
+    statement: Statement,
+    params: Sequence[Any] | Mapping[str, Any] | None = None,
+) -> psycopg.Cursor:
+    """Execute a registered statement as a server-side prepared statement."""
+    return cursor.execute(statement.sql, params, prepare=True)
+
+
+async def execute_async(
+    cursor: psycopg.AsyncCursor,
+    statement: Statement,
+    params: Sequence[Any] | Mapping[str, Any] | None = None,
+) -> psycopg.AsyncCursor:
+    """Async counterpart of `execute`."""
+    return await cursor.execute(statement.sql, params, prepare=True)
+
+
+# --- runs -------------------------------------------------------------------
+
+_RUN_COLUMNS = """
+    r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate,
+    r.shoe_id, r.deleted_at, s.name
+"""
+
+_RUN_DETAIL_COLUMNS = """
+    r.id, r.datetime_utc, r.type, r.distance, r.duration, r.source, r.avg_heart_rate,
+    r.shoe_id, r.deleted_at, COALESCE(s.name, 'Unknown') as shoe_name,
+    s.retirement_notes, sr.sync_status, sr.synced_at, sr.google_event_id,
+    sr.run_version, sr.error_message, r.version
+"""
+
+# (name suffix, predicate) for the run detail listings, keyed by
+# `include_deleted` and by `synced` (None for any, true or false).
+_RUN_DELETED_FILTERS = {
+    False: ("", "r.deleted_at IS NULL"),
+    True: ("_with_deleted", "TRUE"),
+}
+_RUN_SYNCED_FILTERS = {
+    None: ("", "TRUE"),
+    True: ("_synced", "sr.sync_status = 'synced'"),
+    False: ("_unsynced", "sr.sync_status IS DISTINCT FROM 'synced'"),
+}
+
+ALL_RUNS = _register(
+    "all_runs",
+    f"""
+    SELECT {_RUN_COLUMNS}
+    FROM runs r
+    LEFT JOIN shoes s ON r.shoe_id = s.id
+    ORDER BY r.datetime_utc
+    """,
+)
+
+ACTIVE_RUNS = _register(
+    "active_runs",
+    f"""
+    SELECT {_RUN_COLUMNS}
+    FROM runs r
+    LEFT JOIN shoes s ON r.shoe_id = s.id
+    WHERE r.deleted_at IS NULL
+    ORDER BY r.datetime_utc
+    """,
+)
+
+# The runs as they were at %(as_of)s: each run's latest version changed at or
+# before then, minus runs deleted by then. Versions are read from the covering
+# idx_runs_history_as_of index alone. `deleted_at` is always NULL.
+ACTIVE_RUNS_AS_OF = _register(
+    "active_runs_as_of",
+    """
+    SELECT h.run_id, h.datetime_utc, h.type, h.distance, h.duration, h.source,
+           h.avg_heart_rate, h.shoe_id, NULL::timestamp, s.name
+    FROM (
+        SELECT DISTINCT ON (run_id)
+            run_id, datetime_utc, type, distance, duration, source,
+            avg_heart_rate, shoe_id
+        FROM runs_history
+        WHERE changed_at <= %(as_of)s
+        ORDER BY run_id, version_number DESC
+    ) h
+    LEFT JOIN shoes s ON h.shoe_id = s.id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM runs r
+        WHERE r.id = h.run_id AND r.deleted_at <= %(as_of)s
+    )
+    ORDER BY h.datetime_utc
+    """,
+)
+
+RUN_BY_ID = _register(
+    "run_by_id",
+    f"""
+    SELECT {_RUN_COLUMNS}
+    FROM runs r
+    LEFT JOIN shoes s ON r.shoe_id = s.id
+    WHERE r.id = %s AND r.deleted_at IS NULL
+    """,
+)
+
+ACTIVE_RUN_IDS = _register(
+    "active_run_ids",
+    "SELECT id FROM runs WHERE deleted_at IS NULL",
+)
+
+RUN_DETAILS = {
+    (deleted, synced): _register(
+        f"run_details{deleted_suffix}{synced_suffix}",
+        f"""
+        SELECT {_RUN_DETAIL_COLUMNS}
+        FROM runs r
+        LEFT JOIN shoes s ON r.shoe_id = s.id
+        LEFT JOIN synced_runs sr ON sr.run_id = r.id
+        WHERE {deleted_filter}
+          AND {synced_filter}
+        ORDER BY r.datetime_utc DESC
+        """,
+    )
+    for deleted, (deleted_suffix, deleted_filter) in _RUN_DELETED_FILTERS.items()
+    for synced, (synced_suffix, synced_filter) in _RUN_SYNCED_FILTERS.items()
+}
+
+RUN_DETAILS_IN_RANGE = {
+    (deleted, synced): _register(
+        f"run_details_in_range{deleted_suffix}{synced_suffix}",
+        f"""
+        SELECT {_RUN_DETAIL_COLUMNS}
+        FROM runs r
+        LEFT JOIN shoes s ON r.shoe_id = s.id
+        LEFT JOIN synced_runs sr ON sr.run_id = r.id
+        WHERE r.datetime_utc >= %(start)s::date
+          AND r.datetime_utc < %(end)s::date + 1
+          AND {deleted_filter}
+          AND {synced_filter}
+        ORDER BY r.datetime_utc DESC
+        """,
+    )
+    for deleted, (deleted_suffix, deleted_filter) in _RUN_DELETED_FILTERS.items()
+    for synced, (synced_suffix, synced_filter) in _RUN_SYNCED_FILTERS.items()
+}
+
+INSERT_RUN = _register(
+    "insert_run",
+    """
+    INSERT INTO runs (id, datetime_utc, type, distance, duration, source, avg_heart_rate, shoe_id, deleted_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+)
+
+# Used to tell a missing run from a version conflict when EDIT_RUN updates nothing.
+RUN_VERSION = _register(
+    "run_version",
+    "SELECT version FROM runs WHERE id = %s AND deleted_at IS NULL",
+)
+
+
+# Editable run columns and their SQL types.
+_EDITABLE_RUN_COLUMNS = {
+    "datetime_utc": "timestamp",
+    "type": "varchar",
+    "distance": "double precision",
+    "duration": "double precision",
+    "avg_heart_rate": "double precision",
+    "shoe_id": "varchar",
+}
+
+
+def _edited(column: str, flag: str, value: str) -> str:
+    return f"{column} = CASE WHEN {flag} THEN {value} ELSE {column} END"
+
+
+_EDIT_RUN_SET = ",\n            ".join(
+    _edited(column, f"%(set_{column})s", f"%({column})s::{sql_type}")
+    for column, sql_type in _EDITABLE_RUN_COLUMNS.items()
+)
+
+_EDIT_RUNS_SET = ",\n            ".join(
+    _edited(column, f"e.set_{column}", f"e.new_{column}")
+    for column in _EDITABLE_RUN_COLUMNS
+)
+
+_EDIT_RUNS_ARRAYS = ",\n            ".join(
+    f"%(set_{column})s::boolean[], %({column})s::{sql_type}[]"
+    for column, sql_type in _EDITABLE_RUN_COLUMNS.items()
+)
+
+_EDIT_RUNS_COLUMNS = ",\n            ".join(
+    f"set_{column}, new_{column}" for column in _EDITABLE_RUN_COLUMNS
+)
+
+_INSERT_EDIT_HISTORY = """
+        INSERT INTO runs_history (
+            run_id, version_number, change_type, datetime_utc, type,
+            distance, duration, source, avg_heart_rate, shoe_id,
+            changed_by, change_reason
+        )
+        SELECT id, version, 'edit', datetime_utc, type,
+               distance, duration, source, avg_heart_rate, shoe_id,
+               %(changed_by)s, %(change_reason)s
+        FROM updated
+"""
+
+
+# Edits a run and records the new version in runs_history in one statement.
+# Each editable column has a `set_<column>` flag so a column can also be set to
+# NULL. The version is bumped in the UPDATE itself, and a non-NULL
+# `expected_version` makes the edit apply only if nobody else edited the run first.
+EDIT_RUN = _register(
+    "edit_run",
+    f"""
+    WITH updated AS (
+        UPDATE runs
+        SET {_EDIT_RUN_SET},
+            last_edited_at = CURRENT_TIMESTAMP,
+            last_edited_by = %(changed_by)s,
+            version = version + 1
+        WHERE id = %(id)s
+          AND deleted_at IS NULL
+          AND (%(expected_version)s::integer IS NULL OR version = %(expected_version)s)
+        RETURNING *
+    ),
+    history AS ({_INSERT_EDIT_HISTORY})
+    SELECT {_RUN_COLUMNS}, r.version
+    FROM updated r
+    LEFT JOIN shoes s ON r.shoe_id = s.id
+    """,
+)
+
+# Batch form of EDIT_RUN: every parameter except changed_by and change_reason
+# is an array with one element per edited run.
+EDIT_RUNS = _register(
+    "edit_runs",
+    f"""
+    WITH edits AS (
+        SELECT *
+        FROM unnest(
+            %(id)s::varchar[],
+            %(expected_version)s::integer[],
+            {_EDIT_RUNS_ARRAYS}
+        ) AS e(
+            id,
+            expected_version,
+            {_EDIT_RUNS_COLUMNS}
+        )
+    ),
+    updated AS (
+        UPDATE runs
+        SET {_EDIT_RUNS_SET},
+            last_edited_at = CURRENT_TIMESTAMP,
+            last_edited_by = %(changed_by)s,
+            version = runs.version + 1
+        FROM edits e
+        WHERE runs.id = e.id
+          AND runs.deleted_at IS NULL
+          AND (e.expected_version IS NULL OR runs.version = e.expected_version)
+        RETURNING runs.*
+    ),
+    history AS ({_INSERT_EDIT_HISTORY})
+    SELECT id, version FROM updated
+    """,
+)
+
+RUN_VERSIONS = _register(
+    "run_versions",
+    "SELECT id, version FROM runs WHERE id = ANY(%s) AND deleted_at IS NULL",
+)
+
+_SOURCE_RUN_COLUMNS = "datetime_utc, type, distance, duration, avg_heart_rate, shoe_id"
+
+# Diffs runs fetched from a source against the stored ones, all in one statement:
+# - runs not stored yet are inserted, with an original history entry;
+# - runs whose content hash changed since the last import are edited, with an
+#   edit entry. Runs stored before hashes were (NULL hash) are only edited if
+#   they haven't been edited here, so local edits aren't overwritten;
+# - otherwise only a new or first hash is recorded, with no history;
+# - stored runs of the source in `deleted_ids`, or with `delete_missing` any not
+#   in `listed_ids` (every run the source listed, fetched or not), are
+#   soft-deleted with a deletion entry.
+# Runs deleted here are never re-inserted or edited. Returns (outcome, run_id)
+# for each created, updated and deleted run.
+SYNC_SOURCE_RUNS = _register(
+    "sync_source_runs",
+    f"""
+    WITH incoming AS (
+        SELECT *
+        FROM unnest(
+            %(id)s::varchar[],
+            %(datetime_utc)s::timestamp[],
+            %(type)s::varchar[],
+            %(distance)s::double precision[],
+            %(duration)s::double precision[],
+            %(avg_heart_rate)s::double precision[],
+            %(shoe_id)s::varchar[],
+            %(source_hash)s::text[]
+        ) AS i(id, {_SOURCE_RUN_COLUMNS}, source_hash)
+    ),
+    inserted AS (
+        INSERT INTO runs (id, source, source_hash, {_SOURCE_RUN_COLUMNS})
+        SELECT id, %(source)s, source_hash, {_SOURCE_RUN_COLUMNS}
+        FROM incoming
+        ON CONFLICT (id) DO NOTHING
+        RETURNING *
+    ),
+    updated AS (
+        UPDATE runs r
+        SET datetime_utc = i.datetime_utc,
+            type = i.type,
+            distance = i.distance,
+            duration = i.duration,
+            avg_heart_rate = i.avg_heart_rate,
+            shoe_id = i.shoe_id,
+            source_hash = i.source_hash,
+            last_edited_at = CURRENT_TIMESTAMP,
+            last_edited_by = %(changed_by)s,
+            version = r.version + 1
+        FROM incoming i
+        WHERE r.id = i.id
+          AND r.deleted_at IS NULL
+          AND r.source_hash IS DISTINCT FROM i.source_hash
+          AND (r.source_hash IS NOT NULL OR r.version = 1)
+          AND (r.datetime_utc, r.type, r.distance, r.duration, r.avg_heart_rate, r.shoe_id)
+              IS DISTINCT FROM
+              (i.datetime_utc, i.type, i.distance, i.duration, i.avg_heart_rate, i.shoe_id)
+        RETURNING r.*
+    ),
+    rehashed AS (
+        UPDATE runs r
+        SET source_hash = i.source_hash
+        FROM incoming i
+        WHERE r.id = i.id
+          AND r.deleted_at IS NULL
+          AND r.source_hash IS DISTINCT FROM i.source_hash
+          AND r.id NOT IN (SELECT id FROM updated)
+        RETURNING r.id
+    ),
+    deleted AS (
+        UPDATE runs r
+        SET deleted_at = CURRENT_TIMESTAMP,
+            last_edited_at = CURRENT_TIMESTAMP,
+            last_edited_by = %(changed_by)s,
+            version = r.version + 1
+        WHERE r.source = %(source)s
+          AND r.deleted_at IS NULL
+          AND (
+              r.id = ANY(%(deleted_ids)s::varchar[])
+              OR (
+                  %(delete_missing)s
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM unnest(%(listed_ids)s::varchar[]) AS listed(id)
+                      WHERE listed.id = r.id
+                  )
+              )
+          )
+        RETURNING r.*
+    ),
+    history AS (
+        INSERT INTO runs_history (
+            run_id, version_number, change_type, datetime_utc, type,
+            distance, duration, source, avg_heart_rate, shoe_id,
+            changed_by, change_reason
+        )
+        SELECT id, version, 'original', datetime_utc, type,
+               distance, duration, source, avg_heart_rate, shoe_id,
+               'system', 'Initial import'
+        FROM inserted
+        UNION ALL
+        SELECT id, version, 'edit', datetime_utc, type,
+               distance, duration, source, avg_heart_rate, shoe_id,
+               %(changed_by)s, %(change_reason)s
+        FROM updated
+        UNION ALL
+        SELECT id, version, 'deletion', datetime_utc, type,
+               distance, duration, source, avg_heart_rate, shoe_id,
+               %(changed_by)s, %(change_reason)s
+        FROM deleted
+    )
+    SELECT 'created', id FROM inserted
+    UNION ALL
+    SELECT 'updated', id FROM updated
+    UNION ALL
+    SELECT 'deleted', id FROM deleted
+    """,
+)
+
+# --- runs_history -----------------------------------------------------------
+
+_RUN_HISTORY_COLUMNS = """
+    history_id, run_id, version_number, change_type, datetime_utc,
+    type, distance, duration, source, avg_heart_rate, shoe_id,
+    changed_at, changed_by, change_reason
+"""
+
+INSERT_RUN_HISTORY = _register(
+    "insert_run_history",
+    """
+    INSERT INTO runs_history (
+        run_id, version_number, change_type, datetime_utc, type,
+        distance, duration, source, avg_heart_rate, shoe_id,
+        changed_by, change_reason
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING history_id
+    """,
+)
+
+# Same as INSERT_RUN_HISTORY without RETURNING, for executemany batches.
+INSERT_RUN_HISTORY_BATCH = _register(
+    "insert_run_history_batch",
+    """
+    INSERT INTO runs_history (
+        run_id, version_number, change_type, datetime_utc, type,
+        distance, duration, source, avg_heart_rate, shoe_id,
+        changed_by, change_reason
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+)
+
+# Run data fields compared between consecutive versions by RUN_HISTORY_CHANGES.
+_RUN_HISTORY_DATA_COLUMNS = (
+    "datetime_utc",
+    "type",
+    "distance",
+    "duration",
+    "source",
+    "avg_heart_rate",
+    "shoe_id",
+)
+
+# Newest first, keyset-paginated: `before_version` is the last version_number
+# of the previous page, or NULL for the first page. A NULL limit returns every
+# version. Deleted and unknown runs have no history.
+_RUN_HISTORY_PAGE = """
+    FROM runs_history
+    WHERE run_id = %(run_id)s
+      AND (%(before_version)s::integer IS NULL
+           OR version_number < %(before_version)s)
+      AND EXISTS (
+          SELECT 1 FROM runs WHERE id = %(run_id)s AND deleted_at IS NULL
+      )
+"""
+
+RUN_HISTORY = _register(
+    "run_history",
+    f"""
+    SELECT {_RUN_HISTORY_COLUMNS}
+    {_RUN_HISTORY_PAGE}
+    ORDER BY version_number DESC
+    LIMIT %(limit)s
+    """,
+)
+
+# Each field is included only if it differs from the previous version; the
+# first version includes every field. The window sees every earlier version
+# because WHERE only drops later ones, so diffs are right on any page.
+_RUN_HISTORY_CHANGES = "\n        || ".join(
+    f"""CASE WHEN LAG(version_number) OVER w IS NULL
+                  OR {column} IS DISTINCT FROM LAG({column}) OVER w
+             THEN jsonb_build_object('{column}', {column})
+             ELSE jsonb_build_object() END"""
+    for column in _RUN_HISTORY_DATA_COLUMNS
+)
+
+RUN_HISTORY_CHANGES = _register(
+    "run_history_changes",
+    f"""
+    SELECT history_id, run_id, version_number, change_type,
+           changed_at, changed_by, change_reason,
+           {_RUN_HISTORY_CHANGES} AS changes
+    {_RUN_HISTORY_PAGE}
+    WINDOW w AS (ORDER BY version_number)
+    ORDER BY version_number DESC
+    LIMIT %(limit)s
+    """,
+)
+
+RUN_HISTORY_VERSION = _register(
+    "run_history_version",
+    f"""
+    SELECT {_RUN_HISTORY_COLUMNS}
+    FROM runs_history
+    WHERE run_id = %s AND version_number = %s
+    """,
+)
+
+LATEST_HISTORY_VERSION = _register(
+    "latest_history_version",
+    """
+    SELECT COALESCE(MAX(version_number), 0)
+    FROM runs_history
+    WHERE run_id = %s
+    """,
+)
+
+# Whether runs_history was partitioned by the opt-in partitioning migration.
+RUNS_HISTORY_IS_PARTITIONED = _register(
+    "runs_history_is_partitioned",
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'runs_history'::regclass
+    )
+    """,
+)
+
+RUNS_HISTORY_PARTITIONS = _register(
+    "runs_history_partitions",
+    """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'runs_history'::regclass
+    ORDER BY c.relname
+    """,
+)
+
+# --- shoes ------------------------------------------------------------------
+
+_SHOE_COLUMNS = "id, name, retired_at, notes, retirement_notes, deleted_at"
+
+# (name suffix, predicate) for the shoe listings, keyed by `include_deleted` and
+# by `retired` (None for any, or false; retired shoes are listed by
+# RETIRED_SHOES, most recently retired first).
+_SHOE_DELETED_FILTERS = {
+    False: ("", "deleted_at IS NULL"),
+    True: ("_with_deleted", "TRUE"),
+}
+_SHOE_RETIRED_FILTERS = {
+    None: ("", "TRUE"),
+    False: ("_unretired", "retired_at IS NULL"),
+}
+
+SHOES_BY_NAME = {
+    (deleted, retired): _register(
+        f"shoes_by_name{deleted_suffix}{retired_suffix}",
+        f"""
+        SELECT {_SHOE_COLUMNS}
+        FROM shoes
+        WHERE {deleted_filter}
+          AND {retired_filter}
+        ORDER BY name
+        """,
+    )
+    for deleted, (deleted_suffix, deleted_filter) in _SHOE_DELETED_FILTERS.items()
+    for retired, (retired_suffix, retired_filter) in _SHOE_RETIRED_FILTERS.items()
+}
+
+RETIRED_SHOES = {
+    deleted: _register(
+        f"retired_shoes{deleted_suffix}",
+        f"""
+        SELECT {_SHOE_COLUMNS}
+        FROM shoes
+        WHERE {deleted_filter}
+          AND retired_at IS NOT NULL
+        ORDER BY retired_at DESC
+        """,
+    )
+    for deleted, (deleted_suffix, deleted_filter) in _SHOE_DELETED_FILTERS.items()
+}
+
+SHOE_BY_ID = _register(
+    "shoe_by_id",
+    f"""
+    SELECT {_SHOE_COLUMNS}
+    FROM shoes
+    WHERE id = %s AND deleted_at IS NULL
+    """,
+)
+
+SHOE_BY_ID_INCLUDING_DELETED = _register(
+    "shoe_by_id_including_deleted",
+    f"""
+    SELECT {_SHOE_COLUMNS}
+    FROM shoes
+    WHERE id = %s
+    """,
+)
+
+SHOE_EXISTS = _register(
+    "shoe_exists",
+    "SELECT 1 FROM shoes WHERE id = %s",
+)
+
+INSERT_SHOE = _register(
+    "insert_shoe",
+    """
+    INSERT INTO shoes (id, name, retired_at, notes, retirement_notes, deleted_at)
+    VALUES (%s, %s, NULL, NULL, NULL, NULL)
+    """,
+)
+
+SHOE_IDS_BY_NAMES = _register(
+    "shoe_ids_by_names",
+    """
+    SELECT name, id FROM shoes
+    WHERE name = ANY(%s) AND deleted_at IS NULL
+    """,
+)
+
+RETIRE_SHOE = _register(
+    "retire_shoe",
+    """
+    UPDATE shoes
+    SET retired_at = %s, retirement_notes = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s AND deleted_at IS NULL
+    """,
+)
+
+UNRETIRE_SHOE = _register(
+    "unretire_shoe",
+    """
+    UPDATE shoes
+    SET retired_at = NULL, retirement_notes = NULL, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s AND deleted_at IS NULL
+    """,
+)
+
+_SHOE_MILEAGE_SELECT = """
+    SELECT s.id, s.name, s.retired_at, s.notes, s.retirement_notes, s.deleted_at,
+           SUM(r.distance) AS mileage
+    FROM shoes s
+    JOIN runs r ON r.shoe_id = s.id AND r.deleted_at IS NULL
+"""
+
+ACTIVE_SHOE_MILEAGES = _register(
+    "active_shoe_mileages",
+    f"""
+    {_SHOE_MILEAGE_SELECT}
+    WHERE s.deleted_at IS NULL AND s.retired_at IS NULL
+    GROUP BY s.id
+    ORDER BY s.name
+    """,
+)
+
+ALL_SHOE_MILEAGES = _register(
+    "all_shoe_mileages",
+    f"""
+    {_SHOE_MILEAGE_SELECT}
+    WHERE s.deleted_at IS NULL
+    GROUP BY s.id
+    ORDER BY s.name
+    """,
+)
+
+# --- synced_runs ------------------------------------------------------------
+
+_SYNCED_RUN_COLUMNS = """
+    id, run_id, run_version, google_event_id, synced_at,
+    sync_status, error_message, created_at, updated_at
+"""
+
+SYNCED_RUN_BY_RUN_ID = _register(
+    "synced_run_by_run_id",
+    f"""
+    SELECT {_SYNCED_RUN_COLUMNS}
+    FROM synced_runs
+    WHERE run_id = %s
+    """,
+)
+
+INSERT_SYNCED_RUN = _register(
+    "insert_synced_run",
+    """
+    INSERT INTO synced_runs
+    (run_id, run_version, google_event_id, synced_at, sync_status, error_message, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING id, created_at, updated_at
+    """,
+)
+
+# Insert or replace the sync records for many runs at once, recording each
+# run's current version. Failed syncs have an empty google_event_id.
+UPSERT_SYNCED_RUNS = _register(
+    "upsert_synced_runs",
+    """
+    INSERT INTO synced_runs
+    (run_id, run_version, google_event_id, synced_at, sync_status, error_message, created_at, updated_at)
+    SELECT v.run_id, r.version, v.google_event_id, %(now)s, v.sync_status,
+           v.error_message, %(now)s, %(now)s
+    FROM unnest(
+        %(run_ids)s::text[], %(google_event_ids)s::text[],
+        %(sync_statuses)s::text[], %(error_messages)s::text[]
+    ) AS v(run_id, google_event_id, sync_status, error_message)
+    JOIN runs r ON r.id = v.run_id
+    ON CONFLICT (run_id) DO UPDATE
+    SET run_version = EXCLUDED.run_version,
+        google_event_id = EXCLUDED.google_event_id,
+        synced_at = EXCLUDED.synced_at,
+        sync_status = EXCLUDED.sync_status,
+        error_message = EXCLUDED.error_message,
+        updated_at = EXCLUDED.updated_at
+    """,
+)
+
+# NULL parameters leave the column unchanged. A non-NULL error_message wins over
+# clear_error_message, which otherwise resets the error to NULL.
+UPDATE_SYNCED_RUN = _register(
+    "update_synced_run",
+    f"""
+    UPDATE synced_runs
+    SET run_version = COALESCE(%(run_version)s, run_version),
+        google_event_id = COALESCE(%(google_event_id)s, google_event_id),
+        sync_status = COALESCE(%(sync_status)s, sync_status),
+        error_message = COALESCE(
+            %(error_message)s,
+            CASE WHEN %(clear_error_message)s THEN NULL ELSE error_message END
+        ),
+        updated_at = %(updated_at)s
+    WHERE run_id = %(run_id)s
+    RETURNING {_SYNCED_RUN_COLUMNS}
+    """,
+)
+
+DELETE_SYNCED_RUN = _register(
+    "delete_synced_run",
+    "DELETE FROM synced_runs WHERE run_id = %s",
+)
+
+DELETE_SYNCED_RUNS = _register(
+    "delete_synced_runs",
+    "DELETE FROM synced_runs WHERE run_id = ANY(%(run_ids)s::text[])",
+)
+
+ALL_SYNCED_RUNS = _register(
+    "all_synced_runs",
+    f"""
+    SELECT {_SYNCED_RUN_COLUMNS}
+    FROM synced_runs
+    ORDER BY synced_at DESC
+    """,
+)
+
+FAILED_SYNCED_RUNS = _register(
+    "failed_synced_runs",
+    f"""
+    SELECT {_SYNCED_RUN_COLUMNS}
+    FROM synced_runs
+    WHERE sync_status = 'failed'
+    ORDER BY updated_at DESC
+    """,
+)
+
+# Synced runs whose calendar event is out of date: the run was edited or deleted
+# after it was synced, or its event shows up among %(cancelled_event_ids)s
+# (events deleted in Google). Rows are the run columns followed by the event ID,
+# the run's current version and whether the event was deleted.
+STALE_SYNCED_RUNS = _register(
+    "stale_synced_runs",
+    f"""
+    SELECT {_RUN_COLUMNS}, sr.google_event_id, r.version,
+           sr.google_event_id = ANY(%(cancelled_event_ids)s::text[]) AS event_deleted
+    FROM synced_runs sr
+    JOIN runs r ON r.id = sr.run_id
+    LEFT JOIN shoes s ON r.shoe_id = s.id
+    WHERE sr.sync_status = 'synced'
+      AND (r.version > sr.run_version
+           OR r.deleted_at IS NOT NULL
+           OR sr.google_event_id = ANY(%(cancelled_event_ids)s::text[]))
+    ORDER BY r.datetime_utc
+    """,
+)
+
+# Record that each run's event now matches its version %(run_versions)s[i].
+MARK_SYNCED_RUNS_CURRENT = _register(
+    "mark_synced_runs_current",
+    """
+    UPDATE synced_runs sr
+    SET run_version = v.run_version,
+        synced_at = %(now)s,
+        error_message = NULL,
+        updated_at = %(now)s
+    FROM unnest(%(run_ids)s::text[], %(run_versions)s::int[]) AS v(run_id, run_version)
+    WHERE sr.run_id = v.run_id
+    """,
+)
+
+MARK_SYNCED_RUNS_FAILED = _register(
+    "mark_synced_runs_failed",
+    """
+    UPDATE synced_runs sr
+    SET sync_status = 'failed',
+        error_message = v.error_message,
+        updated_at = %(now)s
+    FROM unnest(%(run_ids)s::text[], %(error_messages)s::text[]) AS v(run_id, error_message)
+    WHERE sr.run_id = v.run_id
+    """,
+)
+
+# --- calendar_sync_state ----------------------------------------------------
+
+CALENDAR_SYNC_STATE = _register(
+    "calendar_sync_state",
+    """
+    SELECT sync_token, reconciled_at
+    FROM calendar_sync_state
+    WHERE calendar_id = %s
+    """,
+)
+
+UPSERT_CALENDAR_SYNC_STATE = _register(
+    "upsert_calendar_sync_state",
+    """
+    INSERT INTO calendar_sync_state (calendar_id, sync_token, reconciled_at, updated_at)
+    VALUES (%(calendar_id)s, %(sync_token)s, %(reconciled_at)s, NOW())
+    ON CONFLICT (calendar_id) DO UPDATE
+    SET sync_token = EXCLUDED.sync_token,
+        reconciled_at = EXCLUDED.reconciled_at,
+        updated_at = NOW()
+    """,
+)
+
+# --- oauth_credentials ------------------------------------------------------
+
+CREDENTIALS_BY_PROVIDER = _register(
+    "credentials_by_provider",
+    """
+    SELECT provider, client_id, client_secret, access_token, refresh_token,
+           expires_at, created_at, updated_at, account_id
+    FROM oauth_credentials
+    WHERE provider = %s
+    """,
+)
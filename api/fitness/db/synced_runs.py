@@ -1,27 +1,44 @@
 """Database access functions for synced runs (Google Calendar sync tracking)."""
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Collection, Dict, List, Optional
 
+from fitness.models import Run
 from fitness.models.sync import SyncedRun, SyncStatus
 from .connection import get_db_cursor
+from .runs import _row_to_run, _validate_db_rows
+from . import statements
+from .statements import execute
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class StaleSyncedRun:
+    """A synced run whose Google Calendar event no longer matches it."""
+
+    run: Run
+    google_event_id: str
+    # The run's current version, which the event should be brought up to.
+    run_version: int
+    # The event was deleted in Google Calendar.
+    event_deleted: bool
+
+
+@dataclass
+class CalendarSyncState:
+    """Where the last calendar reconciliation left off."""
+
+    sync_token: Optional[str]
+    reconciled_at: datetime
+
+
 def get_synced_run(run_id: str) -> Optional[SyncedRun]:
     """Get sync record for a specific run."""
     with get_db_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT id, run_id, run_version, google_event_id, synced_at, 
-                   sync_status, error_message, created_at, updated_at
-            FROM synced_runs
-            WHERE run_id = %s
-        """,
-            (run_id,),
-        )
+        execute(cursor, statements.SYNCED_RUN_BY_RUN_ID, (run_id,))
 
         row = cursor.fetchone()
         if row is None:
@@ -50,13 +67,9 @@ def create_synced_run(
     """Create a new sync record for a run."""
     with get_db_cursor() as cursor:
         now = datetime.now()
-        cursor.execute(
-            """
-            INSERT INTO synced_runs 
-            (run_id, run_version, google_event_id, synced_at, sync_status, error_message, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id, created_at, updated_at
-        """,
+        execute(
+            cursor,
+            statements.INSERT_SYNCED_RUN,
             (
                 run_id,
                 run_version,
@@ -89,6 +102,44 @@ def create_synced_run(
         )
 
 
+def upsert_synced_runs(
+    event_ids: Dict[str, str], error_messages: Dict[str, str]
+) -> int:
+    """Record the outcome of syncing many runs in one statement.
+
+    Existing sync records for the runs are replaced.
+
+    Args:
+        event_ids: Google event ID of each run that synced, keyed by run ID.
+        error_messages: Error of each run that failed to sync, keyed by run ID.
+
+    Returns:
+        The number of sync records written.
+    """
+    run_ids = [*event_ids, *error_messages]
+    if not run_ids:
+        return 0
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.UPSERT_SYNCED_RUNS,
+            {
+                "run_ids": run_ids,
+                "google_event_ids": [*event_ids.values(), *[""] * len(error_messages)],
+                "sync_statuses": ["synced"] * len(event_ids)
+                + ["failed"] * len(error_messages),
+                "error_messages": [None] * len(event_ids)
+                + list(error_messages.values()),
+                "now": datetime.now(),
+            },
+        )
+        count = cursor.rowcount
+    logger.info(
+        f"Recorded sync for {len(event_ids)} runs and {len(error_messages)} failures"
+    )
+    return count
+
+
 def update_synced_run(
     run_id: str,
     run_version: Optional[int] = None,
@@ -98,50 +149,30 @@ def update_synced_run(
     clear_error_message: bool = False,
 ) -> Optional[SyncedRun]:
     """Update an existing sync record."""
+    if (
+        run_version is None
+        and google_event_id is None
+        and sync_status is None
+        and error_message is None
+        and not clear_error_message
+    ):
+        # Nothing to update
+        return get_synced_run(run_id)
+
     with get_db_cursor() as cursor:
-        # Build dynamic UPDATE query based on provided fields
-        update_fields = []
-        params = []
-
-        if run_version is not None:
-            update_fields.append("run_version = %s")
-            params.append(run_version)
-
-        if google_event_id is not None:
-            update_fields.append("google_event_id = %s")
-            params.append(google_event_id)
-
-        if sync_status is not None:
-            update_fields.append("sync_status = %s")
-            params.append(sync_status)
-
-        if error_message is not None:
-            update_fields.append("error_message = %s")
-            params.append(error_message)
-        elif clear_error_message:
-            update_fields.append("error_message = NULL")
-            # No parameter needed for NULL
-
-        if not update_fields:
-            # Nothing to update
-            return get_synced_run(run_id)
-
-        # Always update the updated_at timestamp
-        update_fields.append("updated_at = %s")
-        params.append(datetime.now())
-
-        # Add run_id for WHERE clause
-        params.append(run_id)
-
-        query = f"""
-            UPDATE synced_runs 
-            SET {", ".join(update_fields)}
-            WHERE run_id = %s
-            RETURNING id, run_id, run_version, google_event_id, synced_at, 
-                      sync_status, error_message, created_at, updated_at
-        """
-
-        cursor.execute(query, params)
+        execute(
+            cursor,
+            statements.UPDATE_SYNCED_RUN,
+            {
+                "run_version": run_version,
+                "google_event_id": google_event_id,
+                "sync_status": sync_status,
+                "error_message": error_message,
+                "clear_error_message": clear_error_message,
+                "updated_at": datetime.now(),
+                "run_id": run_id,
+            },
+        )
         row = cursor.fetchone()
 
         if row is None:
@@ -166,7 +197,7 @@ def update_synced_run(
 def delete_synced_run(run_id: str) -> bool:
     """Delete a sync record for a run (when unsyncing from calendar)."""
     with get_db_cursor() as cursor:
-        cursor.execute("DELETE FROM synced_runs WHERE run_id = %s", (run_id,))
+        execute(cursor, statements.DELETE_SYNCED_RUN, (run_id,))
         deleted_count = cursor.rowcount
 
         if deleted_count > 0:
@@ -177,15 +208,25 @@ def delete_synced_run(run_id: str) -> bool:
             return False
 
 
+def delete_synced_runs(run_ids: Collection[str]) -> int:
+    """Delete the sync records of many runs in one statement.
+
+    Returns:
+        The number of sync records deleted.
+    """
+    if not run_ids:
+        return 0
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.DELETE_SYNCED_RUNS, {"run_ids": list(run_ids)})
+        count = cursor.rowcount
+    logger.info(f"Deleted {count} sync records")
+    return count
+
+
 def get_all_synced_runs() -> List[SyncedRun]:
     """Get all sync records."""
     with get_db_cursor() as cursor:
-        cursor.execute("""
-            SELECT id, run_id, run_version, google_event_id, synced_at, 
-                   sync_status, error_message, created_at, updated_at
-            FROM synced_runs
-            ORDER BY synced_at DESC
-        """)
+        execute(cursor, statements.ALL_SYNCED_RUNS)
 
         return [
             SyncedRun(
@@ -212,13 +253,7 @@ def is_run_synced(run_id: str) -> bool:
 def get_failed_syncs() -> List[SyncedRun]:
     """Get all runs with failed sync status for retry."""
     with get_db_cursor() as cursor:
-        cursor.execute("""
-            SELECT id, run_id, run_version, google_event_id, synced_at, 
-                   sync_status, error_message, created_at, updated_at
-            FROM synced_runs
-            WHERE sync_status = 'failed'
-            ORDER BY updated_at DESC
-        """)
+        execute(cursor, statements.FAILED_SYNCED_RUNS)
 
         return [
             SyncedRun(
@@ -234,3 +269,101 @@ def get_failed_syncs() -> List[SyncedRun]:
             )
             for row in cursor.fetchall()
         ]
+
+
+def get_stale_synced_runs(
+    cancelled_event_ids: Collection[str] = (),
+) -> List[StaleSyncedRun]:
+    """Get synced runs whose calendar events need updating.
+
+    Args:
+        cancelled_event_ids: Event IDs Google reports as deleted.
+
+    Returns:
+        Runs edited or deleted since they were synced, plus runs whose event is
+        among `cancelled_event_ids`.
+    """
+    validate = _validate_db_rows()
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.STALE_SYNCED_RUNS,
+            {"cancelled_event_ids": list(cancelled_event_ids)},
+        )
+        return [
+            StaleSyncedRun(
+                run=_row_to_run(row[:10], validate=validate),
+                google_event_id=row[10],
+                run_version=row[11],
+                event_deleted=row[12],
+            )
+            for row in cursor.fetchall()
+        ]
+
+
+def mark_synced_runs_current(run_versions: Dict[str, int]) -> int:
+    """Record that the events for these runs now match the given run versions.
+
+    Returns:
+        The number of sync records updated.
+    """
+    if not run_versions:
+        return 0
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.MARK_SYNCED_RUNS_CURRENT,
+            {
+                "run_ids": list(run_versions),
+                "run_versions": list(run_versions.values()),
+                "now": datetime.now(),
+            },
+        )
+        return cursor.rowcount
+
+
+def mark_synced_runs_failed(error_messages: Dict[str, str]) -> int:
+    """Mark sync records as failed, each with its own error message.
+
+    Returns:
+        The number of sync records updated.
+    """
+    if not error_messages:
+        return 0
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.MARK_SYNCED_RUNS_FAILED,
+            {
+                "run_ids": list(error_messages),
+                "error_messages": list(error_messages.values()),
+                "now": datetime.now(),
+            },
+        )
+        return cursor.rowcount
+
+
+def get_calendar_sync_state(calendar_id: str) -> Optional[CalendarSyncState]:
+    """Get the saved reconciliation state for a calendar, if any."""
+    with get_db_cursor() as cursor:
+        execute(cursor, statements.CALENDAR_SYNC_STATE, (calendar_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return CalendarSyncState(sync_token=row[0], reconciled_at=row[1])
+
+
+def save_calendar_sync_state(
+    calendar_id: str, sync_token: Optional[str], reconciled_at: datetime
+) -> None:
+    """Save where a calendar reconciliation left off."""
+    with get_db_cursor() as cursor:
+        execute(
+            cursor,
+            statements.UPSERT_CALENDAR_SYNC_STATE,
+            {
+                "calendar_id": calendar_id,
+                "sync_token": sync_token,
+                "reconciled_at": reconciled_at,
+            },
+        )
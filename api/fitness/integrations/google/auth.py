@@ -5,7 +5,6 @@ from urllib.parse import urlencode
 from datetime import datetime, timedelta, timezone
 import logging
 
-import httpx
 from fastapi import HTTPException
 from pydantic import BaseModel
 
@@ -52,6 +51,8 @@ async def exchange_code_for_token(code: str) -> GoogleToken:
 
     redirect_uri = f"{PUBLIC_API_BASE_URL}/oauth/google/callback"
 
+    import httpx
+
     async with httpx.AsyncClient(timeout=10) as client:
         response = await client.post(
             "https://oauth2.googleapis.com/token",
@@ -0,0 +1,76 @@
+"""Sync newly imported runs to Google Calendar as part of ingestion.
+
+Opt-in with GOOGLE_CALENDAR_AUTO_SYNC=true. The import endpoints then pass the
+runs they inserted here, which creates their events in batch requests (at most
+GOOGLE_CALENDAR_SYNC_CONCURRENCY in flight) and records every outcome in
+`synced_runs` with one upsert.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from fitness.db.synced_runs import upsert_synced_runs
+from fitness.models import Run
+from .calendar_client import GoogleCalendarClient, get_calendar_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class AutoSyncResult:
+    """How many runs were synced to Google Calendar and how many failed."""
+
+    synced: int
+    failed: int
+
+
+def auto_sync_enabled() -> bool:
+    """Whether imported runs should be synced to Google Calendar automatically."""
+    return os.environ.get("GOOGLE_CALENDAR_AUTO_SYNC", "").lower() in ("1", "true")
+
+
+def sync_new_runs(
+    runs: Sequence[Run], client: Optional[GoogleCalendarClient] = None
+) -> Optional[AutoSyncResult]:
+    """Create calendar events for newly inserted runs and record the outcomes.
+
+    Args:
+        runs: Runs that were just inserted.
+        client: Client to use. Defaults to the shared client.
+
+    Returns:
+        Counts of synced and failed runs, or None if Google Calendar isn't
+        authorized (the import itself is not affected).
+    """
+    if not runs:
+        return AutoSyncResult(synced=0, failed=0)
+
+    try:
+        client = client or get_calendar_client()
+    except ValueError as e:
+        logger.warning(f"Skipping Google Calendar auto-sync: {e}")
+        return None
+
+    concurrency = int(
+        os.environ.get("GOOGLE_CALENDAR_SYNC_CONCURRENCY", DEFAULT_CONCURRENCY)
+    )
+    results = client.create_workout_events(runs, max_concurrency=concurrency)
+
+    event_ids: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    for run_id, result in results.items():
+        if result.success and result.event_id:
+            event_ids[run_id] = result.event_id
+        else:
+            errors[run_id] = f"Failed to create Google Calendar event: {result.error}"
+    upsert_synced_runs(event_ids, errors)
+
+    logger.info(
+        f"Auto-synced {len(event_ids)} new runs to Google Calendar, "
+        f"{len(errors)} failed"
+    )
+    return AutoSyncResult(synced=len(event_ids), failed=len(errors))
@@ -1,22 +1,141 @@
 """Google Calendar API client for syncing workout events."""
 
+from __future__ import annotations
+
+import email
+import email.policy
+import json
 import os
 import logging
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, NamedTuple, Optional, Dict, Any, Sequence
+from urllib.parse import urlsplit
 
-import httpx
 from fitness.models.run import Run
 from fitness.db.oauth_credentials import get_credentials, update_access_token
+from fitness.integrations.http_client import (
+    GOOGLE,
+    HttpClient,
+    close_client,
+    get_client,
+)
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
+# Google rejects batch requests with more calls than this.
+BATCH_SIZE = 50
+
+_calendar_client: "GoogleCalendarClient | None" = None
+_calendar_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client for Google APIs.
+
+    It pools connections, paces requests to Google's quota and retries
+    throttled ones; see `fitness.integrations.http_client`.
+    """
+    return get_client(GOOGLE)
+
+
+def get_calendar_client() -> "GoogleCalendarClient":
+    """Get the process-wide Google Calendar client.
+
+    Credentials are loaded from the database on first use and then kept in
+    memory; the access token is refreshed when it expires rather than re-read.
+
+    Raises:
+        ValueError: If the credentials are missing or incomplete.
+    """
+    global _calendar_client
+    with _calendar_client_lock:
+        if _calendar_client is None:
+            _calendar_client = GoogleCalendarClient()
+        return _calendar_client
+
+
+def reset_calendar_client() -> None:
+    """Forget the cached credentials so the next client re-reads the database.
+
+    Call after storing new credentials (e.g. from the OAuth callback).
+    """
+    global _calendar_client
+    with _calendar_client_lock:
+        _calendar_client = None
+
+
+def close_calendar_client() -> None:
+    """Forget the cached client and close its pooled connections."""
+    reset_calendar_client()
+    close_client(GOOGLE)
+
+
+@dataclass
+class EventResult:
+    """Outcome of one event operation in a batch request."""
+
+    event_id: Optional[str]
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class EventChanges:
+    """Events changed since a sync token or time, from events.list."""
+
+    # Only "id" and "status" are fetched; deleted events have status "cancelled".
+    events: list[Dict[str, Any]]
+    # Pass to the next list_changed_events() call; None if Google gave none.
+    next_sync_token: Optional[str]
+
+
+class SyncTokenExpiredError(Exception):
+    """Google no longer accepts the sync token; list by time instead."""
+
+
+class _BatchCall(NamedTuple):
+    method: str
+    # Relative to the client's base_url, e.g. "/calendars/primary/events".
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+class _PartResponse(NamedTuple):
+    # 0 if the call got no response of its own.
+    status_code: int
+    # Parsed JSON, raw text, or None for an empty body.
+    body: Any
+
 
 class GoogleCalendarClient:
-    """Client for interacting with Google Calendar API."""
+    """Client for interacting with Google Calendar API.
+
+    Use `get_calendar_client()` to share one instance (and its cached
+    credentials) across requests.
+    """
+
+    def __init__(self, http_client: HttpClient | None = None):
+        """Initialize the client with credentials from database.
+
+        Args:
+            http_client: Client to send requests with. Defaults to the shared
+                client from `get_http_client()`.
+        """
+        self._http_client = http_client
+        # Serializes token refreshes across threads sharing this client.
+        self._refresh_lock = threading.Lock()
 
-    def __init__(self):
-        """Initialize the client with credentials from database."""
         db_creds = get_credentials("google")
 
         if not db_creds:
@@ -41,9 +160,16 @@ class GoogleCalendarClient:
             )
 
         self.base_url = "https://www.googleapis.com/calendar/v3"
+        self.batch_url = "https://www.googleapis.com/batch/calendar/v3"
+        self.token_url = "https://oauth2.googleapis.com/token"
         # Allow selecting a specific calendar; default to primary.
         self.calendar_id = os.getenv("GOOGLE_CALENDAR_ID") or "primary"
 
+    @property
+    def http(self) -> HttpClient:
+        """The HTTP client requests are sent with."""
+        return self._http_client or get_http_client()
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
         return {
@@ -78,90 +204,89 @@ class GoogleCalendarClient:
             Raises ValueError if refresh token is revoked/expired (invalid_grant error).
         """
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    "https://oauth2.googleapis.com/token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "refresh_token": self.refresh_token,
-                        "grant_type": "refresh_token",
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-
-                if response.status_code == 200:
-                    token_data = response.json()
-                    new_access_token = token_data["access_token"]
+            response = self.http.post(
+                self.token_url,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "refresh_token": self.refresh_token,
+                    "grant_type": "refresh_token",
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
 
-                    # Extract expiration time from expires_in (seconds)
-                    expires_at = None
-                    if "expires_in" in token_data:
-                        expires_in_seconds = token_data["expires_in"]
-                        expires_at = datetime.now(timezone.utc) + timedelta(
-                            seconds=expires_in_seconds
-                        )
+            if response.status_code == 200:
+                token_data = response.json()
+                new_access_token = token_data["access_token"]
 
-                    # Google may return a new refresh token
-                    new_refresh_token = token_data.get("refresh_token")
-
-                    # Update in-memory tokens
-                    self.access_token = new_access_token
-                    if new_refresh_token:
-                        self.refresh_token = new_refresh_token
-                        logger.info("Google provided a new refresh token")
-                    if expires_at:
-                        self.expires_at = expires_at
-
-                    # Persist to database
-                    try:
-                        update_access_token(
-                            "google",
-                            new_access_token,
-                            expires_at=expires_at,
-                            refresh_token=new_refresh_token,
-                        )
-                        logger.info(
-                            "Successfully refreshed Google access token and persisted to database"
-                        )
-                    except Exception as db_error:
-                        logger.error(
-                            f"Failed to persist refreshed token to database: {db_error}"
-                        )
-                        logger.warning(
-                            "Token refreshed in memory but not persisted - may need to refresh again on restart"
-                        )
+                # Extract expiration time from expires_in (seconds)
+                expires_at = None
+                if "expires_in" in token_data:
+                    expires_in_seconds = token_data["expires_in"]
+                    expires_at = datetime.now(timezone.utc) + timedelta(
+                        seconds=expires_in_seconds
+                    )
 
-                    return True
-                else:
-                    error_text = response.text
-                    error_data = {}
-                    try:
-                        error_data = response.json()
-                    except Exception as json_error:
-                        # Failed to parse error response as JSON; proceed with empty error_data.
-                        logger.warning(
-                            f"Failed to parse error response as JSON: {json_error}"
-                        )
+                # Google may return a new refresh token
+                new_refresh_token = token_data.get("refresh_token")
+
+                # Update in-memory tokens
+                self.access_token = new_access_token
+                if new_refresh_token:
+                    self.refresh_token = new_refresh_token
+                    logger.info("Google provided a new refresh token")
+                if expires_at:
+                    self.expires_at = expires_at
+
+                # Persist to database
+                try:
+                    update_access_token(
+                        "google",
+                        new_access_token,
+                        expires_at=expires_at,
+                        refresh_token=new_refresh_token,
+                    )
+                    logger.info(
+                        "Successfully refreshed Google access token and persisted to database"
+                    )
+                except Exception as db_error:
+                    logger.error(
+                        f"Failed to persist refreshed token to database: {db_error}"
+                    )
+                    logger.warning(
+                        "Token refreshed in memory but not persisted - may need to refresh again on restart"
+                    )
 
-                    # Check for revoked/expired refresh token
-                    if (
-                        response.status_code == 400
-                        and error_data.get("error") == "invalid_grant"
-                    ):
-                        logger.error(
-                            f"Refresh token has been expired or revoked. "
-                            f"Re-authorization required. Error: {error_text}"
-                        )
-                        # Raise a specific exception that callers can catch
-                        raise ValueError(
-                            "Refresh token expired or revoked. Re-authorization required."
-                        )
+                return True
+            else:
+                error_text = response.text
+                error_data = {}
+                try:
+                    error_data = response.json()
+                except Exception as json_error:
+                    # Failed to parse error response as JSON; proceed with empty error_data.
+                    logger.warning(
+                        f"Failed to parse error response as JSON: {json_error}"
+                    )
 
+                # Check for revoked/expired refresh token
+                if (
+                    response.status_code == 400
+                    and error_data.get("error") == "invalid_grant"
+                ):
                     logger.error(
-                        f"Failed to refresh token: {response.status_code} - {error_text}"
+                        f"Refresh token has been expired or revoked. "
+                        f"Re-authorization required. Error: {error_text}"
+                    )
+                    # Raise a specific exception that callers can catch
+                    raise ValueError(
+                        "Refresh token expired or revoked. Re-authorization required."
                     )
-                    return False
+
+                logger.error(
+                    f"Failed to refresh token: {response.status_code} - {error_text}"
+                )
+                return False
 
         except ValueError:
             # Re-raise ValueError (invalid_grant) so callers can handle it
@@ -170,6 +295,36 @@ class GoogleCalendarClient:
             logger.error(f"Error refreshing access token: {e}")
             return False
 
+    def _refresh_if_stale(self, rejected_token: str | None = None) -> bool:
+        """Refresh the access token unless another caller already has.
+
+        Refreshes are single-flight: concurrent callers queue on a lock, the
+        first one refreshes, and the rest find a new token and return without
+        contacting Google again.
+
+        Args:
+            rejected_token: The token a request was just rejected with (401).
+                If omitted, refresh only when the token is about to expire.
+
+        Returns:
+            True if a fresh token is available, False if the refresh failed.
+            Raises ValueError if refresh token is revoked/expired (invalid_grant error).
+        """
+        with self._refresh_lock:
+            if rejected_token is not None:
+                if self.access_token != rejected_token:
+                    return True
+            elif not self.needs_token_refresh():
+                return True
+
+            try:
+                return self._refresh_access_token()
+            except ValueError:
+                # The stored credentials may since have been replaced by a new
+                # authorization; make the next client re-read them.
+                reset_calendar_client()
+                raise
+
     def _make_request(
         self, method: str, url: str, **kwargs
     ) -> Optional[httpx.Response]:
@@ -180,7 +335,7 @@ class GoogleCalendarClient:
                 "Access token expired or about to expire, refreshing proactively..."
             )
             try:
-                if not self._refresh_access_token():
+                if not self._refresh_if_stale():
                     logger.error("Failed to refresh token proactively")
                     # Continue anyway - might still work, or will get 401
             except ValueError as e:
@@ -188,46 +343,170 @@ class GoogleCalendarClient:
                 logger.error(f"Cannot refresh token: {e}")
                 return None
 
-        headers = self._get_headers()
-        kwargs.setdefault("headers", {}).update(headers)
+        token = self.access_token
+        # Headers passed by the caller (e.g. a multipart Content-Type) win.
+        extra_headers = kwargs.pop("headers", {})
 
         try:
-            with httpx.Client() as client:
-                response = client.request(method, url, **kwargs)
-
-                # If unauthorized, try to refresh token and retry once
-                if response.status_code == 401:
-                    logger.info("Received 401, refreshing token...")
-                    try:
-                        if self._refresh_access_token():
-                            # Update headers with new token and retry
-                            kwargs["headers"].update(self._get_headers())
-                            response = client.request(method, url, **kwargs)
-                        else:
-                            logger.error(
-                                "Failed to refresh token, cannot retry request"
-                            )
-                            return response
-                    except ValueError as e:
-                        # Refresh token is revoked/expired - cannot retry
-                        logger.error(f"Cannot refresh token: {e}")
-                        return None
-
-                return response
+            response = self.http.request(
+                method, url, headers={**self._get_headers(), **extra_headers}, **kwargs
+            )
+
+            # If unauthorized, try to refresh token and retry once
+            if response.status_code == 401:
+                logger.info("Received 401, refreshing token...")
+                try:
+                    if self._refresh_if_stale(rejected_token=token):
+                        # Retry with the new token
+                        response = self.http.request(
+                            method,
+                            url,
+                            headers={**self._get_headers(), **extra_headers},
+                            **kwargs,
+                        )
+                    else:
+                        logger.error("Failed to refresh token, cannot retry request")
+                        return response
+                except ValueError as e:
+                    # Refresh token is revoked/expired - cannot retry
+                    logger.error(f"Cannot refresh token: {e}")
+                    return None
+
+            return response
 
         except Exception as e:
             logger.error(f"Error making request to {url}: {e}")
             return None
 
-    def create_workout_event(self, run: Run) -> Optional[str]:
-        """Create a calendar event for a workout run.
+    def _batch(
+        self, calls: Sequence[_BatchCall], max_concurrency: int = 1
+    ) -> list[_PartResponse]:
+        """Send calls as batch requests of up to BATCH_SIZE calls each.
 
         Args:
-            run: The Run object to create an event for.
+            calls: The calls to make.
+            max_concurrency: How many batch requests may be in flight at once.
 
         Returns:
-            Google Calendar event ID if successful, None otherwise.
+            One response per call, in the order of `calls`.
+        """
+        chunks = [
+            calls[start : start + BATCH_SIZE]
+            for start in range(0, len(calls), BATCH_SIZE)
+        ]
+        if max_concurrency <= 1 or len(chunks) <= 1:
+            chunk_responses = [self._send_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(chunks))
+            ) as executor:
+                chunk_responses = list(executor.map(self._send_chunk, chunks))
+        return [response for chunk in chunk_responses for response in chunk]
+
+    def _send_chunk(self, chunk: Sequence[_BatchCall]) -> list[_PartResponse]:
+        """Send one batch request, retrying calls rejected with an expired token."""
+        token = self.access_token
+        responses = self._send_batch(chunk)
+
+        # Each call is authorized separately, so an expired token shows up
+        # as 401s inside an otherwise successful batch.
+        unauthorized = [
+            i for i, response in enumerate(responses) if response.status_code == 401
+        ]
+        if unauthorized:
+            logger.info("Batch calls got 401, refreshing token...")
+            try:
+                refreshed = self._refresh_if_stale(rejected_token=token)
+            except ValueError as e:
+                logger.error(f"Cannot refresh token: {e}")
+                refreshed = False
+            if refreshed:
+                retried = self._send_batch([chunk[i] for i in unauthorized])
+                for i, response in zip(unauthorized, retried):
+                    responses[i] = response
+        return responses
+
+    def _send_batch(self, calls: Sequence[_BatchCall]) -> list[_PartResponse]:
+        """Send one multipart/mixed batch request and split its response."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        api_path = urlsplit(self.base_url).path
+        parts = []
+        for i, call in enumerate(calls):
+            request = f"{call.method} {api_path}{call.path} HTTP/1.1\r\n"
+            if call.body is not None:
+                request += "Content-Type: application/json\r\n\r\n"
+                request += json.dumps(call.body)
+            else:
+                request += "\r\n"
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{i}>\r\n\r\n"
+                f"{request}\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+
+        response = self._make_request(
+            "POST",
+            self.batch_url,
+            content=body.encode(),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        if response is None:
+            return [_PartResponse(0, "No response")] * len(calls)
+        if response.status_code != 200:
+            return [_PartResponse(response.status_code, response.text)] * len(calls)
+        return self._parse_batch_response(response, len(calls))
+
+    @staticmethod
+    def _parse_batch_response(
+        response: httpx.Response, num_calls: int
+    ) -> list[_PartResponse]:
+        """Match the parts of a batch response to calls by their Content-ID.
+
+        Google does not guarantee that parts come back in request order.
         """
+        message = email.message_from_bytes(
+            f"Content-Type: {response.headers.get('content-type', '')}\r\n\r\n".encode()
+            + response.content,
+            policy=email.policy.HTTP,
+        )
+        responses = [_PartResponse(0, "No response for this call")] * num_calls
+        if not message.is_multipart():
+            return responses
+
+        for part in message.iter_parts():
+            match = re.fullmatch(
+                r"<response-item-(\d+)>", str(part.get("Content-ID", "")).strip()
+            )
+            if match is None or int(match.group(1)) >= num_calls:
+                continue
+
+            payload = part.get_payload(decode=True) or b""
+            http_response = payload.decode().replace("\r\n", "\n")
+            head, _, part_body = http_response.partition("\n\n")
+            try:
+                status_code = int(head.split(maxsplit=2)[1])
+            except (IndexError, ValueError):
+                continue
+            try:
+                parsed_body = json.loads(part_body) if part_body.strip() else None
+            except ValueError:
+                parsed_body = part_body
+            responses[int(match.group(1))] = _PartResponse(status_code, parsed_body)
+        return responses
+
+    @staticmethod
+    def _batch_error(response: _PartResponse) -> str:
+        body = response.body
+        text = body if isinstance(body, str) else json.dumps(body)
+        if response.status_code == 0:
+            return text
+        return f"{response.status_code} - {text}"
+
+    @staticmethod
+    def _event_data(run: Run) -> Dict[str, Any]:
+        """Build the Calendar event body for a run."""
         # Format the event title
         distance_str = f"{run.distance:.1f}" if run.distance else "0.0"
         event_title = f"{distance_str} Mile {run.type or 'Run'}"
@@ -241,7 +520,7 @@ class GoogleCalendarClient:
             duration_seconds = 0
         end_dt_utc = start_dt_utc + timedelta(seconds=duration_seconds)
 
-        event_data = {
+        return {
             "summary": event_title,
             "description": f"Workout synced from fitness app\nRun ID: {run.id}",
             "start": {
@@ -253,6 +532,17 @@ class GoogleCalendarClient:
             },
         }
 
+    def create_workout_event(self, run: Run) -> Optional[str]:
+        """Create a calendar event for a workout run.
+
+        Args:
+            run: The Run object to create an event for.
+
+        Returns:
+            Google Calendar event ID if successful, None otherwise.
+        """
+        event_data = self._event_data(run)
+
         url = f"{self.base_url}/calendars/{self.calendar_id}/events"
         response = self._make_request("POST", url, json=event_data)
 
@@ -306,3 +596,144 @@ class GoogleCalendarClient:
             error_msg = response.text if response else "No response"
             logger.error(f"Failed to get calendar event {event_id}: {error_msg}")
             return None
+
+    def create_workout_events(
+        self, runs: Sequence[Run], max_concurrency: int = 1
+    ) -> Dict[str, EventResult]:
+        """Create calendar events for many runs using batch requests.
+
+        Args:
+            runs: The runs to create events for.
+            max_concurrency: How many batch requests may be in flight at once.
+
+        Returns:
+            Result for each run, keyed by run ID. Failed runs have an error and
+            no event ID; the other runs are unaffected.
+        """
+        path = f"/calendars/{self.calendar_id}/events"
+        calls = [_BatchCall("POST", path, self._event_data(run)) for run in runs]
+
+        results: Dict[str, EventResult] = {}
+        for run, response in zip(runs, self._batch(calls, max_concurrency)):
+            event_id = (
+                response.body.get("id") if isinstance(response.body, dict) else None
+            )
+            if 200 <= response.status_code < 300 and event_id:
+                results[run.id] = EventResult(event_id=event_id)
+            else:
+                error = self._batch_error(response)
+                logger.error(
+                    f"Failed to create calendar event for run {run.id}: {error}"
+                )
+                results[run.id] = EventResult(event_id=None, error=error)
+
+        created = sum(result.success for result in results.values())
+        logger.info(f"Created {created} of {len(runs)} calendar events in batch")
+        return results
+
+    def delete_workout_events(self, event_ids: Sequence[str]) -> Dict[str, EventResult]:
+        """Delete many calendar events using batch requests.
+
+        Args:
+            event_ids: Google Calendar event IDs to delete.
+
+        Returns:
+            Result for each event, keyed by event ID.
+        """
+        calls = [
+            _BatchCall("DELETE", f"/calendars/{self.calendar_id}/events/{event_id}")
+            for event_id in event_ids
+        ]
+
+        results: Dict[str, EventResult] = {}
+        for event_id, response in zip(event_ids, self._batch(calls)):
+            if response.status_code == 204:
+                results[event_id] = EventResult(event_id=event_id)
+            else:
+                error = self._batch_error(response)
+                logger.error(f"Failed to delete calendar event {event_id}: {error}")
+                results[event_id] = EventResult(event_id=event_id, error=error)
+
+        deleted = sum(result.success for result in results.values())
+        logger.info(f"Deleted {deleted} of {len(event_ids)} calendar events in batch")
+        return results
+
+    def update_workout_events(self, runs: Dict[str, Run]) -> Dict[str, EventResult]:
+        """Update existing calendar events to match their runs using batch requests.
+
+        Args:
+            runs: The run each event should show, keyed by event ID.
+
+        Returns:
+            Result for each event, keyed by event ID.
+        """
+        calls = [
+            _BatchCall(
+                "PATCH",
+                f"/calendars/{self.calendar_id}/events/{event_id}",
+                self._event_data(run),
+            )
+            for event_id, run in runs.items()
+        ]
+
+        results: Dict[str, EventResult] = {}
+        for event_id, response in zip(runs, self._batch(calls)):
+            if 200 <= response.status_code < 300:
+                results[event_id] = EventResult(event_id=event_id)
+            else:
+                error = self._batch_error(response)
+                logger.error(f"Failed to update calendar event {event_id}: {error}")
+                results[event_id] = EventResult(event_id=event_id, error=error)
+        return results
+
+    def list_changed_events(
+        self,
+        sync_token: Optional[str] = None,
+        updated_min: Optional[datetime] = None,
+    ) -> Optional[EventChanges]:
+        """List events changed since a sync token or time, including deleted ones.
+
+        With neither argument every event is listed. Only the event IDs and
+        statuses are fetched.
+
+        Args:
+            sync_token: next_sync_token from a previous call.
+            updated_min: List events modified at or after this time (naive
+                datetimes are UTC). Ignored if `sync_token` is given.
+
+        Returns:
+            The changed events, or None if a request failed.
+
+        Raises:
+            SyncTokenExpiredError: If Google rejects the sync token (410 Gone).
+        """
+        url = f"{self.base_url}/calendars/{self.calendar_id}/events"
+        params: Dict[str, str] = {
+            "showDeleted": "true",
+            "maxResults": "2500",
+            "fields": "items(id,status),nextPageToken,nextSyncToken",
+        }
+        if sync_token is not None:
+            params["syncToken"] = sync_token
+        elif updated_min is not None:
+            if updated_min.tzinfo is None:
+                updated_min = updated_min.replace(tzinfo=timezone.utc)
+            params["updatedMin"] = updated_min.isoformat()
+
+        events: list[Dict[str, Any]] = []
+        while True:
+            response = self._make_request("GET", url, params=params)
+            if response is not None and response.status_code == 410:
+                raise SyncTokenExpiredError("Google Calendar sync token expired")
+            if response is None or response.status_code != 200:
+                error_msg = response.text if response is not None else "No response"
+                logger.error(f"Failed to list changed calendar events: {error_msg}")
+                return None
+
+            page = response.json()
+            events.extend(page.get("items", []))
+            if "nextPageToken" not in page:
+                return EventChanges(
+                    events=events, next_sync_token=page.get("nextSyncToken")
+                )
+            params["pageToken"] = page["nextPageToken"]
@@ -0,0 +1,149 @@
+"""Bring Google Calendar events up to date with the runs they were synced from.
+
+Instead of fetching every synced event, reconciliation asks Google only for the
+events changed since the last pass (`events.list` with the saved sync token, or
+`updatedMin` when there is none) and finds edited runs with one query comparing
+`runs.version` to `synced_runs.run_version`. Only those events are touched:
+
+- Events whose run was edited are patched in batch requests.
+- Events whose run was deleted are deleted in batch requests, and the runs'
+  sync records with them.
+- Runs whose event was deleted in Google are marked failed, so they show up in
+  /sync/runs/failed and can be synced again.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from fitness.db.synced_runs import (
+    delete_synced_runs,
+    get_calendar_sync_state,
+    get_stale_synced_runs,
+    mark_synced_runs_current,
+    mark_synced_runs_failed,
+    save_calendar_sync_state,
+)
+from .calendar_client import (
+    EventChanges,
+    GoogleCalendarClient,
+    SyncTokenExpiredError,
+    get_calendar_client,
+)
+
+logger = logging.getLogger(__name__)
+
+DELETED_IN_CALENDAR = "Event was deleted in Google Calendar"
+
+
+@dataclass
+class ReconcileResult:
+    """What a reconciliation pass found and changed."""
+
+    # Events Google reported as changed since the last pass.
+    changed_events: int
+    # Events patched to match an edited run.
+    updated: int
+    # Runs marked failed because their event was deleted in Google.
+    deleted_in_calendar: int
+    # Deleted runs whose event was removed and sync record dropped.
+    removed: int
+    # Events that could not be patched or removed; their runs are marked failed.
+    failed: int
+    # Whether all events were listed, as on the first pass.
+    full_sync: bool
+
+
+def reconcile_calendar(
+    client: Optional[GoogleCalendarClient] = None,
+) -> ReconcileResult:
+    """Patch events of edited runs, remove deleted runs' events, flag events deleted in Google.
+
+    Args:
+        client: Client to use. Defaults to the shared client.
+
+    Raises:
+        ValueError: If Google Calendar credentials are missing.
+        RuntimeError: If the changed events could not be listed.
+    """
+    client = client or get_calendar_client()
+    started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    changes, full_sync = _list_changes(client)
+
+    cancelled = {
+        event["id"] for event in changes.events if event.get("status") == "cancelled"
+    }
+    stale = get_stale_synced_runs(cancelled)
+    to_update = {
+        s.google_event_id: s
+        for s in stale
+        if not s.event_deleted and not s.run.is_deleted
+    }
+    to_remove = {
+        s.google_event_id: s for s in stale if not s.event_deleted and s.run.is_deleted
+    }
+    results = client.update_workout_events(
+        {event_id: s.run for event_id, s in to_update.items()}
+    )
+    removal_results = client.delete_workout_events(list(to_remove))
+
+    current: Dict[str, int] = {}
+    errors: Dict[str, str] = {}
+    for event_id, stale_run in to_update.items():
+        result = results[event_id]
+        if result.success:
+            current[stale_run.run.id] = stale_run.run_version
+        else:
+            errors[stale_run.run.id] = (
+                f"Failed to update Google Calendar event: {result.error}"
+            )
+    # A deleted run whose event is already gone only needs its sync record dropped.
+    removed = [s.run.id for s in stale if s.event_deleted and s.run.is_deleted]
+    for event_id, stale_run in to_remove.items():
+        result = removal_results[event_id]
+        if result.success:
+            removed.append(stale_run.run.id)
+        else:
+            errors[stale_run.run.id] = (
+                f"Failed to delete Google Calendar event: {result.error}"
+            )
+    failed = len(errors)
+    deleted = [s.run.id for s in stale if s.event_deleted and not s.run.is_deleted]
+    errors.update(dict.fromkeys(deleted, DELETED_IN_CALENDAR))
+
+    mark_synced_runs_current(current)
+    mark_synced_runs_failed(errors)
+    delete_synced_runs(removed)
+    save_calendar_sync_state(client.calendar_id, changes.next_sync_token, started_at)
+
+    result = ReconcileResult(
+        changed_events=len(changes.events),
+        updated=len(current),
+        deleted_in_calendar=len(deleted),
+        removed=len(removed),
+        failed=failed,
+        full_sync=full_sync,
+    )
+    logger.info(f"Reconciled Google Calendar: {result}")
+    return result
+
+
+def _list_changes(client: GoogleCalendarClient) -> tuple[EventChanges, bool]:
+    """List events changed since the last pass, and whether that was a full listing."""
+    state = get_calendar_sync_state(client.calendar_id)
+    if state is None:
+        changes = client.list_changed_events()
+    else:
+        try:
+            # Falls back to updated_min when there is no sync token.
+            changes = client.list_changed_events(
+                sync_token=state.sync_token, updated_min=state.reconciled_at
+            )
+        except SyncTokenExpiredError:
+            logger.info("Sync token expired, listing events updated since last pass")
+            changes = client.list_changed_events(updated_min=state.reconciled_at)
+
+    if changes is None:
+        raise RuntimeError("Failed to list changed Google Calendar events")
+    return changes, state is None
@@ -0,0 +1,457 @@
+"""Outbound HTTP shared by the Strava and Google integrations.
+
+Each provider gets one pooled `HttpClient` per process (see `get_client()`).
+Requests are paced by a token bucket sized to the provider's quota, and 429s and
+5xx responses are retried with jittered exponential backoff, as are the 403s
+Google Calendar throttles with. A `Retry-After` header, or a quota the provider
+reports as used up (Strava's `X-RateLimit-*` headers), pauses every request to
+that provider until it resets. Request counts,
+retries and latencies are kept per provider; see `http_stats()`.
+
+httpx is imported when the first client is built rather than with this module,
+so importing the app doesn't pay for it.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: the provider is throttling us or briefly unwell.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# These mean the request wasn't processed, so any method may be retried. After
+# the other statuses it may have been, so only idempotent requests are retried.
+_UNPROCESSED_STATUSES = frozenset({429, 503})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Number of recent request latencies kept for percentiles.
+_LATENCY_WINDOW = 1000
+
+
+class RateLimitedError(Exception):
+    """The provider's rate limit allows no request for longer than we wait."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(
+            f"{provider} rate limit reached; retry in {math.ceil(retry_after)}s"
+        )
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class ProviderPolicy:
+    """How requests to one provider are paced, timed out and retried."""
+
+    name: str
+    # Sustained requests per second, and how many may go out at once after idling.
+    rate: float
+    burst: int
+    timeout: float = 10.0
+    max_retries: int = 3
+    # The wait before retry n is random in [0, min(max_backoff, backoff * 2**n)].
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    # Longest to wait for the rate limit before raising RateLimitedError.
+    max_wait: float = 60.0
+    http2: bool = False
+    # Seconds until the provider accepts requests again, if a response says its
+    # quota is used up; None otherwise.
+    quota_reset: Optional[Callable[[httpx.Response], Optional[float]]] = None
+    # Whether a response other than a 429 means the provider is throttling us.
+    # Such responses are retried like 429s.
+    throttled: Optional[Callable[[httpx.Response], bool]] = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second.
+
+    `reserve()` takes a token even if none is left yet, and returns how long the
+    caller must wait before using it, so waiting callers are served in order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float = math.inf) -> float:
+        """Take a token and return the seconds to wait before using it.
+
+        If the wait would be longer than `max_wait`, no token is taken.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            wait = max(0.0, self._paused_until - now, (1 - self._tokens) / self.rate)
+            if wait <= max_wait:
+                self._tokens -= 1
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class ProviderStats:
+    """Request, retry and latency counts for one provider."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Attempts sent, including retries.
+        self.requests = 0
+        self.retries = 0
+        # Throttled responses received: 429s, and any the policy recognizes.
+        self.throttled = 0
+        # Requests that still failed (error status or exception) after retrying.
+        self.failures = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def record_attempt(self, seconds: float, throttled: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(seconds)
+            if throttled:
+                self.throttled += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts so far, and latency percentiles of recent requests in ms."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "failures": self.failures,
+            }
+        if not latencies:
+            return {**counts, "latency_ms": None}
+
+        def percentile(p: float) -> float:
+            return round(latencies[int(p * (len(latencies) - 1))] * 1000, 1)
+
+        return {
+            **counts,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": percentile(1.0),
+            },
+        }
+
+
+class HttpClient:
+    """Pooled, rate-limited, retrying HTTP client for one provider.
+
+    Has the `request`/`get`/`post` interface of `httpx.Client`. Once retries are
+    used up the last response is returned whatever its status, and transport
+    errors are raised, so callers handle failures as they would with httpx.
+
+    Raises:
+        RateLimitedError: From any request, if the provider's rate limit would
+            hold it for longer than the policy's `max_wait`.
+    """
+
+    def __init__(self, policy: ProviderPolicy, client: Optional[httpx.Client] = None):
+        """Create a client for a provider.
+
+        Args:
+            policy: The provider's pacing, timeout and retry settings.
+            client: Client to send requests with. Defaults to a new pooled one.
+        """
+        import httpx
+
+        self.policy = policy
+        self.client = client or httpx.Client(
+            http2=policy.http2,
+            timeout=policy.timeout,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=60,
+            ),
+        )
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self.stats = ProviderStats()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
+
+    def close(self) -> None:
+        self.client.close()
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying throttled and failed attempts."""
+        import httpx
+
+        policy = self.policy
+        idempotent = method.upper() in _IDEMPOTENT_METHODS
+        # Other methods are only retried after transport errors raised before
+        # the request was sent.
+        retryable_errors = (
+            httpx.TransportError
+            if idempotent
+            else (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        )
+
+        attempt = 0
+        while True:
+            last_attempt = attempt == policy.max_retries
+            self._wait_for_capacity()
+            start = time.monotonic()
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except retryable_errors as e:
+                self.stats.record_attempt(time.monotonic() - start)
+                if last_attempt:
+                    self.stats.record_failure()
+                    raise
+                logger.warning(
+                    f"{policy.name} {method} {url} failed "
+                    f"({type(e).__name__}: {e}), retrying"
+                )
+            except httpx.HTTPError:
+                self.stats.record_attempt(time.monotonic() - start)
+                self.stats.record_failure()
+                raise
+            else:
+                elapsed = time.monotonic() - start
+                throttled = self._is_throttled(response)
+                self.stats.record_attempt(elapsed, throttled)
+                logger.debug(
+                    f"{policy.name} {method} {url} -> {response.status_code} "
+                    f"in {elapsed * 1000:.0f}ms"
+                )
+                self._observe_limits(response, throttled)
+
+                status = response.status_code
+                retryable = (
+                    throttled
+                    or status in _UNPROCESSED_STATUSES
+                    or (status in RETRY_STATUSES and idempotent)
+                )
+                if not retryable or last_attempt:
+                    if status >= 400:
+                        self.stats.record_failure()
+                    return response
+                logger.warning(
+                    f"{policy.name} {method} {url} returned {status}, retrying"
+                )
+
+            self.stats.record_retry()
+            time.sleep(
+                random.uniform(0, min(policy.max_backoff, policy.backoff * 2**attempt))
+            )
+            attempt += 1
+
+    def _wait_for_capacity(self) -> None:
+        """Block until the rate limit allows another request."""
+        wait = self.bucket.reserve(self.policy.max_wait)
+        if wait > self.policy.max_wait:
+            raise RateLimitedError(self.policy.name, wait)
+        if wait > 0:
+            if wait >= 1:
+                logger.info(
+                    f"Waiting {wait:.1f}s for the {self.policy.name} rate limit"
+                )
+            time.sleep(wait)
+
+    def _is_throttled(self, response: httpx.Response) -> bool:
+        """Whether the provider rejected the request because we sent too many."""
+        if response.status_code == 429:
+            return True
+        return self.policy.throttled is not None and self.policy.throttled(response)
+
+    def _observe_limits(self, response: httpx.Response, throttled: bool) -> None:
+        """Pause further requests if the response says the quota is used up."""
+        pauses = []
+        if throttled or response.status_code in _UNPROCESSED_STATUSES:
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                pauses.append(retry_after)
+        if self.policy.quota_reset is not None:
+            reset = self.policy.quota_reset(response)
+            if reset is not None:
+                pauses.append(reset)
+        if pauses:
+            logger.warning(
+                f"{self.policy.name} rate limit reached, pausing requests for "
+                f"{max(pauses):.0f}s"
+            )
+            self.bucket.pause(max(pauses))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delay or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _usage_pair(value: Optional[str]) -> Optional[tuple[int, int]]:
+    """Parse a Strava "15-minute,daily" header value."""
+    try:
+        short, daily = (value or "").split(",")
+        return int(short), int(daily)
+    except ValueError:
+        return None
+
+
+def strava_quota_reset(
+    response: httpx.Response, now: Optional[datetime] = None
+) -> Optional[float]:
+    """Seconds until Strava accepts requests again, if a limit is used up.
+
+    Strava reports "15-minute,daily" limits and usage in X-RateLimit-Limit and
+    X-RateLimit-Usage, and the stricter read limits in X-ReadRateLimit-*. The
+    15-minute windows start on the quarter hour and the daily one at midnight
+    UTC.
+    """
+    now = now or datetime.now(timezone.utc)
+    reset: Optional[float] = None
+    for prefix in ("X-RateLimit", "X-ReadRateLimit"):
+        limit = _usage_pair(response.headers.get(f"{prefix}-Limit"))
+        usage = _usage_pair(response.headers.get(f"{prefix}-Usage"))
+        if limit is None or usage is None:
+            continue
+        if usage[1] >= limit[1]:
+            resets_at = (now + timedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        elif usage[0] >= limit[0]:
+            resets_at = now.replace(
+                minute=now.minute - now.minute % 15, second=0, microsecond=0
+            ) + timedelta(minutes=15)
+        else:
+            continue
+        reset = max(reset or 0.0, (resets_at - now).total_seconds())
+    return reset
+
+
+# Reasons Google gives, in the usageLimits domain, for a 403 that means "slow down"
+# rather than "forbidden".
+_GOOGLE_RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+
+def google_rate_limited(response: httpx.Response) -> bool:
+    """Whether a Google API response is a 403 throttling the request.
+
+    Google Calendar answers too many requests with 403 as well as 429. The error
+    body tells these apart from permission errors:
+    `{"error": {"errors": [{"domain": "usageLimits", "reason": "rateLimitExceeded"}]}}`.
+    """
+    if response.status_code != 403:
+        return False
+    try:
+        errors = response.json()["error"]["errors"]
+        reasons = {error.get("reason") for error in errors}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return False
+    return not reasons.isdisjoint(_GOOGLE_RATE_LIMIT_REASONS)
+
+
+# Strava allows 100 reads per 15 minutes. Listing activities is often very slow.
+STRAVA = ProviderPolicy(
+    "strava",
+    rate=100 / (15 * 60),
+    burst=100,
+    timeout=20.0,
+    quota_reset=strava_quota_reset,
+)
+# Google Calendar allows about 10 requests per second per user.
+GOOGLE = ProviderPolicy(
+    "google", rate=10, burst=20, http2=True, throttled=google_rate_limited
+)
+
+_clients: Dict[str, HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(policy: ProviderPolicy) -> HttpClient:
+    """Get the process-wide client for a provider.
+
+    Connections are kept alive between requests (and multiplexed over HTTP/2
+    where the policy allows it), so calls after the first skip the TCP and TLS
+    handshakes, and every caller shares the provider's rate limit.
+    """
+    with _clients_lock:
+        client = _clients.get(policy.name)
+        if client is None or client.is_closed:
+            client = _clients[policy.name] = HttpClient(policy)
+        return client
+
+
+def close_client(policy: ProviderPolicy) -> None:
+    """Close a provider's shared client; the next `get_client()` opens a new one."""
+    with _clients_lock:
+        client = _clients.pop(policy.name, None)
+    if client is not None:
+        client.close()
+
+
+def close_clients() -> None:
+    """Close every provider's shared client."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def http_stats() -> Dict[str, Dict[str, Any]]:
+    """Request, retry and latency stats of each provider's shared client."""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.stats.snapshot() for name, client in clients.items()}
@@ -6,7 +6,14 @@ from .auth import (
     CLIENT_SECRET,
 )
 from .client import StravaClient
-from .models import StravaActivity, StravaGear, StravaActivityWithGear, StravaAthlete
+from .models import (
+    StravaActivity,
+    StravaActivitySummary,
+    StravaGear,
+    StravaActivityWithGear,
+    StravaAthlete,
+    StravaWebhookEvent,
+)
 
 __all__ = [
     "refresh_access_token",
@@ -14,9 +21,11 @@ __all__ = [
     "build_oauth_authorize_url",
     "StravaClient",
     "StravaActivity",
+    "StravaActivitySummary",
     "StravaGear",
     "StravaActivityWithGear",
     "StravaAthlete",
+    "StravaWebhookEvent",
     "CLIENT_ID",
     "CLIENT_SECRET",
 ]
@@ -2,7 +2,6 @@ import os
 from urllib.parse import urlencode
 import logging
 
-import httpx
 from fastapi import HTTPException
 
 from .models import StravaToken
@@ -28,6 +27,8 @@ async def exchange_code_for_token(code: str) -> StravaToken:
     Raises:
         HTTPException: If the exchange request fails
     """
+    import httpx
+
     async with httpx.AsyncClient(timeout=10) as client:
         response = await client.post(
             TOKEN_URL,
@@ -59,6 +60,8 @@ async def refresh_access_token(refresh_token: str) -> StravaToken:
     Raises:
         HTTPException: If the refresh request fails
     """
+    import httpx
+
     async with httpx.AsyncClient(timeout=10) as client:
         response = await client.post(
             TOKEN_URL,
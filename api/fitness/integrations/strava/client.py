@@ -1,23 +1,36 @@
-from typing import Iterable
+from typing import Collection, Iterable, Iterator, Optional, get_args
 from dataclasses import dataclass
+import asyncio
 import logging
 
-import httpx
-
 from fitness.db.oauth_credentials import OAuthCredentials, upsert_credentials
-from .models import StravaActivity, StravaGear, activity_list_adapter
+from fitness.integrations.http_client import STRAVA, HttpClient, get_client
+from .models import (
+    StravaActivitySummary,
+    StravaActivityType,
+    StravaGear,
+    activity_list_adapter,
+)
 from .auth import refresh_access_token
 
 logger = logging.getLogger(__name__)
 
 GEAR_URL = "https://www.strava.com/api/v3/gear"
 ACTIVITIES_URL = "https://www.strava.com/api/v3/athlete/activities"
+ACTIVITY_URL = "https://www.strava.com/api/v3/activities"
 ATHLETE_URL = "https://www.strava.com/api/v3/athlete"
 
 
 @dataclass
 class StravaClient:
     creds: OAuthCredentials
+    # Defaults to the shared Strava client from `get_client(STRAVA)`.
+    http_client: Optional[HttpClient] = None
+
+    @property
+    def http(self) -> HttpClient:
+        """The HTTP client requests are sent with."""
+        return self.http_client or get_client(STRAVA)
 
     def needs_token_refresh(self) -> bool:
         """Check if the client's access token needs to be refreshed."""
@@ -36,8 +49,9 @@ class StravaClient:
             access_token=token.access_token,
             refresh_token=token.refresh_token,
             expires_at=token.expires_at_datetime(),
+            account_id=self.creds.account_id,
         )
-        upsert_credentials(new_creds)
+        await asyncio.to_thread(upsert_credentials, new_creds)
         self.creds = new_creds
         logger.info("Refreshed Strava access token and updated credentials in database")
 
@@ -46,20 +60,33 @@ class StravaClient:
             "Authorization": f"Bearer {self.creds.access_token}",
         }
 
-    def get_activities(self) -> list[StravaActivity]:
-        """Get the activities from the Strava API."""
-        raw_activities = self._get_activities_raw()
-        activities = activity_list_adapter.validate_python(raw_activities)
+    def get_activities(
+        self, types: Collection[str] = get_args(StravaActivityType)
+    ) -> list[StravaActivitySummary]:
+        """Get the activities of the given types from the Strava API.
+
+        Activities of other types are dropped while still raw, and each page is
+        validated as soon as it arrives instead of after the last one.
+        """
+        activities: list[StravaActivitySummary] = []
+        for page, raw_activities in enumerate(self._iter_activity_pages(), start=1):
+            wanted = [raw for raw in raw_activities if raw.get("type") in types]
+            activities.extend(activity_list_adapter.validate_python(wanted))
+            logger.debug(
+                f"Kept {len(wanted)} of {len(raw_activities)} activities from page {page}"
+            )
         return activities
 
-    def _get_activities_raw(self) -> list[dict]:
-        """Get the activity data from the Strava API.
+    def _iter_activity_pages(self) -> Iterator[list[dict]]:
+        """Get the activity data from the Strava API, one page at a time.
 
         Handles pagination until no more pages are returned.
         """
+        import httpx
+
         page = 1
         per_page = 200
-        activities: list[dict] = []
+        total = 0
         logger.info(f"Fetching activities from Strava API (page size: {per_page})")
 
         while True:
@@ -67,7 +94,7 @@ class StravaClient:
             logger.debug(f"Requesting Strava activities page {page}: {params}")
 
             try:
-                response = httpx.get(
+                response = self.http.get(
                     ACTIVITIES_URL,
                     headers=self._auth_headers(),
                     params=params,
@@ -75,19 +102,6 @@ class StravaClient:
                 )
                 response.raise_for_status()
                 payload: list[dict] = response.json()
-
-                logger.debug(f"Received {len(payload)} activities from page {page}")
-                activities.extend(payload)
-
-                if len(payload) == 0:
-                    # This indicates there are no more activities to fetch.
-                    logger.info(
-                        f"Completed fetching activities: {len(activities)} total activities across {page - 1} pages"
-                    )
-                    break
-
-                page += 1
-
             except httpx.HTTPStatusError as e:
                 logger.error(
                     f"Strava API returned error on page {page}: {e.response.status_code} {e.response.text}"
@@ -99,7 +113,68 @@ class StravaClient:
                 )
                 raise
 
-        return activities
+            logger.debug(f"Received {len(payload)} activities from page {page}")
+            if len(payload) == 0:
+                # This indicates there are no more activities to fetch.
+                logger.info(
+                    f"Completed fetching activities: {total} total activities across {page - 1} pages"
+                )
+                return
+
+            total += len(payload)
+            yield payload
+            page += 1
+
+    def get_activity(self, activity_id: int) -> Optional[StravaActivitySummary]:
+        """Get one activity from the Strava API.
+
+        Returns None if it is not a type of activity `StravaActivitySummary` models.
+        """
+        raw_activity = self._get_activity_raw(activity_id)
+        if raw_activity.get("type") not in get_args(StravaActivityType):
+            logger.info(
+                f"Ignoring Strava activity {activity_id} of type {raw_activity.get('type')}"
+            )
+            return None
+        return StravaActivitySummary.model_validate(raw_activity)
+
+    def activity_exists(self, activity_id: int) -> bool:
+        """Check whether Strava still has an activity, e.g. to confirm a deletion.
+
+        Only a 404 counts as gone; other errors are raised, so that an outage or
+        an expired token isn't mistaken for a deletion.
+        """
+        response = self.http.get(
+            f"{ACTIVITY_URL}/{activity_id}", headers=self._auth_headers(), timeout=10
+        )
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def _get_activity_raw(self, activity_id: int) -> dict:
+        """Get the data of one activity from the Strava API."""
+        import httpx
+
+        logger.debug(f"Fetching Strava activity {activity_id}")
+        try:
+            response = self.http.get(
+                f"{ACTIVITY_URL}/{activity_id}",
+                headers=self._auth_headers(),
+                timeout=10,
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Strava API returned error for activity {activity_id}: {e.response.status_code} {e.response.text}"
+            )
+            raise
+        except httpx.RequestError as e:
+            logger.error(
+                f"Failed to fetch activity {activity_id} from Strava API: {type(e).__name__}: {str(e)}"
+            )
+            raise
 
     def get_gear(self, gear_ids: Iterable[str]) -> list[StravaGear]:
         """Get the gear from the Strava API."""
@@ -109,6 +184,8 @@ class StravaClient:
 
     def _get_gear_raw(self, gear_ids: Iterable[str]) -> list[dict]:
         """Get the gear data from the Strava API."""
+        import httpx
+
         gear: list[dict] = []
         gear_id_list = list(gear_ids)
 
@@ -118,7 +195,7 @@ class StravaClient:
             logger.debug(f"Fetching gear {idx}/{len(gear_id_list)}: {id}")
 
             try:
-                response = httpx.get(
+                response = self.http.get(
                     f"{GEAR_URL}/{id}", headers=self._auth_headers(), timeout=10
                 )
                 response.raise_for_status()
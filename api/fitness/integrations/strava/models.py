@@ -1,6 +1,6 @@
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, TypeAdapter, AwareDatetime
 
@@ -24,21 +24,45 @@ StravaActivityType = Literal[
 ]
 
 
-class StravaActivity(BaseModel):
-    """An activity pulled from the Strava API."""
+class StravaActivitySummary(BaseModel):
+    """The fields of a Strava activity that runs are built from.
+
+    Activities are fetched in bulk, so validating only these is much cheaper than
+    validating a full `StravaActivity`.
+    """
 
     id: int
+    type: StravaActivityType
+    start_date: AwareDatetime
+    distance: float
+    elapsed_time: int
+    average_heartrate: float | None = None
+    gear_id: str | None = None
+
+    def with_gear(self, gear: StravaGear) -> StravaActivityWithGear:
+        """Return a new StravaActivityWithGear with the given gear."""
+        return StravaActivityWithGear(
+            id=self.id,
+            type=self.type,
+            start_date=self.start_date,
+            distance=self.distance,
+            elapsed_time=self.elapsed_time,
+            average_heartrate=self.average_heartrate,
+            gear_id=self.gear_id,
+            gear=gear,
+        )
+
+
+class StravaActivity(StravaActivitySummary):
+    """An activity pulled from the Strava API."""
+
     name: str
     resource_state: int
-    type: StravaActivityType
     commute: bool
-    start_date: AwareDatetime
     start_date_local: AwareDatetime
     timezone: str
     utc_offset: float
-    distance: float
     moving_time: int
-    elapsed_time: int
     total_elevation_gain: float
     has_kudoed: bool
     has_heartrate: bool
@@ -67,69 +91,14 @@ class StravaActivity(BaseModel):
     device_watts: bool | None = None
     suffer_score: float | None = None
     workout_type: int | None = None
-    gear_id: str | None = None
     elev_low: float | None = None
     elev_high: float | None = None
     max_heartrate: float | None = None
-    average_heartrate: float | None = None
     upload_id_str: str | None = None
     average_watts: float | None = None
 
-    def with_gear(self, gear: StravaGear) -> StravaActivityWithGear:
-        """Return a new StravaActivityWithGear with the given gear."""
-        return StravaActivityWithGear(
-            id=self.id,
-            name=self.name,
-            resource_state=self.resource_state,
-            type=self.type,
-            commute=self.commute,
-            start_date=self.start_date,
-            start_date_local=self.start_date_local,
-            timezone=self.timezone,
-            utc_offset=self.utc_offset,
-            distance=self.distance,
-            moving_time=self.moving_time,
-            elapsed_time=self.elapsed_time,
-            total_elevation_gain=self.total_elevation_gain,
-            has_kudoed=self.has_kudoed,
-            has_heartrate=self.has_heartrate,
-            athlete=self.athlete,
-            manual=self.manual,
-            kilojoules=self.kilojoules,
-            start_latlng=self.start_latlng,
-            end_latlng=self.end_latlng,
-            achievement_count=self.achievement_count,
-            kudos_count=self.kudos_count,
-            comment_count=self.comment_count,
-            athlete_count=self.athlete_count,
-            total_photo_count=self.total_photo_count,
-            max_speed=self.max_speed,
-            from_accepted_tag=self.from_accepted_tag,
-            sport_type=self.sport_type,
-            trainer=self.trainer,
-            photo_count=self.photo_count,
-            private=self.private,
-            pr_count=self.pr_count,
-            heartrate_opt_out=self.heartrate_opt_out,
-            average_speed=self.average_speed,
-            visibility=self.visibility,
-            upload_id=self.upload_id,
-            external_id=self.external_id,
-            device_watts=self.device_watts,
-            suffer_score=self.suffer_score,
-            workout_type=self.workout_type,
-            gear_id=self.gear_id,
-            elev_low=self.elev_low,
-            elev_high=self.elev_high,
-            max_heartrate=self.max_heartrate,
-            average_heartrate=self.average_heartrate,
-            upload_id_str=self.upload_id_str,
-            average_watts=self.average_watts,
-            gear=gear,
-        )
-
 
-activity_list_adapter = TypeAdapter(list[StravaActivity])
+activity_list_adapter = TypeAdapter(list[StravaActivitySummary])
 
 
 class StravaGear(BaseModel):
@@ -159,12 +128,31 @@ class StravaToken(BaseModel):
     expires_in: int
     refresh_token: str
     access_token: str
+    # Sent when exchanging an authorization code, not when refreshing.
+    athlete: StravaAthlete | None = None
 
     def expires_at_datetime(self) -> datetime:
         return datetime.fromtimestamp(self.expires_at, tz=timezone.utc)
 
 
-class StravaActivityWithGear(StravaActivity):
+class StravaWebhookEvent(BaseModel):
+    """A push event from a Strava webhook subscription."""
+
+    object_type: Literal["activity", "athlete"]
+    # Activity ID, or athlete ID for athlete events.
+    object_id: int
+    aspect_type: Literal["create", "update", "delete"]
+    # The athlete the object belongs to.
+    owner_id: int
+    subscription_id: int
+    # Unix timestamp of the change.
+    event_time: int
+    # For updates, the changed fields, e.g. {"title": "Morning Run"}; a
+    # deauthorization is an athlete update with {"authorized": "false"}.
+    updates: dict[str, Any] = {}
+
+
+class StravaActivityWithGear(StravaActivitySummary):
     """A merged Strava activity and gear."""
 
     gear: StravaGear
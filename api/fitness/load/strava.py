@@ -1,32 +1,33 @@
 import logging
+from typing import NamedTuple, Optional
 
 from fitness.integrations.strava.client import StravaClient
 from fitness.integrations.strava.models import StravaActivityWithGear
 
 logger = logging.getLogger(__name__)
 
+# Strava activity types imported as runs.
+RUN_TYPES = ("Run", "Indoor Run")
 
-def load_strava_runs(client: StravaClient) -> list[StravaActivityWithGear]:
+
+class StravaRuns(NamedTuple):
+    """The runs fetched from Strava, and the IDs of every run Strava listed."""
+
+    runs: list[StravaActivityWithGear]
+    # Includes the runs left out of `runs` for having no gear. They still exist
+    # in Strava, so a full sync mustn't take them for deleted.
+    listed_ids: list[int]
+
+
+def load_strava_runs(client: StravaClient) -> StravaRuns:
     """Fetch runs from Strava along with the gear used in them."""
     logger.info("Starting Strava data load")
 
     try:
-        # Get activities and the gear used in them.
-        logger.info("Fetching activities from Strava API")
-        activities = client.get_activities()
-        logger.info(f"Retrieved {len(activities)} total activities from Strava")
-
-        # Limit down to only runs.
-        initial_count = len(activities)
-        runs = [
-            activity
-            for activity in activities
-            if activity.type in ("Run", "Indoor Run")
-        ]
-        non_run_count = initial_count - len(runs)
-        logger.info(
-            f"Filtered to {len(runs)} runs (excluded {non_run_count} non-run activities)"
-        )
+        # Get runs and the gear used in them; the client skips other activities.
+        logger.info("Fetching runs from Strava API")
+        runs = client.get_activities(types=RUN_TYPES)
+        logger.info(f"Retrieved {len(runs)} runs from Strava")
 
         # Get gear information for runs that have gear
         gear_ids = {run.gear_id for run in runs if run.gear_id}
@@ -52,7 +53,7 @@ def load_strava_runs(client: StravaClient) -> list[StravaActivityWithGear]:
         logger.info(
             f"Successfully loaded {len(runs_w_gear)} Strava runs with gear information"
         )
-        return runs_w_gear
+        return StravaRuns(runs=runs_w_gear, listed_ids=[run.id for run in runs])
 
     except Exception as e:
         logger.error(
@@ -60,3 +61,23 @@ def load_strava_runs(client: StravaClient) -> list[StravaActivityWithGear]:
             exc_info=True,
         )
         raise
+
+
+def load_strava_run(
+    client: StravaClient, activity_id: int
+) -> Optional[StravaActivityWithGear]:
+    """Fetch one run from Strava along with the gear used in it.
+
+    Returns None if the activity is not a run or has no gear, as those are left
+    out of `load_strava_runs` too.
+    """
+    activity = client.get_activity(activity_id)
+    if activity is None or activity.type not in RUN_TYPES:
+        logger.info(f"Strava activity {activity_id} is not a run")
+        return None
+    if activity.gear_id is None:
+        logger.info(f"Strava run {activity_id} has no gear")
+        return None
+
+    (gear,) = client.get_gear([activity.gear_id])
+    return activity.with_gear(gear=gear)
@@ -1,6 +1,21 @@
-from .run import Run, RunType, RunSource, LocalizedRun
-from .shoe import Shoe, ShoeMileage
-from .training_load import TrainingLoad, DayTrainingLoad
+from .run import (
+    Run,
+    RunType,
+    RunSource,
+    LocalizedRun,
+    RunRecord,
+    LocalizedRunRecord,
+    RunLike,
+)
+from .shoe import Shoe, ShoeMileage, ShoeMileagePoint, ShoeUsageRate, ShoeUsage
+from .training_load import (
+    TrainingLoad,
+    DayTrainingLoad,
+    HRProfile,
+    ProfileTrainingLoad,
+    LoadModel,
+    Sex,
+)
 from .sync import (
     SyncedRun,
     SyncRequest,
@@ -8,20 +23,25 @@ from .sync import (
     SyncStatusResponse,
     SyncStatus,
 )
-from typing import Literal
-
-Sex = Literal["M", "F"]
-
 
 __all__ = [
     "Run",
     "RunType",
     "RunSource",
     "LocalizedRun",
+    "RunRecord",
+    "LocalizedRunRecord",
+    "RunLike",
     "Shoe",
     "ShoeMileage",
+    "ShoeMileagePoint",
+    "ShoeUsageRate",
+    "ShoeUsage",
     "TrainingLoad",
     "DayTrainingLoad",
+    "HRProfile",
+    "ProfileTrainingLoad",
+    "LoadModel",
     "Sex",
     "SyncedRun",
     "SyncRequest",
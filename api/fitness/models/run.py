@@ -1,4 +1,5 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from datetime import date, datetime, timezone, time
 from typing import Literal, Self
@@ -194,3 +195,78 @@ class LocalizedRun(Run):
         )
         localized_run._shoe_name = run._shoe_name
         return localized_run
+
+
+@dataclass(slots=True)
+class RunRecord:
+    """
+    A compact, unvalidated run for internal computations.
+
+    Fields are in the same order as the run columns selected from the database, so a
+    row can be unpacked directly with `RunRecord(*row)`. Only build these from trusted
+    data; convert to a `Run` with `to_run()` at the API boundary.
+    """
+
+    id: str
+    datetime_utc: datetime
+    type: RunType
+    distance: float
+    duration: float
+    source: RunSource
+    avg_heart_rate: float | None
+    shoe_id: str | None
+    deleted_at: datetime | None
+    shoe_name: str | None
+
+    @property
+    def is_deleted(self) -> bool:
+        """Check if the run is soft-deleted."""
+        return self.deleted_at is not None
+
+    @classmethod
+    def from_run(cls, run: Run) -> Self:
+        """Create a RunRecord from a validated Run."""
+        return cls(
+            run.id,
+            run.datetime_utc,
+            run.type,
+            run.distance,
+            run.duration,
+            run.source,
+            run.avg_heart_rate,
+            run.shoe_id,
+            run.deleted_at,
+            run.shoe_name,
+        )
+
+    def to_run(self) -> Run:
+        """Convert to a validated Run for API responses."""
+        run = Run(
+            id=self.id,
+            datetime_utc=self.datetime_utc,
+            type=self.type,
+            distance=self.distance,
+            duration=self.duration,
+            source=self.source,
+            avg_heart_rate=self.avg_heart_rate,
+            shoe_id=self.shoe_id,
+            deleted_at=self.deleted_at,
+        )
+        run._shoe_name = self.shoe_name
+        return run
+
+
+@dataclass(slots=True)
+class LocalizedRunRecord(RunRecord):
+    """A RunRecord with its datetime converted to user's local timezone."""
+
+    localized_datetime: datetime
+
+    @property
+    def local_date(self) -> date:
+        """Get the local date for this run."""
+        return self.localized_datetime.date()
+
+
+# Anything that can be aggregated: validated runs or compact internal records.
+RunLike = Run | RunRecord
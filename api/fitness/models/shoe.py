@@ -97,3 +97,31 @@ class ShoeMileage(BaseModel):
 
     def __lt__(self, other: "ShoeMileage") -> bool:
         return self.mileage < other.mileage
+
+
+class ShoeMileagePoint(BaseModel):
+    """Cumulative mileage of a shoe at the end of a day on which it was used."""
+
+    date: date
+    mileage: float
+
+
+class ShoeUsageRate(BaseModel):
+    """Miles put on a shoe over a trailing window of days."""
+
+    window_days: int
+    miles: float
+    miles_per_day: float
+
+
+class ShoeUsage(BaseModel):
+    """Shoe with its mileage over time and a projected retirement date."""
+
+    shoe: Shoe
+    mileage: float
+    cumulative_mileage: list[ShoeMileagePoint]
+    usage_rates: list[ShoeUsageRate]
+    retirement_threshold: float
+    # The date the shoe crossed the threshold if it already has, otherwise the
+    # date it will cross at the current usage rate (None if it isn't being used).
+    projected_retirement_date: Optional[date] = None
@@ -67,3 +67,22 @@ class SyncStatusResponse(BaseModel):
     error_message: Optional[str] = Field(
         default=None, description="Error message if sync failed"
     )
+
+
+class ReconcileResponse(BaseModel):
+    """Response from reconciling Google Calendar events with their runs."""
+
+    changed_events: int = Field(
+        description="Events Google reported as changed since the last reconciliation"
+    )
+    updated: int = Field(description="Events updated to match an edited run")
+    deleted_in_calendar: int = Field(
+        description="Runs marked failed because their event was deleted in Google"
+    )
+    removed: int = Field(
+        description="Events removed, with their sync records, because their run was deleted"
+    )
+    failed: int = Field(description="Events that could not be updated or removed")
+    full_sync: bool = Field(
+        description="Whether all events were listed instead of only changed ones"
+    )
@@ -1,7 +1,10 @@
 from datetime import date
-from typing import Self
+from typing import Literal, Self
 from pydantic import BaseModel
 
+Sex = Literal["M", "F"]
+LoadModel = Literal["banister", "distance", "duration"]
+
 
 class TrainingLoad(BaseModel):
     atl: float
@@ -15,3 +18,18 @@ class DayTrainingLoad(BaseModel):
 
     def __lt__(self, other: Self) -> bool:
         return self.date < other.date
+
+
+class HRProfile(BaseModel):
+    """Heart rate settings used to score training load."""
+
+    max_hr: float
+    resting_hr: float
+    sex: Sex
+
+
+class ProfileTrainingLoad(BaseModel):
+    """Training load by day computed for a single heart rate profile."""
+
+    profile: HRProfile
+    training_load: list[DayTrainingLoad]
@@ -1,45 +1,58 @@
 """Timezone utility functions for converting between UTC and user timezones."""
 
-from datetime import date
+from datetime import date, datetime, timezone
+from typing import Sequence
+import zoneinfo
 
-from fitness.models import Run, LocalizedRun
+from fitness.models import LocalizedRunRecord, RunLike
 
 
 def convert_runs_to_user_timezone(
-    runs: list[Run], user_timezone: str | None = None
-) -> list[LocalizedRun]:
+    runs: Sequence[RunLike], user_timezone: str | None = None
+) -> list[LocalizedRunRecord]:
     """
     Convert a list of runs to use the user's local timezone.
 
     Uses the run's datetime_utc field for accurate timezone conversion.
-    If user_timezone is None, returns LocalizedRun objects with UTC datetime as localized_datetime.
+    If user_timezone is None, returns LocalizedRunRecord objects with UTC datetime as localized_datetime.
     """
     if user_timezone is None:
         # No conversion needed - use UTC datetime as localized_datetime
-        localized_runs = []
-        for run in runs:
-            localized_run = LocalizedRun(
-                id=run.id,
-                datetime_utc=run.datetime_utc,
-                localized_datetime=run.datetime_utc,
-                type=run.type,
-                distance=run.distance,
-                duration=run.duration,
-                source=run.source,
-                avg_heart_rate=run.avg_heart_rate,
-                shoe_id=run.shoe_id,
-                deleted_at=run.deleted_at,
-            )
-            localized_run._shoe_name = run._shoe_name
-            localized_runs.append(localized_run)
-        return localized_runs
-
-    return [LocalizedRun.from_run(run, user_timezone) for run in runs]
+        return [_localized_record(run, run.datetime_utc) for run in runs]
+    if not runs:
+        return []
+
+    tz = zoneinfo.ZoneInfo(user_timezone)
+    return [
+        _localized_record(
+            run,
+            run.datetime_utc.replace(tzinfo=timezone.utc)
+            .astimezone(tz)
+            .replace(tzinfo=None),
+        )
+        for run in runs
+    ]
+
+
+def _localized_record(run: RunLike, localized_datetime: datetime) -> LocalizedRunRecord:
+    return LocalizedRunRecord(
+        run.id,
+        run.datetime_utc,
+        run.type,
+        run.distance,
+        run.duration,
+        run.source,
+        run.avg_heart_rate,
+        run.shoe_id,
+        run.deleted_at,
+        run.shoe_name,
+        localized_datetime,
+    )
 
 
 def filter_runs_by_local_date_range(
-    runs: list[Run], start: date, end: date, user_timezone: str | None = None
-) -> list[Run]:
+    runs: Sequence[RunLike], start: date, end: date, user_timezone: str | None = None
+) -> list[RunLike]:
     """
     Filter runs to only include those that fall within the date range in the user's timezone.
 
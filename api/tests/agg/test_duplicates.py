@@ -0,0 +1,102 @@
+from datetime import date, datetime
+
+import pytest
+
+from fitness.agg.duplicates import find_duplicate_runs
+from tests._factories.run import RunFactory
+
+
+def _run(run_id: str, source: str = "Strava", **update):
+    return RunFactory().make({"id": run_id, "source": source, **update})
+
+
+def _ids(pairs):
+    return [(first.id, second.id) for first, second in pairs]
+
+
+def test_same_workout_from_both_sources():
+    strava = _run("strava_1", distance=5.0, duration=1800)
+    # MapMyFitness measured it a little shorter and started it a bit later.
+    mmf = _run(
+        "mmf_1",
+        "MapMyFitness",
+        distance=4.9,
+        duration=1790,
+        datetime_utc=datetime(2023, 10, 1, 12, 3),
+    )
+
+    assert _ids(find_duplicate_runs([strava, mmf])) == [("mmf_1", "strava_1")]
+
+
+@pytest.mark.parametrize("shorter_source", ["Strava", "MapMyFitness"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_distances_right_at_the_tolerance(shorter_source, reverse):
+    """5% of the longer run apart is a match, whichever run comes first."""
+    longer_source = "MapMyFitness" if shorter_source == "Strava" else "Strava"
+    runs = [
+        _run("shorter", shorter_source, distance=9.5),
+        _run("longer", longer_source, distance=10.0),
+    ]
+    if reverse:
+        runs.reverse()
+
+    assert _ids(find_duplicate_runs(runs)) == [("shorter", "longer")]
+    # Just past the tolerance isn't a match.
+    runs = [
+        _run("shorter", shorter_source, distance=9.49),
+        _run("longer", longer_source, distance=10.0),
+    ]
+    if reverse:
+        runs.reverse()
+    assert find_duplicate_runs(runs) == []
+
+
+def test_runs_from_the_same_source_are_not_duplicates():
+    """Two runs on one day from one source are two runs, e.g. a double."""
+    runs = [_run("strava_1"), _run("strava_2")]
+    assert find_duplicate_runs(runs) == []
+
+
+def test_different_days_distances_or_durations_are_not_duplicates():
+    strava = _run("strava_1", distance=5.0, duration=1800)
+    runs = [
+        strava,
+        _run("mmf_1", "MapMyFitness", date=date(2023, 10, 2)),
+        _run("mmf_2", "MapMyFitness", distance=6.0),
+        _run("mmf_3", "MapMyFitness", duration=2400),
+    ]
+    assert find_duplicate_runs(runs) == []
+
+
+def test_sweep_reaches_past_non_matching_runs():
+    """A same-source run between two matches in sort order doesn't end the sweep."""
+    runs = [
+        _run("strava_1", distance=5.0),
+        _run("strava_2", distance=5.05, duration=600),
+        _run("mmf_1", "MapMyFitness", distance=5.1),
+        _run("mmf_2", "MapMyFitness", distance=8.0),
+    ]
+    assert _ids(find_duplicate_runs(runs)) == [("strava_1", "mmf_1")]
+
+
+def test_local_dates():
+    """Late runs are matched on the local date, not the UTC one."""
+    strava = _run("strava_1", datetime_utc=datetime(2023, 10, 2, 3, 30))
+    mmf = _run("mmf_1", "MapMyFitness", datetime_utc=datetime(2023, 10, 1, 23, 30))
+
+    assert find_duplicate_runs([strava, mmf]) == []
+    (pair,) = find_duplicate_runs([strava, mmf], "America/Chicago")
+    assert pair[0].local_date == date(2023, 10, 1)
+
+
+def test_involving():
+    runs = [
+        _run("strava_1"),
+        _run("mmf_1", "MapMyFitness"),
+        _run("strava_2", date=date(2023, 10, 5)),
+        _run("mmf_2", "MapMyFitness", date=date(2023, 10, 5)),
+    ]
+
+    pairs = find_duplicate_runs(runs, involving={"strava_2"})
+
+    assert {run.id for pair in pairs for run in pair} == {"strava_2", "mmf_2"}
@@ -127,3 +127,88 @@ def test_mileage_by_shoes_include_retired(run_factory):
     assert brooks_result.shoe.is_retired is False
     assert brooks_result.shoe.retired_at is None
     assert brooks_result.shoe.retirement_notes is None
+
+
+def test_shoe_usage_cumulative_series_and_rates(run_factory):
+    """Cumulative mileage collapses same-day runs and windows end on `today`."""
+    from fitness.agg.shoes import shoe_usage
+    from fitness.models.shoe import Shoe
+
+    shoes = [Shoe(id="ghost", name="Brooks Ghost 14")]
+    runs = [
+        run_factory.make(update={"distance": 5.0, "date": date(2024, 1, 3)}),
+        run_factory.make(update={"distance": 4.0, "date": date(2024, 1, 1)}),
+        run_factory.make(update={"distance": 1.0, "date": date(2024, 1, 3)}),
+        run_factory.make(update={"distance": 2.0, "date": date(2023, 11, 1)}),
+    ]
+    runs = [run.model_copy(update={"shoe_id": "ghost"}) for run in runs]
+
+    [usage] = shoe_usage(
+        runs,
+        shoes=shoes,
+        today=date(2024, 1, 10),
+        retirement_threshold=100.0,
+        windows=(10, 90),
+    )
+
+    assert usage.mileage == 12.0
+    assert [(p.date, p.mileage) for p in usage.cumulative_mileage] == [
+        (date(2023, 11, 1), 2.0),
+        (date(2024, 1, 1), 6.0),
+        (date(2024, 1, 3), 12.0),
+    ]
+    assert [(r.window_days, r.miles) for r in usage.usage_rates] == [
+        (10, 10.0),
+        (90, 12.0),
+    ]
+    # 88 miles remaining at 1 mile/day over the shortest window.
+    assert usage.projected_retirement_date == date(2024, 4, 7)
+
+
+def test_shoe_usage_already_past_threshold(run_factory):
+    """Shoes past the threshold report the date they crossed it."""
+    from fitness.agg.shoes import shoe_usage
+    from fitness.models.shoe import Shoe
+
+    shoes = [Shoe(id="ghost", name="Brooks Ghost 14")]
+    runs = [
+        run_factory.make(
+            update={"distance": 6.0, "date": date(2024, 1, d), "shoe_id": "ghost"}
+        )
+        for d in (1, 2, 3)
+    ]
+
+    [usage] = shoe_usage(
+        runs, shoes=shoes, today=date(2024, 6, 1), retirement_threshold=10.0
+    )
+
+    assert usage.projected_retirement_date == date(2024, 1, 2)
+
+
+def test_shoe_usage_retired_and_idle_shoes(run_factory):
+    """Retired shoes are excluded by default and idle shoes have no projection."""
+    from fitness.agg.shoes import shoe_usage
+    from fitness.models.shoe import Shoe
+
+    shoes = [
+        Shoe(id="old", name="Old Shoe", retired_at=date(2023, 12, 1)),
+        Shoe(id="idle", name="Idle Shoe"),
+    ]
+    runs = [
+        run_factory.make(
+            update={"distance": 3.0, "date": date(2023, 6, 1), "shoe_id": "old"}
+        ),
+        run_factory.make(
+            update={"distance": 3.0, "date": date(2023, 6, 1), "shoe_id": "idle"}
+        ),
+    ]
+
+    results = shoe_usage(runs, shoes=shoes, today=date(2024, 6, 1))
+    assert [u.shoe.id for u in results] == ["idle"]
+    assert results[0].projected_retirement_date is None
+
+    results = shoe_usage(
+        runs, shoes=shoes, today=date(2024, 6, 1), include_retired=True
+    )
+    assert [u.shoe.id for u in results] == ["idle", "old"]
+    assert results[1].projected_retirement_date is None
@@ -1,12 +1,24 @@
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+import numpy as np
 import pytest
-from datetime import date
 from fitness.agg.training_load import (
     trimp,
+    trimp_values,
     trimp_by_day,
     training_stress_balance,
-    _exponential_training_load,
-    _calculate_atl_and_ctl,
+    training_stress_balance_by_profile,
+    training_load_by_model,
+    ATL_LOOKBACK,
+    CTL_LOOKBACK,
+    LOAD_MODELS,
+    _ewma,
 )
+from fitness.models import HRProfile
+from fitness.utils.timezone import convert_runs_to_user_timezone
 from tests._factories.run import RunFactory
 
 
@@ -323,15 +335,19 @@ class TestTrimpByDay:
         assert result[5].trimp > 0  # Has the run on Jan 20
 
 
-class TestExponentialTrainingLoad:
-    """Tests for the _exponential_training_load() function."""
+def _ewma_list(values: list[float], tau: float) -> list[float]:
+    return _ewma(np.asarray(values, dtype=np.float64), tau).tolist()
+
+
+class TestEwma:
+    """Tests for the _ewma() function."""
 
-    def test_exponential_training_load_basic(self):
+    def test_ewma_basic(self):
         """Test basic exponential training load calculation."""
         trimp_values = [100.0, 50.0, 75.0, 0.0, 25.0]
         tau = 7  # 7-day time constant
 
-        result = _exponential_training_load(trimp_values, tau)
+        result = _ewma_list(trimp_values, tau)
 
         assert len(result) == 5
         # First value should be close to input since there's no history
@@ -341,23 +357,23 @@ class TestExponentialTrainingLoad:
             assert val >= 0
             assert val <= 200  # Should not exceed reasonable bounds
 
-    def test_exponential_training_load_zero_values(self):
+    def test_ewma_zero_values(self):
         """Test exponential training load with zero TRIMP values."""
         trimp_values = [0.0, 0.0, 0.0, 0.0]
         tau = 7
 
-        result = _exponential_training_load(trimp_values, tau)
+        result = _ewma_list(trimp_values, tau)
 
         assert len(result) == 4
         for val in result:
             assert val == 0.0
 
-    def test_exponential_training_load_single_spike(self):
+    def test_ewma_single_spike(self):
         """Test exponential training load with a single high value."""
         trimp_values = [0.0, 100.0, 0.0, 0.0, 0.0]
         tau = 7
 
-        result = _exponential_training_load(trimp_values, tau)
+        result = _ewma_list(trimp_values, tau)
 
         assert len(result) == 5
         assert result[0] == 0.0
@@ -366,12 +382,12 @@ class TestExponentialTrainingLoad:
         assert result[3] < result[2]  # Should continue decaying
         assert result[4] < result[3]  # Should continue decaying
 
-    def test_exponential_training_load_different_tau(self):
+    def test_ewma_different_tau(self):
         """Test that different tau values produce different decay rates."""
         trimp_values = [100.0, 0.0, 0.0, 0.0, 0.0]
 
-        result_fast = _exponential_training_load(trimp_values, tau=3)  # Fast response
-        result_slow = _exponential_training_load(trimp_values, tau=14)  # Slow response
+        result_fast = _ewma_list(trimp_values, tau=3)  # Fast response
+        result_slow = _ewma_list(trimp_values, tau=14)  # Slow response
 
         # Larger tau means smaller alpha (less responsive)
         # Fast response should have different values than slow response
@@ -387,14 +403,18 @@ class TestExponentialTrainingLoad:
         assert result_slow[2] < result_slow[1]
 
 
-class TestCalculateAtlAndCtl:
-    """Tests for the _calculate_atl_and_ctl() function."""
+def _atl_and_ctl(values: list[float]) -> tuple[list[float], list[float]]:
+    return _ewma_list(values, ATL_LOOKBACK), _ewma_list(values, CTL_LOOKBACK)
+
+
+class TestAtlAndCtl:
+    """ATL and CTL are EWMAs of the same loads with different time constants."""
 
-    def test_calculate_atl_and_ctl_basic(self):
+    def test_atl_and_ctl_basic(self):
         """Test basic ATL and CTL calculation."""
         trimp_values = [50.0, 60.0, 55.0, 70.0, 45.0, 65.0, 50.0]
 
-        atl, ctl = _calculate_atl_and_ctl(trimp_values)
+        atl, ctl = _atl_and_ctl(trimp_values)
 
         assert len(atl) == 7
         assert len(ctl) == 7
@@ -407,18 +427,18 @@ class TestCalculateAtlAndCtl:
         for val in atl + ctl:
             assert val >= 0
 
-    def test_calculate_atl_and_ctl_empty(self):
+    def test_atl_and_ctl_empty(self):
         """Test ATL and CTL calculation with empty input."""
-        atl, ctl = _calculate_atl_and_ctl([])
+        atl, ctl = _atl_and_ctl([])
 
         assert atl == []
         assert ctl == []
 
-    def test_calculate_atl_and_ctl_single_value(self):
+    def test_atl_and_ctl_single_value(self):
         """Test ATL and CTL calculation with single value."""
         trimp_values = [100.0]
 
-        atl, ctl = _calculate_atl_and_ctl(trimp_values)
+        atl, ctl = _atl_and_ctl(trimp_values)
 
         assert len(atl) == 1
         assert len(ctl) == 1
@@ -595,3 +615,270 @@ class TestTrainingStressBalance:
         # The earlier run should have affected the CTL/ATL values
         assert result[0].training_load.ctl > 0
         assert result[0].training_load.atl > 0
+
+
+def _reference_exponential_training_load(
+    trimp_values: list[float], tau: int
+) -> list[float]:
+    """The original per-day loop, kept to check the vectorized implementation."""
+    alpha = 1 - math.exp(-1 / tau)
+    load = []
+    prev = 0.0
+    for value in trimp_values:
+        current = prev + alpha * (value - prev)
+        load.append(current)
+        prev = current
+    return load
+
+
+def _random_hr_runs(seed: int, num_runs: int, start: date, num_days: int):
+    rng = random.Random(seed)
+    return [
+        RunFactory().make(
+            {
+                "id": f"run_{i}",
+                "datetime_utc": datetime.combine(
+                    start + timedelta(days=rng.randrange(num_days)),
+                    time(hour=rng.randrange(24), minute=rng.randrange(60)),
+                ),
+                "duration": rng.uniform(600, 9000),
+                "avg_heart_rate": rng.uniform(40, 200),
+            }
+        )
+        for i in range(num_runs)
+    ]
+
+
+class TestVectorizedEquivalence:
+    """The NumPy implementations match the original scalar loops."""
+
+    @pytest.mark.parametrize("tau", [1, 7, 42])
+    def test_ewma_matches_loop_over_decades(self, tau):
+        """Blocked closed-form EWMA matches the recursive loop over 40 years."""
+        rng = random.Random(tau)
+        values = [rng.choice([0.0, rng.uniform(0, 300)]) for _ in range(40 * 365)]
+
+        result = _ewma_list(values, tau)
+
+        expected = _reference_exponential_training_load(values, tau)
+        assert result == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+    @pytest.mark.parametrize("sex", ["M", "F"])
+    def test_trimp_values_matches_trimp(self, sex):
+        """Vectorized TRIMP matches per-run TRIMP, including clamped heart rates."""
+        runs = _random_hr_runs(
+            seed=1, num_runs=200, start=date(2020, 1, 1), num_days=30
+        )
+
+        result = trimp_values(
+            np.array([run.avg_heart_rate for run in runs]),
+            np.array([run.duration for run in runs]),
+            max_hr=190,
+            resting_hr=50,
+            sex=sex,
+        )
+
+        expected = [trimp(run, max_hr=190, resting_hr=50, sex=sex) for run in runs]
+        assert result.tolist() == pytest.approx(expected, rel=1e-12)
+
+    @pytest.mark.parametrize("user_timezone", [None, "America/Chicago"])
+    def test_training_stress_balance_matches_loop(self, user_timezone):
+        """TSB over several years matches bucketing and smoothing one day at a time."""
+        first_day = date(2018, 1, 1)
+        runs = _random_hr_runs(seed=2, num_runs=1500, start=first_day, num_days=2000)
+        start_date, end_date = date(2020, 6, 1), date(2023, 12, 31)
+
+        result = training_stress_balance(
+            runs=runs,
+            max_hr=190,
+            resting_hr=50,
+            sex="M",
+            start_date=start_date,
+            end_date=end_date,
+            user_timezone=user_timezone,
+        )
+
+        localized = convert_runs_to_user_timezone(runs, user_timezone)
+        first_run_date = min(run.local_date for run in localized)
+        days = [
+            first_run_date + timedelta(days=i)
+            for i in range((end_date - first_run_date).days + 1)
+        ]
+        daily = {day: 0.0 for day in days}
+        for run in localized:
+            if run.local_date in daily:
+                daily[run.local_date] += trimp(run, 190, 50, "M")
+        atl = _reference_exponential_training_load(list(daily.values()), 7)
+        ctl = _reference_exponential_training_load(list(daily.values()), 42)
+        expected = [
+            (day, c, a, c - a)
+            for day, c, a in zip(days, ctl, atl)
+            if start_date <= day <= end_date
+        ]
+
+        assert [d.date for d in result] == [e[0] for e in expected]
+        assert [d.training_load.ctl for d in result] == pytest.approx(
+            [e[1] for e in expected], rel=1e-9
+        )
+        assert [d.training_load.atl for d in result] == pytest.approx(
+            [e[2] for e in expected], rel=1e-9
+        )
+        assert [d.training_load.tsb for d in result] == pytest.approx(
+            [e[3] for e in expected], rel=1e-9, abs=1e-9
+        )
+
+
+class TestTrainingStressBalanceByProfile:
+    """Test computing training load for several HR profiles in one pass."""
+
+    def test_matches_single_profile_calls(self):
+        """Each profile's series equals a separate training_stress_balance call."""
+        runs = _random_hr_runs(
+            seed=3, num_runs=300, start=date(2022, 1, 1), num_days=400
+        )
+        profiles = [
+            HRProfile(max_hr=190, resting_hr=50, sex="M"),
+            HRProfile(max_hr=180, resting_hr=60, sex="F"),
+            HRProfile(max_hr=200, resting_hr=45, sex="M"),
+        ]
+        start_date, end_date = date(2022, 6, 1), date(2023, 3, 1)
+
+        results = training_stress_balance_by_profile(
+            runs, profiles, start_date, end_date, "America/Chicago"
+        )
+
+        assert len(results) == len(profiles)
+        for profile, result in zip(profiles, results):
+            expected = training_stress_balance(
+                runs=runs,
+                max_hr=profile.max_hr,
+                resting_hr=profile.resting_hr,
+                sex=profile.sex,
+                start_date=start_date,
+                end_date=end_date,
+                user_timezone="America/Chicago",
+            )
+            assert result == expected
+        assert results[0] != results[1]
+
+    def test_empty_runs(self):
+        """Every profile gets a zero series when there are no heart rate runs."""
+        profiles = [
+            HRProfile(max_hr=190, resting_hr=50, sex="M"),
+            HRProfile(max_hr=180, resting_hr=60, sex="F"),
+        ]
+
+        results = training_stress_balance_by_profile(
+            [], profiles, date(2024, 1, 1), date(2024, 1, 3)
+        )
+
+        assert len(results) == 2
+        for result in results:
+            assert [d.date for d in result] == [
+                date(2024, 1, 1),
+                date(2024, 1, 2),
+                date(2024, 1, 3),
+            ]
+            assert all(d.training_load.ctl == 0 for d in result)
+
+
+class TestTrainingLoadByModel:
+    """Test pluggable load models and configurable time constants."""
+
+    def test_banister_matches_training_stress_balance(self):
+        """The banister model is the heart rate TRIMP training load."""
+        runs = _random_hr_runs(
+            seed=4, num_runs=100, start=date(2023, 1, 1), num_days=120
+        )
+        profile = HRProfile(max_hr=190, resting_hr=50, sex="F")
+
+        result = training_load_by_model(
+            runs, ["banister"], date(2023, 2, 1), date(2023, 5, 1), profile=profile
+        )
+
+        assert result["banister"] == training_stress_balance(
+            runs, 190, 50, "F", date(2023, 2, 1), date(2023, 5, 1)
+        )
+
+    def test_banister_requires_profile(self):
+        """Asking for heart rate load without a profile is an error."""
+        with pytest.raises(ValueError):
+            training_load_by_model(
+                [], ["distance", "banister"], date(2024, 1, 1), date(2024, 1, 2)
+            )
+
+    def test_duration_and_distance_include_runs_without_hr(self):
+        """Non-HR models score every run and start from the first run of any kind."""
+        factory = RunFactory()
+        runs = [
+            factory.make(
+                {
+                    "id": "no_hr",
+                    "datetime_utc": datetime(2024, 1, 1, 12),
+                    "distance": 6.0,
+                    "duration": 3000,
+                    "avg_heart_rate": None,
+                }
+            ),
+            factory.make({"id": "hr", "datetime_utc": datetime(2024, 1, 3, 12)}),
+        ]
+        profile = HRProfile(max_hr=190, resting_hr=50, sex="M")
+
+        result = training_load_by_model(
+            runs,
+            ["banister", "distance", "duration"],
+            date(2023, 12, 31),
+            date(2024, 1, 3),
+            profile=profile,
+        )
+
+        alpha = 1 - math.exp(-1 / 7)
+        assert [d.date for d in result["distance"]] == [
+            date(2024, 1, 1),
+            date(2024, 1, 2),
+            date(2024, 1, 3),
+        ]
+        assert result["distance"][0].training_load.atl == pytest.approx(6.0 * alpha)
+        assert result["duration"][0].training_load.atl == pytest.approx(50.0 * alpha)
+        # Only the run with heart rate data counts toward the banister model.
+        assert [d.date for d in result["banister"]] == [date(2024, 1, 3)]
+
+    def test_runs_are_bucketed_once_for_all_models(self):
+        """Adding models does not repeat the timezone conversion of the runs."""
+        runs = _random_hr_runs(seed=5, num_runs=50, start=date(2024, 1, 1), num_days=60)
+        profile = HRProfile(max_hr=190, resting_hr=50, sex="M")
+
+        with patch(
+            "fitness.agg.training_load.convert_runs_to_user_timezone",
+            wraps=convert_runs_to_user_timezone,
+        ) as mock_convert:
+            result = training_load_by_model(
+                runs,
+                list(LOAD_MODELS),
+                date(2024, 1, 1),
+                date(2024, 3, 1),
+                profile=profile,
+                user_timezone="America/Chicago",
+            )
+
+        assert mock_convert.call_count == 1
+        assert set(result) == set(LOAD_MODELS)
+
+    def test_custom_time_constants(self):
+        """ATL and CTL use the requested time constants instead of 7 and 42 days."""
+        runs = _random_hr_runs(seed=6, num_runs=80, start=date(2024, 1, 1), num_days=90)
+        end_date = date(2024, 3, 30)
+
+        result = training_stress_balance(
+            runs, 190, 50, "M", date(2024, 1, 1), end_date, atl_days=3, ctl_days=28
+        )
+
+        daily = [
+            d.trimp
+            for d in trimp_by_day(runs, date(2024, 1, 1), end_date, 190, 50, "M")
+        ]
+        first = (min(run.datetime_utc.date() for run in runs) - date(2024, 1, 1)).days
+        expected_atl = _reference_exponential_training_load(daily, 3)[first:]
+        expected_ctl = _reference_exponential_training_load(daily, 28)[first:]
+        assert [d.training_load.atl for d in result] == pytest.approx(expected_atl)
+        assert [d.training_load.ctl for d in result] == pytest.approx(expected_ctl)
@@ -5,6 +5,7 @@ from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 
 from fitness.db.oauth_credentials import OAuthCredentials
+from fitness.integrations.strava.models import StravaAthlete
 
 
 class TestStravaAuthStatus:
@@ -112,6 +113,7 @@ class TestStravaCallback:
                 "access_token": "new_access_token",
                 "refresh_token": "new_refresh_token",
                 "expires_at_datetime": lambda self=None: future_date,
+                "athlete": StravaAthlete(id=12345, resource_state=1),
             },
         )()
 
@@ -148,6 +150,7 @@ class TestStravaCallback:
         assert saved_creds.refresh_token == "new_refresh_token"
         assert saved_creds.client_id == "test_client_id"
         assert saved_creds.client_secret == "test_secret"
+        assert saved_creds.account_id == "12345"
 
 
 class TestGoogleAuthStatus:
@@ -6,6 +6,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import patch
 
+from fitness.db.runs_history import EditedRun
 from fitness.models import Run
 
 
@@ -34,7 +35,7 @@ class TestDatetimeUtcEditing:
     ):
         """Test updating only the datetime_utc field."""
         mock_get_run.return_value = sample_run
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
 
         # Updated run with new datetime
         updated_run = Run(
@@ -68,6 +69,7 @@ class TestDatetimeUtcEditing:
             updates={"datetime_utc": datetime(2024, 1, 15, 9, 55, 0)},
             changed_by="user123",
             change_reason="Corrected start time - forgot to start watch immediately",
+            expected_version=None,
         )
 
     @patch("fitness.app.routers.run.get_run_by_id")
@@ -77,7 +79,7 @@ class TestDatetimeUtcEditing:
     ):
         """Test updating multiple fields including datetime_utc."""
         mock_get_run.return_value = sample_run
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
 
         updated_run = Run(
             id="test_run_123",
@@ -146,7 +148,7 @@ class TestDatetimeUtcEditing:
         )
 
         mock_get_version.return_value = historical_version
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
         mock_get_run.side_effect = [sample_run, sample_run]  # Second call for response
 
         response = auth_client.post("/runs/test_run_123/restore/1?restored_by=user123")
@@ -167,7 +169,7 @@ class TestDatetimeUtcEditing:
     ):
         """Test that timezone information is handled correctly in datetime edits."""
         mock_get_run.return_value = sample_run
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
         mock_get_run.side_effect = [sample_run, sample_run]
 
         # Test with ISO 8601 format with timezone
@@ -195,7 +197,7 @@ class TestDatetimeUtcBusinessLogic:
     ):
         """Test common use cases for datetime_utc editing."""
         mock_get_run.return_value = sample_run
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
 
         # Mock should return the run object each time it's called
         mock_get_run.side_effect = [sample_run, sample_run, sample_run, sample_run]
@@ -8,7 +8,13 @@ from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 
 from fitness.models import Run
-from fitness.db.runs_history import RunHistoryRecord
+from fitness.db.runs_history import (
+    EditedRun,
+    RunHistoryChange,
+    RunHistoryRecord,
+    RunNotFoundError,
+    RunVersionConflictError,
+)
 
 
 @pytest.fixture
@@ -50,24 +56,13 @@ def sample_history_record():
 class TestUpdateRunEndpoint:
     """Test the PATCH /runs/{run_id} endpoint."""
 
-    @patch("fitness.app.routers.run.get_run_by_id")
     @patch("fitness.app.routers.run.update_run_with_history")
-    def test_update_run_success(
-        self,
-        mock_update: MagicMock,
-        mock_get_run: MagicMock,
-        sample_run,
-        auth_client: TestClient,
-    ):
+    def test_update_run_success(self, mock_update: MagicMock, auth_client: TestClient):
         """Test successful run update."""
-        # Setup mocks
-        mock_get_run.return_value = sample_run
-        mock_update.return_value = None
-
         # Updated run with new values
         updated_run = Run(
             id="test_run_123",
-            datetime_utc=datetime(2024, 1, 15, 10, 0, 0),
+            datetime_utc=datetime(2024, 1, 15, 10, 5, 0),  # Updated
             type="Outdoor Run",
             distance=5.5,  # Updated
             duration=1800.0,
@@ -75,9 +70,7 @@ class TestUpdateRunEndpoint:
             avg_heart_rate=155.0,  # Updated
             shoe_id="nike_pegasus_38",
         )
-
-        # Mock the second get_run_by_id call for returning updated run
-        mock_get_run.side_effect = [sample_run, updated_run]
+        mock_update.return_value = EditedRun(run=updated_run, version=2)
 
         # Request data
         update_data = {
@@ -98,6 +91,9 @@ class TestUpdateRunEndpoint:
         assert result["updated_by"] == "user123"
         assert "distance" in result["updated_fields"]
         assert "avg_heart_rate" in result["updated_fields"]
+        # The updated run comes back from the edit itself
+        assert result["run"]["distance"] == 5.5
+        assert result["version"] == 2
 
         # Verify the update was called correctly
         mock_update.assert_called_once_with(
@@ -109,14 +105,15 @@ class TestUpdateRunEndpoint:
             },
             changed_by="user123",
             change_reason="Corrected GPS data and start time",
+            expected_version=None,
         )
 
-    @patch("fitness.app.routers.run.get_run_by_id")
+    @patch("fitness.app.routers.run.update_run_with_history")
     def test_update_run_not_found(
-        self, mock_get_run: MagicMock, auth_client: TestClient
+        self, mock_update: MagicMock, auth_client: TestClient
     ):
         """Test update of non-existent run."""
-        mock_get_run.return_value = None
+        mock_update.side_effect = RunNotFoundError("Run nonexistent_run not found")
 
         update_data = {"distance": 5.5, "changed_by": "user123"}
 
@@ -125,6 +122,22 @@ class TestUpdateRunEndpoint:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
+    @patch("fitness.app.routers.run.update_run_with_history")
+    def test_update_run_version_conflict(
+        self, mock_update: MagicMock, auth_client: TestClient
+    ):
+        """An edit based on a stale version is rejected with 409."""
+        mock_update.side_effect = RunVersionConflictError(
+            "Run test_run_123 is at version 3, not 2"
+        )
+
+        update_data = {"distance": 5.5, "changed_by": "user123", "expected_version": 2}
+
+        response = auth_client.patch("/runs/test_run_123", json=update_data)
+
+        assert response.status_code == 409
+        assert mock_update.call_args.kwargs["expected_version"] == 2
+
     @patch("fitness.app.routers.run.get_run_by_id")
     def test_update_run_no_fields(
         self, mock_get_run: MagicMock, sample_run, auth_client: TestClient
@@ -165,21 +178,115 @@ class TestUpdateRunEndpoint:
         assert "No valid fields provided" in response.json()["detail"]
 
 
+class TestBatchUpdateRunsEndpoint:
+    """Test the PATCH /runs/batch endpoint."""
+
+    @patch("fitness.app.routers.run.update_runs_with_history")
+    def test_batch_update_success(
+        self, mock_update: MagicMock, auth_client: TestClient
+    ):
+        """Each edit is passed through and the new versions are returned."""
+        mock_update.return_value = {"run_1": 2, "run_2": 4}
+
+        response = auth_client.patch(
+            "/runs/batch",
+            json={
+                "edits": [
+                    {"run_id": "run_1", "distance": 5.5},
+                    {
+                        "run_id": "run_2",
+                        "shoe_id": "brooks_ghost_15",
+                        "expected_version": 3,
+                    },
+                ],
+                "changed_by": "user123",
+                "change_reason": "Shoe cleanup",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["versions"] == {"run_1": 2, "run_2": 4}
+        assert data["updated_by"] == "user123"
+
+        edits = mock_update.call_args.args[0]
+        assert [(e.run_id, e.updates, e.expected_version) for e in edits] == [
+            ("run_1", {"distance": 5.5}, None),
+            ("run_2", {"shoe_id": "brooks_ghost_15"}, 3),
+        ]
+        assert mock_update.call_args.kwargs == {
+            "changed_by": "user123",
+            "change_reason": "Shoe cleanup",
+        }
+
+    @patch("fitness.app.routers.run.update_runs_with_history")
+    def test_batch_update_edit_without_fields(
+        self, mock_update: MagicMock, auth_client: TestClient
+    ):
+        """An edit with nothing to change rejects the batch."""
+        response = auth_client.patch(
+            "/runs/batch",
+            json={
+                "edits": [{"run_id": "run_1", "distance": 5.5}, {"run_id": "run_2"}],
+                "changed_by": "user123",
+            },
+        )
+
+        assert response.status_code == 400
+        assert "run_2" in response.json()["detail"]
+        mock_update.assert_not_called()
+
+    def test_batch_update_requires_edits(self, auth_client: TestClient):
+        """An empty batch is a validation error."""
+        response = auth_client.patch(
+            "/runs/batch", json={"edits": [], "changed_by": "user123"}
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize(
+        "error, status_code",
+        [
+            (RunNotFoundError("Runs not found: run_2"), 404),
+            (RunVersionConflictError("Runs edited since their expected version"), 409),
+            (ValueError("Each run can only be edited once per batch"), 400),
+        ],
+    )
+    @patch("fitness.app.routers.run.update_runs_with_history")
+    def test_batch_update_errors(
+        self, mock_update: MagicMock, error, status_code, auth_client: TestClient
+    ):
+        """Database errors map to the same status codes as single edits."""
+        mock_update.side_effect = error
+
+        response = auth_client.patch(
+            "/runs/batch",
+            json={"edits": [{"run_id": "run_1", "distance": 5.5}], "changed_by": "u"},
+        )
+
+        assert response.status_code == status_code
+
+    def test_batch_update_requires_auth(self, client: TestClient):
+        """Batch edits need authentication like single edits."""
+        response = client.patch(
+            "/runs/batch",
+            json={"edits": [{"run_id": "run_1", "distance": 5.5}], "changed_by": "u"},
+        )
+
+        assert response.status_code == 401
+
+
 class TestGetRunHistoryEndpoint:
     """Test the GET /runs/{run_id}/history endpoint."""
 
-    @patch("fitness.app.routers.run.get_run_by_id")
     @patch("fitness.app.routers.run.get_run_history")
     def test_get_run_history_success(
         self,
         mock_get_history: MagicMock,
-        mock_get_run: MagicMock,
-        sample_run: Run,
         sample_history_record: RunHistoryRecord,
         auth_client: TestClient,
     ):
         """Test successful history retrieval."""
-        mock_get_run.return_value = sample_run
         mock_get_history.return_value = [sample_history_record]
 
         response = auth_client.get("/runs/test_run_123/history")
@@ -191,35 +298,77 @@ class TestGetRunHistoryEndpoint:
         assert result[0]["version_number"] == 1
         assert result[0]["change_type"] == "original"
 
-    @patch("fitness.app.routers.run.get_run_by_id")
+    @patch("fitness.app.routers.run.get_run_history")
     def test_get_run_history_run_not_found(
-        self, mock_get_run: MagicMock, auth_client: TestClient
+        self, mock_get_history: MagicMock, auth_client: TestClient
     ):
         """Test history retrieval for non-existent run."""
-        mock_get_run.return_value = None
+        mock_get_history.side_effect = RunNotFoundError("Run nonexistent_run not found")
 
         response = auth_client.get("/runs/nonexistent_run/history")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
-    @patch("fitness.app.routers.run.get_run_by_id")
     @patch("fitness.app.routers.run.get_run_history")
     def test_get_run_history_with_limit(
         self,
         mock_get_history: MagicMock,
-        mock_get_run: MagicMock,
-        sample_run: Run,
         auth_client: TestClient,
     ):
         """Test history retrieval with limit parameter."""
-        mock_get_run.return_value = sample_run
         mock_get_history.return_value = []
 
         response = auth_client.get("/runs/test_run_123/history?limit=10")
 
         assert response.status_code == 200
-        mock_get_history.assert_called_once_with("test_run_123", limit=10)
+        mock_get_history.assert_called_once_with(
+            "test_run_123", limit=10, before_version=None
+        )
+
+    @patch("fitness.app.routers.run.get_run_history")
+    def test_get_run_history_next_page(
+        self, mock_get_history: MagicMock, auth_client: TestClient
+    ):
+        """The before_version cursor is passed through for the next page."""
+        mock_get_history.return_value = []
+
+        response = auth_client.get(
+            "/runs/test_run_123/history?limit=10&before_version=7"
+        )
+
+        assert response.status_code == 200
+        mock_get_history.assert_called_once_with(
+            "test_run_123", limit=10, before_version=7
+        )
+
+    @patch("fitness.app.routers.run.get_run_history_changes")
+    def test_get_run_history_changes_only(
+        self, mock_get_changes: MagicMock, auth_client: TestClient
+    ):
+        """changes_only returns each version's changed fields instead of snapshots."""
+        mock_get_changes.return_value = [
+            RunHistoryChange(
+                history_id=2,
+                run_id="test_run_123",
+                version_number=2,
+                change_type="edit",
+                changed_at=datetime(2024, 1, 16, 8, 0, 0),
+                changed_by="user123",
+                change_reason="Fixed shoe",
+                changes={"shoe_id": None},
+            )
+        ]
+
+        response = auth_client.get("/runs/test_run_123/history?changes_only=true")
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result[0]["changes"] == {"shoe_id": None}
+        assert "distance" not in result[0]
+        mock_get_changes.assert_called_once_with(
+            "test_run_123", limit=50, before_version=None
+        )
 
 
 class TestGetRunVersionEndpoint:
@@ -294,7 +443,7 @@ class TestRestoreRunEndpoint:
         """Test successful run restoration."""
         mock_get_run.return_value = sample_run
         mock_get_version.return_value = sample_history_record
-        mock_update.return_value = None
+        mock_update.return_value = EditedRun(run=sample_run, version=2)
 
         # Mock the second get_run_by_id call for returning restored run
         mock_get_run.side_effect = [sample_run, sample_run]
@@ -363,18 +512,14 @@ class TestAuthenticationRequirements:
         response = client.post("/runs/test_run_123/restore/1?restored_by=user123")
         assert response.status_code == 401
 
-    @patch("fitness.app.routers.run.get_run_by_id")
     @patch("fitness.app.routers.run.get_run_history")
     def test_get_run_history_no_auth_required(
         self,
         mock_get_history: MagicMock,
-        mock_get_run: MagicMock,
-        sample_run: Run,
         sample_history_record: RunHistoryRecord,
         client: TestClient,
     ):
         """Test that GET /runs/{run_id}/history works without authentication."""
-        mock_get_run.return_value = sample_run
         mock_get_history.return_value = [sample_history_record]
         # Make request without authentication
         response = client.get("/runs/test_run_123/history")
@@ -1,8 +1,14 @@
 """Test the /strava/update-data endpoint."""
 
+import asyncio
 from unittest.mock import patch, MagicMock
+
+import pytest
 from fastapi.testclient import TestClient
 
+from fitness.db.runs import SourceSyncResult
+from fitness.integrations.google.auto_sync import AutoSyncResult
+from fitness.load.strava import StravaRuns
 from fitness.models.run import Run
 from tests._factories.strava_activity_with_gear import StravaActivityWithGearFactory
 
@@ -10,96 +16,152 @@ from tests._factories.strava_activity_with_gear import StravaActivityWithGearFac
 class TestUpdateStravaData:
     """Test POST /strava/update-data endpoint."""
 
-    @patch("fitness.app.routers.strava.bulk_create_runs")
-    @patch("fitness.app.routers.strava.get_existing_run_ids")
+    @patch("fitness.app.routers.strava.possible_duplicates")
+    @patch("fitness.app.routers.strava.sync_source_runs")
     @patch("fitness.app.routers.strava.load_strava_runs")
-    def test_update_data_identifies_new_runs(
+    def test_update_data_syncs_all_strava_runs(
         self,
         mock_load_strava_runs: MagicMock,
-        mock_get_existing_run_ids: MagicMock,
-        mock_bulk_create_runs: MagicMock,
+        mock_sync_source_runs: MagicMock,
+        mock_possible_duplicates: MagicMock,
         auth_client: TestClient,
     ):
-        """Test that update-data correctly identifies and inserts only new runs."""
+        """Test that update-data hands every Strava run to the diff-based sync."""
         # Create 3 Strava activities
         factory = StravaActivityWithGearFactory()
         strava_run_1 = factory.make({"id": 100, "name": "Morning Run"})
         strava_run_2 = factory.make({"id": 200, "name": "Evening Run"})
         strava_run_3 = factory.make({"id": 300, "name": "Weekend Run"})
 
-        # Mock load_strava_runs to return these 3 activities
-        mock_load_strava_runs.return_value = [strava_run_1, strava_run_2, strava_run_3]
-
-        # Mock get_existing_run_ids to return one existing run (strava_200)
-        mock_get_existing_run_ids.return_value = {"strava_200"}
-
-        # Mock bulk_create_runs to return the count of inserted runs
-        mock_bulk_create_runs.return_value = 2
+        # Mock load_strava_runs to return these 3 activities, and a run without
+        # gear that isn't imported.
+        mock_load_strava_runs.return_value = StravaRuns(
+            runs=[strava_run_1, strava_run_2, strava_run_3],
+            listed_ids=[100, 200, 300, 500],
+        )
+
+        # strava_200 already existed and was edited in Strava; strava_400 is gone.
+        mock_sync_source_runs.return_value = SourceSyncResult(
+            created=["strava_100", "strava_300"],
+            updated=["strava_200"],
+            deleted=["strava_400"],
+        )
+        mock_possible_duplicates.return_value = [["strava_100", "mmf_100"]]
 
         response = auth_client.post("/strava/update-data")
 
         assert response.status_code == 200
         data = response.json()
         assert data["inserted_count"] == 2
+        assert data["updated_count"] == 1
+        assert data["deleted_count"] == 1
         assert "Inserted 2 new runs into the database" in data["message"]
         assert "updated_at" in data
+        # New runs are checked against the runs from other sources.
+        assert data["possible_duplicates"] == [["strava_100", "mmf_100"]]
+        mock_possible_duplicates.assert_called_once_with({"strava_100", "strava_300"})
 
         # Verify load_strava_runs was called with the strava_client
         mock_load_strava_runs.assert_called_once()
         # The client should be passed as an argument
         assert len(mock_load_strava_runs.call_args[0]) == 1
 
-        # Verify get_existing_run_ids was called
-        mock_get_existing_run_ids.assert_called_once()
-
-        # Verify bulk_create_runs was called with the 2 new runs (strava_100 and strava_300)
-        mock_bulk_create_runs.assert_called_once()
-        new_runs = mock_bulk_create_runs.call_args[0][0]
-        assert len(new_runs) == 2
+        # Every fetched run is synced, and runs missing from Strava are deleted.
+        mock_sync_source_runs.assert_called_once()
+        runs, source = mock_sync_source_runs.call_args[0]
+        assert source == "Strava"
+        assert all(isinstance(run, Run) for run in runs)
+        assert {run.id for run in runs} == {"strava_100", "strava_200", "strava_300"}
+        assert mock_sync_source_runs.call_args.kwargs["delete_missing"] is True
+        # The run without gear is still in Strava, so it isn't deleted.
+        assert mock_sync_source_runs.call_args.kwargs["listed_ids"] == [
+            "strava_100",
+            "strava_200",
+            "strava_300",
+            "strava_500",
+        ]
+
+    @patch("fitness.app.routers.strava.possible_duplicates", return_value=[])
+    @patch("fitness.app.routers.strava.sync_new_runs")
+    @patch("fitness.app.routers.strava.auto_sync_enabled", return_value=True)
+    @patch("fitness.app.routers.strava.sync_source_runs")
+    @patch("fitness.app.routers.strava.load_strava_runs")
+    def test_update_data_auto_syncs_only_created_runs(
+        self,
+        mock_load_strava_runs: MagicMock,
+        mock_sync_source_runs: MagicMock,
+        _mock_enabled: MagicMock,
+        mock_sync_new_runs: MagicMock,
+        _mock_possible_duplicates: MagicMock,
+        auth_client: TestClient,
+    ):
+        """Test that edited runs are not pushed to the calendar a second time."""
+        factory = StravaActivityWithGearFactory()
+        mock_load_strava_runs.return_value = StravaRuns(
+            runs=[factory.make({"id": 100}), factory.make({"id": 200})],
+            listed_ids=[100, 200],
+        )
+        mock_sync_source_runs.return_value = SourceSyncResult(
+            created=["strava_100"], updated=["strava_200"]
+        )
+        mock_sync_new_runs.return_value = AutoSyncResult(synced=1, failed=0)
 
-        # Verify the runs are Run objects (converted from StravaActivityWithGear)
-        for run in new_runs:
-            assert isinstance(run, Run)
+        response = auth_client.post("/strava/update-data")
 
-        # Verify the correct runs were identified as new
-        new_run_ids = {run.id for run in new_runs}
-        assert "strava_100" in new_run_ids
-        assert "strava_300" in new_run_ids
-        assert "strava_200" not in new_run_ids  # This one already exists
+        assert response.status_code == 200
+        assert response.json()["calendar_synced"] == 1
+        mock_sync_new_runs.assert_called_once()
+        assert [run.id for run in mock_sync_new_runs.call_args[0][0]] == ["strava_100"]
 
-    @patch("fitness.app.routers.strava.bulk_create_runs")
-    @patch("fitness.app.routers.strava.get_existing_run_ids")
+    @patch("fitness.app.routers.strava.sync_source_runs")
     @patch("fitness.app.routers.strava.load_strava_runs")
-    def test_update_data_no_new_runs(
+    def test_update_data_no_changes(
         self,
         mock_load_strava_runs: MagicMock,
-        mock_get_existing_run_ids: MagicMock,
-        mock_bulk_create_runs: MagicMock,
+        mock_sync_source_runs: MagicMock,
         auth_client: TestClient,
     ):
-        """Test that update-data handles the case when all runs already exist."""
+        """Test that update-data handles the case when nothing changed."""
         factory = StravaActivityWithGearFactory()
-        strava_run_1 = factory.make({"id": 100, "name": "Morning Run"})
-        strava_run_2 = factory.make({"id": 200, "name": "Evening Run"})
-
-        # Mock load_strava_runs to return 2 activities
-        mock_load_strava_runs.return_value = [strava_run_1, strava_run_2]
-
-        # Mock get_existing_run_ids to return both runs as existing
-        mock_get_existing_run_ids.return_value = {"strava_100", "strava_200"}
+        mock_load_strava_runs.return_value = StravaRuns(
+            runs=[
+                factory.make({"id": 100, "name": "Morning Run"}),
+                factory.make({"id": 200, "name": "Evening Run"}),
+            ],
+            listed_ids=[100, 200],
+        )
+        mock_sync_source_runs.return_value = SourceSyncResult()
 
         response = auth_client.post("/strava/update-data")
 
         assert response.status_code == 200
         data = response.json()
         assert data["inserted_count"] == 0
+        assert data["updated_count"] == 0
+        assert data["deleted_count"] == 0
+        assert data["possible_duplicates"] == []
         assert "Inserted 0 new runs into the database" in data["message"]
 
-        # Verify load_strava_runs was called
-        mock_load_strava_runs.assert_called_once()
+    @patch("fitness.app.routers.strava.sync_source_runs")
+    @patch("fitness.app.routers.strava.load_strava_runs")
+    def test_update_data_fetches_off_the_event_loop(
+        self,
+        mock_load_strava_runs: MagicMock,
+        mock_sync_source_runs: MagicMock,
+        auth_client: TestClient,
+    ):
+        """The blocking Strava fetch runs in a worker thread, not on the loop."""
+
+        def load_strava_runs(client):
+            # Raises RuntimeError on the event loop's thread.
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return StravaRuns(runs=[], listed_ids=[])
+
+        mock_load_strava_runs.side_effect = load_strava_runs
+        mock_sync_source_runs.return_value = SourceSyncResult()
 
-        # Verify get_existing_run_ids was called
-        mock_get_existing_run_ids.assert_called_once()
+        response = auth_client.post("/strava/update-data")
 
-        # Verify bulk_create_runs was NOT called since there are no new runs
-        mock_bulk_create_runs.assert_not_called()
+        assert response.status_code == 200
+        mock_load_strava_runs.assert_called_once()
@@ -0,0 +1,267 @@
+"""Test the /strava/webhook endpoints."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fitness.app.routers.strava import _delete_strava_activity, _store_strava_activity
+from fitness.db.oauth_credentials import OAuthCredentials
+from tests._factories.strava_activity_with_gear import StravaActivityWithGearFactory
+
+
+def _event(**overrides) -> dict:
+    return {
+        "object_type": "activity",
+        "object_id": 12345,
+        "aspect_type": "create",
+        "owner_id": 1,
+        "subscription_id": 99,
+        "event_time": 1_700_000_000,
+        "updates": {},
+        **overrides,
+    }
+
+
+class TestValidateStravaWebhook:
+    """Test GET /strava/webhook (subscription validation)."""
+
+    def test_echoes_challenge(self, client: TestClient, monkeypatch):
+        monkeypatch.setenv("STRAVA_WEBHOOK_VERIFY_TOKEN", "secret")
+        response = client.get(
+            "/strava/webhook",
+            params={
+                "hub.mode": "subscribe",
+                "hub.challenge": "abc123",
+                "hub.verify_token": "secret",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"hub.challenge": "abc123"}
+
+    def test_wrong_verify_token(self, client: TestClient, monkeypatch):
+        monkeypatch.setenv("STRAVA_WEBHOOK_VERIFY_TOKEN", "secret")
+        response = client.get(
+            "/strava/webhook",
+            params={
+                "hub.mode": "subscribe",
+                "hub.challenge": "abc123",
+                "hub.verify_token": "guess",
+            },
+        )
+
+        assert response.status_code == 403
+
+    def test_not_configured(self, client: TestClient, monkeypatch):
+        monkeypatch.delenv("STRAVA_WEBHOOK_VERIFY_TOKEN", raising=False)
+        response = client.get(
+            "/strava/webhook",
+            params={
+                "hub.mode": "subscribe",
+                "hub.challenge": "abc123",
+                "hub.verify_token": "secret",
+            },
+        )
+
+        assert response.status_code == 503
+
+
+def _credentials(account_id: str | None = "1") -> OAuthCredentials:
+    return OAuthCredentials(
+        provider="strava",
+        client_id="client_id",
+        client_secret="client_secret",
+        access_token="access_token",
+        refresh_token="refresh_token",
+        account_id=account_id,
+    )
+
+
+class TestReceiveStravaWebhook:
+    """Test POST /strava/webhook (event receiver)."""
+
+    @pytest.fixture(autouse=True)
+    def configured(self, monkeypatch):
+        """Configure the webhook for subscription 99 and athlete 1."""
+        monkeypatch.setenv("STRAVA_WEBHOOK_SUBSCRIPTION_ID", "99")
+        with patch(
+            "fitness.app.routers.strava.get_credentials",
+            new_callable=AsyncMock,
+            return_value=_credentials(),
+        ) as get_credentials:
+            yield get_credentials
+
+    @pytest.mark.parametrize("aspect_type", ["create", "update"])
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_activity_changes_are_ingested(
+        self, mock_ingest: AsyncMock, aspect_type: str, client: TestClient
+    ):
+        response = client.post("/strava/webhook", json=_event(aspect_type=aspect_type))
+
+        assert response.status_code == 200
+        assert response.json() == {"accepted": True}
+        mock_ingest.assert_awaited_once_with(12345)
+
+    @patch("fitness.app.routers.strava._delete_strava_activity", new_callable=AsyncMock)
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_deleted_activities_are_deleted(
+        self, mock_ingest: AsyncMock, mock_delete: AsyncMock, client: TestClient
+    ):
+        response = client.post("/strava/webhook", json=_event(aspect_type="delete"))
+
+        assert response.status_code == 200
+        assert response.json() == {"accepted": True}
+        mock_delete.assert_awaited_once_with(12345)
+        mock_ingest.assert_not_awaited()
+
+    @patch("fitness.app.routers.strava._delete_strava_activity", new_callable=AsyncMock)
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_other_events_are_ignored(
+        self, mock_ingest: AsyncMock, mock_delete: AsyncMock, client: TestClient
+    ):
+        event = _event(
+            object_type="athlete", aspect_type="update", updates={"authorized": "false"}
+        )
+        response = client.post("/strava/webhook", json=event)
+
+        assert response.status_code == 200
+        assert response.json() == {"accepted": False}
+        mock_ingest.assert_not_awaited()
+        mock_delete.assert_not_awaited()
+
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_unknown_subscription_is_rejected(
+        self, mock_ingest: AsyncMock, client: TestClient, monkeypatch
+    ):
+        monkeypatch.setenv("STRAVA_WEBHOOK_SUBSCRIPTION_ID", "42")
+        response = client.post("/strava/webhook", json=_event(subscription_id=99))
+
+        assert response.status_code == 403
+        mock_ingest.assert_not_awaited()
+
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_not_configured(
+        self, mock_ingest: AsyncMock, client: TestClient, monkeypatch
+    ):
+        monkeypatch.delenv("STRAVA_WEBHOOK_SUBSCRIPTION_ID")
+        response = client.post("/strava/webhook", json=_event())
+
+        assert response.status_code == 503
+        mock_ingest.assert_not_awaited()
+
+    @patch("fitness.app.routers.strava._delete_strava_activity", new_callable=AsyncMock)
+    def test_other_athletes_events_are_rejected(
+        self, mock_delete: AsyncMock, client: TestClient
+    ):
+        event = _event(aspect_type="delete", owner_id=2)
+        response = client.post("/strava/webhook", json=event)
+
+        assert response.status_code == 403
+        mock_delete.assert_not_awaited()
+
+    @pytest.mark.parametrize("credentials", [None, _credentials(account_id=None)])
+    @patch("fitness.app.routers.strava._ingest_strava_activity", new_callable=AsyncMock)
+    def test_unknown_athlete(
+        self,
+        mock_ingest: AsyncMock,
+        credentials: OAuthCredentials | None,
+        client: TestClient,
+        configured: AsyncMock,
+    ):
+        """Without a stored athlete, no event can be checked, so none is accepted."""
+        configured.return_value = credentials
+        response = client.post("/strava/webhook", json=_event())
+
+        assert response.status_code == 503
+        mock_ingest.assert_not_awaited()
+
+    def test_malformed_event(self, client: TestClient):
+        response = client.post("/strava/webhook", json={"object_type": "activity"})
+        assert response.status_code == 422
+
+
+class TestStoreStravaActivity:
+    """Test storing the run of a pushed activity."""
+
+    @patch("fitness.app.routers.strava.sync_new_runs")
+    @patch("fitness.app.routers.strava.auto_sync_enabled", return_value=True)
+    @patch("fitness.app.routers.strava.upsert_run_with_history")
+    @patch("fitness.app.routers.strava.load_strava_run")
+    def test_new_run_is_created_and_synced(
+        self,
+        mock_load: MagicMock,
+        mock_upsert: MagicMock,
+        _mock_enabled: MagicMock,
+        mock_sync: MagicMock,
+    ):
+        mock_load.return_value = StravaActivityWithGearFactory().make({"id": 12345})
+        mock_upsert.return_value = "created"
+
+        _store_strava_activity(MagicMock(), 12345)
+
+        run = mock_upsert.call_args[0][0]
+        assert run.id == "strava_12345"
+        assert run.shoe_name == "Nike Air Zoom Pegasus 37"
+        mock_sync.assert_called_once_with([run])
+
+    @patch("fitness.app.routers.strava.sync_new_runs")
+    @patch("fitness.app.routers.strava.auto_sync_enabled", return_value=True)
+    @patch("fitness.app.routers.strava.upsert_run_with_history")
+    @patch("fitness.app.routers.strava.load_strava_run")
+    def test_updated_run_is_not_synced_again(
+        self,
+        mock_load: MagicMock,
+        mock_upsert: MagicMock,
+        _mock_enabled: MagicMock,
+        mock_sync: MagicMock,
+    ):
+        mock_load.return_value = StravaActivityWithGearFactory().make({"id": 12345})
+        mock_upsert.return_value = "updated"
+
+        _store_strava_activity(MagicMock(), 12345)
+
+        mock_sync.assert_not_called()
+
+    @patch("fitness.app.routers.strava.upsert_run_with_history")
+    @patch("fitness.app.routers.strava.load_strava_run", return_value=None)
+    def test_non_runs_are_skipped(self, _mock_load: MagicMock, mock_upsert: MagicMock):
+        _store_strava_activity(MagicMock(), 12345)
+        mock_upsert.assert_not_called()
+
+
+class TestDeleteStravaActivity:
+    """Test deleting the run of a deleted activity."""
+
+    @pytest.mark.asyncio
+    @patch("fitness.app.routers.strava.sync_source_runs", new_callable=AsyncMock)
+    @patch("fitness.app.routers.strava.strava_client", new_callable=AsyncMock)
+    async def test_soft_deletes_only_that_run(
+        self, mock_client: AsyncMock, mock_sync: AsyncMock
+    ):
+        mock_client.return_value.activity_exists = MagicMock(return_value=False)
+
+        await _delete_strava_activity(12345)
+
+        mock_client.return_value.activity_exists.assert_called_once_with(12345)
+
+        mock_sync.assert_awaited_once_with(
+            [],
+            "Strava",
+            changed_by="strava_webhook",
+            change_reason="Deleted in Strava",
+            deleted_ids=["strava_12345"],
+        )
+
+    @pytest.mark.asyncio
+    @patch("fitness.app.routers.strava.sync_source_runs", new_callable=AsyncMock)
+    @patch("fitness.app.routers.strava.strava_client", new_callable=AsyncMock)
+    async def test_activities_still_in_strava_are_kept(
+        self, mock_client: AsyncMock, mock_sync: AsyncMock
+    ):
+        """A delete event for an activity Strava still has deletes nothing."""
+        mock_client.return_value.activity_exists = MagicMock(return_value=True)
+
+        await _delete_strava_activity(12345)
+
+        mock_sync.assert_not_awaited()
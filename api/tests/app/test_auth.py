@@ -7,6 +7,9 @@ from unittest.mock import patch
 
 from fitness.app import app
 from fitness.app.dependencies import strava_client
+from fitness.db.runs import SourceSyncResult
+from fitness.integrations.http_client import http_stats
+from fitness.load.strava import StravaRuns
 
 
 @pytest.fixture(scope="function")
@@ -17,6 +20,10 @@ def override_strava_client():
     app.dependency_overrides = {}
 
 
+async def sync_nothing(runs, source, **kwargs) -> SourceSyncResult:
+    return SourceSyncResult()
+
+
 class TestAuthenticationEndpoints:
     """Test HTTP Basic Authentication on endpoints."""
 
@@ -32,8 +39,11 @@ class TestAuthenticationEndpoints:
     ):
         """POST /strava/update-data should succeed with valid credentials."""
         with monkeypatch.context() as m:
-            m.setattr("fitness.app.routers.strava.load_strava_runs", lambda client: [])
-            m.setattr("fitness.app.routers.strava.get_existing_run_ids", lambda: [])
+            m.setattr(
+                "fitness.app.routers.strava.load_strava_runs",
+                lambda client: StravaRuns(runs=[], listed_ids=[]),
+            )
+            m.setattr("fitness.app.routers.strava.sync_source_runs", sync_nothing)
             response = auth_client.post("/strava/update-data")
 
         assert response.status_code == 200
@@ -52,6 +62,18 @@ class TestAuthenticationEndpoints:
         response = client.post("/strava/update-data", auth=("testuser", "wrongpass"))
         assert response.status_code == 401
 
+    def test_http_stats_requires_auth(self, client: TestClient):
+        """GET /integrations/http-stats should require authentication."""
+        response = client.get("/integrations/http-stats")
+        assert response.status_code == 401
+
+    def test_http_stats_with_valid_credentials(self, auth_client: TestClient):
+        """GET /integrations/http-stats should report each provider's stats."""
+        response = auth_client.get("/integrations/http-stats")
+
+        assert response.status_code == 200
+        assert response.json() == http_stats()
+
     def test_read_runs_no_auth_required(self, client: TestClient):
         """GET /runs should not require authentication."""
         with patch("fitness.app.dependencies.all_runs") as mock_runs:
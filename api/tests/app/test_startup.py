@@ -0,0 +1,56 @@
+"""Guard the API's cold start: how long `import fitness.app` takes.
+
+Serverless deployments import the app on every cold start, so a slow import is
+latency on the first request. Each import runs in a fresh interpreter.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules only some requests need, which importing the app must not load.
+DEFERRED_MODULES = ("httpx", "numpy")
+
+# Generous enough for a loaded CI runner; the import takes well under a second.
+IMPORT_BUDGET_MS = float(os.getenv("FITNESS_IMPORT_BUDGET_MS", "1500"))
+
+API_DIR = Path(__file__).parents[2]
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=API_DIR,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_ms() -> float:
+    """Cumulative time to import `fitness.app`, as reported by -X importtime."""
+    stderr = _python("-X", "importtime", "-c", "import fitness.app").stderr
+    match = re.search(r"^import time:\s*\d+ \|\s*(\d+) \| fitness\.app$", stderr, re.M)
+    assert match, stderr
+    return int(match.group(1)) / 1000
+
+
+def test_importing_the_app_defers_heavy_modules():
+    code = (
+        "import sys, fitness.app; "
+        f"print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    )
+    loaded = _python("-c", code).stdout.splitlines()[-1]
+    assert loaded == "[]"
+
+
+def test_importing_the_app_is_within_budget():
+    # The best of a few runs, so a briefly busy machine doesn't fail the test.
+    import_ms = min(_import_time_ms() for _ in range(3))
+    assert import_ms < IMPORT_BUDGET_MS, (
+        f"import fitness.app took {import_ms:.0f}ms, over the "
+        f"{IMPORT_BUDGET_MS:.0f}ms budget"
+    )
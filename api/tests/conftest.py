@@ -1,6 +1,13 @@
+import os
+
 import pytest
 from fitness.app import env_loader  # noqa: F401
 
+# Validate every model built from a database row, even though production trusts them.
+os.environ.setdefault("VALIDATE_DB_ROWS", "1")
+# Fail fast when a test reaches for a database that isn't there.
+os.environ.setdefault("DATABASE_POOL_TIMEOUT", "2")
+
 from ._factories import RunFactory, StravaActivityWithGearFactory, MmfActivityFactory
 
 
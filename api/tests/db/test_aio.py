@@ -0,0 +1,121 @@
+"""
+Tests for the async database functions.
+"""
+
+from datetime import datetime
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+
+from fitness.db import statements
+from fitness.db.aio.runs import (
+    bulk_create_runs,
+    get_existing_run_ids,
+    sync_source_runs,
+)
+from fitness.models import Run
+
+
+def _mock_async_cursor_context(mock_get_cursor: MagicMock) -> AsyncMock:
+    """Make `async with get_async_db_cursor() as cursor` yield a mock cursor."""
+    mock_cursor = AsyncMock()
+    mock_get_cursor.return_value.__aenter__.return_value = mock_cursor
+    return mock_cursor
+
+
+@pytest.mark.asyncio
+@patch("fitness.db.aio.runs.get_async_db_cursor")
+async def test_get_existing_run_ids(mock_get_cursor):
+    """Run IDs are read with the shared prepared statement."""
+    mock_cursor = _mock_async_cursor_context(mock_get_cursor)
+    mock_cursor.fetchall.return_value = [("run_1",), ("run_2",)]
+
+    assert await get_existing_run_ids() == {"run_1", "run_2"}
+    mock_cursor.execute.assert_awaited_once_with(
+        statements.ACTIVE_RUN_IDS.sql, None, prepare=True
+    )
+
+
+@pytest.mark.asyncio
+@patch("fitness.db.aio.runs.get_async_db_connection")
+@patch("fitness.db.aio.runs.bulk_create_shoes_by_names")
+@patch("fitness.db.aio.runs.get_existing_shoes_by_names")
+async def test_bulk_create_runs_inserts_runs_and_history(
+    mock_get_shoes, mock_create_shoes, mock_get_connection
+):
+    """Runs and their original history rows are inserted in one transaction."""
+    mock_get_shoes.return_value = {"Nike Pegasus 37": "nike_pegasus_37"}
+    mock_create_shoes.return_value = {}
+    mock_connection = MagicMock()
+    mock_cursor = AsyncMock()
+    mock_cursor.rowcount = 1
+    mock_connection.cursor.return_value.__aenter__.return_value = mock_cursor
+    mock_get_connection.return_value.__aenter__.return_value = mock_connection
+
+    run = Run(
+        id="strava_1",
+        datetime_utc=datetime(2024, 1, 1, 12),
+        type="Outdoor Run",
+        distance=5.0,
+        duration=1800.0,
+        source="Strava",
+    )
+    run._shoe_name = "Nike Pegasus 37"
+
+    assert await bulk_create_runs([run]) == 1
+
+    mock_connection.transaction.assert_called_once()
+    (run_sql, run_rows), (history_sql, history_rows) = [
+        call.args for call in mock_cursor.executemany.await_args_list
+    ]
+    assert run_sql == statements.INSERT_RUN.sql
+    assert run_rows[0][7] == "nike_pegasus_37"
+    assert history_sql == statements.INSERT_RUN_HISTORY_BATCH.sql
+    assert history_rows[0][1:3] == (1, "original")
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_runs_empty():
+    """No database work is done for an empty batch."""
+    assert await bulk_create_runs([]) == 0
+
+
+@pytest.mark.asyncio
+@patch("fitness.db.aio.runs.get_async_db_cursor")
+@patch("fitness.db.aio.runs.bulk_create_shoes_by_names")
+@patch("fitness.db.aio.runs.get_existing_shoes_by_names")
+async def test_sync_source_runs_diffs_in_one_statement(
+    mock_get_shoes, mock_create_shoes, mock_get_cursor
+):
+    """The fetched runs go to the database as arrays; outcomes come back."""
+    mock_get_shoes.return_value = {}
+    mock_create_shoes.return_value = {"Nike Pegasus 37": "nike_pegasus_37"}
+    mock_cursor = _mock_async_cursor_context(mock_get_cursor)
+    mock_cursor.fetchall.return_value = [
+        ("created", "strava_1"),
+        ("deleted", "strava_0"),
+    ]
+    run = Run(
+        id="strava_1",
+        datetime_utc=datetime(2024, 1, 1, 12),
+        type="Outdoor Run",
+        distance=5.0,
+        duration=1800.0,
+        source="Strava",
+    )
+    run._shoe_name = "Nike Pegasus 37"
+
+    result = await sync_source_runs(
+        [run], "Strava", "strava_import", delete_missing=True
+    )
+
+    assert (result.created, result.updated, result.deleted) == (
+        ["strava_1"],
+        [],
+        ["strava_0"],
+    )
+    sql, params = mock_cursor.execute.await_args.args
+    assert sql == statements.SYNC_SOURCE_RUNS.sql
+    assert params["id"] == ["strava_1"]
+    assert params["shoe_id"] == ["nike_pegasus_37"]
+    assert params["delete_missing"] is True
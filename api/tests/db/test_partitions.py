@@ -0,0 +1,78 @@
+"""
+Tests for runs_history partition maintenance.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fitness.db.partitions import (
+    NotPartitionedError,
+    archive_history_partition,
+    create_history_partition,
+)
+
+PARTITIONS = ["runs_history_2024", "runs_history_2025", "runs_history_default"]
+
+
+def _mock_cursor(mock_get_cursor: MagicMock) -> MagicMock:
+    mock_cursor = MagicMock()
+    mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+    return mock_cursor
+
+
+def _executed_sql(mock_cursor: MagicMock) -> list[str]:
+    return [call.args[0].as_string(None) for call in mock_cursor.execute.call_args_list]
+
+
+@patch("fitness.db.partitions.get_history_partitions", return_value=PARTITIONS)
+@patch("fitness.db.partitions.get_db_cursor")
+def test_create_history_partition(mock_get_cursor, _mock_partitions):
+    """The new partition takes over its year's rows from the default partition."""
+    mock_cursor = _mock_cursor(mock_get_cursor)
+
+    assert create_history_partition(2026) is True
+
+    create, move, attach = _executed_sql(mock_cursor)
+    assert create.startswith('CREATE TABLE "runs_history_2026" (LIKE runs_history')
+    assert 'DELETE FROM "runs_history_default"' in move
+    assert 'INSERT INTO "runs_history_2026"' in move
+    assert attach == (
+        'ALTER TABLE runs_history ATTACH PARTITION "runs_history_2026" '
+        "FOR VALUES FROM ('2026-01-01'::date) TO ('2027-01-01'::date)"
+    )
+
+
+@patch("fitness.db.partitions.get_history_partitions", return_value=PARTITIONS)
+@patch("fitness.db.partitions.get_db_cursor")
+def test_create_history_partition_exists(mock_get_cursor, _mock_partitions):
+    """An existing partition is left alone."""
+    assert create_history_partition(2025) is False
+    mock_get_cursor.assert_not_called()
+
+
+@patch("fitness.db.partitions.get_history_partitions", return_value=[])
+def test_create_history_partition_not_partitioned(_mock_partitions):
+    with pytest.raises(NotPartitionedError, match="not partitioned"):
+        create_history_partition(2026)
+
+
+@patch("fitness.db.partitions.get_history_partitions", return_value=PARTITIONS)
+@patch("fitness.db.partitions.get_db_cursor")
+def test_archive_history_partition(mock_get_cursor, _mock_partitions):
+    """Archiving detaches the year's partition, then moves latest versions back."""
+    mock_cursor = _mock_cursor(mock_get_cursor)
+
+    assert archive_history_partition(2024) == "runs_history_2024"
+    detach, keep_latest = _executed_sql(mock_cursor)
+    assert detach == 'ALTER TABLE runs_history DETACH PARTITION "runs_history_2024"'
+    assert 'DELETE FROM "runs_history_2024" a' in keep_latest
+    assert "INSERT INTO runs_history SELECT * FROM latest" in keep_latest
+
+
+@patch("fitness.db.partitions.get_history_partitions", return_value=PARTITIONS)
+@patch("fitness.db.partitions.get_db_cursor")
+def test_archive_missing_partition(mock_get_cursor, _mock_partitions):
+    with pytest.raises(NotPartitionedError, match="runs_history_2019"):
+        archive_history_partition(2019)
+    mock_get_cursor.assert_not_called()
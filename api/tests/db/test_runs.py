@@ -0,0 +1,132 @@
+"""
+Tests for building run models from database rows.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from fitness.db.runs import (
+    _row_to_run,
+    _row_to_run_detail,
+    _run_detail_row_factory,
+    _run_row_factory,
+    get_run_by_id,
+    get_run_records_as_of,
+)
+from fitness.db import statements
+from fitness.models import RunRecord
+
+RUN_ROW = (
+    "strava_1",
+    datetime(2024, 11, 4, 12),
+    "Outdoor Run",
+    5.0,
+    1800.0,
+    "Strava",
+    150.0,
+    "nike_pegasus_37",
+    None,
+    "Nike Pegasus 37",
+)
+DETAIL_ROW = RUN_ROW + (
+    "Worn out",
+    "synced",
+    datetime(2024, 11, 5),
+    "event_1",
+    2,
+    None,
+    2,
+)
+
+
+class TestTrustedRowConstruction:
+    """Unvalidated construction builds the same models as validation."""
+
+    def test_row_to_run_matches_validated(self):
+        trusted = _row_to_run(RUN_ROW, validate=False)
+        validated = _row_to_run(RUN_ROW)
+
+        assert trusted == validated
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.shoe_name == "Nike Pegasus 37"
+        assert trusted.model_fields_set == validated.model_fields_set
+
+    def test_row_to_run_detail_matches_validated(self):
+        trusted = _row_to_run_detail(DETAIL_ROW, validate=False)
+        validated = _row_to_run_detail(DETAIL_ROW)
+
+        assert trusted == validated
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.is_synced
+        assert trusted.shoes == "Nike Pegasus 37"
+
+    def test_trusted_run_is_mutable_like_validated(self):
+        run = _row_to_run(RUN_ROW, validate=False)
+        run.soft_delete()
+        run._shoe_name = "Other Shoe"
+
+        assert run.is_deleted
+        assert run.shoe_name == "Other Shoe"
+
+
+class TestRowFactories:
+    """Row factories validate only when VALIDATE_DB_ROWS is set."""
+
+    bad_row = RUN_ROW[:2] + ("Bike Ride",) + RUN_ROW[3:]
+
+    def test_validation_on(self, monkeypatch):
+        monkeypatch.setenv("VALIDATE_DB_ROWS", "1")
+
+        with pytest.raises(ValidationError):
+            _run_row_factory(MagicMock())(self.bad_row)
+
+    def test_validation_off(self, monkeypatch):
+        monkeypatch.delenv("VALIDATE_DB_ROWS", raising=False)
+
+        run = _run_row_factory(MagicMock())(self.bad_row)
+        detail = _run_detail_row_factory(MagicMock())(DETAIL_ROW)
+
+        assert run.type == "Bike Ride"
+        assert detail == _row_to_run_detail(DETAIL_ROW)
+
+    @patch("fitness.db.runs.get_db_cursor")
+    def test_get_run_by_id_uses_row_factory(self, mock_get_cursor):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert get_run_by_id("missing") is None
+        mock_get_cursor.assert_called_once_with(row_factory=_run_row_factory)
+
+
+class TestRunRecordsAsOf:
+    """Rebuilding the run set at a past instant from runs_history."""
+
+    @patch("fitness.db.runs.get_db_cursor")
+    def test_as_of_reads_history(self, mock_get_cursor):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [RunRecord(*RUN_ROW)]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        as_of = datetime(2024, 11, 5, 12)
+        records = get_run_records_as_of(as_of)
+
+        assert records == [RunRecord(*RUN_ROW)]
+        mock_cursor.execute.assert_called_once_with(
+            statements.ACTIVE_RUNS_AS_OF.sql, {"as_of": as_of}, prepare=True
+        )
+
+    @patch("fitness.db.runs.get_db_cursor")
+    def test_as_of_aware_datetime_is_compared_in_utc(self, mock_get_cursor):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        eastern = timezone(timedelta(hours=-5))
+        get_run_records_as_of(datetime(2024, 11, 5, 7, tzinfo=eastern))
+
+        params = mock_cursor.execute.call_args[0][1]
+        assert params == {"as_of": datetime(2024, 11, 5, 12)}
@@ -7,12 +7,19 @@ from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 from fitness.models import Run
+from fitness.db.runs import SourceSyncResult
 from fitness.db.runs_history import (
     insert_run_history,
     get_run_history,
+    get_run_history_changes,
     get_run_version,
     update_run_with_history,
+    update_runs_with_history,
+    upsert_run_with_history,
+    RunEdit,
     RunHistoryRecord,
+    RunNotFoundError,
+    RunVersionConflictError,
 )
 
 
@@ -134,60 +141,146 @@ class TestGetRunHistory:
         get_run_history("test_run_123", limit=10)
 
         # Verify limit was applied
-        call_args = mock_cursor.execute.call_args[0]
-        assert "LIMIT %s" in call_args[0]
-        assert 10 in call_args[1]
+        call_args = mock_cursor.execute.call_args_list[0][0]
+        assert "LIMIT %(limit)s" in call_args[0]
+        assert call_args[1]["limit"] == 10
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_get_run_history_next_page(self, mock_get_cursor):
+        """Later pages are read with a keyset condition on the version number."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (12,)
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        # Past the last page of an existing run
+        assert get_run_history("test_run_123", limit=10, before_version=1) == []
+
+        sql, params = mock_cursor.execute.call_args_list[0][0]
+        assert "version_number < %(before_version)s" in sql
+        assert "OFFSET" not in sql
+        assert params["before_version"] == 1
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_get_run_history_run_not_found(self, mock_get_cursor):
+        """A run that doesn't exist raises instead of returning no history."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = None
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        with pytest.raises(RunNotFoundError):
+            get_run_history("nonexistent_run")
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_get_run_history_changes(self, mock_get_cursor):
+        """Changed fields come back from the database as a dict per version."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            (
+                2,
+                "test_run_123",
+                2,
+                "edit",
+                datetime(2024, 1, 16, 8, 0),
+                "user123",
+                "Updated distance",
+                {"distance": 5.5},
+            )
+        ]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        changes = get_run_history_changes("test_run_123", limit=10)
+
+        assert changes[0].version_number == 2
+        assert changes[0].changes == {"distance": 5.5}
+        sql = mock_cursor.execute.call_args[0][0]
+        assert "LAG(distance) OVER w" in sql
+        mock_cursor.execute.assert_called_once()
 
 
 class TestUpdateRunWithHistory:
     """Test run updates with history tracking."""
 
-    @patch("fitness.db.runs_history.get_db_connection")
-    @patch("fitness.db.runs.get_run_by_id")
-    def test_update_run_with_history_success(
-        self, mock_get_run, mock_get_connection, sample_run
-    ):
-        """Test successful run update with history tracking."""
-        # Setup mocks
-        mock_get_run.return_value = sample_run
-
-        mock_connection = MagicMock()
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_run_with_history_success(self, mock_get_cursor):
+        """The edit and its history row are written by a single statement."""
         mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = [1]  # Current version
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_get_connection.return_value.__enter__.return_value = mock_connection
+        mock_cursor.fetchone.return_value = (
+            "test_run_123",
+            datetime(2024, 1, 15, 10, 0, 0),
+            "Outdoor Run",
+            5.5,
+            1800.0,
+            "Strava",
+            155.0,
+            "nike_pegasus_38",
+            None,
+            "Nike Pegasus 38",
+            2,
+        )
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
 
         # Execute
         updates = {"distance": 5.5, "avg_heart_rate": 155.0}
-        update_run_with_history(
+        edited = update_run_with_history(
             "test_run_123", updates, "user123", "Corrected GPS data"
         )
 
-        # Verify transaction was used
-        mock_connection.transaction.assert_called_once()
+        # One round trip: UPDATE ... RETURNING feeding the history INSERT
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "UPDATE runs" in sql
+        assert "INSERT INTO runs_history" in sql
+        assert params["set_distance"] is True
+        assert params["distance"] == 5.5
+        assert params["set_shoe_id"] is False
+        assert params["expected_version"] is None
+
+        assert edited.version == 2
+        assert edited.run.distance == 5.5
+        assert edited.run.shoe_name == "Nike Pegasus 38"
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_run_with_history_can_clear_fields(self, mock_get_cursor):
+        """Fields explicitly set to None are written as NULL, not left unchanged."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        with pytest.raises(ValueError):
+            update_run_with_history("test_run_123", {"shoe_id": None}, "user123")
 
-        # Verify cursor operations
-        assert (
-            mock_cursor.execute.call_count >= 2
-        )  # At least INSERT into history and UPDATE current
+        params = mock_cursor.execute.call_args_list[0][0][1]
+        assert params["set_shoe_id"] is True
+        assert params["shoe_id"] is None
 
-    @patch("fitness.db.runs.get_run_by_id")
-    def test_update_run_with_history_run_not_found(self, mock_get_run):
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_run_with_history_run_not_found(self, mock_get_cursor):
         """Test handling of non-existent run."""
-        mock_get_run.return_value = None
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
 
-        with pytest.raises(ValueError, match="Run test_run_123 not found"):
+        with pytest.raises(RunNotFoundError, match="Run test_run_123 not found"):
             update_run_with_history("test_run_123", {"distance": 5.5}, "user123")
 
-    @patch("fitness.db.runs_history.get_db_connection")
-    @patch("fitness.db.runs.get_run_by_id")
-    def test_update_run_with_history_invalid_field(
-        self, mock_get_run, mock_get_connection, sample_run
-    ):
-        """Test handling of invalid update fields."""
-        # This test should fail early during field validation, before any DB operations
-        mock_get_run.return_value = sample_run
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_run_with_history_version_conflict(self, mock_get_cursor):
+        """A stale expected_version is reported as a conflict, not a missing run."""
+        mock_cursor = MagicMock()
+        # Nothing updated, but the run exists at version 3.
+        mock_cursor.fetchone.side_effect = [None, (3,)]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        with pytest.raises(RunVersionConflictError, match="at version 3, not 2"):
+            update_run_with_history(
+                "test_run_123", {"distance": 5.5}, "user123", expected_version=2
+            )
 
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_run_with_history_invalid_field(self, mock_get_cursor):
+        """Test handling of invalid update fields."""
         # We shouldn't even get to database operations due to validation failure
         with pytest.raises(
             ValueError, match="Field 'source' is not allowed to be updated"
@@ -195,6 +288,125 @@ class TestUpdateRunWithHistory:
             update_run_with_history(
                 "test_run_123", {"source": "MapMyFitness"}, "user123"
             )
+        mock_get_cursor.assert_not_called()
+
+
+class TestUpdateRunsWithHistory:
+    """Test batch run updates with history tracking."""
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_success(self, mock_get_cursor):
+        """All edits go to the database as one statement with array parameters."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [("run_1", 2), ("run_2", 5)]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        versions = update_runs_with_history(
+            [
+                RunEdit("run_1", {"distance": 5.5}),
+                RunEdit("run_2", {"shoe_id": None}, expected_version=4),
+            ],
+            "user123",
+            "Bulk fix",
+        )
+
+        assert versions == {"run_1": 2, "run_2": 5}
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "UPDATE runs" in sql
+        assert "INSERT INTO runs_history" in sql
+        assert params["id"] == ["run_1", "run_2"]
+        assert params["expected_version"] == [None, 4]
+        assert params["set_distance"] == [True, False]
+        assert params["distance"] == [5.5, None]
+        assert params["set_shoe_id"] == [False, True]
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_empty(self, mock_get_cursor):
+        """An empty batch doesn't touch the database."""
+        assert update_runs_with_history([], "user123") == {}
+        mock_get_cursor.assert_not_called()
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_duplicate_run(self, mock_get_cursor):
+        """A run can't be edited twice in one batch."""
+        edits = [
+            RunEdit("run_1", {"distance": 5.5}),
+            RunEdit("run_1", {"duration": 1.0}),
+        ]
+
+        with pytest.raises(ValueError, match="only be edited once"):
+            update_runs_with_history(edits, "user123")
+        mock_get_cursor.assert_not_called()
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_run_not_found(self, mock_get_cursor):
+        """A missing run fails the whole batch."""
+        mock_cursor = MagicMock()
+        # run_1 was updated, run_2 doesn't exist.
+        mock_cursor.fetchall.side_effect = [[("run_1", 2)], []]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        with pytest.raises(RunNotFoundError, match="run_2"):
+            update_runs_with_history(
+                [
+                    RunEdit("run_1", {"distance": 5.5}),
+                    RunEdit("run_2", {"distance": 3.0}),
+                ],
+                "user123",
+            )
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_version_conflict(self, mock_get_cursor):
+        """A stale expected_version fails the whole batch."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[("run_1", 2)], [("run_2", 7)]]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        with pytest.raises(RunVersionConflictError, match="run_2 \\(now version 7\\)"):
+            update_runs_with_history(
+                [
+                    RunEdit("run_1", {"distance": 5.5}),
+                    RunEdit("run_2", {"distance": 3.0}, expected_version=6),
+                ],
+                "user123",
+            )
+
+    @patch("fitness.db.runs_history.get_db_cursor")
+    def test_update_runs_with_history_invalid_field(self, mock_get_cursor):
+        """Invalid fields are rejected before any database work."""
+        with pytest.raises(ValueError, match="Field 'source' is not allowed"):
+            update_runs_with_history(
+                [RunEdit("run_1", {"source": "MapMyFitness"})], "user123"
+            )
+        mock_get_cursor.assert_not_called()
+
+
+class TestUpsertRunWithHistory:
+    """Test inserting or updating a run fetched from its source."""
+
+    @patch("fitness.db.runs_history.sync_source_runs")
+    def test_run_is_synced_from_its_source(self, mock_sync, sample_run):
+        mock_sync.return_value = SourceSyncResult()
+
+        upsert_run_with_history(sample_run, "strava_webhook", "Edited")
+
+        mock_sync.assert_called_once_with(
+            [sample_run], "Strava", "strava_webhook", "Edited"
+        )
+
+    @pytest.mark.parametrize(
+        "result, outcome",
+        [
+            (SourceSyncResult(created=["test_run_123"]), "created"),
+            (SourceSyncResult(updated=["test_run_123"]), "updated"),
+            (SourceSyncResult(), "unchanged"),
+        ],
+    )
+    @patch("fitness.db.runs_history.sync_source_runs")
+    def test_outcome(self, mock_sync, result, outcome, sample_run):
+        mock_sync.return_value = result
+        assert upsert_run_with_history(sample_run, "strava_webhook") == outcome
 
 
 class TestGetRunVersion:
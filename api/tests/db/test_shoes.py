@@ -0,0 +1,64 @@
+"""
+Tests for shoe database operations.
+"""
+
+from datetime import date
+from unittest.mock import patch, MagicMock
+
+from fitness.db.shoes import get_shoe_mileages
+
+
+class TestGetShoeMileages:
+    """Test per-shoe mileage aggregation in SQL."""
+
+    @patch("fitness.db.shoes.get_db_cursor")
+    def test_get_shoe_mileages_maps_rows(self, mock_get_cursor):
+        """Aggregated rows are converted into ShoeMileage objects."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            ("brooks_ghost_14", "Brooks Ghost 14", None, None, None, None, 5.0),
+            (
+                "nike_pegasus_37",
+                "Nike Pegasus 37",
+                date(2024, 12, 15),
+                None,
+                "Worn out",
+                None,
+                8.0,
+            ),
+        ]
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        results = get_shoe_mileages(include_retired=True)
+
+        assert [r.shoe.name for r in results] == ["Brooks Ghost 14", "Nike Pegasus 37"]
+        assert [r.mileage for r in results] == [5.0, 8.0]
+        assert results[1].shoe.is_retired
+        assert results[1].shoe.retirement_notes == "Worn out"
+
+    @patch("fitness.db.shoes.get_db_cursor")
+    def test_get_shoe_mileages_groups_in_sql(self, mock_get_cursor):
+        """The query aggregates with GROUP BY and excludes retired shoes by default."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert get_shoe_mileages() == []
+
+        query = mock_cursor.execute.call_args[0][0]
+        assert "SUM(r.distance)" in query
+        assert "GROUP BY s.id" in query
+        assert "r.deleted_at IS NULL" in query
+        assert "s.retired_at IS NULL" in query
+
+    @patch("fitness.db.shoes.get_db_cursor")
+    def test_get_shoe_mileages_include_retired(self, mock_get_cursor):
+        """Retired shoes are not filtered out when requested."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        get_shoe_mileages(include_retired=True)
+
+        query = mock_cursor.execute.call_args[0][0]
+        assert "s.retired_at IS NULL" not in query
@@ -0,0 +1,136 @@
+"""
+Tests for the prepared statement registry.
+"""
+
+from datetime import date
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from fitness.db import statements
+from fitness.db.runs import get_all_run_details, get_run_details_in_date_range
+from fitness.db.shoes import get_shoes
+from fitness.db.synced_runs import update_synced_run
+
+
+class TestStatementRegistry:
+    """Test the registered statements themselves."""
+
+    def test_names_match_registry_keys(self):
+        """Every statement is registered under its own name."""
+        assert statements.STATEMENTS
+        for name, statement in statements.STATEMENTS.items():
+            assert statement.name == name
+
+    def test_duplicate_name_rejected(self):
+        """Registering a name twice raises instead of shadowing a statement."""
+        with pytest.raises(ValueError, match="already registered"):
+            statements._register("all_runs", "SELECT 1")
+
+    def test_statements_are_fully_rendered(self):
+        """No template placeholders leak into the SQL text."""
+        for statement in statements.STATEMENTS.values():
+            assert "{" not in statement.sql, statement.name
+
+    def test_date_ranges_can_use_datetime_index(self):
+        """Date ranges compare datetime_utc itself, not DATE(datetime_utc)."""
+        for statement in statements.STATEMENTS.values():
+            assert "DATE(r.datetime_utc)" not in statement.sql, statement.name
+
+    def test_execute_prepares_statement(self):
+        """execute() asks psycopg to prepare the statement server-side."""
+        mock_cursor = MagicMock()
+
+        statements.execute(mock_cursor, statements.RUN_BY_ID, ("run_1",))
+
+        mock_cursor.execute.assert_called_once_with(
+            statements.RUN_BY_ID.sql, ("run_1",), prepare=True
+        )
+
+
+class TestStatementSelection:
+    """Test that callers pick static statements instead of building SQL."""
+
+    def test_no_catch_all_filters(self):
+        """Optional filters are separate statements, not `%(flag)s OR ...`."""
+        for statement in statements.STATEMENTS.values():
+            assert "%(include_deleted)s" not in statement.sql, statement.name
+            assert "::boolean IS NULL" not in statement.sql, statement.name
+
+    @pytest.mark.parametrize(
+        "retired, include_deleted, statement",
+        [
+            (None, False, statements.SHOES_BY_NAME[False, None]),
+            (False, False, statements.SHOES_BY_NAME[False, False]),
+            (None, True, statements.SHOES_BY_NAME[True, None]),
+            (False, True, statements.SHOES_BY_NAME[True, False]),
+        ],
+    )
+    @patch("fitness.db.shoes.get_db_cursor")
+    def test_get_shoes_picks_statement_for_filters(
+        self, mock_get_cursor, retired, include_deleted, statement
+    ):
+        """Each combination of filters has its own static statement."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        get_shoes(retired=retired, include_deleted=include_deleted)
+
+        mock_cursor.execute.assert_called_once_with(statement.sql, None, prepare=True)
+
+    @patch("fitness.db.shoes.get_db_cursor")
+    def test_get_retired_shoes_orders_by_retirement(self, mock_get_cursor):
+        """Retired shoes use the statement ordered by retirement date."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        get_shoes(retired=True, include_deleted=True)
+
+        sql = mock_cursor.execute.call_args[0][0]
+        assert sql == statements.RETIRED_SHOES[True].sql
+        assert "ORDER BY retired_at DESC" in sql
+
+    @pytest.mark.parametrize("include_deleted", [False, True])
+    @pytest.mark.parametrize("synced", [None, True, False])
+    @patch("fitness.db.runs.get_db_cursor")
+    def test_run_details_pick_statement_for_filters(
+        self, mock_get_cursor, synced, include_deleted
+    ):
+        """Run detail listings pick the variant for their filters."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        get_all_run_details(include_deleted=include_deleted, synced=synced)
+        get_run_details_in_date_range(
+            date(2024, 1, 1), date(2024, 1, 31), include_deleted, synced
+        )
+
+        all_call, range_call = mock_cursor.execute.call_args_list
+        assert all_call.args == (
+            statements.RUN_DETAILS[include_deleted, synced].sql,
+            None,
+        )
+        assert range_call.args == (
+            statements.RUN_DETAILS_IN_RANGE[include_deleted, synced].sql,
+            {"start": date(2024, 1, 1), "end": date(2024, 1, 31)},
+        )
+
+    @patch("fitness.db.synced_runs.get_db_cursor")
+    def test_update_synced_run_binds_unset_fields_as_null(self, mock_get_cursor):
+        """Fields that are not being updated are passed as NULL."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+
+        update_synced_run("run_1", sync_status="failed", error_message="boom")
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert sql == statements.UPDATE_SYNCED_RUN.sql
+        assert params["sync_status"] == "failed"
+        assert params["error_message"] == "boom"
+        assert params["run_version"] is None
+        assert params["google_event_id"] is None
+        assert params["run_id"] == "run_1"
@@ -0,0 +1,58 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from fitness.db.runs import bulk_create_runs
+from fitness.db.synced_runs import get_synced_run
+from fitness.integrations.google.auto_sync import sync_new_runs
+from fitness.integrations.google.calendar_client import EventResult
+from fitness.models import Run
+
+
+@pytest.mark.e2e
+def test_sync_new_runs_upserts_synced_runs(client):
+    """Outcomes for all runs land in synced_runs; a retry replaces failures."""
+    runs = [
+        Run(
+            id=f"e2e_auto_sync_{i}",
+            datetime_utc=datetime(2024, 5, i + 1, 7, 0, 0),
+            type="Outdoor Run",
+            distance=5.0,
+            duration=1800.0,
+            source="Strava",
+        )
+        for i in range(2)
+    ]
+    bulk_create_runs(runs)
+
+    calendar = Mock()
+    calendar.create_workout_events.return_value = {
+        "e2e_auto_sync_0": EventResult(event_id="e2e_auto_event_0"),
+        "e2e_auto_sync_1": EventResult(event_id=None, error="500 - backend error"),
+    }
+    result = sync_new_runs(runs, client=calendar)
+
+    assert (result.synced, result.failed) == (1, 1)
+    synced = get_synced_run("e2e_auto_sync_0")
+    assert (synced.sync_status, synced.google_event_id, synced.run_version) == (
+        "synced",
+        "e2e_auto_event_0",
+        1,
+    )
+    failed = get_synced_run("e2e_auto_sync_1")
+    assert (failed.sync_status, failed.google_event_id) == ("failed", "")
+    assert failed.error_message.endswith("500 - backend error")
+
+    calendar.create_workout_events.return_value = {
+        "e2e_auto_sync_1": EventResult(event_id="e2e_auto_event_1")
+    }
+    sync_new_runs(runs[1:], client=calendar)
+
+    retried = get_synced_run("e2e_auto_sync_1")
+    assert (retried.sync_status, retried.google_event_id) == (
+        "synced",
+        "e2e_auto_event_1",
+    )
+    assert retried.error_message is None
+    assert retried.created_at == failed.created_at
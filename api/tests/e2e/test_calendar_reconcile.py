@@ -0,0 +1,105 @@
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fitness.db.connection import get_db_cursor
+from fitness.db.runs import bulk_create_runs
+from fitness.db.synced_runs import (
+    create_synced_run,
+    get_calendar_sync_state,
+    get_synced_run,
+)
+from fitness.integrations.google.calendar_client import EventChanges, EventResult
+from fitness.integrations.google.reconcile import DELETED_IN_CALENDAR
+from fitness.models import Run
+
+
+@pytest.mark.e2e
+def test_reconcile_updates_only_stale_events(client, auth_client):
+    """Edited runs are patched, deleted runs unsynced, deleted events marked failed."""
+    runs = [
+        Run(
+            id=f"e2e_reconcile_{i}",
+            datetime_utc=datetime(2024, 3, i + 1, 7, 0, 0),
+            type="Outdoor Run",
+            distance=5.0,
+            duration=1800.0,
+            source="Strava",
+        )
+        for i in range(4)
+    ]
+    bulk_create_runs(runs)
+    for i, run in enumerate(runs):
+        create_synced_run(run.id, google_event_id=f"e2e_event_{i}")
+
+    res = auth_client.patch(
+        "/runs/e2e_reconcile_0", json={"distance": 6.0, "changed_by": "e2e"}
+    )
+    assert res.status_code == 200
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE runs SET deleted_at = %s WHERE id = 'e2e_reconcile_3'",
+            (datetime(2024, 3, 10),),
+        )
+
+    calendar = Mock(calendar_id="e2e_calendar")
+    calendar.list_changed_events.return_value = EventChanges(
+        events=[{"id": "e2e_event_2", "status": "cancelled"}],
+        next_sync_token="e2e_token_1",
+    )
+    calendar.update_workout_events.side_effect = lambda runs: {
+        event_id: EventResult(event_id=event_id) for event_id in runs
+    }
+    calendar.delete_workout_events.side_effect = lambda event_ids: {
+        event_id: EventResult(event_id=event_id) for event_id in event_ids
+    }
+    with patch(
+        "fitness.integrations.google.reconcile.get_calendar_client",
+        return_value=calendar,
+    ):
+        res = auth_client.post("/sync/reconcile")
+
+    assert res.status_code == 200
+    assert res.json() == {
+        "changed_events": 1,
+        "updated": 1,
+        "deleted_in_calendar": 1,
+        "removed": 1,
+        "failed": 0,
+        "full_sync": True,
+    }
+    (patched,) = calendar.update_workout_events.call_args.args
+    assert list(patched) == ["e2e_event_0"]
+    assert patched["e2e_event_0"].distance == 6.0
+    calendar.delete_workout_events.assert_called_once_with(["e2e_event_3"])
+    assert get_synced_run("e2e_reconcile_3") is None
+
+    edited = get_synced_run("e2e_reconcile_0")
+    assert (edited.sync_status, edited.run_version) == ("synced", 2)
+    assert get_synced_run("e2e_reconcile_1").run_version == 1
+    deleted = get_synced_run("e2e_reconcile_2")
+    assert (deleted.sync_status, deleted.error_message) == (
+        "failed",
+        DELETED_IN_CALENDAR,
+    )
+    assert get_calendar_sync_state("e2e_calendar").sync_token == "e2e_token_1"
+
+    # The next pass continues from the saved token and finds nothing stale.
+    calendar.list_changed_events.return_value = EventChanges([], "e2e_token_2")
+    calendar.update_workout_events.reset_mock()
+    with patch(
+        "fitness.integrations.google.reconcile.get_calendar_client",
+        return_value=calendar,
+    ):
+        res = auth_client.post("/sync/reconcile")
+
+    assert res.json()["updated"] == 0
+    assert res.json()["full_sync"] is False
+    assert calendar.list_changed_events.call_args.kwargs["sync_token"] == "e2e_token_1"
+    calendar.update_workout_events.assert_called_once_with({})
+
+
+@pytest.mark.e2e
+def test_reconcile_requires_auth(client):
+    assert client.post("/sync/reconcile").status_code == 401
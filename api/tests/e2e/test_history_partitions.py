@@ -0,0 +1,102 @@
+"""End-to-end tests for archiving runs_history partitions."""
+
+import argparse
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from testcontainers.postgres import PostgresContainer
+
+from fitness.db.connection import get_db_cursor
+from fitness.db.partitions import (
+    archive_history_partition,
+    create_history_partition,
+    get_history_partitions,
+)
+from fitness.db.runs import bulk_create_runs
+from fitness.db.runs_history import update_run_with_history
+from fitness.models import Run
+
+
+@pytest.fixture(scope="module")
+def partitioned_db(db_url: str) -> Iterator[str]:
+    """A separate database migrated with runs_history partitioned by year."""
+    with PostgresContainer("postgres:16") as pg:
+        url = pg.get_connection_url().replace("postgresql+psycopg2://", "postgresql://")
+        os.environ["DATABASE_URL"] = url
+        try:
+            api_dir = Path(__file__).resolve().parents[2]
+            alembic_cfg = Config(
+                str(api_dir / "alembic.ini"),
+                cmd_opts=argparse.Namespace(x=["partition_runs_history=true"]),
+            )
+            command.upgrade(alembic_cfg, "head")
+            yield url
+        finally:
+            os.environ["DATABASE_URL"] = db_url
+
+
+def _set_changed_at(run_id: str, version_number: int, changed_at: datetime) -> None:
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE runs_history SET changed_at = %s "
+            "WHERE run_id = %s AND version_number = %s",
+            (changed_at, run_id, version_number),
+        )
+
+
+@pytest.mark.e2e
+def test_archive_keeps_latest_versions(partitioned_db, client):
+    """Archiving a year leaves as_of totals and unedited runs' history unchanged."""
+    create_history_partition(2015)
+    create_history_partition(2016)
+    bulk_create_runs(
+        [
+            Run(
+                id=f"archive_test_{suffix}",
+                datetime_utc=datetime(2015, 5, day, 7, 0, 0),
+                type="Outdoor Run",
+                distance=distance,
+                duration=1800.0,
+                source="Strava",
+            )
+            for suffix, day, distance in [("kept", 1, 4.0), ("edited", 2, 3.0)]
+        ]
+    )
+    update_run_with_history("archive_test_edited", {"distance": 5.0}, "e2e")
+    # Only the edited run has a version changed after 2015.
+    _set_changed_at("archive_test_kept", 1, datetime(2015, 5, 1, 8))
+    _set_changed_at("archive_test_edited", 1, datetime(2015, 5, 2, 8))
+    _set_changed_at("archive_test_edited", 2, datetime(2016, 1, 10, 8))
+
+    def snapshot():
+        total = client.get(
+            "/metrics/mileage/total",
+            params={
+                "start": "2015-05-01",
+                "end": "2015-05-31",
+                "as_of": "2017-01-01T00:00:00",
+            },
+        )
+        kept_history = client.get("/runs/archive_test_kept/history")
+        edited_history = client.get("/runs/archive_test_edited/history")
+        assert total.status_code == kept_history.status_code == 200
+        assert edited_history.status_code == 200
+        return total.json(), kept_history.json(), edited_history.json()
+
+    total, kept_history, edited_history = snapshot()
+    assert total == 9.0
+
+    assert archive_history_partition(2015) == "runs_history_2015"
+
+    assert "runs_history_2015" not in get_history_partitions()
+    # The edited run loses only its superseded 2015 version (history is newest first).
+    assert snapshot() == (total, kept_history, edited_history[:1])
+    # Only the superseded version is left in the detached table.
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT run_id, version_number FROM runs_history_2015")
+        assert cursor.fetchall() == [("archive_test_edited", 1)]
@@ -1,9 +1,10 @@
 """End-to-end tests for metrics endpoints."""
 
 import pytest
-from datetime import datetime
+from datetime import datetime, timezone
 from fitness.models import Run
 from fitness.db.runs import bulk_create_runs
+from fitness.db.runs_history import update_run_with_history
 
 
 @pytest.mark.e2e
@@ -414,3 +415,46 @@ def test_metrics_empty_data(client):
     assert res.status_code == 200
     empty_trimp = res.json()
     assert isinstance(empty_trimp, list)
+
+
+@pytest.mark.e2e
+def test_mileage_metrics_as_of(client):
+    """Metrics with as_of use the runs as they were at that instant."""
+    bulk_create_runs(
+        [
+            Run(
+                id="as_of_test_1",
+                datetime_utc=datetime(2023, 3, 1, 10, 0, 0),
+                type="Outdoor Run",
+                distance=4.0,
+                duration=2000.0,
+                source="Strava",
+            )
+        ]
+    )
+    before_edit = datetime.now(timezone.utc)
+    update_run_with_history("as_of_test_1", {"distance": 6.0}, "e2e")
+    bulk_create_runs(
+        [
+            Run(
+                id="as_of_test_2",
+                datetime_utc=datetime(2023, 3, 2, 10, 0, 0),
+                type="Outdoor Run",
+                distance=1.0,
+                duration=600.0,
+                source="Strava",
+            )
+        ]
+    )
+
+    params = {"start": "2023-03-01", "end": "2023-03-02"}
+    res = client.get("/metrics/mileage/total", params=params)
+    assert res.status_code == 200
+    assert res.json() == 7.0
+
+    res = client.get(
+        "/metrics/mileage/total",
+        params={**params, "as_of": before_edit.isoformat()},
+    )
+    assert res.status_code == 200
+    assert res.json() == 4.0
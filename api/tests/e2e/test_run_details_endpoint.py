@@ -144,3 +144,43 @@ def test_run_details_with_sync_and_date_filtering_and_sorting(client):
     # Expect 3.0 then 5.0
     distances = [d["distance"] for d in subset]
     assert distances == sorted(distances)
+
+
+@pytest.mark.e2e
+def test_run_details_synced_filter(client):
+    """synced=true/false split runs by sync status, with and without a range."""
+    runs = []
+    for suffix, day in [("3A", 1), ("3B", 2), ("3C", 3)]:
+        run = Run(
+            id=f"details_test_run_{suffix}",
+            datetime_utc=datetime(2036, 3, day, 7, 0, 0),
+            type="Outdoor Run",
+            distance=4.0,
+            duration=2000.0,
+            source="Strava",
+        )
+        run._shoe_name = "Details Shoe Delta"
+        runs.append(run)
+    assert bulk_create_runs(runs) == 3
+
+    create_synced_run(run_id="details_test_run_3A", google_event_id="evt_3A")
+    create_synced_run(
+        run_id="details_test_run_3B",
+        google_event_id="evt_3B",
+        sync_status="failed",
+        error_message="boom",
+    )
+
+    def listed_ids(**params):
+        res = client.get("/runs/details", params=params)
+        assert res.status_code == 200
+        return {d["id"] for d in res.json() if d["id"].startswith("details_test_run_3")}
+
+    in_range = {"start": "2036-03-01", "end": "2036-03-31"}
+    for params in ({}, in_range):
+        assert listed_ids(synced="true", **params) == {"details_test_run_3A"}
+        assert listed_ids(synced="false", **params) == {
+            "details_test_run_3B",
+            "details_test_run_3C",
+        }
+        assert len(listed_ids(**params)) == 3
@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime
 from fitness.models import Run
+from fitness.app.dependencies import possible_duplicates
 from fitness.db.runs import bulk_create_runs
 
 
@@ -322,3 +323,35 @@ def test_timezone_handling(client):
     # Results might differ between timezone-aware and UTC filtering
     # This tests that timezone parameter is being processed
     assert isinstance(utc_runs, list)
+
+
+@pytest.mark.e2e
+def test_duplicate_runs_endpoint(client):
+    """The same workout imported from both sources is listed as a duplicate."""
+    workout = {
+        "datetime_utc": datetime(2019, 3, 3, 14, 0, 0),
+        "type": "Outdoor Run",
+        "duration": 2700.0,
+    }
+    bulk_create_runs(
+        [
+            Run(id="strava_dup_1", source="Strava", distance=6.2, **workout),
+            Run(id="mmf_dup_1", source="MapMyFitness", distance=6.1, **workout),
+            # Two Strava runs that day aren't duplicates of each other.
+            Run(id="strava_dup_2", source="Strava", distance=6.2, **workout),
+        ]
+    )
+
+    res = client.get(
+        "/runs/duplicates", params={"start": "2019-03-03", "end": "2019-03-03"}
+    )
+
+    assert res.status_code == 200
+    pairs = res.json()
+    assert [pair["local_date"] for pair in pairs] == ["2019-03-03"] * 2
+    assert sorted([run["id"] for run in pair["runs"]] for pair in pairs) == [
+        ["mmf_dup_1", "strava_dup_1"],
+        ["mmf_dup_1", "strava_dup_2"],
+    ]
+    # Imports report each new run with the run it likely duplicates.
+    assert possible_duplicates({"strava_dup_1"}) == [["strava_dup_1", "mmf_dup_1"]]
@@ -0,0 +1,157 @@
+from datetime import datetime
+
+import pytest
+
+from fitness.db.runs import (
+    bulk_create_runs,
+    get_all_runs,
+    get_run_by_id,
+    sync_source_runs,
+)
+from fitness.db.runs_history import (
+    get_run_history,
+    get_run_version,
+    update_run_with_history,
+)
+from fitness.models import Run
+
+
+def _run(run_id: str, **overrides) -> Run:
+    return Run(
+        **{
+            "id": run_id,
+            "datetime_utc": datetime(2024, 7, 1, 7, 0, 0),
+            "type": "Outdoor Run",
+            "distance": 5.0,
+            "duration": 1800.0,
+            "source": "Strava",
+            "avg_heart_rate": 150.0,
+            **overrides,
+        }
+    )
+
+
+def _sync(runs, **kwargs):
+    return sync_source_runs(
+        runs, "Strava", "strava_import", "Updated in Strava", **kwargs
+    )
+
+
+@pytest.mark.e2e
+def test_runs_are_inserted_then_edited_only_when_changed(client):
+    run = _run("e2e_source_sync_edit")
+
+    assert _sync([run]).created == [run.id]
+    # Fetching the same activity again is a no-op.
+    assert _sync([run]).updated == []
+    assert len(get_run_history(run.id)) == 1
+
+    result = _sync([run.model_copy(update={"distance": 6.0})])
+
+    assert result.updated == [run.id]
+    assert get_run_by_id(run.id).distance == 6.0
+    latest = get_run_history(run.id)[0]
+    assert (latest.version_number, latest.change_type, latest.changed_by) == (
+        2,
+        "edit",
+        "strava_import",
+    )
+
+
+@pytest.mark.e2e
+def test_local_edits_survive_until_the_source_changes(client):
+    run = _run("e2e_source_sync_local_edit")
+    _sync([run])
+    update_run_with_history(run.id, {"distance": 5.2}, "user", "GPS drift")
+
+    _sync([run])
+    assert get_run_by_id(run.id).distance == 5.2
+
+    _sync([run.model_copy(update={"duration": 1750.0})])
+    stored = get_run_by_id(run.id)
+    assert (stored.distance, stored.duration) == (5.0, 1750.0)
+
+
+@pytest.mark.e2e
+def test_runs_stored_before_hashing_adopt_the_hash(client):
+    edited = _run("e2e_source_sync_legacy_edited")
+    untouched = _run("e2e_source_sync_legacy")
+    bulk_create_runs([edited, untouched])
+    update_run_with_history(edited.id, {"distance": 5.2}, "user", "GPS drift")
+
+    changed = [run.model_copy(update={"distance": 6.0}) for run in (edited, untouched)]
+    result = _sync(changed)
+
+    # Without a hash there's no telling whether the source changed, so a run
+    # edited here keeps its edit.
+    assert result.updated == [untouched.id]
+    assert get_run_by_id(edited.id).distance == 5.2
+    # Now that it has a hash, later source changes do apply.
+    _sync([edited.model_copy(update={"distance": 7.0})])
+    assert get_run_by_id(edited.id).distance == 7.0
+
+
+@pytest.mark.e2e
+def test_missing_runs_are_soft_deleted_for_good(client):
+    gone = _run("e2e_source_sync_gone")
+    kept = _run("e2e_source_sync_kept")
+    _sync([gone, kept])
+    # Every other stored Strava run is still there, so only `gone` is missing.
+    others = [
+        run
+        for run in get_all_runs()
+        if run.source == "Strava" and run.id not in (gone.id, kept.id)
+    ]
+
+    result = _sync([kept, *others], delete_missing=True)
+
+    assert result.deleted == [gone.id]
+    assert get_run_by_id(gone.id) is None
+    deletion = get_run_version(gone.id, 2)
+    assert (deletion.change_type, deletion.changed_by) == ("deletion", "strava_import")
+
+    # A run deleted here isn't brought back by fetching it again.
+    assert _sync([gone, kept]).created == []
+    assert get_run_by_id(gone.id) is None
+
+
+@pytest.mark.e2e
+def test_listed_runs_that_arent_fetched_are_kept(client):
+    """A run left out of the import, e.g. its gear was removed, isn't deleted."""
+    gear_removed = _run("e2e_source_sync_gear_removed")
+    kept = _run("e2e_source_sync_listed_kept")
+    _sync([gear_removed, kept])
+    others = [
+        run.id
+        for run in get_all_runs()
+        if run.source == "Strava" and run.id not in (gear_removed.id, kept.id)
+    ]
+
+    result = _sync(
+        [kept], delete_missing=True, listed_ids=[kept.id, gear_removed.id, *others]
+    )
+
+    assert result.deleted == []
+    assert get_run_by_id(gear_removed.id) is not None
+
+
+@pytest.mark.e2e
+def test_empty_fetch_deletes_nothing(client):
+    run = _run("e2e_source_sync_empty_fetch")
+    _sync([run])
+
+    assert _sync([], delete_missing=True).deleted == []
+    assert get_run_by_id(run.id) is not None
+
+
+@pytest.mark.e2e
+def test_deleted_ids_are_soft_deleted(client):
+    run = _run("e2e_source_sync_deleted_id")
+    _sync([run])
+
+    result = sync_source_runs(
+        [], "Strava", "strava_webhook", "Deleted in Strava", deleted_ids=[run.id]
+    )
+
+    assert result.deleted == [run.id]
+    assert get_run_by_id(run.id) is None
@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fitness.db.oauth_credentials import OAuthCredentials, upsert_credentials
+from fitness.db.runs import get_run_by_id
+from fitness.db.runs_history import get_run_history
+from tests._factories.strava_activity_with_gear import StravaActivityWithGearFactory
+
+
+def _event(aspect_type: str) -> dict:
+    return {
+        "object_type": "activity",
+        "object_id": 987654,
+        "aspect_type": aspect_type,
+        "owner_id": 1,
+        "subscription_id": 99,
+        "event_time": 1_700_000_000,
+        "updates": {},
+    }
+
+
+@pytest.fixture
+def webhook_configured(monkeypatch):
+    """Configure the webhook for subscription 99 and athlete 1."""
+    monkeypatch.setenv("STRAVA_WEBHOOK_SUBSCRIPTION_ID", "99")
+    upsert_credentials(
+        OAuthCredentials(
+            provider="strava",
+            client_id="client_id",
+            client_secret="client_secret",
+            access_token="access_token",
+            refresh_token="refresh_token",
+            account_id="1",
+        )
+    )
+
+
+@pytest.mark.e2e
+def test_pushed_activity_is_created_then_updated(client, webhook_configured):
+    """A create inserts the run; an update edits only what changed in Strava."""
+    factory = StravaActivityWithGearFactory()
+    activity = factory.make({"id": 987654})
+    edited = factory.make({"id": 987654, "distance": 10000.0})
+
+    with (
+        patch("fitness.app.routers.strava.strava_client", new_callable=AsyncMock),
+        patch("fitness.app.routers.strava.load_strava_run") as load_strava_run,
+    ):
+        load_strava_run.return_value = activity
+        assert client.post("/strava/webhook", json=_event("create")).status_code == 200
+
+        run = get_run_by_id("strava_987654")
+        assert run is not None
+        assert run.shoe_name == "Nike Air Zoom Pegasus 37"
+
+        # A repeated event for an unchanged activity adds no history.
+        assert client.post("/strava/webhook", json=_event("update")).status_code == 200
+        assert len(get_run_history("strava_987654")) == 1
+
+        load_strava_run.return_value = edited
+        assert client.post("/strava/webhook", json=_event("update")).status_code == 200
+
+    updated = get_run_by_id("strava_987654")
+    assert updated.distance == pytest.approx(10000.0 * 0.000621371)
+    assert updated.shoe_id == run.shoe_id
+    latest = get_run_history("strava_987654")[0]
+    assert (latest.version_number, latest.changed_by, latest.change_reason) == (
+        2,
+        "strava_webhook",
+        "Updated in Strava",
+    )
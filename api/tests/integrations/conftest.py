@@ -0,0 +1,107 @@
+"""A scriptable local HTTP server for testing outbound clients."""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, NamedTuple
+
+import pytest
+
+
+class StubResponse(NamedTuple):
+    status: int = 200
+    # Sent as JSON.
+    body: Any = None
+    headers: dict[str, str] = {}
+    # Close the connection without answering.
+    drop: bool = False
+
+
+class StubRequest(NamedTuple):
+    method: str
+    path: str
+    headers: dict[str, str]
+    # time.monotonic() when the request arrived.
+    received_at: float
+
+
+class StubServer:
+    """HTTP server that answers each request with the next queued response.
+
+    Once the queue is empty every request gets `default`. Requests received
+    are recorded in `requests`.
+    """
+
+    def __init__(self) -> None:
+        self.responses: deque[StubResponse] = deque()
+        self.default = StubResponse(200, [])
+        self.requests: list[StubRequest] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def queue(
+        self,
+        status: int = 200,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+        drop: bool = False,
+    ) -> None:
+        """Answer the next unanswered request with this response."""
+        self.responses.append(StubResponse(status, body, headers or {}, drop))
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next(self, request: StubRequest) -> StubResponse:
+        with self._lock:
+            self.requests.append(request)
+            return self.responses.popleft() if self.responses else self.default
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                response = stub._next(
+                    StubRequest(
+                        self.command, self.path, dict(self.headers), time.monotonic()
+                    )
+                )
+                if response.drop:
+                    self.close_connection = True
+                    return
+                content = json.dumps(response.body).encode()
+                self.send_response(response.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _respond
+
+        return Handler
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """A running stub server."""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
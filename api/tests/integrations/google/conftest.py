@@ -0,0 +1,277 @@
+"""A local fake of the Google Calendar API for client tests."""
+
+import email
+import email.policy
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+
+from fitness.db.oauth_credentials import OAuthCredentials
+from fitness.integrations.google.calendar_client import GoogleCalendarClient
+from fitness.integrations.http_client import GOOGLE, HttpClient
+
+_STATUS_TEXT = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    410: "Gone",
+}
+
+
+class FakeCalendar:
+    """In-memory calendar served over HTTP with Google's events.list, batch and
+    token endpoints.
+
+    Live events are kept in `events` by ID. Every create, update and delete is
+    appended to `changes`, and a sync token is a position in that log. Creating
+    an event for a run in `fail_run_ids` fails with a 400, and only
+    `valid_tokens` are accepted.
+    """
+
+    def __init__(self) -> None:
+        self.events: dict[str, dict[str, Any]] = {}
+        # (when, event) for every change; deleted events have status "cancelled".
+        self.changes: list[tuple[datetime, dict[str, Any]]] = []
+        self.fail_run_ids: set[str] = set()
+        self.expired_sync_tokens: set[str] = set()
+        self.valid_tokens = {"test_access_token"}
+        self.page_size = 2500
+        # Number of calls in each batch request received.
+        self.batch_sizes: list[int] = []
+        # Seconds each batch request takes, and the most handled at once.
+        self.batch_delay = 0.0
+        self.max_batches_in_flight = 0
+        self._batches_in_flight = 0
+        # Query parameters of each events.list request received.
+        self.list_requests: list[dict[str, str]] = []
+        self.token_requests = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_event(self, event: dict[str, Any]) -> str:
+        """Create an event directly, as if made in Google; returns its ID."""
+        with self._lock:
+            return self._create(event)["id"]
+
+    def delete_event(self, event_id: str) -> None:
+        """Delete an event directly, as if deleted in Google."""
+        with self._lock:
+            self._delete(event_id)
+
+    def _record(self, event: dict[str, Any]) -> None:
+        self.changes.append((datetime.now(timezone.utc), dict(event)))
+
+    def _create(self, event: dict[str, Any]) -> dict[str, Any]:
+        event = {**event, "id": f"event_{self._next_id}", "status": "confirmed"}
+        self._next_id += 1
+        self.events[event["id"]] = event
+        self._record(event)
+        return event
+
+    def _delete(self, event_id: str) -> bool:
+        if self.events.pop(event_id, None) is None:
+            return False
+        self._record({"id": event_id, "status": "cancelled"})
+        return True
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if not re.fullmatch(r"/calendar/v3/calendars/[^/]+/events", url.path):
+                    self._send(404, "text/plain", b"Not Found")
+                    return
+                status, payload = fake._list(params)
+                self._send(status, "application/json", json.dumps(payload).encode())
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/token":
+                    self._send(200, "application/json", fake._refresh_token())
+                elif self.path == "/batch/calendar/v3":
+                    token = self.headers["Authorization"].removeprefix("Bearer ")
+                    with fake._lock:
+                        fake._batches_in_flight += 1
+                        fake.max_batches_in_flight = max(
+                            fake.max_batches_in_flight, fake._batches_in_flight
+                        )
+                    time.sleep(fake.batch_delay)
+                    content_type, content = fake._batch(
+                        self.headers["Content-Type"], body, token
+                    )
+                    with fake._lock:
+                        fake._batches_in_flight -= 1
+                    self._send(200, content_type, content)
+                else:
+                    self._send(404, "text/plain", b"Not Found")
+
+            def _send(self, status: int, content_type: str, content: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+    def _refresh_token(self) -> bytes:
+        with self._lock:
+            self.token_requests += 1
+            token = f"refreshed_token_{self.token_requests}"
+            self.valid_tokens = {token}
+        return json.dumps({"access_token": token, "expires_in": 3600}).encode()
+
+    def _list(self, params: dict[str, str]) -> tuple[int, Any]:
+        with self._lock:
+            self.list_requests.append(params)
+            if "syncToken" in params:
+                if params["syncToken"] in self.expired_sync_tokens:
+                    return 410, {"error": {"code": 410, "message": "Gone"}}
+                changes = self.changes[int(params["syncToken"].removeprefix("sync_")) :]
+            elif "updatedMin" in params:
+                updated_min = datetime.fromisoformat(params["updatedMin"])
+                changes = [c for c in self.changes if c[0] >= updated_min]
+            else:
+                changes = self.changes
+            # Latest state of each changed event, in order of first change.
+            latest = {event["id"]: event for _, event in changes}
+            items = [
+                {"id": event["id"], "status": event["status"]}
+                for event in latest.values()
+                if params.get("showDeleted") == "true" or event["status"] != "cancelled"
+            ]
+            sync_token = f"sync_{len(self.changes)}"
+
+        start = int(params.get("pageToken", "0"))
+        page: dict[str, Any] = {"items": items[start : start + self.page_size]}
+        if start + self.page_size < len(items):
+            page["nextPageToken"] = str(start + self.page_size)
+        else:
+            page["nextSyncToken"] = sync_token
+        return 200, page
+
+    def _batch(self, content_type: str, body: bytes, token: str) -> tuple[str, bytes]:
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body,
+            policy=email.policy.HTTP,
+        )
+        requests = list(message.iter_parts())
+        with self._lock:
+            self.batch_sizes.append(len(requests))
+
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        # Google may answer in any order; reverse to make sure IDs are used.
+        for part in reversed(requests):
+            content_id = str(part["Content-ID"]).strip("<>")
+            request = part.get_payload(decode=True).decode().replace("\r\n", "\n")
+            head, _, request_body = request.partition("\n\n")
+            method, path, _ = head.split("\n")[0].split(" ")
+            if token in self.valid_tokens:
+                status, payload = self._call(method, path, request_body)
+            else:
+                status, payload = 401, {"error": {"code": 401}}
+            response = f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+            if payload is None:
+                response += "\r\n"
+            else:
+                response += "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                response += json.dumps(payload)
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"{response}\r\n"
+            )
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        return f"multipart/mixed; boundary={boundary}", content.encode()
+
+    def _call(self, method: str, path: str, body: str) -> tuple[int, Any]:
+        match = re.fullmatch(r"/calendar/v3/calendars/[^/]+/events(?:/(.+))?", path)
+        if match is None:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        event_id = match.group(1)
+
+        with self._lock:
+            if method == "POST" and event_id is None:
+                event = json.loads(body)
+                run_id = event["description"].rsplit("Run ID: ", 1)[-1]
+                if run_id in self.fail_run_ids:
+                    return 400, {"error": {"code": 400, "message": "Invalid event"}}
+                return 200, self._create(event)
+            if event_id is not None and event_id not in self.events:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            if method == "PATCH" and event_id is not None:
+                self.events[event_id].update(json.loads(body))
+                self._record(self.events[event_id])
+                return 200, self.events[event_id]
+            if method == "DELETE" and event_id is not None:
+                self._delete(event_id)
+                return 204, None
+        return 400, {"error": {"code": 400, "message": "Unsupported call"}}
+
+
+@pytest.fixture
+def fake_calendar() -> Iterator[FakeCalendar]:
+    """A running fake Calendar server."""
+    fake = FakeCalendar()
+    fake.start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def fake_calendar_client(
+    fake_calendar: FakeCalendar,
+) -> Iterator[GoogleCalendarClient]:
+    """A client that talks to the fake Calendar server."""
+    credentials = OAuthCredentials(
+        provider="google",
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        access_token="test_access_token",
+        refresh_token="test_refresh_token",
+    )
+    with (
+        patch(
+            "fitness.integrations.google.calendar_client.get_credentials",
+            return_value=credentials,
+        ),
+        patch("fitness.integrations.google.calendar_client.update_access_token"),
+        httpx.Client() as http,
+    ):
+        client = GoogleCalendarClient(http_client=HttpClient(GOOGLE, http))
+        client.calendar_id = "primary"
+        client.base_url = f"{fake_calendar.url}/calendar/v3"
+        client.batch_url = f"{fake_calendar.url}/batch/calendar/v3"
+        client.token_url = f"{fake_calendar.url}/token"
+        yield client
@@ -0,0 +1,74 @@
+"""Tests for syncing newly imported runs to Google Calendar."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from fitness.integrations.google.auto_sync import auto_sync_enabled, sync_new_runs
+from fitness.models import Run
+
+
+def _runs(count: int) -> list[Run]:
+    return [
+        Run(
+            id=f"new_{i}",
+            datetime_utc=datetime(2025, 8, 9, 14, 30),
+            type="Outdoor Run",
+            distance=5.0,
+            duration=1800.0,
+            source="Strava",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, False), ("", False), ("false", False), ("true", True), ("1", True)],
+)
+def test_auto_sync_enabled(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("GOOGLE_CALENDAR_AUTO_SYNC", raising=False)
+    else:
+        monkeypatch.setenv("GOOGLE_CALENDAR_AUTO_SYNC", value)
+    assert auto_sync_enabled() is expected
+
+
+@patch("fitness.integrations.google.auto_sync.upsert_synced_runs")
+def test_sync_new_runs_records_every_outcome_in_one_upsert(
+    mock_upsert, monkeypatch, fake_calendar, fake_calendar_client
+):
+    """Events are created in concurrent batches; failures are recorded per run."""
+    monkeypatch.setenv("GOOGLE_CALENDAR_SYNC_CONCURRENCY", "2")
+    fake_calendar.batch_delay = 0.05
+    fake_calendar.fail_run_ids = {"new_7"}
+
+    result = sync_new_runs(_runs(120), client=fake_calendar_client)
+
+    assert (result.synced, result.failed) == (119, 1)
+    assert fake_calendar.max_batches_in_flight == 2
+    mock_upsert.assert_called_once()
+    event_ids, errors = mock_upsert.call_args.args
+    assert len(event_ids) == 119
+    assert set(event_ids.values()) == set(fake_calendar.events)
+    assert list(errors) == ["new_7"]
+    assert errors["new_7"].startswith("Failed to create Google Calendar event: 400")
+
+
+@patch("fitness.integrations.google.auto_sync.upsert_synced_runs")
+@patch(
+    "fitness.integrations.google.auto_sync.get_calendar_client",
+    side_effect=ValueError("Google Calendar credentials not found in database."),
+)
+def test_sync_new_runs_skips_without_credentials(mock_get_client, mock_upsert):
+    """A missing authorization doesn't fail the import."""
+    assert sync_new_runs(_runs(2)) is None
+    mock_upsert.assert_not_called()
+
+
+@patch("fitness.integrations.google.auto_sync.get_calendar_client")
+def test_sync_new_runs_nothing_inserted(mock_get_client):
+    result = sync_new_runs([])
+    assert (result.synced, result.failed) == (0, 0)
+    mock_get_client.assert_not_called()
@@ -1,11 +1,20 @@
 """Tests for Google Calendar client."""
 
+import threading
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 import pytest
 import httpx
 
-from fitness.integrations.google.calendar_client import GoogleCalendarClient
+from fitness.integrations.google import calendar_client
+from fitness.integrations.google.calendar_client import (
+    GoogleCalendarClient,
+    SyncTokenExpiredError,
+    close_calendar_client,
+    get_calendar_client,
+    get_http_client,
+    reset_calendar_client,
+)
 from fitness.models.run import Run
 from fitness.db.oauth_credentials import OAuthCredentials
 
@@ -107,7 +116,7 @@ class TestGoogleCalendarClientHeaders:
 class TestGoogleCalendarClientTokenRefresh:
     """Test token refresh functionality."""
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     @patch("fitness.integrations.google.calendar_client.update_access_token")
     def test_refresh_access_token_success(self, mock_update_token, mock_client):
         """Test successful token refresh."""
@@ -125,7 +134,7 @@ class TestGoogleCalendarClientTokenRefresh:
             }
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -155,7 +164,7 @@ class TestGoogleCalendarClientTokenRefresh:
             # refresh_token can be None if Google doesn't return a new one
             assert "refresh_token" in call_args[1]
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_refresh_access_token_failure(self, mock_client):
         """Test token refresh failure."""
         mock_creds = create_mock_google_credentials(access_token="old_access_token")
@@ -169,7 +178,7 @@ class TestGoogleCalendarClientTokenRefresh:
             mock_response.text = "Invalid refresh token"
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -179,7 +188,7 @@ class TestGoogleCalendarClientTokenRefresh:
             assert result is False
             assert client.access_token == old_token  # Should remain unchanged
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     @patch("fitness.integrations.google.calendar_client.update_access_token")
     def test_refresh_access_token_with_new_refresh_token(
         self, mock_update_token, mock_client
@@ -200,7 +209,7 @@ class TestGoogleCalendarClientTokenRefresh:
             }
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -218,7 +227,7 @@ class TestGoogleCalendarClientTokenRefresh:
             assert call_args[1]["expires_at"] is not None
             assert call_args[1]["refresh_token"] == "new_refresh_token"
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_refresh_access_token_exception(self, mock_client):
         """Test token refresh with network exception."""
         mock_creds = create_mock_google_credentials()
@@ -226,7 +235,7 @@ class TestGoogleCalendarClientTokenRefresh:
             "fitness.integrations.google.calendar_client.get_credentials",
             return_value=mock_creds,
         ):
-            mock_client.return_value.__enter__.side_effect = httpx.RequestError(
+            mock_client.return_value.post.side_effect = httpx.RequestError(
                 "Network error"
             )
 
@@ -239,7 +248,7 @@ class TestGoogleCalendarClientTokenRefresh:
 class TestGoogleCalendarClientMakeRequest:
     """Test the _make_request method."""
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_make_request_success(self, mock_client):
         """Test successful API request."""
         mock_creds = create_mock_google_credentials()
@@ -252,7 +261,7 @@ class TestGoogleCalendarClientMakeRequest:
             mock_response.json.return_value = {"id": "event123"}
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -268,7 +277,7 @@ class TestGoogleCalendarClientMakeRequest:
                 },
             )
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     @patch("fitness.integrations.google.calendar_client.update_access_token")
     def test_make_request_401_with_successful_refresh(
         self, mock_update_token, mock_client
@@ -297,7 +306,7 @@ class TestGoogleCalendarClientMakeRequest:
             }
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             # First call returns 401, second call for refresh returns 200, third call returns 200
             mock_client_instance.request.side_effect = [
@@ -318,7 +327,7 @@ class TestGoogleCalendarClientMakeRequest:
             # Verify update_access_token was called during refresh
             mock_update_token.assert_called_once()
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_make_request_401_with_failed_refresh(self, mock_client):
         """Test API request with 401 and failed token refresh."""
         mock_creds = create_mock_google_credentials(access_token="expired_token")
@@ -335,7 +344,7 @@ class TestGoogleCalendarClientMakeRequest:
             mock_token_response.text = "Invalid refresh token"
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_401_response
             mock_client_instance.post.return_value = mock_token_response
 
@@ -348,7 +357,7 @@ class TestGoogleCalendarClientMakeRequest:
 class TestGoogleCalendarClientCreateEvent:
     """Test event creation functionality."""
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_create_workout_event_success(self, mock_client):
         """Test successful workout event creation."""
         mock_creds = create_mock_google_credentials()
@@ -375,7 +384,7 @@ class TestGoogleCalendarClientCreateEvent:
             }
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             with patch("os.getenv", return_value=None):
@@ -404,7 +413,7 @@ class TestGoogleCalendarClientCreateEvent:
                 "start"
             ]["dateTime"].endswith("Z")
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_create_workout_event_with_zero_distance(self, mock_client):
         """Test event creation with zero distance."""
         mock_creds = create_mock_google_credentials()
@@ -426,7 +435,7 @@ class TestGoogleCalendarClientCreateEvent:
             mock_response.json.return_value = {"id": "google_event_123"}
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -439,7 +448,7 @@ class TestGoogleCalendarClientCreateEvent:
             event_data = call_args[1]["json"]
             assert event_data["summary"] == "0.0 Mile Treadmill Run"
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_create_workout_event_failure(self, mock_client):
         """Test failed event creation."""
         mock_creds = create_mock_google_credentials()
@@ -461,7 +470,7 @@ class TestGoogleCalendarClientCreateEvent:
             mock_response.text = "Invalid event data"
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -469,7 +478,7 @@ class TestGoogleCalendarClientCreateEvent:
 
             assert event_id is None
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_create_workout_event_no_response(self, mock_client):
         """Test event creation with no response."""
         mock_creds = create_mock_google_credentials()
@@ -487,7 +496,7 @@ class TestGoogleCalendarClientCreateEvent:
             )
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = None
 
             client = GoogleCalendarClient()
@@ -499,7 +508,7 @@ class TestGoogleCalendarClientCreateEvent:
 class TestGoogleCalendarClientDeleteEvent:
     """Test event deletion functionality."""
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_delete_workout_event_success(self, mock_client):
         """Test successful event deletion."""
         mock_creds = create_mock_google_credentials()
@@ -513,7 +522,7 @@ class TestGoogleCalendarClientDeleteEvent:
             )
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             with patch("os.getenv", return_value=None):
@@ -533,7 +542,7 @@ class TestGoogleCalendarClientDeleteEvent:
                 },
             )
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_delete_workout_event_failure(self, mock_client):
         """Test failed event deletion."""
         mock_creds = create_mock_google_credentials()
@@ -546,7 +555,7 @@ class TestGoogleCalendarClientDeleteEvent:
             mock_response.text = "Event not found"
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -558,7 +567,7 @@ class TestGoogleCalendarClientDeleteEvent:
 class TestGoogleCalendarClientGetEvent:
     """Test event retrieval functionality."""
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_get_event_success(self, mock_client):
         """Test successful event retrieval."""
         mock_creds = create_mock_google_credentials()
@@ -578,7 +587,7 @@ class TestGoogleCalendarClientGetEvent:
             mock_response.json.return_value = expected_event
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
@@ -586,7 +595,7 @@ class TestGoogleCalendarClientGetEvent:
 
             assert event == expected_event
 
-    @patch("httpx.Client")
+    @patch("fitness.integrations.google.calendar_client.get_http_client")
     def test_get_event_not_found(self, mock_client):
         """Test event retrieval for non-existent event."""
         mock_creds = create_mock_google_credentials()
@@ -599,10 +608,297 @@ class TestGoogleCalendarClientGetEvent:
             mock_response.text = "Event not found"
 
             mock_client_instance = Mock()
-            mock_client.return_value.__enter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request.return_value = mock_response
 
             client = GoogleCalendarClient()
             event = client.get_event("nonexistent_event")
 
             assert event is None
+
+
+class TestSharedCalendarClient:
+    """Test the process-wide client and its cached credentials."""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_client(self):
+        reset_calendar_client()
+        yield
+        close_calendar_client()
+
+    def test_credentials_are_read_once(self):
+        """The shared client loads credentials from the database only once."""
+        with patch(
+            "fitness.integrations.google.calendar_client.get_credentials",
+            return_value=create_mock_google_credentials(),
+        ) as mock_get_credentials:
+            assert get_calendar_client() is get_calendar_client()
+
+        mock_get_credentials.assert_called_once_with("google")
+
+    def test_reset_reloads_credentials(self):
+        """After a reset the next client re-reads the database."""
+        first = get_calendar_client()
+        reset_calendar_client()
+        assert get_calendar_client() is not first
+
+    def test_missing_credentials_are_not_cached(self):
+        """A failed load is retried on the next call."""
+        with patch(
+            "fitness.integrations.google.calendar_client.get_credentials",
+            return_value=None,
+        ):
+            with pytest.raises(ValueError):
+                get_calendar_client()
+        assert get_calendar_client().access_token == "test_access_token"
+
+    def test_http_client_is_shared_and_reopened_after_close(self):
+        """Requests reuse one pooled HTTP client until it is closed."""
+        http = get_http_client()
+        assert get_calendar_client().http is http
+        assert get_http_client() is http
+
+        close_calendar_client()
+        assert http.is_closed
+        assert get_http_client() is not http
+
+
+class TestSingleFlightTokenRefresh:
+    """Test that concurrent callers share one token refresh."""
+
+    @patch("fitness.integrations.google.calendar_client.update_access_token")
+    def test_concurrent_401s_refresh_once(self, mock_update_token):
+        """Requests rejected with the same token trigger a single refresh."""
+        num_requests = 8
+        rejected = threading.Barrier(num_requests)
+
+        def request(method, url, headers, **kwargs):
+            if headers["Authorization"] == "Bearer test_access_token":
+                # Hold every request until all of them have been rejected.
+                rejected.wait(timeout=5)
+                return Mock(status_code=401)
+            return Mock(status_code=200)
+
+        token_response = Mock(status_code=200)
+        token_response.json.return_value = {
+            "access_token": "new_access_token",
+            "expires_in": 3600,
+        }
+        http = Mock()
+        http.request.side_effect = request
+        http.post.return_value = token_response
+
+        client = GoogleCalendarClient(http_client=http)
+        responses = []
+        threads = [
+            threading.Thread(
+                target=lambda: responses.append(
+                    client._make_request("GET", "https://test.com/api")
+                )
+            )
+            for _ in range(num_requests)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [response.status_code for response in responses] == [200] * num_requests
+        http.post.assert_called_once()
+        mock_update_token.assert_called_once()
+
+    def test_refresh_skipped_when_token_already_replaced(self):
+        """A caller holding an outdated token just picks up the new one."""
+        http = Mock()
+        client = GoogleCalendarClient(http_client=http)
+        client.access_token = "refreshed_by_another_caller"
+
+        assert client._refresh_if_stale(rejected_token="test_access_token") is True
+        http.post.assert_not_called()
+
+    @patch("fitness.integrations.google.calendar_client.get_credentials")
+    def test_revoked_refresh_token_drops_cached_client(self, mock_get_credentials):
+        """invalid_grant forgets the cached client so new credentials get loaded."""
+        mock_get_credentials.return_value = create_mock_google_credentials()
+        token_response = Mock(status_code=400, text="invalid_grant")
+        token_response.json.return_value = {"error": "invalid_grant"}
+        http = Mock()
+        http.post.return_value = token_response
+
+        with patch.object(calendar_client, "get_http_client", return_value=http):
+            client = get_calendar_client()
+            with pytest.raises(ValueError, match="Re-authorization required"):
+                client._refresh_if_stale(rejected_token="test_access_token")
+
+            assert get_calendar_client() is not client
+        reset_calendar_client()
+
+
+def _runs(count: int) -> list[Run]:
+    return [
+        Run(
+            id=f"run_{i}",
+            datetime_utc=datetime(2025, 8, 9, 14, 30),
+            type="Outdoor Run",
+            distance=5.0,
+            duration=1800.0,
+            source="Strava",
+        )
+        for i in range(count)
+    ]
+
+
+class TestGoogleCalendarClientBatch:
+    """Test batch create and delete against a fake Calendar server."""
+
+    def test_create_workout_events(self, fake_calendar, fake_calendar_client):
+        """Each run is mapped to the event created for it."""
+        runs = _runs(3)
+
+        results = fake_calendar_client.create_workout_events(runs)
+
+        assert fake_calendar.batch_sizes == [3]
+        assert set(results) == {"run_0", "run_1", "run_2"}
+        for run in runs:
+            event = fake_calendar.events[results[run.id].event_id]
+            assert event["description"].endswith(f"Run ID: {run.id}")
+            assert event["summary"] == "5.0 Mile Outdoor Run"
+
+    def test_create_workout_events_splits_into_batches_of_50(
+        self, fake_calendar, fake_calendar_client
+    ):
+        """Google allows at most 50 calls per batch request."""
+        results = fake_calendar_client.create_workout_events(_runs(120))
+
+        assert fake_calendar.batch_sizes == [50, 50, 20]
+        assert all(result.success for result in results.values())
+        assert len(fake_calendar.events) == 120
+
+    def test_create_workout_events_bounded_concurrency(
+        self, fake_calendar, fake_calendar_client
+    ):
+        """Batch requests run in parallel, but no more than max_concurrency."""
+        fake_calendar.batch_delay = 0.05
+
+        results = fake_calendar_client.create_workout_events(
+            _runs(250), max_concurrency=3
+        )
+
+        assert all(result.success for result in results.values())
+        assert list(results) == [f"run_{i}" for i in range(250)]
+        assert fake_calendar.batch_sizes == [50] * 5
+        assert fake_calendar.max_batches_in_flight == 3
+
+    def test_create_workout_events_partial_failure(
+        self, fake_calendar, fake_calendar_client
+    ):
+        """A failed call is reported for its run without affecting the others."""
+        fake_calendar.fail_run_ids = {"run_1"}
+
+        results = fake_calendar_client.create_workout_events(_runs(3))
+
+        assert results["run_0"].success and results["run_2"].success
+        assert not results["run_1"].success
+        assert results["run_1"].event_id is None
+        assert results["run_1"].error.startswith("400 - ")
+        assert "Invalid event" in results["run_1"].error
+        assert len(fake_calendar.events) == 2
+
+    def test_delete_workout_events(self, fake_calendar, fake_calendar_client):
+        """Existing events are deleted; unknown ones fail individually."""
+        created = fake_calendar_client.create_workout_events(_runs(2))
+        event_ids = [result.event_id for result in created.values()]
+
+        results = fake_calendar_client.delete_workout_events(event_ids + ["missing"])
+
+        assert all(results[event_id].success for event_id in event_ids)
+        assert results["missing"].error.startswith("404 - ")
+        assert fake_calendar.events == {}
+
+    def test_batch_retries_unauthorized_calls_after_refresh(
+        self, fake_calendar, fake_calendar_client
+    ):
+        """Calls rejected with an expired token are resent after one refresh."""
+        fake_calendar.valid_tokens = {"some_other_token"}
+
+        results = fake_calendar_client.create_workout_events(_runs(60))
+
+        assert all(result.success for result in results.values())
+        assert fake_calendar.token_requests == 1
+        # Both chunks were rejected; the second reuses the refreshed token.
+        assert fake_calendar.batch_sizes == [50, 50, 10]
+        assert fake_calendar_client.access_token == "refreshed_token_1"
+
+    def test_empty_batch_sends_nothing(self, fake_calendar, fake_calendar_client):
+        assert fake_calendar_client.create_workout_events([]) == {}
+        assert fake_calendar_client.delete_workout_events([]) == {}
+        assert fake_calendar.batch_sizes == []
+
+
+class TestGoogleCalendarClientChanges:
+    """Test listing changed events and patching events against the fake server."""
+
+    def test_list_changed_events_with_sync_token(
+        self, fake_calendar, fake_calendar_client
+    ):
+        """A sync token lists only events changed since it was issued."""
+        first = fake_calendar.add_event({"summary": "first"})
+        initial = fake_calendar_client.list_changed_events()
+        assert [event["id"] for event in initial.events] == [first]
+
+        second = fake_calendar.add_event({"summary": "second"})
+        fake_calendar.delete_event(first)
+        changes = fake_calendar_client.list_changed_events(
+            sync_token=initial.next_sync_token
+        )
+
+        assert changes.events == [
+            {"id": second, "status": "confirmed"},
+            {"id": first, "status": "cancelled"},
+        ]
+        assert changes.next_sync_token != initial.next_sync_token
+        assert fake_calendar.list_requests[-1]["showDeleted"] == "true"
+
+    def test_list_changed_events_follows_pages(
+        self, fake_calendar, fake_calendar_client
+    ):
+        fake_calendar.page_size = 2
+        for i in range(5):
+            fake_calendar.add_event({"summary": str(i)})
+
+        changes = fake_calendar_client.list_changed_events()
+
+        assert len(changes.events) == 5
+        assert len(fake_calendar.list_requests) == 3
+        assert changes.next_sync_token is not None
+
+    def test_list_changed_events_updated_min(self, fake_calendar, fake_calendar_client):
+        """Naive updated_min datetimes are sent as UTC."""
+        fake_calendar.add_event({"summary": "old"})
+        since = datetime.now(timezone.utc).replace(tzinfo=None)
+        new = fake_calendar.add_event({"summary": "new"})
+
+        changes = fake_calendar_client.list_changed_events(updated_min=since)
+
+        assert [event["id"] for event in changes.events] == [new]
+        assert fake_calendar.list_requests[-1]["updatedMin"].endswith("+00:00")
+
+    def test_list_changed_events_expired_sync_token(
+        self, fake_calendar, fake_calendar_client
+    ):
+        fake_calendar.expired_sync_tokens = {"sync_0"}
+        with pytest.raises(SyncTokenExpiredError):
+            fake_calendar_client.list_changed_events(sync_token="sync_0")
+
+    def test_update_workout_events(self, fake_calendar, fake_calendar_client):
+        """Events are patched to match their runs; missing events fail alone."""
+        event_id = fake_calendar.add_event({"summary": "5.0 Mile Outdoor Run"})
+        run = _runs(1)[0].model_copy(update={"distance": 6.2})
+
+        results = fake_calendar_client.update_workout_events(
+            {event_id: run, "missing": run}
+        )
+
+        assert results[event_id].success
+        assert results["missing"].error.startswith("404 - ")
+        assert fake_calendar.events[event_id]["summary"] == "6.2 Mile Outdoor Run"
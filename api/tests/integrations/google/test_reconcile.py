@@ -0,0 +1,160 @@
+"""Tests for Google Calendar reconciliation."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from fitness.db.synced_runs import CalendarSyncState, StaleSyncedRun
+from fitness.integrations.google.reconcile import (
+    DELETED_IN_CALENDAR,
+    reconcile_calendar,
+)
+from fitness.models import Run
+
+MODULE = "fitness.integrations.google.reconcile"
+
+
+def _run(run_id: str, distance: float = 5.0, deleted: bool = False) -> Run:
+    return Run(
+        id=run_id,
+        datetime_utc=datetime(2025, 8, 9, 14, 30),
+        type="Outdoor Run",
+        distance=distance,
+        duration=1800.0,
+        source="Strava",
+        deleted_at=datetime(2025, 8, 10) if deleted else None,
+    )
+
+
+@pytest.fixture
+def db():
+    """Patch the database functions reconciliation uses."""
+    with (
+        patch(f"{MODULE}.get_calendar_sync_state") as get_state,
+        patch(f"{MODULE}.get_stale_synced_runs") as get_stale,
+        patch(f"{MODULE}.mark_synced_runs_current") as mark_current,
+        patch(f"{MODULE}.mark_synced_runs_failed") as mark_failed,
+        patch(f"{MODULE}.delete_synced_runs") as delete_synced,
+        patch(f"{MODULE}.save_calendar_sync_state") as save_state,
+    ):
+        get_state.return_value = None
+        get_stale.return_value = []
+        yield {
+            "get_state": get_state,
+            "get_stale": get_stale,
+            "mark_current": mark_current,
+            "mark_failed": mark_failed,
+            "delete_synced": delete_synced,
+            "save_state": save_state,
+        }
+
+
+def test_reconcile_patches_edited_runs_and_flags_deleted_events(
+    db, fake_calendar, fake_calendar_client
+):
+    """Edited runs get their event patched; deleted events mark the run failed."""
+    edited_event = fake_calendar.add_event({"summary": "5.0 Mile Outdoor Run"})
+    deleted_event = fake_calendar.add_event({"summary": "3.0 Mile Outdoor Run"})
+    fake_calendar.delete_event(deleted_event)
+    db["get_stale"].return_value = [
+        StaleSyncedRun(_run("edited", 6.2), edited_event, 3, event_deleted=False),
+        StaleSyncedRun(_run("deleted"), deleted_event, 1, event_deleted=True),
+    ]
+    changes_before = len(fake_calendar.changes)
+
+    result = reconcile_calendar(fake_calendar_client)
+
+    assert (result.updated, result.deleted_in_calendar, result.failed) == (1, 1, 0)
+    assert result.full_sync is True
+    assert result.changed_events == 2
+    db["get_stale"].assert_called_once_with({deleted_event})
+    assert fake_calendar.events[edited_event]["summary"] == "6.2 Mile Outdoor Run"
+    db["mark_current"].assert_called_once_with({"edited": 3})
+    db["mark_failed"].assert_called_once_with({"deleted": DELETED_IN_CALENDAR})
+
+    calendar_id, sync_token, _ = db["save_state"].call_args.args
+    assert calendar_id == "primary"
+    # The token from the listing, taken before the patch was made.
+    assert sync_token == f"sync_{changes_before}"
+
+
+def test_reconcile_uses_saved_sync_token(db, fake_calendar, fake_calendar_client):
+    """Only events changed since the saved token are listed."""
+    fake_calendar.add_event({"summary": "before"})
+    db["get_state"].return_value = CalendarSyncState(
+        sync_token=f"sync_{len(fake_calendar.changes)}",
+        reconciled_at=datetime(2025, 1, 1),
+    )
+    fake_calendar.add_event({"summary": "after"})
+
+    result = reconcile_calendar(fake_calendar_client)
+
+    assert result.full_sync is False
+    assert result.changed_events == 1
+    assert fake_calendar.list_requests[-1]["syncToken"] == "sync_1"
+
+
+def test_reconcile_falls_back_to_updated_min_when_token_expires(
+    db, fake_calendar, fake_calendar_client
+):
+    fake_calendar.expired_sync_tokens = {"sync_old"}
+    db["get_state"].return_value = CalendarSyncState(
+        sync_token="sync_old", reconciled_at=datetime(2025, 1, 1)
+    )
+
+    reconcile_calendar(fake_calendar_client)
+
+    assert "syncToken" not in fake_calendar.list_requests[-1]
+    assert fake_calendar.list_requests[-1]["updatedMin"].startswith("2025-01-01")
+
+
+def test_reconcile_records_failed_patches(db, fake_calendar, fake_calendar_client):
+    """An event that can't be patched marks its run failed with the error."""
+    db["get_stale"].return_value = [
+        StaleSyncedRun(_run("gone"), "missing_event", 2, event_deleted=False)
+    ]
+
+    result = reconcile_calendar(fake_calendar_client)
+
+    assert result.failed == 1
+    db["mark_current"].assert_called_once_with({})
+    (errors,) = db["mark_failed"].call_args.args
+    assert errors["gone"].startswith("Failed to update Google Calendar event: 404")
+
+
+def test_reconcile_removes_events_of_deleted_runs(
+    db, fake_calendar, fake_calendar_client
+):
+    """Deleted runs lose their event and sync record; failures mark them failed."""
+    event = fake_calendar.add_event({"summary": "5.0 Mile Outdoor Run"})
+    gone_event = fake_calendar.add_event({"summary": "3.0 Mile Outdoor Run"})
+    fake_calendar.delete_event(gone_event)
+    db["get_stale"].return_value = [
+        StaleSyncedRun(_run("deleted", deleted=True), event, 2, event_deleted=False),
+        StaleSyncedRun(
+            _run("both_deleted", deleted=True), gone_event, 2, event_deleted=True
+        ),
+        StaleSyncedRun(
+            _run("undeletable", deleted=True), "missing_event", 2, event_deleted=False
+        ),
+    ]
+
+    result = reconcile_calendar(fake_calendar_client)
+
+    assert (result.updated, result.removed, result.failed) == (0, 2, 1)
+    assert result.deleted_in_calendar == 0
+    assert event not in fake_calendar.events
+    db["delete_synced"].assert_called_once_with(["both_deleted", "deleted"])
+    db["mark_current"].assert_called_once_with({})
+    (errors,) = db["mark_failed"].call_args.args
+    assert list(errors) == ["undeletable"]
+    assert errors["undeletable"].startswith("Failed to delete Google Calendar event")
+
+
+def test_reconcile_raises_when_listing_fails(db, fake_calendar_client):
+    fake_calendar_client.base_url = f"{fake_calendar_client.base_url}/nope"
+
+    with pytest.raises(RuntimeError):
+        reconcile_calendar(fake_calendar_client)
+    db["save_state"].assert_not_called()
@@ -1,11 +1,15 @@
+from dataclasses import replace
 from unittest.mock import AsyncMock, MagicMock
 import datetime
 
+import httpx
 import pytest
 
 from fitness.db.oauth_credentials import OAuthCredentials
+from fitness.integrations.http_client import STRAVA, HttpClient
 from fitness.integrations.strava.client import StravaClient
 from fitness.integrations.strava.models import StravaToken
+from tests._factories.strava_activity_with_gear import StravaActivityWithGearFactory
 
 
 def test_needs_token_refresh_valid():
@@ -52,6 +56,7 @@ async def test_refresh_access_token_success(monkeypatch):
         access_token="101",
         refresh_token="789",
         expires_at=one_minute_ago,
+        account_id="1",
     )
     client = StravaClient(creds=expired_creds)
 
@@ -83,3 +88,120 @@ async def test_refresh_access_token_success(monkeypatch):
     assert client.creds.access_token == "new_access_token"
     assert client.creds.refresh_token == "new_refresh_token"
     assert client.creds.expires_at == one_hour_from_now_datetime
+    # Refreshed tokens don't name the athlete, so the stored one is kept.
+    assert client.creds.account_id == "1"
+
+
+@pytest.fixture
+def stub_strava_client(stub_server, monkeypatch):
+    """A client whose requests go to the stub server, retrying without delay."""
+    monkeypatch.setattr(
+        "fitness.integrations.strava.client.ACTIVITIES_URL",
+        f"{stub_server.url}/athlete/activities",
+    )
+    monkeypatch.setattr(
+        "fitness.integrations.strava.client.GEAR_URL", f"{stub_server.url}/gear"
+    )
+    creds = OAuthCredentials(
+        provider="strava",
+        client_id="123",
+        client_secret="456",
+        access_token="101",
+        refresh_token="789",
+    )
+    http = HttpClient(replace(STRAVA, backoff=0.01))
+    yield StravaClient(creds=creds, http_client=http)
+    http.close()
+
+
+def test_iter_activity_pages_until_empty(stub_server, stub_strava_client):
+    stub_server.queue(body=[{"id": 1}, {"id": 2}])
+    stub_server.queue(body=[{"id": 3}])
+    stub_server.queue(body=[])
+
+    assert list(stub_strava_client._iter_activity_pages()) == [
+        [{"id": 1}, {"id": 2}],
+        [{"id": 3}],
+    ]
+    assert [request.path for request in stub_server.requests] == [
+        "/athlete/activities?per_page=200&page=1",
+        "/athlete/activities?per_page=200&page=2",
+        "/athlete/activities?per_page=200&page=3",
+    ]
+    assert stub_server.requests[0].headers["Authorization"] == "Bearer 101"
+
+
+def test_iter_activity_pages_retries_throttled_pages(stub_server, stub_strava_client):
+    """A 429 or 5xx mid-pagination is retried instead of failing the import."""
+    stub_server.queue(body=[{"id": 1}])
+    stub_server.queue(status=429)
+    stub_server.queue(status=503)
+    stub_server.queue(body=[])
+
+    assert list(stub_strava_client._iter_activity_pages()) == [[{"id": 1}]]
+    assert stub_strava_client.http.stats.retries == 2
+
+
+def test_get_activities_validates_only_wanted_types(stub_server, stub_strava_client):
+    """Other activity types are skipped unvalidated, even ones not modeled."""
+    raw = StravaActivityWithGearFactory().make().model_dump(mode="json")
+    del raw["gear"]
+    stub_server.queue(
+        body=[
+            {**raw, "id": 1, "gear_id": "g343"},
+            {"id": 2, "type": "Ride"},
+            {"id": 3, "type": "Swim", "distance": "not validated"},
+        ]
+    )
+    stub_server.queue(body=[{**raw, "id": 4, "type": "Indoor Run"}])
+    stub_server.queue(body=[])
+
+    activities = stub_strava_client.get_activities(types=("Run", "Indoor Run"))
+
+    assert [(a.id, a.type) for a in activities] == [(1, "Run"), (4, "Indoor Run")]
+    assert activities[0].gear_id == "g343"
+
+
+def test_get_gear_raw_raises_after_retries(stub_server, stub_strava_client):
+    for _ in range(STRAVA.max_retries + 1):
+        stub_server.queue(status=500)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        stub_strava_client._get_gear_raw(["g1"])
+    assert len(stub_server.requests) == STRAVA.max_retries + 1
+
+
+def test_get_activity(stub_server, stub_strava_client, monkeypatch):
+    monkeypatch.setattr(
+        "fitness.integrations.strava.client.ACTIVITY_URL",
+        f"{stub_server.url}/activities",
+    )
+    raw = StravaActivityWithGearFactory().make({"id": 42}).model_dump(mode="json")
+    del raw["gear"]
+    stub_server.queue(body=raw)
+    stub_server.queue(body={**raw, "type": "Swim"})
+
+    activity = stub_strava_client.get_activity(42)
+    assert activity is not None
+    assert activity.id == 42
+    assert stub_server.requests[0].path == "/activities/42"
+    # Types StravaActivity doesn't model are skipped rather than failing.
+    assert stub_strava_client.get_activity(42) is None
+
+
+def test_activity_exists(stub_server, stub_strava_client, monkeypatch):
+    monkeypatch.setattr(
+        "fitness.integrations.strava.client.ACTIVITY_URL",
+        f"{stub_server.url}/activities",
+    )
+    stub_server.queue(body={"id": 42})
+    stub_server.queue(status=404)
+
+    assert stub_strava_client.activity_exists(42) is True
+    assert stub_strava_client.activity_exists(42) is False
+
+    # Any other failure is raised rather than taken for a deletion.
+    for _ in range(STRAVA.max_retries + 1):
+        stub_server.queue(status=500)
+    with pytest.raises(httpx.HTTPStatusError):
+        stub_strava_client.activity_exists(42)
@@ -0,0 +1,295 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from fitness.integrations import http_client
+from fitness.integrations.http_client import (
+    HttpClient,
+    ProviderPolicy,
+    RateLimitedError,
+    TokenBucket,
+    close_clients,
+    GOOGLE,
+    get_client,
+    google_rate_limited,
+    http_stats,
+    strava_quota_reset,
+)
+
+# Fast enough that pacing never slows the tests down unless they ask for it.
+POLICY = ProviderPolicy("stub", rate=1000, burst=1000, backoff=0.01, max_retries=3)
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(POLICY)
+    yield client
+    client.close()
+
+
+class TestRetries:
+    def test_retries_server_errors_until_success(self, stub_server, client):
+        stub_server.queue(status=503)
+        stub_server.queue(status=500)
+        stub_server.queue(status=200, body={"ok": True})
+
+        response = client.get(f"{stub_server.url}/thing")
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True}
+        assert len(stub_server.requests) == 3
+        assert client.stats.retries == 2
+
+    def test_returns_last_response_when_retries_run_out(self, stub_server, client):
+        for _ in range(POLICY.max_retries + 1):
+            stub_server.queue(status=502)
+
+        response = client.get(f"{stub_server.url}/thing")
+
+        assert response.status_code == 502
+        assert len(stub_server.requests) == POLICY.max_retries + 1
+        assert client.stats.failures == 1
+
+    def test_client_errors_are_not_retried(self, stub_server, client):
+        stub_server.queue(status=404)
+
+        assert client.get(f"{stub_server.url}/thing").status_code == 404
+        assert len(stub_server.requests) == 1
+
+    def test_post_is_not_retried_after_a_500(self, stub_server, client):
+        """The POST may have been processed, so retrying could repeat it."""
+        stub_server.queue(status=500)
+
+        assert client.post(f"{stub_server.url}/thing").status_code == 500
+        assert len(stub_server.requests) == 1
+
+    def test_post_is_retried_after_a_429(self, stub_server, client):
+        stub_server.queue(status=429)
+
+        assert client.post(f"{stub_server.url}/thing").status_code == 200
+        assert len(stub_server.requests) == 2
+        assert client.stats.throttled == 1
+
+    def test_dropped_connection_is_retried_for_get(self, stub_server, client):
+        stub_server.queue(drop=True)
+
+        assert client.get(f"{stub_server.url}/thing").status_code == 200
+        assert len(stub_server.requests) == 2
+
+    def test_connection_errors_raise_after_retries(self, client):
+        with pytest.raises(httpx.ConnectError):
+            # Nothing listens on port 9 (discard) here.
+            client.get("http://127.0.0.1:9/thing")
+        assert client.stats.requests == POLICY.max_retries + 1
+        assert client.stats.failures == 1
+
+
+class TestRateLimits:
+    def test_retry_after_is_honored(self, stub_server, client):
+        stub_server.queue(status=429, headers={"Retry-After": "1"})
+
+        assert client.get(f"{stub_server.url}/thing").status_code == 200
+
+        first, second = stub_server.requests
+        assert second.received_at - first.received_at >= 1
+
+    def test_retry_after_date_pauses_other_requests(self, stub_server):
+        """A 429 holds back every request to the provider, not just its retry."""
+        client = HttpClient(replace(POLICY, max_retries=0))
+        # HTTP dates have whole seconds, so this is between 1 and 2s away.
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=2)
+        stub_server.queue(
+            status=429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)}
+        )
+
+        assert client.get(f"{stub_server.url}/a").status_code == 429
+        assert client.get(f"{stub_server.url}/b").status_code == 200
+        client.close()
+
+        first, second = stub_server.requests
+        assert second.received_at - first.received_at >= 1
+
+    def test_raises_when_limit_resets_too_late(self, stub_server):
+        client = HttpClient(ProviderPolicy("stub", rate=1000, burst=1000, max_wait=5))
+        stub_server.queue(status=429, headers={"Retry-After": "3600"})
+
+        with pytest.raises(RateLimitedError) as excinfo:
+            client.get(f"{stub_server.url}/thing")
+        client.close()
+
+        assert excinfo.value.provider == "stub"
+        assert excinfo.value.retry_after > 3500
+        assert len(stub_server.requests) == 1
+
+    def test_strava_usage_headers_pause_requests(self, stub_server):
+        """A used-up Strava quota stops requests before Strava rejects them."""
+        client = HttpClient(
+            ProviderPolicy(
+                "strava", rate=1000, burst=1000, quota_reset=strava_quota_reset
+            )
+        )
+        # The daily limit resets at midnight, well past the policy's max_wait.
+        stub_server.queue(
+            headers={"X-RateLimit-Limit": "100,1000", "X-RateLimit-Usage": "60,1000"}
+        )
+
+        assert client.get(f"{stub_server.url}/thing").status_code == 200
+        with pytest.raises(RateLimitedError):
+            client.get(f"{stub_server.url}/thing")
+        client.close()
+
+        assert len(stub_server.requests) == 1
+
+    def test_google_rate_limit_403_is_retried(self, stub_server):
+        """Google Calendar throttles with 403 rateLimitExceeded; that's retried."""
+        client = HttpClient(replace(POLICY, throttled=GOOGLE.throttled))
+        stub_server.queue(
+            status=403,
+            body=_google_error("userRateLimitExceeded"),
+            headers={"Retry-After": "1"},
+        )
+
+        assert client.post(f"{stub_server.url}/thing").status_code == 200
+        client.close()
+
+        first, second = stub_server.requests
+        assert second.received_at - first.received_at >= 1
+        assert client.stats.throttled == 1
+        assert client.stats.retries == 1
+
+    def test_google_permission_403_is_not_retried(self, stub_server):
+        client = HttpClient(replace(POLICY, throttled=GOOGLE.throttled))
+        stub_server.queue(status=403, body=_google_error("forbidden", "global"))
+
+        assert client.get(f"{stub_server.url}/thing").status_code == 403
+        client.close()
+
+        assert len(stub_server.requests) == 1
+        assert client.stats.throttled == 0
+
+    def test_requests_are_paced_by_the_bucket(self, stub_server):
+        client = HttpClient(ProviderPolicy("stub", rate=20, burst=1))
+
+        for _ in range(5):
+            client.get(f"{stub_server.url}/thing")
+        client.close()
+
+        times = [request.received_at for request in stub_server.requests]
+        # The first request uses the burst; the other four wait 1/20s each.
+        assert times[-1] - times[0] >= 4 / 20 * 0.9
+
+
+def _google_error(reason: str, domain: str = "usageLimits") -> dict:
+    return {
+        "error": {
+            "errors": [{"domain": domain, "reason": reason, "message": reason}],
+            "code": 403,
+            "message": reason,
+        }
+    }
+
+
+class TestGoogleRateLimited:
+    @pytest.mark.parametrize("reason", ["rateLimitExceeded", "userRateLimitExceeded"])
+    def test_rate_limit_reasons(self, reason):
+        assert google_rate_limited(httpx.Response(403, json=_google_error(reason)))
+
+    def test_other_403s_and_statuses(self):
+        forbidden = _google_error("forbidden", "global")
+        assert not google_rate_limited(httpx.Response(403, json=forbidden))
+        rate_limited = _google_error("rateLimitExceeded")
+        assert not google_rate_limited(httpx.Response(400, json=rate_limited))
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            httpx.Response(403),
+            httpx.Response(403, text="Forbidden"),
+            httpx.Response(403, json={"error": "forbidden"}),
+            httpx.Response(403, json={"error": {"errors": ["rateLimitExceeded"]}}),
+        ],
+    )
+    def test_malformed_bodies(self, response):
+        assert not google_rate_limited(response)
+
+
+class TestStravaQuotaReset:
+    NOW = datetime(2025, 6, 1, 10, 7, 30, tzinfo=timezone.utc)
+
+    def _response(self, limit: str, usage: str, prefix: str = "X-RateLimit"):
+        return httpx.Response(
+            200, headers={f"{prefix}-Limit": limit, f"{prefix}-Usage": usage}
+        )
+
+    def test_under_limits(self):
+        response = self._response("100,1000", "99,999")
+        assert strava_quota_reset(response, self.NOW) is None
+
+    def test_fifteen_minute_limit_resets_on_the_quarter_hour(self):
+        response = self._response("100,1000", "100,400")
+        assert strava_quota_reset(response, self.NOW) == 7.5 * 60
+
+    def test_daily_limit_resets_at_midnight_utc(self):
+        response = self._response("100,1000", "50,1000")
+        assert strava_quota_reset(response, self.NOW) == (13 * 60 + 52.5) * 60
+
+    def test_read_limit(self):
+        response = self._response("100,1000", "100,500", prefix="X-ReadRateLimit")
+        assert strava_quota_reset(response, self.NOW) == 7.5 * 60
+
+    def test_missing_or_malformed_headers(self):
+        assert strava_quota_reset(httpx.Response(200), self.NOW) is None
+        response = self._response("100", "garbage")
+        assert strava_quota_reset(response, self.NOW) is None
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == pytest.approx(0.5)
+        # Reserved tokens queue up behind each other.
+        assert bucket.reserve() == pytest.approx(1.0)
+
+        now[0] = 10.0
+        assert bucket.reserve() == 0
+
+    def test_reserve_over_max_wait_takes_no_token(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=1, capacity=1, clock=lambda: now[0])
+        bucket.reserve()
+
+        assert bucket.reserve(max_wait=0.5) == pytest.approx(1.0)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_pause(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=10, capacity=10, clock=lambda: now[0])
+        bucket.pause(30)
+        bucket.pause(5)
+
+        assert bucket.reserve() == pytest.approx(30)
+
+
+class TestSharedClients:
+    def test_one_client_per_provider_with_stats(self, stub_server):
+        with patch.dict(http_client._clients, clear=True):
+            shared = get_client(POLICY)
+            assert get_client(POLICY) is shared
+
+            shared.get(f"{stub_server.url}/thing")
+            stats = http_stats()["stub"]
+            assert stats["requests"] == 1
+            assert stats["retries"] == 0
+            assert stats["latency_ms"]["max"] >= stats["latency_ms"]["p50"] > 0
+
+            close_clients()
+            assert shared.is_closed
+            assert get_client(POLICY) is not shared
+            close_clients()
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from fitness.integrations.strava.models import StravaActivity, StravaAthlete, StravaGear
-from fitness.load.strava import load_strava_runs
+from fitness.load.strava import RUN_TYPES, load_strava_run, load_strava_runs
 
 
 @pytest.fixture()
@@ -93,10 +93,10 @@ def test_strava_load(make_sample_strava_activity, make_sample_strava_gear, monke
     indoor_run = make_sample_strava_activity()
     indoor_run.type = "Indoor Run"
     indoor_run.gear_id = "2"
-    bike = make_sample_strava_activity()
-    bike.type = "Ride"
-    bike.gear_id = "3"
-    mock_client.get_activities.return_value = [run, indoor_run, bike]
+    no_gear = make_sample_strava_activity()
+    no_gear.gear_id = None
+    # The client only returns the types asked for.
+    mock_client.get_activities.return_value = [run, indoor_run, no_gear]
 
     # Set up mocking of the gear fetching.
     gear1 = make_sample_strava_gear()
@@ -106,9 +106,46 @@ def test_strava_load(make_sample_strava_activity, make_sample_strava_gear, monke
     gear2.id = "2"
     gear2.nickname = "Nike Shoes"
     mock_client.get_gear.return_value = [gear1, gear2]
-    runs = load_strava_runs(mock_client)
+    runs, listed_ids = load_strava_runs(mock_client)
     assert len(runs) == 2
     assert runs[0].gear.nickname == "Brooks Shoes"  # type: ignore[possibly-unbound-attribute]
     assert runs[1].gear.nickname == "Nike Shoes"  # type: ignore[possibly-unbound-attribute]
 
+    # The run without gear isn't loaded, but is still known to exist.
+    assert listed_ids == [run.id, indoor_run.id, no_gear.id]
+
+    mock_client.get_activities.assert_called_once_with(types=RUN_TYPES)
     mock_client.get_gear.assert_called_once_with({"1", "2"})
+
+
+def test_strava_load_single_run(make_sample_strava_activity, make_sample_strava_gear):
+    mock_client = MagicMock()
+    run = make_sample_strava_activity()
+    run.gear_id = "1"
+    gear = make_sample_strava_gear()
+    gear.id = "1"
+    mock_client.get_activity.return_value = run
+    mock_client.get_gear.return_value = [gear]
+
+    loaded = load_strava_run(mock_client, run.id)
+
+    assert loaded is not None
+    assert loaded.id == run.id
+    assert loaded.gear.id == "1"
+    mock_client.get_activity.assert_called_once_with(run.id)
+    mock_client.get_gear.assert_called_once_with(["1"])
+
+
+@pytest.mark.parametrize(
+    "type_, gear_id", [("Ride", "1"), ("Run", None)], ids=["not a run", "no gear"]
+)
+def test_strava_load_single_run_skips(make_sample_strava_activity, type_, gear_id):
+    """Activities `load_strava_runs` would leave out are skipped."""
+    mock_client = MagicMock()
+    activity = make_sample_strava_activity()
+    activity.type = type_
+    activity.gear_id = gear_id
+    mock_client.get_activity.return_value = activity
+
+    assert load_strava_run(mock_client, activity.id) is None
+    mock_client.get_gear.assert_not_called()
@@ -3,7 +3,7 @@ import zoneinfo
 
 import pytest
 
-from fitness.models import Run
+from fitness.models import LocalizedRunRecord, Run, RunRecord
 from tests._factories import StravaActivityWithGearFactory, MmfActivityFactory
 
 
@@ -59,3 +59,46 @@ def test_run_from_mmf_activity(mmf_activity_factory: MmfActivityFactory):
     assert run.source == "MapMyFitness"
     assert run.id.startswith("mmf_")  # Should be deterministic MMF ID
     assert run.deleted_at is None  # Should not be deleted by default
+
+
+def test_run_record_round_trip():
+    row = (
+        "strava_1",
+        datetime(2024, 11, 4, 12),
+        "Outdoor Run",
+        5.0,
+        1800.0,
+        "Strava",
+        150.0,
+        "nike_air_zoom",
+        None,
+        "Nike Air Zoom",
+    )
+    record = RunRecord(*row)
+    run = record.to_run()
+    assert isinstance(run, Run)
+    assert run.id == "strava_1"
+    assert run.shoe_id == "nike_air_zoom"
+    assert run.shoe_name == "Nike Air Zoom"
+    assert RunRecord.from_run(run) == record
+    assert not record.is_deleted
+
+
+def test_run_records_are_slotted():
+    record = LocalizedRunRecord(
+        "strava_1",
+        datetime(2024, 11, 4, 3),
+        "Outdoor Run",
+        5.0,
+        1800.0,
+        "Strava",
+        None,
+        None,
+        None,
+        None,
+        datetime(2024, 11, 3, 21),
+    )
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+    assert record.local_date == date(2024, 11, 3)